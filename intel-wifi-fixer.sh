@@ -56,6 +56,13 @@ if [ "$EUID" -ne 0 ]; then
     exit 1
 fi
 
+# With subcommand arguments, setup messages go to stderr so stdout holds only
+# the command's output (e.g. --json)
+exec 3>&1
+if [ $# -gt 0 ]; then
+    exec 1>&2
+fi
+
 # Get the script directory
 SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )"
 
@@ -135,7 +142,7 @@ echo_color "green" "Environment setup complete."
 # Run the application
 echo "Starting Intel WiFi Fixer..."
 cd "$SCRIPT_DIR"
-python -m src.main
+python -m src.main "$@" 1>&3
 EXIT_CODE=$?
 
 # Deactivate virtual environment
@@ -4,7 +4,7 @@ import glob
 
 # Include data files
 data_files = [
-    ('data', glob.glob('data/*')),
+    ('data/adapters', glob.glob('data/adapters/*')),
 ]
 
 setup(
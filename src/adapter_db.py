@@ -0,0 +1,263 @@
+"""
+Adapter Database Module
+
+This module loads the adapter specification and quirk database from
+data/adapters/*.json|*.yaml, validates each entry against ADAPTER_SCHEMA and
+indexes it by PCI/USB "vendor:device" ID. The compiled index is cached as
+JSON and reused as long as the source files' mtimes and sizes are unchanged.
+"""
+
+import os
+import json
+import stat
+from src.utils.ui_helpers import display_warning
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+ADAPTER_DB_DIR = os.path.join(DATA_DIR, "adapters")
+INDEX_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "intel-wifi-fixer", "adapter_index.json"
+)
+
+# Bump when the index layout changes so stale caches are rebuilt
+INDEX_VERSION = 3
+
+# Module parameters a profile may recommend, per kernel module
+MODULE_PARAMETERS = {
+    "iwlwifi": ["11n_disable", "power_save", "power_level", "swcrypto", "bt_coex_active",
+                "amsdu_size", "uapsd_disable", "disable_11ac", "disable_11ax"],
+    "iwlmvm": ["power_scheme"],
+    "iwldvm": ["force_cam"]
+}
+
+# Used when the adapter cannot be detected (the tool's original target)
+DEFAULT_ADAPTER_ID = "8086:0085"
+
+ADAPTER_SCHEMA = {
+    "type": "object",
+    "required": ["name", "chipset", "bus", "ids", "specs"],
+    "properties": {
+        "name": {"type": "string"},
+        "chipset": {"type": "string"},
+        "bus": {"enum": ["pci", "usb"]},
+        "ids": {
+            "type": "array",
+            "minItems": 1,
+            "items": {"type": "string", "pattern": "^[0-9a-f]{4}:[0-9a-f]{4}$"}
+        },
+        "driver": {
+            "type": "object",
+            "properties": {
+                "module": {"type": "string"},
+                "op_mode": {"type": "string"}
+            }
+        },
+        "firmware": {"type": "string"},
+        "module_parameters": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                module: {
+                    "type": "object",
+                    "additionalProperties": False,
+                    "properties": {param: {"type": "integer"} for param in params}
+                }
+                for module, params in MODULE_PARAMETERS.items()
+            }
+        },
+        "specs": {"type": "object"},
+        "quirks": {"type": "object"}
+    }
+}
+
+DB_EXTENSIONS = (".json", ".yaml", ".yml")
+
+_index = None
+
+def _source_files(db_dir):
+    return sorted(
+        os.path.join(db_dir, name) for name in os.listdir(db_dir)
+        if name.endswith(DB_EXTENSIONS)
+    )
+
+def _signature(files):
+    """Identify a set of source files by name, mtime and size."""
+    signature = [INDEX_VERSION]
+    for path in files:
+        info = os.stat(path)
+        # Lists rather than tuples, so the signature compares equal after a JSON round trip
+        signature.append([os.path.basename(path), info.st_mtime_ns, info.st_size])
+    return signature
+
+def _read_cache(cache_path, signature):
+    """Return the cached index if it matches the signature and only we could have written it."""
+    with open(cache_path, 'r') as f:
+        info = os.fstat(f.fileno())
+        # The cache lives in the user's home but is also read by root
+        if info.st_uid != os.geteuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            return None
+        cached = json.load(f)
+    if cached.get("signature") != signature:
+        return None
+    entries = cached["entries"]
+    return {device_id: entries[position] for device_id, position in cached["ids"].items()}
+
+def _write_cache(cache_path, signature, index):
+    # Entries shared by several IDs are stored once
+    entries, positions = [], {}
+    for entry in index.values():
+        if id(entry) not in positions:
+            positions[id(entry)] = len(entries)
+            entries.append(entry)
+    ids = {device_id: positions[id(entry)] for device_id, entry in index.items()}
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+        json.dump({"signature": signature, "entries": entries, "ids": ids}, f)
+    os.replace(tmp_path, cache_path)
+
+def _load_file(path):
+    with open(path, 'r') as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        import yaml
+        return yaml.safe_load(f)
+
+def compile_index(files):
+    """
+    Parse and validate adapter files into an ID index.
+
+    Args:
+        files: Paths of the adapter definition files
+
+    Returns:
+        dict: Adapter entries keyed by "vendor:device" ID
+    """
+    import jsonschema
+
+    index = {}
+    for path in files:
+        try:
+            entry = _load_file(path)
+            jsonschema.validate(entry, ADAPTER_SCHEMA)
+        except Exception as e:
+            display_warning(f"Skipping invalid adapter definition {os.path.basename(path)}: {str(e)}")
+            continue
+
+        entry.setdefault("quirks", {})
+        entry.setdefault("module_parameters", {})
+        entry["source"] = os.path.basename(path)
+        for device_id in entry["ids"]:
+            if device_id in index:
+                display_warning(f"Adapter ID {device_id} in {entry['source']} "
+                                f"is already defined in {index[device_id]['source']}")
+                continue
+            index[device_id] = entry
+
+    return index
+
+def load_adapter_index(db_dir=ADAPTER_DB_DIR, cache_path=INDEX_CACHE_PATH):
+    """
+    Load the adapter index, rebuilding the cache only when sources change.
+
+    Args:
+        db_dir: The directory containing adapter definition files
+        cache_path: Where to store the compiled index (None disables caching)
+
+    Returns:
+        dict: Adapter entries keyed by "vendor:device" ID
+    """
+    try:
+        files = _source_files(db_dir)
+    except OSError as e:
+        display_warning(f"Error reading adapter database: {str(e)}")
+        return {}
+
+    signature = _signature(files)
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            index = _read_cache(cache_path, signature)
+            if index is not None:
+                return index
+        except Exception:
+            # Corrupt or incompatible cache; rebuild it below
+            pass
+
+    index = compile_index(files)
+
+    if cache_path:
+        try:
+            _write_cache(cache_path, signature, index)
+        except (OSError, TypeError, ValueError):
+            # The index still works without a cache, e.g. on a read-only home
+            pass
+
+    return index
+
+def get_adapter_index():
+    """Return the process-wide adapter index, loading it on first use."""
+    global _index
+    if _index is None:
+        _index = load_adapter_index()
+    return _index
+
+def lookup_adapter(device_id):
+    """
+    Look up an adapter by its "vendor:device" ID.
+
+    Returns:
+        dict: The adapter entry, or None if the ID is not in the database
+    """
+    return get_adapter_index().get(device_id.lower())
+
+def _read_id(path):
+    try:
+        with open(path) as f:
+            value = f.read().strip().lower()
+    except OSError:
+        return None
+    return value[2:] if value.startswith("0x") else value
+
+def read_device_id(interface="wlan0"):
+    """
+    Read the PCI or USB vendor:device ID of a network interface from sysfs.
+
+    Args:
+        interface: The network interface name
+
+    Returns:
+        str: The "vendor:device" ID, or None if it cannot be determined
+    """
+    device_dir = f"/sys/class/net/{interface}/device"
+
+    # PCI devices expose vendor/device directly
+    vendor = _read_id(os.path.join(device_dir, "vendor"))
+    device = _read_id(os.path.join(device_dir, "device"))
+    if vendor and device:
+        return f"{vendor}:{device}"
+
+    # USB network interfaces hang off an interface of the USB device
+    vendor = _read_id(os.path.join(device_dir, "..", "idVendor"))
+    device = _read_id(os.path.join(device_dir, "..", "idProduct"))
+    if vendor and device:
+        return f"{vendor}:{device}"
+
+    return None
+
+def detect_adapter(interface="wlan0"):
+    """
+    Detect the adapter behind a network interface.
+
+    Args:
+        interface: The network interface name
+
+    Returns:
+        dict: The adapter entry, or None if the device is not in the database
+    """
+    device_id = read_device_id(interface)
+    return lookup_adapter(device_id) if device_id else None
+
+def default_adapter():
+    """Return the entry used when the adapter cannot be detected."""
+    return lookup_adapter(DEFAULT_ADAPTER_ID)
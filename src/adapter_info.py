@@ -1,137 +1,229 @@
-import os
-import re
-import json
+import time
 from src.utils.command_runner import run_command
+from src.adapter_db import detect_adapter, default_adapter
+from src.link_state import get_static_info, get_address, get_wireless_info, freq_to_channel
 from src.utils.ui_helpers import display_warning
 
+# Facts that do not change for the life of the process, keyed by (adapter_id, field)
+_STATIC_CACHE = {}
+
+class Fallback:
+    """A field value that was not actually read (e.g. the interface is absent); returned but never cached."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+class cached_field:
+    """
+    Lazily computed adapter field.
+
+    The value is computed on first access and cached for ``ttl`` seconds.
+    Static fields are cached for the life of the process and shared between
+    AdapterInfo instances for the same adapter. A field returning a Fallback
+    is recomputed on the next access.
+    """
+
+    def __init__(self, ttl=None, static=False):
+        self.ttl = ttl
+        self.static = static
+
+    def __call__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+        return self
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        cache = _STATIC_CACHE if self.static else obj._cache
+        key = (obj.adapter_id, self.name) if self.static else self.name
+        now = time.monotonic()
+
+        entry = cache.get(key)
+        if entry is not None and (self.ttl is None or now - entry[1] < self.ttl):
+            return entry[0]
+
+        value = self.func(obj)
+        if isinstance(value, Fallback):
+            return value.value
+        cache[key] = (value, now)
+        return value
+
+    def is_cached(self, obj):
+        """Return True if a value was read and stored (it may have expired)."""
+        if self.static:
+            return (obj.adapter_id, self.name) in _STATIC_CACHE
+        return self.name in obj._cache
+
+    def invalidate(self, obj):
+        if self.static:
+            _STATIC_CACHE.pop((obj.adapter_id, self.name), None)
+        else:
+            obj._cache.pop(self.name, None)
+
 class AdapterInfo:
+    # Fields shown by retrieve_configuration, in display order
+    CONFIGURATION_FIELDS = [
+        ("SSID", "ssid"),
+        ("MAC Address", "mac_address"),
+        ("Driver", "driver"),
+        ("Firmware", "firmware"),
+        ("IP Address", "ip_address"),
+        ("Channel", "channel"),
+        ("Frequency", "frequency"),
+        ("Bit Rate", "bitrate"),
+        ("Transmit Power", "tx_power")
+    ]
+
     def __init__(self):
-        self.adapter_name = "Intel Centrino Advanced-N 6205"
         self.adapter_id = "wlan0"
-        self.status = None
-        self.configuration = {}
-        self.specs = self._load_specs()
+        self._cache = {}
 
-    def retrieve_status(self):
-        """Retrieve the current status of the adapter."""
+    def refresh(self, *names):
+        """
+        Drop cached values so they are recomputed on next access.
+
+        Args:
+            names: Field names to refresh; refreshes every dynamic field if empty
+        """
+        if not names:
+            self._cache.clear()
+            return
+
+        for name in names:
+            field = getattr(type(self), name, None)
+            if not isinstance(field, cached_field):
+                raise AttributeError(f"Unknown adapter field: {name}")
+            field.invalidate(self)
+            # Derived fields share a single underlying query
+            if name in ("ssid", "channel", "frequency", "bitrate", "tx_power"):
+                type(self).link.invalidate(self)
+            elif name in ("mac_address", "driver", "firmware"):
+                type(self).static_info.invalidate(self)
+
+    @cached_field(ttl=2)
+    def status(self):
+        """Connection status reported by NetworkManager ("connected"/"disconnected")."""
         try:
             # Try to get the status from NetworkManager using the correct field
             output = run_command(["nmcli", "-t", "device", "status"])
             if output and self.adapter_id in output:
                 # Parse the output to find the status of our adapter
+                status = "disconnected"
                 for line in output.splitlines():
                     if self.adapter_id in line:
                         parts = line.split(':')
                         if len(parts) >= 3 and parts[2] == "connected":
-                            self.status = "connected"
+                            status = "connected"
                             break
-                        else:
-                            self.status = "disconnected"
+                return status
             else:
                 # Fallback to checking if the interface is up
                 output = run_command(["ip", "link", "show", self.adapter_id])
-                if "UP" in output:
-                    self.status = "connected"
-                else:
-                    self.status = "disconnected"
-            
-            return self.status
+                return "connected" if output and "UP" in output else "disconnected"
         except Exception as e:
             display_warning(f"Error retrieving adapter status: {str(e)}")
             return "unknown"
 
+    @cached_field(static=True)
+    def static_info(self):
+        """MAC address, driver and firmware, memoized for the process once the interface exists."""
+        info = get_static_info(self.adapter_id)
+        return info if any(info.values()) else Fallback(info)
+
+    @cached_field(static=True)
+    def profile(self):
+        """Adapter database entry for the detected device, memoized for the process."""
+        return detect_adapter(self.adapter_id) or Fallback(default_adapter() or {})
+
+    @cached_field(static=True)
+    def adapter_name(self):
+        name = self.profile.get("name", "Intel Centrino Advanced-N 6205")
+        return name if type(self).profile.is_cached(self) else Fallback(name)
+
+    @cached_field(static=True)
+    def specs(self):
+        """Adapter specifications, memoized for the process."""
+        specs = self._load_specs()
+        return specs if type(self).profile.is_cached(self) else Fallback(specs)
+
+    @cached_field(ttl=1)
+    def link(self):
+        """Raw wireless link information from nl80211."""
+        return get_wireless_info(self.adapter_id)
+
+    @cached_field(static=True)
+    def mac_address(self):
+        return self.static_info["mac"] or Fallback("Unknown")
+
+    @cached_field(static=True)
+    def driver(self):
+        return self.static_info["driver"] or Fallback("Unknown")
+
+    @cached_field(static=True)
+    def firmware(self):
+        return self.static_info["firmware"] or Fallback("Unknown")
+
+    @cached_field(ttl=5)
+    def ip_address(self):
+        return get_address(self.adapter_id) or "Not assigned"
+
+    @cached_field(ttl=5)
+    def ssid(self):
+        return self.link.get("ssid") or "Not connected"
+
+    @cached_field(ttl=5)
+    def frequency(self):
+        frequency = self.link.get("frequency")
+        return f"{frequency / 1000:.3f} GHz" if frequency else "Unknown"
+
+    @cached_field(ttl=5)
+    def channel(self):
+        channel = freq_to_channel(self.link.get("frequency"))
+        return str(channel) if channel else "Unknown"
+
+    @cached_field(ttl=2)
+    def bitrate(self):
+        bitrate = self.link.get("bitrate")
+        return f"{bitrate:g} Mb/s" if bitrate else "Unknown"
+
+    @cached_field(ttl=5)
+    def tx_power(self):
+        tx_power = self.link.get("tx_power")
+        return f"{tx_power:g} dBm" if tx_power is not None else "Unknown"
+
+    @property
+    def configuration(self):
+        """The adapter configuration, computed from the cached fields."""
+        return {label: getattr(self, name) for label, name in self.CONFIGURATION_FIELDS}
+
+    def retrieve_status(self):
+        """Retrieve the current status of the adapter."""
+        return self.status
+
     def retrieve_configuration(self):
         """Retrieve the configuration of the adapter."""
         try:
-            # Get the current SSID if connected
-            ssid = "Not connected"
-            connection_info = run_command(["nmcli", "-t", "device", "status"])
-            if connection_info and self.adapter_id in connection_info:
-                for line in connection_info.splitlines():
-                    if self.adapter_id in line:
-                        parts = line.split(':')
-                        if len(parts) >= 4 and parts[2] == "connected":
-                            ssid = parts[3]
-                            break
-            
-            # Get the MAC address
-            mac = run_command(["cat", f"/sys/class/net/{self.adapter_id}/address"])
-            if not mac:
-                mac = "Unknown"
-            
-            # Get the driver information
-            driver_info = run_command(["ethtool", "-i", self.adapter_id])
-            driver = "Unknown"
-            firmware = "Unknown"
-            
-            if driver_info:
-                driver_match = re.search(r"driver: (\w+)", driver_info)
-                if driver_match:
-                    driver = driver_match.group(1)
-                
-                firmware_match = re.search(r"firmware-version: ([\w.-]+)", driver_info)
-                if firmware_match:
-                    firmware = firmware_match.group(1)
-            
-            # Get the IP address if connected
-            ip_address = run_command(["ip", "-4", "addr", "show", self.adapter_id])
-            if ip_address:
-                ip_match = re.search(r"inet ([\d.]+)", ip_address)
-                if ip_match:
-                    ip_address = ip_match.group(1)
-                else:
-                    ip_address = "Not assigned"
-            else:
-                ip_address = "Not assigned"
-            
-            # Get the current channel and frequency if connected
-            channel_info = run_command(["iwconfig", self.adapter_id])
-            channel = "Unknown"
-            frequency = "Unknown"
-            
-            if channel_info:
-                channel_match = re.search(r"Channel=(\d+)", channel_info)
-                if channel_match:
-                    channel = channel_match.group(1)
-                
-                freq_match = re.search(r"Frequency[=:](\d+\.\d+) GHz", channel_info)
-                if freq_match:
-                    frequency = f"{freq_match.group(1)} GHz"
-            
-            self.configuration = {
-                "SSID": ssid,
-                "MAC Address": mac,
-                "Driver": driver,
-                "Firmware": firmware,
-                "IP Address": ip_address,
-                "Channel": channel,
-                "Frequency": frequency
-            }
-            
             return self.configuration
         except Exception as e:
             display_warning(f"Error retrieving adapter configuration: {str(e)}")
-            return {
-                "SSID": "Error retrieving information",
-                "MAC Address": "Error retrieving information",
-                "Driver": "Error retrieving information",
-                "Firmware": "Error retrieving information",
-                "IP Address": "Error retrieving information",
-                "Channel": "Error retrieving information",
-                "Frequency": "Error retrieving information"
-            }
+            return {label: "Error retrieving information" for label, _ in self.CONFIGURATION_FIELDS}
 
     def display_info(self):
         """Display information about the adapter."""
         status = self.retrieve_status()
         configuration = self.retrieve_configuration()
-        
+
         print(f"\nAdapter: {self.adapter_name}")
         print(f"Status: {'Connected' if 'connected' in status else 'Disconnected'}")
         print("\nConfiguration:")
         for key, value in configuration.items():
             print(f"  {key}: {value}")
-        
+
         if self.specs:
             print("\nSpecifications:")
             for key, value in self.specs.items():
@@ -143,16 +235,12 @@ class AdapterInfo:
                     print(f"  {key}: {value}")
 
     def _load_specs(self):
-        """Load the adapter specifications from the JSON file."""
+        """Load the adapter specifications from the adapter database."""
         try:
-            specs_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                                     "data", "intel_6205_specs.json")
-            
-            if os.path.exists(specs_path):
-                with open(specs_path, 'r') as f:
-                    return json.load(f)
+            if self.profile.get("specs"):
+                return self.profile["specs"]
             else:
-                # Return default specs if file not found
+                # Return default specs if the adapter is not in the database
                 return {
                     "Model": "Intel Centrino Advanced-N 6205",
                     "Chipset": "Intel 6205",
@@ -163,4 +251,4 @@ class AdapterInfo:
                 }
         except Exception as e:
             display_warning(f"Error loading adapter specifications: {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
@@ -0,0 +1,207 @@
+"""
+Driver Auto-Tuning Module
+
+This module searches the driver's module parameters for the configuration
+with the best measured throughput. Each candidate is applied by rewriting the
+modprobe configuration and reloading the driver, then probed with a short
+benchmark run against a benchmark server (see src.benchmark).
+
+The search is a coordinate descent starting from the adapter's profile: one
+parameter is varied at a time and the best value is kept before moving on.
+It stops early once several trials in a row fail to improve on the best
+result, and rolls back to the best known configuration whenever a trial
+loses connectivity or regresses latency.
+"""
+
+import copy
+import socket
+import time
+from src.benchmark import DEFAULT_PORT, measure_download, measure_upload, measure_latency
+from src.driver_profiles import get_module_parameters
+from src.driver_reload import reload_driver
+from src.fixes import configure_driver_parameters
+from src.utils.ui_helpers import display_message, display_success, display_error, display_warning
+
+# Candidate values per (module, parameter); modules the adapter does not use are skipped
+SEARCH_SPACE = {
+    ("iwlwifi", "11n_disable"): [0, 1, 8],
+    ("iwlwifi", "power_save"): [0, 1],
+    ("iwlwifi", "amsdu_size"): [0, 1, 2, 3],
+    ("iwlwifi", "bt_coex_active"): [0, 1],
+    ("iwlmvm", "power_scheme"): [1, 2, 3]
+}
+
+def score_result(result):
+    """Score a probe result by its mean throughput, discounted by packet loss."""
+    throughput = (result["upload_mbps"] + result["download_mbps"]) / 2
+    return throughput * (1 - (result.get("loss") or 0) / 100)
+
+def wait_for_server(host, port, timeout=30):
+    """Wait until the benchmark server is reachable, e.g. after a driver reload."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=2).close()
+            return True
+        except OSError:
+            time.sleep(1)
+    return False
+
+class DriverTuner:
+    """Coordinate-descent search over driver module parameters."""
+
+    def __init__(self, host, port=DEFAULT_PORT, adapter_info=None, search_space=None,
+                 probe_duration=3.0, patience=3, min_improvement=0.02, max_trials=30,
+                 latency_tolerance=1.5, apply=None, probe=None):
+        """
+        Args:
+            host: The benchmark server address
+            port: The benchmark server port
+            adapter_info: An AdapterInfo instance used to find the starting profile
+            search_space: Candidate values keyed by (module, parameter)
+            probe_duration: Seconds per throughput direction in each probe
+            patience: Move on to the next parameter after this many of its
+                values in a row without improvement
+            min_improvement: Relative score gain that counts as an improvement
+            max_trials: Hard limit on the number of probes
+            latency_tolerance: Reject candidates whose p90 RTT exceeds the
+                baseline's by this factor
+            apply: Callable taking module parameters and applying them (for testing)
+            probe: Callable returning a benchmark result dict or None (for testing)
+        """
+        self.host = host
+        self.port = port
+        self.adapter_info = adapter_info
+        self.probe_duration = probe_duration
+        self.patience = patience
+        self.min_improvement = min_improvement
+        self.max_trials = max_trials
+        self.latency_tolerance = latency_tolerance
+        self.apply = apply or self._apply
+        self.probe = probe or self._probe
+
+        self.baseline = copy.deepcopy(get_module_parameters(adapter_info))
+        space = search_space or SEARCH_SPACE
+        modules = set(self.baseline) | {"iwlwifi"}
+        if adapter_info is not None:
+            modules.add(adapter_info.profile.get("driver", {}).get("op_mode", "iwlmvm"))
+        self.search_space = {key: values for key, values in space.items() if key[0] in modules}
+        self.trials = []
+        self.applied = None
+
+    def _set(self, parameters):
+        if not self.apply(parameters):
+            return False
+        self.applied = copy.deepcopy(parameters)
+        return True
+
+    def _apply(self, parameters):
+        # A candidate only counts if its configuration was written and loaded;
+        # otherwise the probe would measure the previous driver state
+        if not configure_driver_parameters(self.adapter_info, parameters):
+            return False
+        try:
+            return reload_driver(self.adapter_info)["success"]
+        except Exception as e:
+            display_warning(f"Could not reload driver: {str(e)}")
+            return False
+
+    def _probe(self):
+        if not wait_for_server(self.host, self.port):
+            return None
+        try:
+            upload = measure_upload(self.host, self.port, self.probe_duration)
+            download = measure_download(self.host, self.port, self.probe_duration)
+            latency = measure_latency(self.host, self.port, count=20)
+        except (OSError, ValueError):
+            return None
+
+        result = {"upload_mbps": upload["mbps"], "download_mbps": download["mbps"]}
+        result.update(latency)
+        return result
+
+    def _trial(self, parameters):
+        if not self._set(parameters):
+            return None
+        result = self.probe()
+        trial = {
+            "parameters": copy.deepcopy(parameters),
+            "result": result,
+            "score": score_result(result) if result else None
+        }
+        self.trials.append(trial)
+        return trial
+
+    def _is_regression(self, trial, baseline_trial):
+        if trial["result"] is None:
+            return True
+        baseline_rtt = baseline_trial["result"].get("rtt_p90")
+        rtt = trial["result"].get("rtt_p90")
+        return bool(baseline_rtt and rtt and rtt > baseline_rtt * self.latency_tolerance)
+
+    def run(self):
+        """
+        Run the search and leave the best configuration applied.
+
+        Returns:
+            dict: best (parameters, result, score), baseline trial, trials and
+                  stopped_early; None if the baseline could not be measured
+        """
+        display_message("Measuring baseline configuration...", color='blue')
+        baseline_trial = self._trial(self.baseline)
+        if not baseline_trial or baseline_trial["result"] is None:
+            display_error("Could not measure the baseline configuration.")
+            return None
+
+        best = baseline_trial
+        stopped_early = False
+        out_of_trials = False
+
+        for (module, key), values in self.search_space.items():
+            # Patience applies per coordinate, so a later parameter still gets its turn
+            misses = 0
+            for value in values:
+                if best["parameters"].get(module, {}).get(key) == value:
+                    continue
+                if len(self.trials) >= self.max_trials:
+                    stopped_early = out_of_trials = True
+                    break
+                if misses >= self.patience:
+                    stopped_early = True
+                    break
+
+                candidate = copy.deepcopy(best["parameters"])
+                candidate.setdefault(module, {})[key] = value
+                if any(trial["parameters"] == candidate for trial in self.trials):
+                    continue
+                display_message(f"Trying {module}.{key}={value}...", color='blue')
+                trial = self._trial(candidate)
+
+                if trial is None or self._is_regression(trial, baseline_trial):
+                    display_warning(f"{module}.{key}={value} regressed; rolling back.")
+                    self._set(best["parameters"])
+                    misses += 1
+                elif trial["score"] > best["score"] * (1 + self.min_improvement):
+                    best = trial
+                    misses = 0
+                else:
+                    misses += 1
+            if out_of_trials:
+                break
+
+        # Leave the best configuration applied
+        if self.applied != best["parameters"]:
+            self._set(best["parameters"])
+
+        if best is baseline_trial:
+            display_message("The current profile already performs best.", color='green')
+        else:
+            gain = (best["score"] / baseline_trial["score"] - 1) * 100 if baseline_trial["score"] else 0
+            display_success(f"Found a configuration {gain:.0f}% faster than the baseline.")
+
+        return {
+            "best": best,
+            "baseline": baseline_trial,
+            "trials": self.trials,
+            "stopped_early": stopped_early
+        }
@@ -0,0 +1,374 @@
+"""
+Throughput Benchmark Module
+
+This module measures throughput, latency and TCP retransmits against a
+benchmark server, so the effect of driver parameter or transmit power changes
+can be compared between runs. The server is bundled and can run on a LAN host
+or on loopback for CI:
+
+    python -m src.benchmark --port 5201
+
+The server speaks a one-line protocol on a TCP port ("RECV" to sink data,
+"SEND <seconds>" to source it) and echoes UDP datagrams on the same port number.
+"""
+
+import os
+import json
+import time
+import socket
+import struct
+import threading
+import datetime
+from src.telemetry import percentile
+from src.utils.ui_helpers import display_message, display_error, display_warning
+
+DEFAULT_PORT = 5201
+CHUNK_SIZE = 128 * 1024
+PING_SIZE = 64
+RESULTS_PATH = os.path.join(
+    os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share")),
+    "intel-wifi-fixer", "benchmarks.ndjson"
+)
+
+# Offset of tcpi_total_retrans in struct tcp_info
+TCP_INFO_TOTAL_RETRANS = 100
+
+def tcp_retransmits(sock):
+    """Return the total number of retransmitted segments on a TCP socket, or None."""
+    try:
+        info = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, TCP_INFO_TOTAL_RETRANS + 4)
+        return struct.unpack_from("I", info, TCP_INFO_TOTAL_RETRANS)[0]
+    except (OSError, AttributeError, struct.error):
+        return None
+
+def _read_line(sock):
+    line = b""
+    while not line.endswith(b"\n"):
+        data = sock.recv(1)
+        if not data:
+            break
+        line += data
+    return line.decode().strip()
+
+def _recv_exact(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Benchmark server closed the connection")
+        data += chunk
+    return data
+
+class BenchmarkServer:
+    """A TCP sink/source and UDP echo server for benchmark runs."""
+
+    def __init__(self, host="0.0.0.0", port=DEFAULT_PORT):
+        self.tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.tcp.bind((host, port))
+        self.tcp.listen(8)
+        # Port 0 picks a free port; use the same number for UDP
+        self.host, self.port = self.tcp.getsockname()
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind((host, self.port))
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Serve in background threads."""
+        for target in (self._serve_tcp, self._serve_udp):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def serve_forever(self):
+        """Serve until interrupted."""
+        self.start()
+        try:
+            while not self._stop_event.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        self.stop()
+
+    def stop(self):
+        self._stop_event.set()
+        for sock in (self.tcp, self.udp):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def _serve_udp(self):
+        while not self._stop_event.is_set():
+            try:
+                data, address = self.udp.recvfrom(2048)
+                if self._stop_event.is_set():
+                    return
+                self.udp.sendto(data, address)
+            except OSError:
+                return
+
+    def _serve_tcp(self):
+        while not self._stop_event.is_set():
+            try:
+                conn, _ = self.tcp.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        try:
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            command = _read_line(conn).split()
+            if not command:
+                return
+
+            if command[0] == "RECV":
+                total = 0
+                started = time.monotonic()
+                while True:
+                    data = conn.recv(CHUNK_SIZE)
+                    if not data:
+                        break
+                    total += len(data)
+                elapsed = time.monotonic() - started
+                conn.sendall(json.dumps({"bytes": total, "seconds": elapsed}).encode() + b"\n")
+
+            elif command[0] == "SEND":
+                duration = float(command[1]) if len(command) > 1 else 5.0
+                frame = struct.pack("I", CHUNK_SIZE) + b"\0" * CHUNK_SIZE
+                deadline = time.monotonic() + duration
+                while time.monotonic() < deadline:
+                    conn.sendall(frame)
+                # A zero-length frame ends the data, followed by our retransmits
+                conn.sendall(struct.pack("I", 0))
+                conn.sendall(json.dumps({"retransmits": tcp_retransmits(conn)}).encode() + b"\n")
+        except (OSError, ValueError):
+            pass
+        finally:
+            conn.close()
+
+def measure_upload(host, port=DEFAULT_PORT, duration=5.0):
+    """
+    Measure client-to-server throughput over TCP.
+
+    Returns:
+        dict: mbps, bytes, seconds and retransmits
+    """
+    with socket.create_connection((host, port), timeout=duration + 10) as sock:
+        sock.sendall(b"RECV\n")
+        payload = b"\0" * CHUNK_SIZE
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            sock.sendall(payload)
+        retransmits = tcp_retransmits(sock)
+        sock.shutdown(socket.SHUT_WR)
+        report = json.loads(_read_line(sock))
+
+    seconds = max(report["seconds"], 1e-6)
+    return {
+        "mbps": report["bytes"] * 8 / seconds / 1e6,
+        "bytes": report["bytes"],
+        "seconds": seconds,
+        "retransmits": retransmits
+    }
+
+def measure_download(host, port=DEFAULT_PORT, duration=5.0):
+    """
+    Measure server-to-client throughput over TCP.
+
+    Returns:
+        dict: mbps, bytes, seconds and retransmits (as seen by the sender)
+    """
+    with socket.create_connection((host, port), timeout=duration + 10) as sock:
+        sock.sendall(f"SEND {duration}\n".encode())
+        buffer = bytearray(CHUNK_SIZE)
+        total = 0
+        started = time.monotonic()
+        while True:
+            length = struct.unpack("I", _recv_exact(sock, 4))[0]
+            if length == 0:
+                break
+            remaining = length
+            while remaining:
+                received = sock.recv_into(buffer, min(remaining, CHUNK_SIZE))
+                if not received:
+                    raise ConnectionError("Benchmark server closed the connection")
+                remaining -= received
+            total += length
+        seconds = max(time.monotonic() - started, 1e-6)
+        report = json.loads(_read_line(sock) or "{}")
+
+    return {
+        "mbps": total * 8 / seconds / 1e6,
+        "bytes": total,
+        "seconds": seconds,
+        "retransmits": report.get("retransmits")
+    }
+
+def measure_latency(host, port=DEFAULT_PORT, count=50, interval=0.02, timeout=1.0):
+    """
+    Measure round-trip times with UDP echo requests.
+
+    Returns:
+        dict: rtt_p50, rtt_p90, rtt_p99 (milliseconds), rtt_min, rtt_max and loss (percent)
+    """
+    rtts = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect((host, port))
+        for seq in range(count):
+            payload = struct.pack("I", seq) + b"\0" * (PING_SIZE - 4)
+            started = time.perf_counter()
+            sock.send(payload)
+            try:
+                while True:
+                    reply = sock.recv(2048)
+                    # Ignore late replies to earlier requests
+                    if reply[:4] == payload[:4]:
+                        rtts.append((time.perf_counter() - started) * 1000)
+                        break
+            except socket.timeout:
+                pass
+            time.sleep(interval)
+
+    return {
+        "rtt_p50": percentile(rtts, 50),
+        "rtt_p90": percentile(rtts, 90),
+        "rtt_p99": percentile(rtts, 99),
+        "rtt_min": min(rtts) if rtts else None,
+        "rtt_max": max(rtts) if rtts else None,
+        "loss": 100.0 * (count - len(rtts)) / count if count else 0.0
+    }
+
+def capture_configuration(interface="wlan0"):
+    """Record the driver parameters and transmit power in effect for a run."""
+    from src.diagnostics import check_driver_parameters
+    from src.driver_profiles import parse_modprobe_options
+    from src.link_state import get_wireless_info
+
+    link = get_wireless_info(interface)
+    return {
+        "module_parameters": parse_modprobe_options(check_driver_parameters()),
+        "tx_power": link.get("tx_power"),
+        "frequency": link.get("frequency"),
+        "bitrate": link.get("bitrate")
+    }
+
+def run_benchmark(host, port=DEFAULT_PORT, duration=5.0, label=None, pings=50,
+                  interface="wlan0", save=True):
+    """
+    Run a full benchmark: upload, download and latency.
+
+    Args:
+        host: The benchmark server address
+        port: The benchmark server port
+        duration: Seconds per throughput direction
+        label: A name for this run (e.g. the configuration under test)
+        pings: The number of latency probes
+        interface: The wireless interface whose configuration is recorded
+        save: Append the result to the results file
+
+    Returns:
+        dict: The benchmark result, or None if the server could not be reached
+    """
+    try:
+        display_message(f"Benchmarking against {host}:{port}...", color='blue')
+        upload = measure_upload(host, port, duration)
+        download = measure_download(host, port, duration)
+        latency = measure_latency(host, port, pings)
+    except (OSError, ValueError) as e:
+        display_error(f"Benchmark failed: {str(e)}")
+        return None
+
+    result = {
+        "label": label or datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
+        "timestamp": time.time(),
+        "host": host,
+        "configuration": capture_configuration(interface),
+        "upload_mbps": upload["mbps"],
+        "download_mbps": download["mbps"],
+        "upload_retransmits": upload["retransmits"],
+        "download_retransmits": download["retransmits"]
+    }
+    result.update(latency)
+
+    if save:
+        save_result(result)
+
+    return result
+
+def save_result(result, path=None):
+    """Append a benchmark result to the NDJSON results file."""
+    path = path or RESULTS_PATH
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a') as f:
+            f.write(json.dumps(result) + "\n")
+    except OSError as e:
+        display_warning(f"Could not save benchmark result: {str(e)}")
+
+def load_results(path=None):
+    """Load previously saved benchmark results, oldest first."""
+    path = path or RESULTS_PATH
+    results = []
+    if not os.path.exists(path):
+        return results
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                results.append(json.loads(line))
+    return results
+
+COMPARISON_FIELDS = [
+    ("Upload (Mb/s)", "upload_mbps"),
+    ("Download (Mb/s)", "download_mbps"),
+    ("RTT p50 (ms)", "rtt_p50"),
+    ("RTT p90 (ms)", "rtt_p90"),
+    ("RTT p99 (ms)", "rtt_p99"),
+    ("Loss (%)", "loss"),
+    ("Upload retrans", "upload_retransmits"),
+    ("Download retrans", "download_retransmits")
+]
+
+def compare_results(results):
+    """
+    Build a side-by-side comparison of benchmark runs.
+
+    Args:
+        results: Benchmark results, the first one being the baseline
+
+    Returns:
+        tuple: (headers, rows) suitable for display_table; each cell after the
+               baseline shows the change relative to the baseline
+    """
+    headers = ["Metric"] + [result["label"] for result in results]
+    rows = []
+    for title, key in COMPARISON_FIELDS:
+        baseline = results[0].get(key) if results else None
+        row = [title]
+        for i, result in enumerate(results):
+            value = result.get(key)
+            if value is None:
+                row.append("-")
+            elif i == 0 or not baseline:
+                row.append(f"{value:.1f}")
+            else:
+                row.append(f"{value:.1f} ({(value - baseline) / baseline * 100:+.0f}%)")
+        rows.append(row)
+    return headers, rows
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Intel WiFi Fixer benchmark server")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP and UDP port")
+    args = parser.parse_args()
+
+    server = BenchmarkServer(args.host, args.port)
+    print(f"Benchmark server listening on {server.host}:{server.port} (TCP and UDP)")
+    server.serve_forever()
@@ -0,0 +1,296 @@
+"""
+WiFi CA Certificate Store
+
+RADIUS server CAs are kept in a store of their own instead of the system
+trust store, so adding one does not run update-ca-certificates, which
+rebuilds the whole system bundle and rehashes every CA. The store is an
+OpenSSL hashed directory: each certificate is a PEM file, and a
+"<subject hash>.<n>" symlink points at it, as c_rehash would create.
+wpa_supplicant looks CAs up by that hash, so enterprise profiles use the
+store through 802-1x.ca-path.
+
+Adding or removing certificates only touches their own files and links.
+A batch is applied in one pass (through the privileged helper when the
+store is not writable), so bulk imports of many site CAs stay fast.
+"""
+
+import os
+import re
+import base64
+import hashlib
+import tempfile
+import threading
+from src.utils import der
+from src.cert_inspector import CertificateError, format_name, get_cache, load_certificates
+
+CA_STORE_DIR = "/etc/intel-wifi-fixer/ca-certificates"
+
+# "<8 hex digits>.<n>", as created by c_rehash
+HASH_LINK = re.compile(r"^([0-9a-f]{8})\.(\d+)$")
+
+# String types OpenSSL canonicalises before hashing a name
+CANONICAL_STRING_TYPES = (der.UTF8_STRING, der.PRINTABLE_STRING, der.T61_STRING, der.IA5_STRING,
+                          der.VISIBLE_STRING, der.UNIVERSAL_STRING, der.BMP_STRING)
+_SPACE = " \t\n\v\f\r"
+
+# Serialises changes made by this process (e.g. concurrent helper requests)
+_store_lock = threading.Lock()
+
+class CAStoreError(Exception):
+    """Raised when the store cannot be updated."""
+
+def _canonical_text(text):
+    # Like OpenSSL's asn1_string_canon: trim, collapse whitespace, lowercase ASCII
+    result = []
+    for char in text.strip(_SPACE):
+        if char in _SPACE:
+            if result[-1] != " ":
+                result.append(" ")
+        else:
+            result.append(char.lower() if char.isascii() else char)
+    return "".join(result)
+
+def subject_hash(certificate):
+    """
+    Compute OpenSSL's subject name hash (X509_NAME_hash, as used by c_rehash).
+
+    Returns:
+        str: Eight hex digits
+    """
+    data = certificate.subject_der
+    canonical = b""
+    for _, set_start, set_end in der.children(data, 0, len(data)):
+        entries = []
+        for _, start, end in der.children(data, set_start, set_end):
+            oid, value = list(der.children(data, start, end))[:2]
+            tag, value_start, value_end = value
+            # The OID is kept as encoded; it is the first element and the value follows it
+            if tag in CANONICAL_STRING_TYPES:
+                text = _canonical_text(der.decode_string(tag, data[value_start:value_end]))
+                value_tlv = der.encode(der.UTF8_STRING, text.encode("utf-8"))
+            else:
+                value_tlv = data[oid[2]:value_end]
+            entries.append(der.encode(der.SEQUENCE, data[start:oid[2]] + value_tlv))
+        # A SET OF is encoded with its elements sorted
+        canonical += der.encode(der.SET, b"".join(sorted(entries)))
+    return f"{int.from_bytes(hashlib.sha1(canonical).digest()[:4], 'little'):08x}"
+
+def to_pem(certificate):
+    body = base64.encodebytes(certificate.der).decode("ascii").replace("\n", "")
+    lines = [body[i:i + 64] for i in range(0, len(body), 64)]
+    return "-----BEGIN CERTIFICATE-----\n" + "\n".join(lines) + "\n-----END CERTIFICATE-----\n"
+
+def _safe_name(name):
+    name = re.sub(r"\.(pem|crt|cer|der)$", "", os.path.basename(name), flags=re.I)
+    return re.sub(r"[^\w.-]", "_", name).strip(".") or "ca"
+
+def _links(store_dir):
+    """Return {hash: {index: target}} for the store's hash links."""
+    links = {}
+    for entry in os.scandir(store_dir):
+        match = HASH_LINK.match(entry.name)
+        if match and entry.is_symlink():
+            links.setdefault(match.group(1), {})[int(match.group(2))] = os.readlink(entry.path)
+    return links
+
+def _atomic_symlink(target, path):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    os.symlink(target, tmp_path)
+    os.replace(tmp_path, path)
+
+def _fingerprint_of(store_dir, target):
+    try:
+        return get_cache().load(os.path.join(store_dir, target))[0].fingerprint
+    except CertificateError:
+        return None
+
+def commit_certificates(certificates, store_dir=CA_STORE_DIR):
+    """
+    Add certificates to the store, creating their hash links.
+
+    This is the part that needs write access to the store; add_certificates
+    runs it in the privileged helper when the current user lacks that access.
+
+    Args:
+        certificates: (name, PEM or DER bytes/text) tuples; bundles are split
+        store_dir: The store directory
+
+    Returns:
+        list: One dict per certificate with name, file, link and status
+              ("added" or "present")
+    """
+    with _store_lock:
+        os.makedirs(store_dir, mode=0o755, exist_ok=True)
+        links = _links(store_dir)
+        results = []
+        for name, data in certificates:
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            parsed = load_certificates(data)
+            for i, certificate in enumerate(parsed):
+                label = _safe_name(name) + (f"-{i + 1}" if len(parsed) > 1 else "")
+                digest = subject_hash(certificate)
+                same_hash = links.setdefault(digest, {})
+
+                # Already stored (under any name)?
+                present = next((index for index, target in same_hash.items()
+                                if _fingerprint_of(store_dir, target) == certificate.fingerprint), None)
+                if present is not None:
+                    results.append({"name": label, "file": same_hash[present], "link": f"{digest}.{present}",
+                                    "status": "present"})
+                    continue
+
+                filename = f"{label}.pem"
+                if os.path.exists(os.path.join(store_dir, filename)):
+                    filename = f"{label}-{certificate.fingerprint[:8]}.pem"
+                fd, tmp_path = tempfile.mkstemp(prefix=f".{filename}.", dir=store_dir)
+                with os.fdopen(fd, "w") as f:
+                    f.write(to_pem(certificate))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, os.path.join(store_dir, filename))
+
+                index = next(i for i in range(len(same_hash) + 1) if i not in same_hash)
+                _atomic_symlink(filename, os.path.join(store_dir, f"{digest}.{index}"))
+                same_hash[index] = filename
+                results.append({"name": label, "file": filename, "link": f"{digest}.{index}", "status": "added"})
+
+        # One directory sync for the whole batch
+        dir_fd = os.open(store_dir, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        return results
+
+def commit_removal(filenames, store_dir=CA_STORE_DIR):
+    """
+    Remove certificate files and their hash links, keeping each hash's links
+    numbered from 0 without gaps (OpenSSL stops at the first missing index).
+
+    Returns:
+        list: The files that were removed
+    """
+    with _store_lock:
+        links = _links(store_dir)
+        removed = []
+        for filename in filenames:
+            filename = os.path.basename(filename)
+            path = os.path.join(store_dir, filename)
+            if not os.path.isfile(path) or os.path.islink(path):
+                continue
+            for digest, same_hash in links.items():
+                for index in [index for index, target in same_hash.items() if target == filename]:
+                    last = max(same_hash)
+                    if index != last:
+                        _atomic_symlink(same_hash[last], os.path.join(store_dir, f"{digest}.{index}"))
+                        same_hash[index] = same_hash[last]
+                    os.unlink(os.path.join(store_dir, f"{digest}.{last}"))
+                    del same_hash[last]
+            os.unlink(path)
+            removed.append(filename)
+        return removed
+
+def rehash(store_dir=CA_STORE_DIR):
+    """
+    Recreate every hash link from the certificate files, like c_rehash.
+
+    Returns:
+        int: The number of links created
+    """
+    with _store_lock:
+        for name in os.listdir(store_dir):
+            if HASH_LINK.match(name) and os.path.islink(os.path.join(store_dir, name)):
+                os.unlink(os.path.join(store_dir, name))
+        count = 0
+        indexes = {}
+        seen = set()
+        for path, certificates in sorted(get_cache().scan(store_dir).items()):
+            certificate = certificates[0]
+            if certificate.fingerprint in seen:
+                continue
+            seen.add(certificate.fingerprint)
+            digest = subject_hash(certificate)
+            index = indexes.get(digest, 0)
+            os.symlink(os.path.basename(path), os.path.join(store_dir, f"{digest}.{index}"))
+            indexes[digest] = index + 1
+            count += 1
+        return count
+
+def _can_write(store_dir):
+    directory = store_dir
+    while not os.path.exists(directory):
+        directory = os.path.dirname(directory)
+    return os.access(directory, os.W_OK)
+
+def add_certificates(paths, store_dir=CA_STORE_DIR):
+    """
+    Add certificate files to the store in one batch.
+
+    Args:
+        paths: The CA certificate files (PEM or DER, bundles allowed)
+        store_dir: The store directory
+
+    Returns:
+        list: As for commit_certificates
+
+    Raises:
+        CAStoreError: If a file cannot be read or the store cannot be updated
+    """
+    certificates = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                certificates.append((os.path.basename(path), f.read()))
+        except OSError as e:
+            raise CAStoreError(f"Could not read {path}: {e.strerror}")
+
+    try:
+        if _can_write(store_dir):
+            return commit_certificates(certificates, store_dir)
+    except (OSError, CertificateError) as e:
+        raise CAStoreError(str(e))
+
+    # The privileged helper writes the files and links
+    from src.utils.privileged_helper import get_helper, HelperError
+    try:
+        return get_helper().store_ca([(name, base64.b64encode(data).decode("ascii"))
+                                      for name, data in certificates], store_dir)
+    except HelperError as e:
+        raise CAStoreError(str(e))
+
+def remove_certificates(filenames, store_dir=CA_STORE_DIR):
+    """
+    Remove certificates from the store by file name.
+
+    Returns:
+        list: The files that were removed
+
+    Raises:
+        CAStoreError: If the store cannot be updated
+    """
+    try:
+        if _can_write(store_dir):
+            return commit_removal(filenames, store_dir)
+    except OSError as e:
+        raise CAStoreError(str(e))
+
+    from src.utils.privileged_helper import get_helper, HelperError
+    try:
+        return get_helper().remove_ca(list(filenames), store_dir)
+    except HelperError as e:
+        raise CAStoreError(str(e))
+
+def list_certificates(store_dir=CA_STORE_DIR):
+    """
+    List the certificates in the store.
+
+    Returns:
+        list: dicts with file, subject, not_after and hash, sorted by file
+    """
+    if not os.path.isdir(store_dir):
+        return []
+    return [{"file": os.path.basename(path), "subject": format_name(certificates[0].subject),
+             "not_after": certificates[0].not_after.isoformat(), "hash": subject_hash(certificates[0])}
+            for path, certificates in sorted(get_cache().scan(store_dir).items())]
@@ -11,8 +11,8 @@ import time
 import socket
 import subprocess
 import webbrowser
-from utils.command_runner import run_command, execute_with_sudo
-from utils.ui_helpers import display_message, display_success, display_error, display_warning
+from src.utils.command_runner import run_command, execute_with_sudo
+from src.utils.ui_helpers import display_message, display_success, display_error, display_warning
 
 # Define test URLs for captive portal detection
 TEST_URLS = [
@@ -6,8 +6,8 @@ This module provides a user interface for detecting and handling captive portals
 
 import os
 import time
-from utils.ui_helpers import display_header, display_message, display_success, display_error, display_warning
-from captive_portal import (
+from src.utils.ui_helpers import display_header, display_message, display_success, display_error, display_warning
+from src.captive_portal import (
     detect_captive_portal,
     check_internet_connectivity,
     get_captive_portal_url,
@@ -0,0 +1,623 @@
+"""
+X.509 Certificate Inspector
+
+Certificates are parsed in-process with a small DER decoder instead of
+forking openssl, and parsed files are cached by path, keyed on their mtime,
+size and inode, so re-scanning a certificate directory or sweeping every
+profile's certificates for expiry only stats unchanged files.
+
+Validation covers what a RADIUS server or CA certificate has to get right:
+the validity period, key usage and extended key usage for its purpose, the
+chain to a supplied CA, and the server name against the subjectAltName.
+Signatures are checked with the cryptography package when it is installed;
+without it RSA PKCS#1 v1.5 signatures are checked in pure Python and other
+algorithms are reported as unchecked.
+"""
+
+import os
+import re
+import base64
+import hashlib
+import hmac
+import ipaddress
+import threading
+from datetime import datetime, timedelta, timezone
+from src.utils import der
+
+# Certificates expiring within this many days are reported
+EXPIRY_WARNING_DAYS = 30
+# File extensions CertificateCache.scan considers
+CERT_EXTENSIONS = (".pem", ".crt", ".cer", ".der")
+MAX_CHAIN_LENGTH = 8
+
+PEM_PATTERN = re.compile(rb"-----BEGIN (?:X509 |TRUSTED )?CERTIFICATE-----(.+?)-----END", re.S)
+
+NAME_ATTRIBUTES = {
+    "2.5.4.3": "CN", "2.5.4.6": "C", "2.5.4.7": "L", "2.5.4.8": "ST", "2.5.4.10": "O",
+    "2.5.4.11": "OU", "2.5.4.5": "serialNumber", "0.9.2342.19200300.100.1.25": "DC",
+    "1.2.840.113549.1.9.1": "emailAddress"
+}
+
+KEY_USAGES = ["digitalSignature", "nonRepudiation", "keyEncipherment", "dataEncipherment",
+              "keyAgreement", "keyCertSign", "cRLSign", "encipherOnly", "decipherOnly"]
+
+EXTENDED_KEY_USAGES = {
+    "1.3.6.1.5.5.7.3.1": "serverAuth", "1.3.6.1.5.5.7.3.2": "clientAuth",
+    "1.3.6.1.5.5.7.3.3": "codeSigning", "1.3.6.1.5.5.7.3.4": "emailProtection",
+    "1.3.6.1.5.5.7.3.9": "OCSPSigning", "2.5.29.37.0": "anyExtendedKeyUsage"
+}
+
+# Signature algorithm OID -> (name, hashlib name)
+SIGNATURE_ALGORITHMS = {
+    "1.2.840.113549.1.1.5": ("sha1WithRSAEncryption", "sha1"),
+    "1.2.840.113549.1.1.14": ("sha224WithRSAEncryption", "sha224"),
+    "1.2.840.113549.1.1.11": ("sha256WithRSAEncryption", "sha256"),
+    "1.2.840.113549.1.1.12": ("sha384WithRSAEncryption", "sha384"),
+    "1.2.840.113549.1.1.13": ("sha512WithRSAEncryption", "sha512"),
+    "1.2.840.113549.1.1.10": ("rsassaPss", None),
+    "1.2.840.10045.4.3.2": ("ecdsa-with-SHA256", "sha256"),
+    "1.2.840.10045.4.3.3": ("ecdsa-with-SHA384", "sha384"),
+    "1.2.840.10045.4.3.4": ("ecdsa-with-SHA512", "sha512"),
+    "1.3.101.112": ("ed25519", None)
+}
+
+# DER encoding of DigestInfo up to the digest: SEQUENCE { AlgorithmIdentifier { hash OID, NULL }, OCTET STRING }
+DIGEST_INFO_PREFIXES = {
+    "sha1": bytes.fromhex("3021300906052b0e03021a05000414"),
+    "sha224": bytes.fromhex("302d300d06096086480165030402040500041c"),
+    "sha256": bytes.fromhex("3031300d060960864801650304020105000420"),
+    "sha384": bytes.fromhex("3041300d060960864801650304020205000430"),
+    "sha512": bytes.fromhex("3051300d060960864801650304020305000440"),
+}
+
+RSA_ENCRYPTION = "1.2.840.113549.1.1.1"
+EC_PUBLIC_KEY = "1.2.840.10045.2.1"
+EC_CURVE_BITS = {"1.2.840.10045.3.1.7": 256, "1.3.132.0.34": 384, "1.3.132.0.35": 521}
+
+# What each purpose requires of the extended key usage
+PURPOSE_EKU = {"server": "serverAuth", "client": "clientAuth"}
+
+class CertificateError(ValueError):
+    """Raised when a file holds no parseable certificate."""
+
+class Certificate:
+    """The fields of a parsed X.509 certificate."""
+
+    def __init__(self, data):
+        """
+        Args:
+            data: The DER encoding
+        """
+        self.der = bytes(data)
+        self.fingerprint = hashlib.sha256(self.der).hexdigest()
+        self.key_usage = None
+        self.extended_key_usage = None
+        self.is_ca = False
+        self.path_length = None
+        self.dns_names = []
+        self.ip_addresses = []
+        self.emails = []
+        self.subject_key_id = None
+        self.authority_key_id = None
+        self._rsa_key = None
+        self._parse()
+
+    def _parse(self):
+        data = self.der
+        tag, start, end = der.read_tlv(data)
+        if tag != der.SEQUENCE:
+            raise der.DERError("Not a certificate")
+        tbs, algorithm, signature = list(der.children(data, start, end))[:3]
+        # The signed bytes are the whole TBSCertificate element, header included
+        self._tbs = data[start:tbs[2]]
+        self.signature_algorithm_oid = decode_oid_at(data, *der.element(data, algorithm[1], algorithm[2], 0))
+        self._signature = der.decode_bit_string(data[signature[1]:signature[2]])[0]
+
+        fields = list(der.children(data, tbs[1], tbs[2]))
+        # version is an explicit [0] and defaults to v1
+        if fields[0][0] == 0xa0:
+            _, version_start, version_end = der.read_tlv(data, fields[0][1])
+            self.version = der.decode_integer(data[version_start:version_end]) + 1
+            fields = fields[1:]
+        else:
+            self.version = 1
+        serial, _, issuer, validity, subject, public_key_info = fields[:6]
+
+        self.serial = der.decode_integer(data[serial[1]:serial[2]])
+        self.issuer_der = data[issuer[1]:issuer[2]]
+        self.subject_der = data[subject[1]:subject[2]]
+        self.issuer = parse_name(data, issuer)
+        self.subject = parse_name(data, subject)
+        not_before, not_after = list(der.children(data, validity[1], validity[2]))[:2]
+        self.not_before = der.decode_time(not_before[0], data[not_before[1]:not_before[2]])
+        self.not_after = der.decode_time(not_after[0], data[not_after[1]:not_after[2]])
+        self._parse_public_key(data, public_key_info)
+
+        for tag, start, end in fields[6:]:
+            if tag == 0xa3:
+                _, seq_start, seq_end = der.read_tlv(data, start)
+                for _, ext_start, ext_end in der.children(data, seq_start, seq_end):
+                    self._parse_extension(data, ext_start, ext_end)
+
+    def _parse_public_key(self, data, public_key_info):
+        algorithm, key = list(der.children(data, public_key_info[1], public_key_info[2]))[:2]
+        parts = list(der.children(data, algorithm[1], algorithm[2]))
+        self.public_key_oid = decode_oid_at(data, *parts[0])
+        key_bytes = der.decode_bit_string(data[key[1]:key[2]])[0]
+        self.public_key_bits = None
+        if self.public_key_oid == RSA_ENCRYPTION:
+            self.public_key_type = "RSA"
+            _, start, end = der.read_tlv(key_bytes)
+            modulus, exponent = list(der.children(key_bytes, start, end))[:2]
+            n = der.decode_integer(key_bytes[modulus[1]:modulus[2]])
+            e = der.decode_integer(key_bytes[exponent[1]:exponent[2]])
+            self._rsa_key = (n, e)
+            self.public_key_bits = n.bit_length()
+        elif self.public_key_oid == EC_PUBLIC_KEY:
+            self.public_key_type = "EC"
+            if len(parts) > 1 and parts[1][0] == der.OID:
+                self.public_key_bits = EC_CURVE_BITS.get(decode_oid_at(data, *parts[1]))
+        elif self.public_key_oid == "1.3.101.112":
+            self.public_key_type, self.public_key_bits = "Ed25519", 256
+        else:
+            self.public_key_type = self.public_key_oid
+
+    def _parse_extension(self, data, start, end):
+        parts = list(der.children(data, start, end))
+        oid = decode_oid_at(data, *parts[0])
+        # The value is an OCTET STRING holding the extension's own DER
+        _, value_start, value_end = parts[-1]
+        value = data[value_start:value_end]
+
+        if oid == "2.5.29.19":
+            _, seq_start, seq_end = der.read_tlv(value)
+            for tag, item_start, item_end in der.children(value, seq_start, seq_end):
+                if tag == der.BOOLEAN:
+                    self.is_ca = value[item_start:item_end] != b"\x00"
+                elif tag == der.INTEGER:
+                    self.path_length = der.decode_integer(value[item_start:item_end])
+        elif oid == "2.5.29.15":
+            _, bits_start, bits_end = der.read_tlv(value)
+            bits, _ = der.decode_bit_string(value[bits_start:bits_end])
+            number = int.from_bytes(bits.ljust(2, b"\0")[:2], "big")
+            self.key_usage = {name for i, name in enumerate(KEY_USAGES) if number & (0x8000 >> i)}
+        elif oid == "2.5.29.37":
+            _, seq_start, seq_end = der.read_tlv(value)
+            self.extended_key_usage = [
+                EXTENDED_KEY_USAGES.get(usage, usage)
+                for usage in (decode_oid_at(value, *item) for item in der.children(value, seq_start, seq_end))
+            ]
+        elif oid == "2.5.29.17":
+            _, seq_start, seq_end = der.read_tlv(value)
+            for tag, item_start, item_end in der.children(value, seq_start, seq_end):
+                item = value[item_start:item_end]
+                if tag == 0x82:
+                    self.dns_names.append(item.decode("ascii", "replace"))
+                elif tag == 0x87:
+                    self.ip_addresses.append(str(ipaddress.ip_address(item)))
+                elif tag == 0x81:
+                    self.emails.append(item.decode("ascii", "replace"))
+        elif oid == "2.5.29.14":
+            _, id_start, id_end = der.read_tlv(value)
+            self.subject_key_id = value[id_start:id_end]
+        elif oid == "2.5.29.35":
+            _, seq_start, seq_end = der.read_tlv(value)
+            for tag, item_start, item_end in der.children(value, seq_start, seq_end):
+                if tag == 0x80:
+                    self.authority_key_id = value[item_start:item_end]
+
+    @property
+    def signature_algorithm(self):
+        return SIGNATURE_ALGORITHMS.get(self.signature_algorithm_oid, (self.signature_algorithm_oid,))[0]
+
+    @property
+    def common_name(self):
+        return next((value for name, value in self.subject if name == "CN"), None)
+
+    @property
+    def self_issued(self):
+        return self.subject_der == self.issuer_der
+
+    def as_dict(self):
+        """Return the certificate's fields as JSON-friendly values."""
+        return {
+            "subject": format_name(self.subject),
+            "issuer": format_name(self.issuer),
+            "serial": f"{self.serial:x}",
+            "not_before": self.not_before.isoformat(),
+            "not_after": self.not_after.isoformat(),
+            "is_ca": self.is_ca,
+            "key_usage": sorted(self.key_usage) if self.key_usage is not None else None,
+            "extended_key_usage": self.extended_key_usage,
+            "dns_names": self.dns_names,
+            "ip_addresses": self.ip_addresses,
+            "public_key": f"{self.public_key_type} {self.public_key_bits or '?'}",
+            "signature_algorithm": self.signature_algorithm,
+            "fingerprint_sha256": self.fingerprint
+        }
+
+def decode_oid_at(data, tag, start, end):
+    if tag != der.OID:
+        raise der.DERError("Expected an object identifier")
+    return der.decode_oid(data[start:end])
+
+def parse_name(data, name):
+    """Decode a Name to a list of (attribute, value) pairs."""
+    attributes = []
+    for _, set_start, set_end in der.children(data, name[1], name[2]):
+        for _, start, end in der.children(data, set_start, set_end):
+            oid_element, value_element = list(der.children(data, start, end))[:2]
+            oid = decode_oid_at(data, *oid_element)
+            tag, value_start, value_end = value_element
+            attributes.append((NAME_ATTRIBUTES.get(oid, oid), der.decode_string(tag, data[value_start:value_end])))
+    return attributes
+
+def format_name(attributes):
+    return ", ".join(f"{name}={value}" for name, value in attributes)
+
+def parse_certificate(data):
+    """
+    Parse one DER-encoded certificate.
+
+    Raises:
+        CertificateError: If the data is not a certificate
+    """
+    try:
+        return Certificate(data)
+    except (der.DERError, ValueError, IndexError) as e:
+        raise CertificateError(f"Invalid certificate: {str(e)}")
+
+def load_certificates(data):
+    """
+    Parse every certificate in PEM data, or a single DER certificate.
+
+    Returns:
+        list: Certificate objects, in file order
+
+    Raises:
+        CertificateError: If the data holds no parseable certificate
+    """
+    blocks = PEM_PATTERN.findall(data)
+    if blocks:
+        try:
+            return [parse_certificate(base64.b64decode(b"".join(block.split()))) for block in blocks]
+        except (ValueError, TypeError) as e:
+            if isinstance(e, CertificateError):
+                raise
+            raise CertificateError(f"Invalid PEM data: {str(e)}")
+    if data[:1] == b"\x30":
+        return [parse_certificate(data)]
+    raise CertificateError("No certificate found")
+
+def _verify_rsa(certificate, issuer):
+    """Check a PKCS#1 v1.5 signature with the issuer's RSA key."""
+    hash_name = SIGNATURE_ALGORITHMS.get(certificate.signature_algorithm_oid, (None, None))[1]
+    if issuer._rsa_key is None or hash_name is None or "RSA" not in certificate.signature_algorithm:
+        return None
+    n, e = issuer._rsa_key
+    size = (n.bit_length() + 7) // 8
+    signature = int.from_bytes(certificate._signature, "big")
+    if len(certificate._signature) > size or signature >= n:
+        return False
+    encoded = pow(signature, e, n).to_bytes(size, "big")
+
+    # Rebuild the whole EMSA-PKCS1-v1_5 encoding, 00 01 FF..FF 00 DigestInfo,
+    # and compare it byte for byte, so no padding or trailing data is left unchecked
+    digest_info = DIGEST_INFO_PREFIXES[hash_name] + hashlib.new(hash_name, certificate._tbs).digest()
+    padding = size - len(digest_info) - 3
+    if padding < 8:
+        return False
+    expected = b"\x00\x01" + b"\xff" * padding + b"\x00" + digest_info
+    return hmac.compare_digest(encoded, expected)
+
+def verify_signature(certificate, issuer):
+    """
+    Check that ``issuer``'s key signed ``certificate``.
+
+    Returns:
+        bool: The result, or None when the algorithm cannot be checked
+    """
+    try:
+        from cryptography import x509
+    except ImportError:
+        return _verify_rsa(certificate, issuer)
+    try:
+        x509.load_der_x509_certificate(certificate.der).verify_directly_issued_by(
+            x509.load_der_x509_certificate(issuer.der))
+        return True
+    except AttributeError:
+        # cryptography < 40 has no verify_directly_issued_by
+        return _verify_rsa(certificate, issuer)
+    except Exception:
+        return False
+
+def matches_hostname(certificate, hostname):
+    """
+    Check a server name against the certificate's subjectAltName.
+
+    The common name is only used when there are no DNS names; a wildcard
+    matches exactly one leftmost label.
+    """
+    hostname = hostname.rstrip(".").lower()
+    try:
+        address = str(ipaddress.ip_address(hostname))
+        return address in certificate.ip_addresses
+    except ValueError:
+        pass
+    names = certificate.dns_names or ([certificate.common_name] if certificate.common_name else [])
+    for name in names:
+        name = name.rstrip(".").lower()
+        if name == hostname:
+            return True
+        if name.startswith("*.") and "." in hostname:
+            label, _, rest = hostname.partition(".")
+            if label and rest == name[2:]:
+                return True
+    return False
+
+def _issued_by(certificate, issuer):
+    if certificate.issuer_der != issuer.subject_der:
+        return False
+    if certificate.authority_key_id and issuer.subject_key_id:
+        return certificate.authority_key_id == issuer.subject_key_id
+    return True
+
+def _can_issue(candidate, chain, anchor=False):
+    """
+    Check that a certificate may sign the last one of a chain (built from the leaf).
+
+    Trust anchors are trusted as configured, so only their path length is enforced.
+    """
+    if not anchor and (not candidate.is_ca or (candidate.key_usage is not None
+                                               and "keyCertSign" not in candidate.key_usage)):
+        return False
+    # pathLenConstraint limits the (not self-issued) intermediate CAs below it
+    below = sum(1 for issued in chain[1:] if not issued.self_issued)
+    return candidate.path_length is None or below <= candidate.path_length
+
+def build_chain(certificate, intermediates, anchors):
+    """
+    Find a chain from a certificate to one of the trust anchors.
+
+    Args:
+        certificate: The certificate to check
+        intermediates: Other certificates that may complete the chain
+        anchors: The trusted CA certificates
+
+    Returns:
+        tuple: (chain from the certificate towards the anchor, error or None,
+                whether every signature could be checked)
+    """
+    chain = [certificate]
+    current = certificate
+    checked = True
+    anchor_fingerprints = {anchor.fingerprint for anchor in anchors}
+    for _ in range(MAX_CHAIN_LENGTH):
+        if current.fingerprint in anchor_fingerprints:
+            return chain, None, checked
+        for candidate in list(anchors) + list(intermediates):
+            if candidate.fingerprint == current.fingerprint or not _issued_by(current, candidate):
+                continue
+            # An ordinary end-entity certificate must not be accepted as an issuer
+            if not _can_issue(candidate, chain, candidate.fingerprint in anchor_fingerprints):
+                continue
+            verified = verify_signature(current, candidate)
+            if verified is False:
+                continue
+            checked = checked and verified is not None
+            chain.append(candidate)
+            current = candidate
+            break
+        else:
+            return chain, f"No trusted issuer found for {format_name(current.issuer)}", checked
+    return chain, "Certificate chain is too long", checked
+
+class CertificateCache:
+    """Parsed certificates by path, reused while a file's mtime, size and inode are unchanged."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _load(self, path, stat):
+        key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None or entry[0] != key:
+            try:
+                with open(path, "rb") as f:
+                    entry = (key, load_certificates(f.read()), None)
+            except (OSError, CertificateError) as e:
+                entry = (key, None, CertificateError(f"{path}: {str(e)}"))
+            with self._lock:
+                self._entries[path] = entry
+        if entry[2] is not None:
+            raise entry[2]
+        return entry[1]
+
+    def load(self, path):
+        """
+        Return the certificates in a file.
+
+        Raises:
+            CertificateError: If the file cannot be read or parsed
+        """
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise CertificateError(f"{path}: {e.strerror}")
+        return self._load(os.path.abspath(path), stat)
+
+    def scan(self, directory, extensions=CERT_EXTENSIONS):
+        """
+        Load every certificate file in a directory.
+
+        Returns:
+            dict: The certificates keyed by path; files that fail to parse are left out
+        """
+        found = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(extensions) and entry.is_file():
+                    try:
+                        found[entry.path] = self._load(os.path.abspath(entry.path), entry.stat())
+                    except CertificateError:
+                        continue
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Return the session's certificate cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CertificateCache()
+        return _cache
+
+def _check_certificate(certificate, intermediates, ca_path, hostname, purpose, now, require_signatures):
+    """Return the errors and warnings for one certificate (see validate_certificate)."""
+    errors = []
+    warnings = []
+    if now < certificate.not_before:
+        errors.append(f"Not valid before {certificate.not_before:%Y-%m-%d %H:%M} UTC")
+    elif now > certificate.not_after:
+        errors.append(f"Expired on {certificate.not_after:%Y-%m-%d %H:%M} UTC")
+    elif now + timedelta(days=EXPIRY_WARNING_DAYS) > certificate.not_after:
+        warnings.append(f"Expires in {(certificate.not_after - now).days} days")
+
+    usage = certificate.key_usage
+    if purpose == "ca":
+        if not certificate.is_ca:
+            errors.append("Not a CA certificate (basicConstraints CA is not set)")
+        if usage is not None and "keyCertSign" not in usage:
+            errors.append("Key usage does not allow signing certificates")
+    else:
+        if usage is not None and not usage & {"digitalSignature", "keyEncipherment", "keyAgreement"}:
+            errors.append(f"Key usage does not allow TLS authentication: {', '.join(sorted(usage))}")
+        required = PURPOSE_EKU[purpose]
+        eku = certificate.extended_key_usage
+        if eku is not None and required not in eku and "anyExtendedKeyUsage" not in eku:
+            errors.append(f"Extended key usage does not include {required}")
+
+    if hostname and not matches_hostname(certificate, hostname):
+        names = certificate.dns_names + certificate.ip_addresses or [certificate.common_name or "none"]
+        errors.append(f"Does not match {hostname} (names: {', '.join(names)})")
+
+    if ca_path:
+        try:
+            anchors = get_cache().load(ca_path)
+        except CertificateError as e:
+            errors.append(str(e))
+        else:
+            chain, error, checked = build_chain(certificate, intermediates, anchors)
+            if error:
+                errors.append(error)
+            if not checked:
+                (errors if require_signatures else warnings).append(
+                    f"{certificate.signature_algorithm} signatures cannot be checked "
+                    "without the cryptography package")
+            for issuer in chain[1:]:
+                if now > issuer.not_after:
+                    errors.append(f"Issuer expired on {issuer.not_after:%Y-%m-%d}: {format_name(issuer.subject)}")
+    elif purpose == "ca" and certificate.self_issued:
+        verified = verify_signature(certificate, certificate)
+        if verified is False:
+            errors.append("Self-signature does not verify")
+        elif verified is None and require_signatures:
+            errors.append(f"{certificate.signature_algorithm} self-signature cannot be checked "
+                          "without the cryptography package")
+
+    return errors, warnings
+
+def validate_certificate(cert_path, ca_path=None, hostname=None, purpose="server", now=None,
+                         require_signatures=False):
+    """
+    Validate a certificate file for use in 802.1X authentication.
+
+    Args:
+        cert_path: The certificate, optionally followed by its intermediates
+        ca_path: A CA certificate or bundle the certificate must chain to
+        hostname: The RADIUS server name the certificate must match
+        purpose: "server", "client" or "ca"
+        now: The time to check validity at (defaults to the current time)
+        require_signatures: Treat signatures that cannot be checked as errors
+                            rather than warnings, when the result decides trust
+
+    Returns:
+        dict: ok, errors, warnings and the certificate's fields (None if it
+              could not be parsed)
+    """
+    now = now or datetime.now(timezone.utc)
+    try:
+        certificates = get_cache().load(cert_path)
+    except CertificateError as e:
+        return {"ok": False, "errors": [str(e)], "warnings": [], "certificate": None}
+    certificate = certificates[0]
+    errors, warnings = _check_certificate(certificate, certificates[1:], ca_path, hostname, purpose, now,
+                                          require_signatures)
+    return {"ok": not errors, "errors": errors, "warnings": warnings, "certificate": certificate.as_dict()}
+
+def validate_ca_bundle(cert_path, now=None, require_signatures=False):
+    """
+    Validate every certificate in a CA file, since each one becomes a trust
+    anchor when the file is imported.
+
+    Args:
+        cert_path: A CA certificate or bundle
+        now: The time to check validity at (defaults to the current time)
+        require_signatures: Treat self-signatures that cannot be checked as errors
+
+    Returns:
+        dict: ok, errors and warnings (prefixed with the certificate's name
+              for bundles) and certificates (their fields)
+    """
+    now = now or datetime.now(timezone.utc)
+    try:
+        certificates = get_cache().load(cert_path)
+    except CertificateError as e:
+        return {"ok": False, "errors": [str(e)], "warnings": [], "certificates": []}
+    errors = []
+    warnings = []
+    for certificate in certificates:
+        cert_errors, cert_warnings = _check_certificate(certificate, [], None, None, "ca", now, require_signatures)
+        prefix = f"{certificate.common_name or format_name(certificate.subject)}: " if len(certificates) > 1 else ""
+        errors.extend(prefix + error for error in cert_errors)
+        warnings.extend(prefix + warning for warning in cert_warnings)
+    return {"ok": not errors, "errors": errors, "warnings": warnings,
+            "certificates": [certificate.as_dict() for certificate in certificates]}
+
+def expiring_certificates(paths, within_days=EXPIRY_WARNING_DAYS, now=None):
+    """
+    Find certificates that have expired or expire soon.
+
+    Args:
+        paths: Certificate files; unchanged files are not parsed again
+        within_days: How far ahead to look
+        now: The reference time (defaults to the current time)
+
+    Returns:
+        list: dicts with path, subject, not_after and days_left (negative
+              once expired), soonest first; unreadable files have an error
+    """
+    now = now or datetime.now(timezone.utc)
+    horizon = now + timedelta(days=within_days)
+    cache = get_cache()
+    report = []
+    for path in paths:
+        try:
+            certificates = cache.load(path)
+        except CertificateError as e:
+            report.append({"path": path, "subject": None, "not_after": None, "days_left": None, "error": str(e)})
+            continue
+        for certificate in certificates:
+            if certificate.not_after <= horizon:
+                report.append({"path": path, "subject": format_name(certificate.subject),
+                               "not_after": certificate.not_after.isoformat(),
+                               "days_left": (certificate.not_after - now).days, "error": None})
+    return sorted(report, key=lambda item: (item["days_left"] is not None, item["days_left"] or 0))
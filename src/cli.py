@@ -0,0 +1,373 @@
+"""
+Command-Line Interface
+
+Subcommands call the core functions directly, without menus or prompts, so
+the tool can be scripted:
+
+    intel-wifi-fixer diag --json
+    intel-wifi-fixer fix --plan
+    intel-wifi-fixer scan --json
+    intel-wifi-fixer reg set US
+    intel-wifi-fixer conn sync fleet.yaml --dry-run
+
+Exit codes: 0 success, 1 the operation failed, 2 usage error, 3 diagnostics
+found issues, 4 administrative privileges are unavailable. With --json the
+result is written to stdout and progress messages go to stderr.
+"""
+
+import sys
+import json
+import argparse
+import contextlib
+
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2
+EXIT_ISSUES = 3
+EXIT_PRIVILEGES = 4
+
+def _status(ok):
+    return EXIT_OK if ok else EXIT_FAILURE
+
+def _emit(args, data, lines):
+    """Print a result as JSON, or as the given text lines."""
+    if getattr(args, "json", False):
+        print(json.dumps(data, indent=2, sort_keys=True, default=str), file=args.out)
+    else:
+        for line in lines:
+            print(line, file=args.out)
+
+def _adapter():
+    from src.adapter_info import AdapterInfo
+    return AdapterInfo()
+
+def cmd_diag(args):
+    from src.diagnostics import gather_diagnostics, identify_issues
+    from src.driver_profiles import get_module_parameters
+
+    diagnostics = gather_diagnostics()
+    issues = identify_issues(diagnostics, get_module_parameters(_adapter()))
+    _emit(args, {"diagnostics": diagnostics, "issues": issues},
+          [f"{key}: {value}" for key, value in diagnostics.items()]
+          + [""] + ([f"Issue: {issue}" for issue in issues] or ["No issues detected."]))
+    return EXIT_ISSUES if issues else EXIT_OK
+
+def cmd_fix(args):
+    from src.diagnostics import run_diagnostics
+    from src.fixes import plan_fixes, apply_all_fixes
+
+    adapter_info = _adapter()
+    plan = plan_fixes(run_diagnostics(adapter_info))
+    if args.plan:
+        _emit(args, [{"issue": issue, "fix": fix} for issue, fix in plan],
+              [f"{issue} -> {fix or 'no automatic fix'}" for issue, fix in plan] or ["No issues detected."])
+        return EXIT_ISSUES if plan else EXIT_OK
+
+    apply_all_fixes([issue for issue, _ in plan], adapter_info)
+    remaining = run_diagnostics(adapter_info)
+    _emit(args, {"applied": [{"issue": issue, "fix": fix} for issue, fix in plan], "remaining": remaining},
+          [f"Remaining issue: {issue}" for issue in remaining])
+    return EXIT_ISSUES if remaining else EXIT_OK
+
+def cmd_scan(args):
+    from src.fixes import scan_networks
+
+    networks = scan_networks(_adapter())
+    _emit(args, networks, [f"{network['signal_strength']:>3}%  ch {network['channel']:>3}  "
+                           f"{network['security']:<12} {network['ssid']}" for network in networks])
+    return EXIT_OK if networks else EXIT_FAILURE
+
+def cmd_phy(args):
+    from src.phy_capabilities import get_phy
+
+    phy = get_phy(args.interface)
+    if phy is None:
+        print(f"No wireless adapter found{f' for {args.interface}' if args.interface else ''}.", file=sys.stderr)
+        return EXIT_FAILURE
+    lines = [f"{phy.name}: {', '.join(phy.interface_modes)}"]
+    for band, caps in phy.bands.items():
+        standards = [name.upper() for name in ("ht", "vht", "he", "eht") if caps[name]]
+        usable = [channel for channel in caps["channels"] if not channel["disabled"]]
+        lines.append(f"  {band}: {len(usable)} channels ({sum(channel['dfs'] for channel in usable)} DFS), "
+                     f"{'/'.join(str(width) for width in caps['widths'])} MHz, {' '.join(standards) or 'legacy'}")
+    lines.append(f"  Ciphers: {', '.join(phy.ciphers)}")
+    for combination in phy.combinations:
+        limits = ", ".join(f"{'/'.join(sorted(types))} <= {limit}" for types, limit in combination["limits"])
+        lines.append(f"  Combination: {limits}; total <= {combination['total']}, channels <= {combination['channels']}")
+    _emit(args, phy.as_dict(), lines)
+    return EXIT_OK
+
+def _channel_line(channel):
+    flags = f"  {' '.join(channel['flags'])}" if channel["flags"] else ""
+    return (f"{channel['band']:<8} ch {channel['channel']:>3}  {channel['frequency']} MHz  "
+            f"{'/'.join(str(width) for width in channel['widths']):<18} {channel['max_eirp']:g} dBm{flags}")
+
+def cmd_reg(args):
+    from src import regulatory
+
+    if args.reg_command == "set":
+        return _status(regulatory.set_regulatory_domain(args.domain.upper()))
+    if args.reg_command == "list":
+        domains = regulatory.get_known_domains()
+        _emit(args, domains, [f"{code}  {name}" for code, name in domains.items()])
+        return EXIT_OK
+    if args.reg_command == "rules":
+        channels = regulatory.get_channel_rules(args.country.upper() if args.country else None)
+        _emit(args, channels, [_channel_line(channel) for channel in channels])
+        return _status(channels)
+    if args.reg_command == "compare":
+        first, second = args.first.upper(), args.second.upper()
+        differences = regulatory.compare_regulatory_domains(first, second)
+        if differences is None:
+            return EXIT_FAILURE
+        lines = [f"{difference['band']:<8} ch {difference['channel']:>3}  "
+                 + "  ".join(f"{code}: " + (f"{'/'.join(str(width) for width in difference[code]['widths'])} MHz "
+                                            f"{difference[code]['max_eirp']:g} dBm" if difference[code] else "-")
+                             for code in (first, second))
+                 for difference in differences]
+        _emit(args, differences, lines or [f"{first} and {second} allow the same channels."])
+        return EXIT_OK
+    domain = regulatory.get_current_regulatory_domain()
+    _emit(args, {"domain": domain}, [domain or "Unknown"])
+    return _status(domain)
+
+def cmd_ent(args):
+    from src import enterprise_wifi
+
+    if args.ent_command == "add":
+        eap_method = {"value": args.eap, "inner_auth": args.phase2 or {"peap": "mschapv2", "ttls": "pap"}.get(args.eap)}
+        return _status(enterprise_wifi.configure_enterprise_wifi(
+            args.ssid, eap_method, args.identity, args.password, args.ca_cert,
+            args.client_cert, args.private_key, args.private_key_password))
+    if args.ent_command == "delete":
+        return _status(enterprise_wifi.delete_enterprise_connection(args.name))
+    if args.ent_command == "connect":
+        return _status(enterprise_wifi.connect_to_enterprise_network(args.name))
+    if args.ent_command == "verify":
+        results = enterprise_wifi.verify_enterprise_profiles(args.names or None, args.timeout)
+        _emit(args, results, [f"{result['name']}: " + (f"ok in {result['latency']:.2f} s" if result["ok"]
+                                                       else enterprise_wifi.describe_failure(result))
+                              for result in results])
+        return _status(results and all(result["ok"] for result in results))
+    if args.ent_command == "cert":
+        from src.cert_inspector import validate_certificate
+        result = validate_certificate(args.path, args.ca, args.hostname, args.purpose)
+        _emit(args, result, [f"{key}: {value}" for key, value in (result["certificate"] or {}).items()]
+              + [f"Warning: {warning}" for warning in result["warnings"]]
+              + [f"Error: {error}" for error in result["errors"]])
+        return _status(result["ok"])
+    if args.ent_command == "ca-add":
+        results = enterprise_wifi.import_ca_certificates(args.paths, args.system)
+        _emit(args, results, [f"{result['name']}: {result['status']}" for result in results])
+        return _status(results and all(result["status"] != "invalid" for result in results))
+    if args.ent_command == "ca-list":
+        from src.ca_store import list_certificates
+        certificates = list_certificates()
+        _emit(args, certificates, [f"{item['hash']}  {item['not_after'][:10]}  {item['file']}  {item['subject']}"
+                                   for item in certificates])
+        return EXIT_OK
+    if args.ent_command == "ca-remove":
+        from src.ca_store import remove_certificates
+        removed = remove_certificates(args.files)
+        _emit(args, removed, removed)
+        return _status(len(removed) == len(args.files))
+    if args.ent_command == "ca-use":
+        return _status(enterprise_wifi.use_ca_store(args.names or None))
+    if args.ent_command == "expiry":
+        report = enterprise_wifi.certificate_expiry_report(args.days)
+        _emit(args, report, [f"{item['path']}: " + (item["error"] or f"{item['days_left']} days left")
+                             for item in report])
+        return EXIT_ISSUES if report else EXIT_OK
+    connections = enterprise_wifi.list_enterprise_connections()
+    _emit(args, connections, [str(connection) for connection in connections])
+    return EXIT_OK
+
+def cmd_conn(args):
+    from src import multi_connection
+
+    command = args.conn_command
+    if command == "list":
+        connections = multi_connection.list_connections()
+        _emit(args, connections, [f"{'*' if connection['active'] else ' '} {connection['name']} "
+                                  f"({connection['device']})" for connection in connections])
+        return EXIT_OK
+    if command in ("up", "down", "delete"):
+        if command == "up":
+            results = multi_connection.bulk_activate_connections(args.names, args.device)
+        elif command == "down":
+            results = multi_connection.bulk_deactivate_connections(args.names)
+        else:
+            results = multi_connection.bulk_delete_connections(args.names)
+        _emit(args, results, [f"{result['name']}: {result['status']}" for result in results])
+        return _status(all(result["ok"] for result in results))
+    if command == "sync":
+        from src.profile_sync import sync_profiles
+        plan = sync_profiles(args.manifest, dry_run=args.dry_run)
+        if plan is None:
+            return EXIT_FAILURE
+        _emit(args, plan, [])
+        return _status(all(result["ok"] for result in plan["results"]))
+    if command == "failover":
+        return _status(multi_connection.configure_failover(args.primary, args.backup))
+    if command == "route":
+        return _status(multi_connection.configure_traffic_routing(args.connection, args.applications))
+    if command == "unroute":
+        return _status(multi_connection.remove_traffic_routing(args.connection))
+    return EXIT_USAGE
+
+def cmd_capture(args):
+    from src.troubleshooting import capture_wifi_traffic
+
+    path = capture_wifi_traffic(args.interface, args.duration, args.output)
+    _emit(args, {"path": path}, [path] if path else [])
+    return _status(path)
+
+def cmd_portal(args):
+    from src.captive_portal import detect_captive_portal
+
+    detected, url = detect_captive_portal()
+    _emit(args, {"captive_portal": detected, "url": url}, [url or "No captive portal detected."])
+    # A detected portal is reported like a diagnostic issue
+    return EXIT_ISSUES if detected else EXIT_OK
+
+def cmd_driver(args):
+    from src.driver_reload import reload_driver
+
+    report = reload_driver(_adapter())
+    _emit(args, report, [])
+    return _status(report["success"])
+
+def build_parser():
+    """Build the argument parser with one subcommand per capability."""
+    parser = argparse.ArgumentParser(prog="intel-wifi-fixer",
+                                     description="Diagnose and fix Intel wireless adapter issues.")
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    subparsers.required = True
+
+    # --json goes on the parsers that take the last positional arguments
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true", help="print the result as JSON")
+
+    def add(name, handler, help_text, actions=False):
+        subparser = subparsers.add_parser(name, help=help_text, parents=[] if actions else [output])
+        subparser.set_defaults(handler=handler)
+        return subparser
+
+    add("diag", cmd_diag, "run diagnostics")
+
+    fix = add("fix", cmd_fix, "apply fixes for detected issues")
+    fix.add_argument("--plan", action="store_true", help="show the fixes that would be applied")
+
+    add("scan", cmd_scan, "scan for networks")
+
+    phy = add("phy", cmd_phy, "show the adapter's bands, channels and capabilities")
+    phy.add_argument("interface", nargs="?", help="a wireless interface (default: the first adapter)")
+
+    reg = add("reg", cmd_reg, "show or set the regulatory domain", actions=True)
+    reg_commands = reg.add_subparsers(dest="reg_command", metavar="ACTION")
+    reg_commands.add_parser("show", help="show the current domain", parents=[output])
+    reg_commands.add_parser("list", help="list known domains", parents=[output])
+    reg_rules = reg_commands.add_parser("rules", help="show allowed channels, widths and power",
+                                        parents=[output])
+    reg_rules.add_argument("country", nargs="?", help="a country to look up (default: the current domain)")
+    reg_compare = reg_commands.add_parser("compare", help="compare two countries' channels", parents=[output])
+    reg_compare.add_argument("first")
+    reg_compare.add_argument("second")
+    reg_set = reg_commands.add_parser("set", help="set the domain", parents=[output])
+    reg_set.add_argument("domain", help="ISO 3166 country code, e.g. US")
+
+    ent = add("ent", cmd_ent, "manage enterprise (802.1X) connections", actions=True)
+    ent_commands = ent.add_subparsers(dest="ent_command", metavar="ACTION")
+    ent_commands.required = True
+    ent_commands.add_parser("list", help="list enterprise connections", parents=[output])
+    ent_add = ent_commands.add_parser("add", help="add an enterprise connection", parents=[output])
+    ent_add.add_argument("ssid")
+    ent_add.add_argument("--eap", choices=["peap", "ttls", "tls"], required=True)
+    ent_add.add_argument("--phase2", choices=["mschapv2", "pap"])
+    ent_add.add_argument("--identity", required=True)
+    ent_add.add_argument("--password")
+    ent_add.add_argument("--ca-cert")
+    ent_add.add_argument("--client-cert")
+    ent_add.add_argument("--private-key")
+    ent_add.add_argument("--private-key-password")
+    for action, help_text in (("delete", "delete a connection"), ("connect", "activate a connection")):
+        ent_commands.add_parser(action, help=help_text, parents=[output]).add_argument("name")
+    ent_verify = ent_commands.add_parser("verify", help="test which connections can authenticate", parents=[output])
+    ent_verify.add_argument("names", nargs="*", help="connections to test (default: all)")
+    ent_verify.add_argument("--timeout", type=float, default=30, help="seconds per profile (default: 30)")
+    ent_cert = ent_commands.add_parser("cert", help="validate a certificate file", parents=[output])
+    ent_cert.add_argument("path")
+    ent_cert.add_argument("--ca", help="CA certificate the certificate must chain to")
+    ent_cert.add_argument("--hostname", help="RADIUS server name the certificate must match")
+    ent_cert.add_argument("--purpose", choices=["server", "client", "ca"], default="server")
+    ent_ca_add = ent_commands.add_parser("ca-add", help="add CA certificates to the WiFi CA store", parents=[output])
+    ent_ca_add.add_argument("paths", nargs="+", help="certificate files or directories")
+    ent_ca_add.add_argument("--system", action="store_true",
+                            help="also add them to the system trust store (runs update-ca-certificates)")
+    ent_commands.add_parser("ca-list", help="list the WiFi CA store", parents=[output])
+    ent_commands.add_parser("ca-remove", help="remove certificates from the WiFi CA store",
+                            parents=[output]).add_argument("files", nargs="+")
+    ent_commands.add_parser("ca-use", help="point connections at the WiFi CA store",
+                            parents=[output]).add_argument("names", nargs="*", help="connections (default: all)")
+    ent_commands.add_parser("expiry", help="list connection certificates that expire soon",
+                            parents=[output]).add_argument("--days", type=int, help="days ahead (default: 30)")
+
+    conn = add("conn", cmd_conn, "manage connections", actions=True)
+    conn_commands = conn.add_subparsers(dest="conn_command", metavar="ACTION")
+    conn_commands.required = True
+    conn_commands.add_parser("list", help="list WiFi connections", parents=[output])
+    conn_up = conn_commands.add_parser("up", help="activate connections", parents=[output])
+    conn_up.add_argument("names", nargs="+")
+    conn_up.add_argument("--device")
+    conn_commands.add_parser("down", help="deactivate connections", parents=[output]).add_argument("names", nargs="+")
+    conn_commands.add_parser("delete", help="delete connections", parents=[output]).add_argument("names", nargs="+")
+    conn_sync = conn_commands.add_parser("sync", help="sync profiles from a manifest", parents=[output])
+    conn_sync.add_argument("manifest")
+    conn_sync.add_argument("--dry-run", action="store_true")
+    conn_failover = conn_commands.add_parser("failover", help="configure failover", parents=[output])
+    conn_failover.add_argument("primary")
+    conn_failover.add_argument("backup")
+    conn_route = conn_commands.add_parser("route", help="route applications through a connection", parents=[output])
+    conn_route.add_argument("connection")
+    conn_route.add_argument("applications", nargs="+")
+    conn_commands.add_parser("unroute", help="remove application routing", parents=[output]).add_argument("connection")
+
+    capture = add("capture", cmd_capture, "capture WiFi traffic")
+    capture.add_argument("--interface", default="wlan0")
+    capture.add_argument("--duration", type=int, default=30, help="seconds (default: 30)")
+    capture.add_argument("--output", help="file name in the home directory")
+
+    add("portal", cmd_portal, "detect a captive portal")
+
+    driver = add("driver", cmd_driver, "manage the driver")
+    driver.add_argument("action", choices=["reload"])
+
+    return parser
+
+def run(argv=None):
+    """
+    Run a subcommand.
+
+    Returns:
+        int: The exit code
+    """
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else EXIT_USAGE
+
+    from src.utils.privileged_helper import HelperError
+    args.out = sys.stdout
+    try:
+        if getattr(args, "json", False):
+            # Progress messages from the core functions go to stderr so
+            # stdout holds only the JSON document
+            with contextlib.redirect_stdout(sys.stderr):
+                return args.handler(args)
+        return args.handler(args)
+    except HelperError as e:
+        print(f"Error: administrative privileges are required: {str(e)}", file=sys.stderr)
+        return EXIT_PRIVILEGES
+    except KeyboardInterrupt:
+        return EXIT_FAILURE
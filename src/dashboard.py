@@ -0,0 +1,378 @@
+"""
+Live Dashboard Module
+
+This module provides a full-screen curses dashboard with live panels for the
+wireless link, connections, nearby networks and a log tail. Each panel's data
+is collected by its own background poller, at an interval suited to its cost,
+so drawing never waits on nmcli. The screen is redrawn several times a second,
+but each frame is compared with the previous one and only the changed cells
+are written, which keeps the dashboard usable over slow SSH sessions.
+"""
+
+import os
+import re
+import time
+import curses
+import threading
+import contextlib
+from collections import deque
+from src.utils.command_runner import run_command
+from src.link_state import get_wireless_info
+from src.utils.ui_helpers import display_error
+
+FRAME_INTERVAL = 0.25
+
+# Seconds between refreshes of each panel's data
+LINK_INTERVAL = 0.5
+CONNECTIONS_INTERVAL = 2.0
+NETWORKS_INTERVAL = 5.0
+LOG_INTERVAL = 1.0
+
+LOG_PATHS = ("/var/log/syslog", "/var/log/messages")
+LOG_LINES = 200
+# The first read of a log file starts this far from its end
+LOG_TAIL_BYTES = 64 * 1024
+
+class Poller:
+    """Calls a function at a fixed interval in a background thread and keeps the latest result."""
+
+    def __init__(self, fetch, interval, default=None):
+        self.fetch = fetch
+        self.interval = interval
+        self._value = default
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def value(self):
+        with self._lock:
+            return self._value
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                value = self.fetch()
+                with self._lock:
+                    self._value = value
+            except Exception:
+                # Keep showing the last good value
+                pass
+            self._stop_event.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+def _split_terse(line):
+    # nmcli terse output escapes colons inside fields as "\:"
+    return [field.replace("\\:", ":") for field in re.split(r"(?<!\\):", line)]
+
+def read_connections():
+    """
+    List NetworkManager connections.
+
+    Returns:
+        list: dicts with name, type, device and active
+    """
+    output = run_command(["nmcli", "-t", "-f", "NAME,TYPE,DEVICE,ACTIVE", "connection", "show"])
+    connections = []
+    for line in (output or "").splitlines():
+        fields = _split_terse(line)
+        if len(fields) >= 4:
+            connections.append({"name": fields[0], "type": fields[1],
+                                "device": fields[2], "active": fields[3] == "yes"})
+    return connections
+
+def read_networks():
+    """
+    List the networks from NetworkManager's last scan, strongest first.
+
+    No new scan is requested, so this is cheap enough to poll.
+
+    Returns:
+        list: dicts with ssid, signal, channel and security
+    """
+    output = run_command(["nmcli", "-t", "-f", "SSID,SIGNAL,CHAN,SECURITY", "device", "wifi", "list",
+                          "--rescan", "no"])
+    networks = []
+    for line in (output or "").splitlines():
+        fields = _split_terse(line)
+        if len(fields) >= 4 and fields[1].isdigit():
+            networks.append({"ssid": fields[0] or "(hidden)", "signal": int(fields[1]),
+                             "channel": fields[2], "security": fields[3] or "Open"})
+    return sorted(networks, key=lambda network: -network["signal"])
+
+class LogTail:
+    """Incrementally follows a log file, keeping the last lines in memory."""
+
+    def __init__(self, path=None, max_lines=LOG_LINES):
+        """
+        Args:
+            path: The log file; the first existing LOG_PATHS entry by default.
+                  Without a log file the NetworkManager journal is read instead.
+            max_lines: The number of lines kept
+        """
+        self.path = path or next((candidate for candidate in LOG_PATHS if os.path.exists(candidate)), None)
+        self.lines = deque(maxlen=max_lines)
+        self._offset = None
+
+    def read(self):
+        """Read any new lines; returns all kept lines."""
+        if self.path is None:
+            output = run_command(["journalctl", "--no-pager", "-o", "short", "-n", str(self.lines.maxlen),
+                                  "-u", "NetworkManager", "-u", "wpa_supplicant"])
+            self.lines.clear()
+            self.lines.extend((output or "").splitlines())
+            return list(self.lines)
+
+        try:
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                first = self._offset is None
+                if first:
+                    # Only the end of a large syslog is of interest; start one byte
+                    # early to see whether the tail begins mid-line
+                    self._offset = max(0, size - LOG_TAIL_BYTES - 1)
+                elif size < self._offset:
+                    # The file was rotated or truncated
+                    self._offset = 0
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return list(self.lines)
+
+        if first and self._offset > 0:
+            # Skip up to the first line start
+            skipped = data.find(b"\n") + 1
+            self._offset += skipped
+            data = data[skipped:]
+
+        # Leave a partial last line for the next read
+        complete = data[:data.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        self.lines.extend(complete.decode("utf-8", "replace").splitlines())
+        return list(self.lines)
+
+class StatusLine:
+    """
+    Stands in for stdout while the dashboard is shown.
+
+    run_command prints failures from the poller threads; printed over the
+    curses screen they would garble it, so the last one is kept for the
+    status line instead.
+    """
+
+    def __init__(self):
+        self._message = None
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if lines:
+            with self._lock:
+                self._message = lines[-1]
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def message(self):
+        with self._lock:
+            return self._message
+
+def signal_bar(percent, width=10):
+    filled = max(0, min(width, round(percent * width / 100)))
+    return "#" * filled + "." * (width - filled)
+
+def dbm_to_percent(dbm):
+    # -100 dBm and below is unusable, -50 dBm and above is excellent
+    return max(0, min(100, 2 * (dbm + 100)))
+
+def _link_lines(interface, link):
+    lines = [f" Link: {interface}"]
+    if not link or not link.get("ssid"):
+        return lines + ["  Not connected"]
+    signal = link.get("signal")
+    lines.append(f"  SSID       {link['ssid']}")
+    if signal is not None:
+        lines.append(f"  Signal     {signal_bar(dbm_to_percent(signal))} {signal} dBm")
+    if link.get("frequency"):
+        lines.append(f"  Frequency  {link['frequency'] / 1000:.3f} GHz")
+    if link.get("bitrate"):
+        lines.append(f"  Bitrate    {link['bitrate']:g} Mb/s")
+    if link.get("tx_power") is not None:
+        lines.append(f"  Tx power   {link['tx_power']:g} dBm")
+    return lines
+
+def _connection_lines(connections):
+    lines = [" Connections"]
+    for connection in connections or []:
+        marker = "*" if connection["active"] else " "
+        device = connection["device"] if connection["device"] not in ("", "--") else ""
+        lines.append(f"  {marker} {connection['name']:<24} {device}")
+    if len(lines) == 1:
+        lines.append("  None")
+    return lines
+
+def _network_lines(networks, limit):
+    lines = [" Networks (strongest first)"]
+    for network in (networks or [])[:limit]:
+        lines.append(f"  {signal_bar(network['signal'])} {network['signal']:>3}%  ch {network['channel']:>3}  "
+                     f"{network['security']:<12} {network['ssid']}")
+    if len(lines) == 1:
+        lines.append("  None")
+    return lines
+
+def _fit(line, width):
+    return line[:width].ljust(width)
+
+def render_frame(width, height, interface, link, connections, networks, log, status=None):
+    """
+    Lay the panels out as text.
+
+    Args:
+        status: A message for the bottom line, e.g. the last failed command
+
+    Returns:
+        list: Exactly height strings of exactly width characters
+    """
+    title = f" Intel WiFi Fixer - Live Dashboard   {time.strftime('%H:%M:%S')}   (q to quit)"
+    rule = "-" * width
+    frame = [_fit(title, width), rule]
+
+    link_lines = _link_lines(interface, link)
+    connection_lines = _connection_lines(connections)
+    if width >= 80:
+        # Link and connections side by side
+        left = width // 2
+        rows = max(len(link_lines), len(connection_lines))
+        link_lines += [""] * (rows - len(link_lines))
+        connection_lines += [""] * (rows - len(connection_lines))
+        frame += [_fit(_fit(a, left - 1) + "|" + b, width) for a, b in zip(link_lines, connection_lines)]
+    else:
+        frame += [_fit(line, width) for line in link_lines + connection_lines]
+    frame.append(rule)
+
+    # Networks take up to half of what is left, the log tail the rest
+    remaining = height - len(frame)
+    network_lines = _network_lines(networks, max(remaining // 2 - 2, 1))
+    frame += [_fit(line, width) for line in network_lines]
+    frame.append(rule)
+
+    status_rows = 1 if status else 0
+    log_rows = height - len(frame) - 1 - status_rows
+    frame.append(_fit(" Log", width))
+    if log_rows > 0:
+        frame += [_fit("  " + line, width) for line in (log or [])[-log_rows:]]
+
+    frame = frame[:height - status_rows]
+    frame += [" " * width] * (height - status_rows - len(frame))
+    if status:
+        frame.append(_fit(f" ! {status}", width))
+    return frame[:height]
+
+def diff_frame(previous, current):
+    """
+    Compute the spans that changed between two frames.
+
+    Returns:
+        list: (row, column, text) for every changed span; every row of the
+              current frame when there is no comparable previous frame
+    """
+    if previous is None or len(previous) != len(current):
+        return [(row, 0, line) for row, line in enumerate(current)]
+
+    changes = []
+    for row, (old, new) in enumerate(zip(previous, current)):
+        if old == new:
+            continue
+        if len(old) != len(new):
+            changes.append((row, 0, new))
+            continue
+        start = next(i for i in range(len(new)) if old[i] != new[i])
+        end = next(i for i in range(len(new) - 1, -1, -1) if old[i] != new[i]) + 1
+        changes.append((row, start, new[start:end]))
+    return changes
+
+class Dashboard:
+    """Full-screen live view of the adapter."""
+
+    def __init__(self, interface="wlan0", log_path=None, frame_interval=FRAME_INTERVAL):
+        self.interface = interface
+        self.frame_interval = frame_interval
+        self.pollers = {
+            "link": Poller(lambda: get_wireless_info(interface), LINK_INTERVAL, {}),
+            "connections": Poller(read_connections, CONNECTIONS_INTERVAL, []),
+            "networks": Poller(read_networks, NETWORKS_INTERVAL, []),
+            "log": Poller(LogTail(log_path).read, LOG_INTERVAL, [])
+        }
+        self.status = StatusLine()
+
+    def run(self):
+        """Run until the user quits."""
+        with contextlib.redirect_stdout(self.status):
+            for poller in self.pollers.values():
+                poller.start()
+            try:
+                curses.wrapper(self._loop)
+            finally:
+                for poller in self.pollers.values():
+                    poller.stop()
+
+    def frame(self, width, height):
+        return render_frame(width, height, self.interface, self.pollers["link"].value(),
+                            self.pollers["connections"].value(), self.pollers["networks"].value(),
+                            self.pollers["log"].value(), self.status.message())
+
+    def _loop(self, stdscr):
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        stdscr.timeout(int(self.frame_interval * 1000))
+
+        previous = None
+        while True:
+            height, width = stdscr.getmaxyx()
+            # Leave the last column free; writing the bottom-right cell scrolls some terminals
+            current = self.frame(max(width - 1, 1), height)
+            for row, column, text in diff_frame(previous, current):
+                try:
+                    stdscr.addstr(row, column, text)
+                except curses.error:
+                    pass
+            stdscr.noutrefresh()
+            curses.doupdate()
+            previous = current
+
+            key = stdscr.getch()
+            if key in (ord('q'), ord('Q'), 27):
+                return
+            if key == curses.KEY_RESIZE:
+                stdscr.erase()
+                previous = None
+
+def run_dashboard(adapter_info=None):
+    """
+    Show the live dashboard for the adapter.
+
+    Returns:
+        bool: False if the terminal cannot show the dashboard
+    """
+    try:
+        Dashboard(adapter_info.adapter_id if adapter_info else "wlan0").run()
+        return True
+    except curses.error as e:
+        display_error(f"The dashboard needs an interactive terminal: {str(e)}")
+        return False
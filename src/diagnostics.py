@@ -7,6 +7,7 @@ import time
 from src.utils.command_runner import run_command, execute_with_sudo
 from src.utils.ui_helpers import display_progress, display_message, display_warning
 from src.config.adapter_configs import IntelCentrino6205Config
+from src.driver_profiles import MODPROBE_CONF_PATH, get_module_parameters, compare_module_parameters, describe_parameter_issue
 
 def check_adapter_status():
     """Check the status of the Intel Centrino Advanced-N 6205 adapter."""
@@ -121,8 +122,8 @@ def check_interface_status():
 def check_driver_parameters():
     """Check the current driver parameters for iwlwifi."""
     try:
-        if os.path.exists("/etc/modprobe.d/iwlwifi.conf"):
-            output = run_command(["cat", "/etc/modprobe.d/iwlwifi.conf"])
+        if os.path.exists(MODPROBE_CONF_PATH):
+            output = run_command(["cat", MODPROBE_CONF_PATH])
             return output
         else:
             return "No custom parameters set"
@@ -203,8 +204,14 @@ def display_diagnostics(diagnostics):
     # in main.py using the display_table function for a more professional look
     pass
 
-def identify_issues(diagnostics):
-    """Identify issues based on the diagnostic results."""
+def identify_issues(diagnostics, module_parameters=None):
+    """Identify issues based on the diagnostic results.
+    
+    Args:
+        diagnostics (dict): The results of gather_diagnostics
+        module_parameters (dict): Recommended driver parameters; defaults to the
+            profile of the detected adapter
+    """
     issues = []
     
     if diagnostics["Adapter Status"] == "Disconnected":
@@ -228,16 +235,19 @@ def identify_issues(diagnostics):
     if diagnostics["Firmware Version"] == "Unknown":
         issues.append("Unable to determine firmware version")
     
-    if "11n_disable=1" not in diagnostics["Driver Parameters"]:
-        issues.append("11n mode is enabled, which may cause issues with this adapter")
+    if module_parameters is None:
+        module_parameters = get_module_parameters()
     
-    if "power_save=0" not in diagnostics["Driver Parameters"]:
-        issues.append("Power save mode is enabled, which may cause connectivity issues")
+    missing, unexpected = compare_module_parameters(diagnostics["Driver Parameters"], module_parameters)
+    for module, key, value in missing:
+        issues.append(describe_parameter_issue(module, key, value))
+    for module, key, value in unexpected:
+        issues.append(describe_parameter_issue(module, key, value, unexpected=True))
     
     return issues
 
 def run_diagnostics(adapter_info):
     """Run diagnostics and identify issues."""
     diagnostics = gather_diagnostics()
-    issues = identify_issues(diagnostics)
+    issues = identify_issues(diagnostics, get_module_parameters(adapter_info))
     return issues
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Driver Profile Module
+
+This module turns the module parameters recommended by an adapter's database
+entry into modprobe configuration, and compares them against what is
+currently configured so diagnostics and fixes follow the detected chipset.
+"""
+
+import re
+
+MODPROBE_CONF_PATH = "/etc/modprobe.d/iwlwifi.conf"
+
+# Shown when the adapter cannot be detected and has no database entry
+FALLBACK_MODULE_PARAMETERS = {"iwlwifi": {"11n_disable": 1, "power_save": 0}}
+
+def get_module_parameters(adapter_info=None):
+    """
+    Get the recommended module parameters for the adapter.
+
+    Args:
+        adapter_info: An AdapterInfo instance; a new one is created if omitted
+
+    Returns:
+        dict: Parameter values keyed by module name, then parameter name
+    """
+    if adapter_info is None:
+        from src.adapter_info import AdapterInfo
+        adapter_info = AdapterInfo()
+
+    profile = adapter_info.profile
+    if not profile:
+        return FALLBACK_MODULE_PARAMETERS
+    return profile.get("module_parameters", {})
+
+def parse_modprobe_options(content):
+    """
+    Parse "options <module> key=value ..." lines.
+
+    Args:
+        content: The modprobe configuration text
+
+    Returns:
+        dict: Parameter values (as strings) keyed by module name, then parameter name
+    """
+    options = {}
+    for line in (content or "").splitlines():
+        match = re.match(r"\s*options\s+(\S+)\s+(.*)", line)
+        if not match:
+            continue
+        module_options = options.setdefault(match.group(1), {})
+        for pair in match.group(2).split():
+            if "=" in pair:
+                key, value = pair.split("=", 1)
+                module_options[key] = value
+    return options
+
+def render_modprobe_options(parameters):
+    """
+    Render module parameters as modprobe configuration.
+
+    Args:
+        parameters: Parameter values keyed by module name, then parameter name
+
+    Returns:
+        str: One "options" line per module
+    """
+    lines = []
+    for module, params in parameters.items():
+        if params:
+            pairs = " ".join(f"{key}={value}" for key, value in params.items())
+            lines.append(f"options {module} {pairs}")
+    return "\n".join(lines)
+
+def merge_modprobe_options(content, parameters):
+    """
+    Merge module parameters into existing modprobe configuration.
+
+    The "options" lines of the given modules are replaced (the first one in
+    place, any duplicates dropped); every other line is kept as it is.
+
+    Args:
+        content: The current modprobe configuration text
+        parameters: Parameter values keyed by module name, then parameter name
+
+    Returns:
+        str: The merged configuration
+    """
+    lines = []
+    merged = set()
+    for line in (content or "").splitlines():
+        match = re.match(r"\s*options\s+(\S+)", line)
+        if not match or match.group(1) not in parameters:
+            lines.append(line)
+            continue
+        module = match.group(1)
+        if module not in merged and parameters[module]:
+            lines.append(render_modprobe_options({module: parameters[module]}))
+        merged.add(module)
+
+    for module, params in parameters.items():
+        if module not in merged and params:
+            lines.append(render_modprobe_options({module: params}))
+    return "\n".join(lines) + "\n"
+
+def compare_module_parameters(content, recommended):
+    """
+    Compare the configured module parameters against a profile.
+
+    Args:
+        content: The current modprobe configuration text
+        recommended: Parameter values keyed by module name, then parameter name
+
+    Returns:
+        tuple: (missing, unexpected) lists of (module, parameter, value) tuples.
+               missing holds recommended values that are not configured;
+               unexpected holds configured parameters the profile does not set.
+    """
+    configured = parse_modprobe_options(content)
+
+    missing = []
+    for module, params in recommended.items():
+        for key, value in params.items():
+            if configured.get(module, {}).get(key) != str(value):
+                missing.append((module, key, value))
+
+    unexpected = []
+    for module, params in configured.items():
+        for key, value in params.items():
+            if key not in recommended.get(module, {}):
+                unexpected.append((module, key, value))
+
+    return missing, unexpected
+
+def describe_parameter_issue(module, key, value, unexpected=False):
+    """Describe a module parameter mismatch as an issue string for apply_all_fixes."""
+    if unexpected:
+        if module == "iwlwifi" and key == "11n_disable" and value != "0":
+            return "11n mode is disabled, which throttles throughput on this adapter"
+        return f"Driver parameter {module}.{key}={value} is not recommended for this adapter"
+
+    if module == "iwlwifi" and key == "11n_disable" and value == 1:
+        return "11n mode is enabled, which may cause issues with this adapter"
+    if module == "iwlwifi" and key == "power_save" and value == 0:
+        return "Power save mode is enabled, which may cause connectivity issues"
+    return f"Driver parameter {module}.{key} should be set to {value} for this adapter"
@@ -0,0 +1,194 @@
+"""
+Driver Reload Module
+
+This module reloads the iwlwifi driver with as little downtime as possible.
+The active connections on the driver's interfaces are recorded first, the
+op-mode module (iwlmvm/iwldvm) is unloaded before iwlwifi, and after loading
+the driver again the interfaces are awaited through link notifications rather
+than fixed sleeps. The saved connections are then reactivated concurrently.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.command_runner import run_command, execute_with_sudo, execute_batch_with_sudo
+from src.utils.netlink import LinkMonitor, RTM_NEWLINK
+from src.utils.ui_helpers import display_message, display_success, display_error, display_warning
+
+DRIVER_MODULE = "iwlwifi"
+# Op-mode modules depend on iwlwifi and must be unloaded first
+OP_MODE_MODULES = ["iwlmvm", "iwldvm"]
+
+INTERFACE_TIMEOUT = 15
+CONNECTION_TIMEOUT = 30
+
+def loaded_modules():
+    """Return the names of the loaded kernel modules."""
+    try:
+        with open("/proc/modules") as f:
+            return {line.split()[0] for line in f if line.strip()}
+    except OSError:
+        return set()
+
+def driver_interfaces(module=DRIVER_MODULE):
+    """
+    Find the network interfaces bound to a driver.
+
+    Args:
+        module: The driver name as shown in /sys/class/net/<if>/device/driver
+
+    Returns:
+        list: Interface names
+    """
+    interfaces = []
+    try:
+        names = sorted(os.listdir("/sys/class/net"))
+    except OSError:
+        return interfaces
+    for name in names:
+        driver = os.path.realpath(f"/sys/class/net/{name}/device/driver")
+        if os.path.basename(driver) == module:
+            interfaces.append(name)
+    return interfaces
+
+def snapshot_connections(interfaces):
+    """
+    Record the active NetworkManager connections on the given interfaces.
+
+    Returns:
+        list: dicts with name, uuid and device
+    """
+    output = run_command(["nmcli", "-t", "-f", "NAME,UUID,DEVICE", "connection", "show", "--active"])
+    connections = []
+    for line in (output or "").splitlines():
+        # Terse output escapes colons inside fields as "\:"
+        fields = [field.replace("\\:", ":") for field in re.split(r"(?<!\\):", line)]
+        if len(fields) >= 3 and fields[2] in interfaces:
+            connections.append({"name": fields[0], "uuid": fields[1], "device": fields[2]})
+    return connections
+
+def wait_for_interfaces(interfaces, timeout=INTERFACE_TIMEOUT, monitor=None):
+    """
+    Wait until every interface exists.
+
+    Args:
+        interfaces: Interface names to wait for
+        timeout: Maximum seconds to wait
+        monitor: A LinkMonitor created before the driver was loaded; without
+                 one, sysfs is polled instead
+
+    Returns:
+        bool: True if every interface appeared in time
+    """
+    deadline = time.monotonic() + timeout
+    pending = {name for name in interfaces if not os.path.exists(f"/sys/class/net/{name}")}
+
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if monitor is None:
+            time.sleep(min(0.1, remaining))
+            pending = {name for name in pending if not os.path.exists(f"/sys/class/net/{name}")}
+            continue
+        for msg_type, name in monitor.read(remaining):
+            # The monitor also holds the RTM_NEWLINK sent when the interface went
+            # down before the unload, so only trust it if the device exists again
+            if msg_type == RTM_NEWLINK and os.path.exists(f"/sys/class/net/{name}"):
+                pending.discard(name)
+
+    return True
+
+def activate_connection(connection, timeout=CONNECTION_TIMEOUT):
+    """Bring a saved connection back up on its device."""
+    output = execute_with_sudo(["nmcli", "--wait", str(timeout), "connection", "up",
+                                "uuid", connection["uuid"], "ifname", connection["device"]])
+    return output is not None
+
+def reload_driver(adapter_info=None, interface_timeout=INTERFACE_TIMEOUT,
+                  connection_timeout=CONNECTION_TIMEOUT):
+    """
+    Reload the iwlwifi driver and restore the connections that were active.
+
+    Args:
+        adapter_info: An AdapterInfo instance whose cached fields are refreshed
+        interface_timeout: Seconds to wait for the interfaces to reappear
+        connection_timeout: Seconds to wait for each connection to activate
+
+    Returns:
+        dict: success, downtime (seconds from unload until every connection is
+              restored), interface_wait (seconds until the interfaces
+              reappeared) and connections (name -> restored)
+    """
+    report = {"success": False, "downtime": None, "interface_wait": None, "connections": {}}
+
+    interfaces = driver_interfaces() or [adapter_info.adapter_id if adapter_info else "wlan0"]
+    connections = snapshot_connections(interfaces)
+    if connections:
+        names = ", ".join(connection["name"] for connection in connections)
+        display_message(f"Saved active connections: {names}", color='blue')
+
+    try:
+        monitor = LinkMonitor()
+    except OSError:
+        monitor = None
+
+    started = time.monotonic()
+    try:
+        display_message("Reloading the driver...", color='blue')
+        modules = loaded_modules()
+        op_modes = [module for module in OP_MODE_MODULES if module in modules]
+        unloaded = True
+        for module in op_modes + [DRIVER_MODULE]:
+            # Removing an op mode also removes iwlwifi once nothing else uses it
+            if module not in loaded_modules():
+                continue
+            command = ["modprobe", "-r", module]
+            if execute_batch_with_sudo([command])[0] is None:
+                display_error(f"Could not run: {' '.join(command)}")
+                unloaded = False
+                break
+
+        # Load the driver (and the op modes that were loaded) even when unloading
+        # failed, so the adapter is never left without a driver
+        commands = [["modprobe", module] for module in [DRIVER_MODULE] + op_modes]
+        for command, output in zip(commands, execute_batch_with_sudo(commands, stop_on_error=False)):
+            if output is None:
+                display_error(f"Could not run: {' '.join(command)}")
+                unloaded = False
+        if not unloaded:
+            return report
+
+        if not wait_for_interfaces(interfaces, interface_timeout, monitor):
+            display_error(f"Timed out waiting for {', '.join(interfaces)} to reappear.")
+            return report
+        report["interface_wait"] = time.monotonic() - started
+    finally:
+        if monitor is not None:
+            monitor.close()
+
+    if connections:
+        display_message("Restoring connections...", color='blue')
+        with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+            results = executor.map(lambda connection: activate_connection(connection, connection_timeout),
+                                   connections)
+            report["connections"] = {
+                connection["name"]: restored for connection, restored in zip(connections, results)
+            }
+
+    report["downtime"] = time.monotonic() - started
+    report["success"] = all(report["connections"].values())
+
+    if adapter_info is not None:
+        # The firmware is loaded afresh; drop everything the adapter cached
+        adapter_info.refresh("driver", "firmware", "mac_address")
+        adapter_info.refresh()
+
+    for name, restored in report["connections"].items():
+        if not restored:
+            display_warning(f"Could not restore connection {name}.")
+    if report["success"]:
+        display_success(f"Driver reloaded; downtime {report['downtime']:.1f}s.")
+
+    return report
@@ -8,8 +8,10 @@ including EAP-TLS, PEAP, and TTLS authentication methods.
 import os
 import re
 import time
-from utils.command_runner import run_command, execute_with_sudo
-from utils.ui_helpers import display_message, display_success, display_error, display_warning
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.command_runner import run_command, execute_with_sudo, execute_batch_with_sudo
+from src.utils.ui_helpers import display_message, display_success, display_error, display_warning
+from src.utils.wpa_events import open_events
 
 # Define supported EAP methods
 EAP_METHODS = {
@@ -19,9 +21,75 @@ EAP_METHODS = {
     "4": {"name": "TLS", "value": "tls", "inner_auth": None}
 }
 
+# Seconds allowed for 802.1X authentication after an activation is requested
+AUTH_TIMEOUT = 30
+# Seconds between state checks when no wpa_supplicant events are available
+POLL_INTERVAL = 0.5
+
+# Why an authentication attempt failed
+FAILURE_REASONS = {
+    "bad-certificate": "The server certificate was rejected",
+    "identity-rejected": "The server rejected the identity",
+    "method-rejected": "No EAP method was agreed with the server",
+    "credentials-rejected": "The server rejected the credentials",
+    "timeout": "Authentication did not complete in time",
+    "failed": "Authentication failed",
+    "activation-failed": "NetworkManager could not start the connection",
+    "not-visible": "The network is not in range of any adapter"
+}
+
+def enterprise_properties(eap_method, username=None, password=None, ca_cert=None,
+                          client_cert=None, private_key=None, private_key_password=None, ca_path=None):
+    """
+    Build the 802.1X nmcli properties for an EAP method.
+    
+    Args:
+        eap_method: An EAP_METHODS entry (value and inner_auth)
+        username, password, ca_cert, client_cert, private_key, private_key_password, ca_path:
+            As for configure_enterprise_wifi
+        
+    Returns:
+        list: Alternating nmcli property names and values
+    """
+    properties = []
+    if eap_method["value"] == "peap" or eap_method["value"] == "ttls":
+        properties.extend(["802-1x.eap", eap_method["value"], 
+                           "802-1x.phase2-auth", eap_method["inner_auth"],
+                           "802-1x.identity", username])
+        
+        if password:
+            properties.extend(["802-1x.password", password])
+        
+        if ca_cert:
+            properties.extend(["802-1x.ca-cert", ca_cert])
+        
+        if ca_path:
+            properties.extend(["802-1x.ca-path", ca_path])
+            
+    elif eap_method["value"] == "tls":
+        properties.extend(["802-1x.eap", "tls", 
+                           "802-1x.identity", username])
+        
+        if ca_cert:
+            properties.extend(["802-1x.ca-cert", ca_cert])
+        
+        if ca_path:
+            properties.extend(["802-1x.ca-path", ca_path])
+        
+        if client_cert:
+            properties.extend(["802-1x.client-cert", client_cert])
+        
+        if private_key:
+            properties.extend(["802-1x.private-key", private_key])
+        
+        if private_key_password:
+            properties.extend(["802-1x.private-key-password", private_key_password])
+    
+    return properties
+
 def configure_enterprise_wifi(ssid, eap_method, username=None, password=None, 
                              ca_cert=None, client_cert=None, private_key=None, 
-                             private_key_password=None):
+                             private_key_password=None, ca_path=None):
     """
     Configure an enterprise WiFi connection.
     
@@ -34,6 +102,7 @@ def configure_enterprise_wifi(ssid, eap_method, username=None, password=None,
         client_cert: Path to the client certificate (for TLS)
         private_key: Path to the private key (for TLS)
         private_key_password: Password for the private key (for TLS)
+        ca_path: A hashed CA directory, e.g. the WiFi CA store (ca_store.CA_STORE_DIR)
         
     Returns:
         bool: True if the configuration was successful, False otherwise
@@ -46,32 +115,8 @@ def configure_enterprise_wifi(ssid, eap_method, username=None, password=None,
                "ifname", "wlan0", "ssid", ssid, "wifi-sec.key-mgmt", "wpa-eap"]
         
         # Add EAP method specific configuration
-        if eap_method["value"] == "peap" or eap_method["value"] == "ttls":
-            cmd.extend(["802-1x.eap", eap_method["value"], 
-                        "802-1x.phase2-auth", eap_method["inner_auth"],
-                        "802-1x.identity", username])
-            
-            if password:
-                cmd.extend(["802-1x.password", password])
-            
-            if ca_cert:
-                cmd.extend(["802-1x.ca-cert", ca_cert])
-                
-        elif eap_method["value"] == "tls":
-            cmd.extend(["802-1x.eap", "tls", 
-                        "802-1x.identity", username])
-            
-            if ca_cert:
-                cmd.extend(["802-1x.ca-cert", ca_cert])
-            
-            if client_cert:
-                cmd.extend(["802-1x.client-cert", client_cert])
-            
-            if private_key:
-                cmd.extend(["802-1x.private-key", private_key])
-            
-            if private_key_password:
-                cmd.extend(["802-1x.private-key-password", private_key_password])
+        cmd.extend(enterprise_properties(eap_method, username, password, ca_cert,
+                                         client_cert, private_key, private_key_password, ca_path))
         
         # Execute the command
         result = execute_with_sudo(cmd)
@@ -87,28 +132,42 @@ def configure_enterprise_wifi(ssid, eap_method, username=None, password=None,
         display_error(f"Error configuring enterprise WiFi: {str(e)}")
         return False
 
-def verify_certificate(cert_path):
+def verify_certificate(cert_path, ca_cert=None, hostname=None, purpose="server"):
     """
     Verify that a certificate file is valid.
     
     Args:
         cert_path: Path to the certificate file
+        ca_cert: Path to the CA certificate it must chain to
+        hostname: The RADIUS server name it must match
+        purpose: "server", "client" or "ca"
         
     Returns:
         bool: True if the certificate is valid, False otherwise
     """
     try:
+        from src.cert_inspector import validate_certificate
+        
         if not os.path.exists(cert_path):
             display_error(f"Certificate file not found: {cert_path}")
             return False
         
-        # Use openssl to verify the certificate
-        result = run_command(["openssl", "x509", "-in", cert_path, "-text", "-noout"])
+        result = validate_certificate(cert_path, ca_cert, hostname, purpose)
+        certificate = result["certificate"]
+        if certificate:
+            display_message(f"Subject: {certificate['subject']}", color='cyan')
+            display_message(f"Issuer:  {certificate['issuer']}", color='cyan')
+            display_message(f"Valid:   {certificate['not_before'][:10]} to {certificate['not_after'][:10]}",
+                            color='cyan')
+        for warning in result["warnings"]:
+            display_warning(warning)
         
-        if result:
+        if result["ok"]:
             display_success(f"Certificate is valid: {cert_path}")
             return True
         else:
+            for error in result["errors"]:
+                display_error(error)
             display_error(f"Invalid certificate: {cert_path}")
             return False
             
@@ -167,13 +226,18 @@ def delete_enterprise_connection(connection_name):
         display_error(f"Error deleting enterprise connection: {str(e)}")
         return False
 
-def import_certificate(cert_path, cert_type="ca"):
+def import_certificate(cert_path, cert_type="ca", system=False):
     """
-    Import a certificate into the system certificate store.
+    Import a certificate.
+    
+    CA certificates go into the WiFi CA store (see src.ca_store); they are
+    only added to the system trust store, which runs update-ca-certificates,
+    when ``system`` is set.
     
     Args:
         cert_path: Path to the certificate file
         cert_type: Type of certificate (ca, client)
+        system: Also add a CA certificate to the system trust store
         
     Returns:
         bool: True if the import was successful, False otherwise
@@ -186,25 +250,15 @@ def import_certificate(cert_path, cert_type="ca"):
             return False
         
         if cert_type == "ca":
-            # Import CA certificate
-            dest_path = "/usr/local/share/ca-certificates/"
-            cert_name = os.path.basename(cert_path)
-            
-            # Copy the certificate to the CA certificates directory
-            execute_with_sudo(["cp", cert_path, os.path.join(dest_path, cert_name)])
-            
-            # Update the CA certificate store
-            result = execute_with_sudo(["update-ca-certificates"])
-            
-            if result:
-                display_success(f"CA certificate imported successfully.")
-                return True
-            else:
-                display_error(f"Failed to import CA certificate.")
+            # Refuse certificates that cannot act as a trust anchor
+            if not verify_certificate(cert_path, purpose="ca"):
                 return False
+            
+            results = import_ca_certificates([cert_path], system)
+            return bool(results) and all(result["status"] in ("added", "present") for result in results)
         else:
             # For client certificates, just verify and return the path
-            if verify_certificate(cert_path):
+            if verify_certificate(cert_path, purpose="client"):
                 display_success(f"Client certificate is valid and ready to use.")
                 return True
             else:
@@ -214,6 +268,412 @@ def import_certificate(cert_path, cert_type="ca"):
         display_error(f"Error importing certificate: {str(e)}")
         return False
 
+def import_ca_certificates(paths, system=False):
+    """
+    Add many CA certificates to the WiFi CA store in one batch.
+    
+    Args:
+        paths: CA certificate files, or directories of them
+        system: Also add them to the system trust store (one
+                update-ca-certificates run for the whole batch)
+        
+    Returns:
+        list: One dict per certificate with name and status ("added",
+              "present" or "invalid", with errors)
+    """
+    try:
+        from src import ca_store
+        from src.cert_inspector import CERT_EXTENSIONS, validate_ca_bundle
+        
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                    if name.lower().endswith(CERT_EXTENSIONS)))
+            else:
+                files.append(path)
+        
+        valid = []
+        results = []
+        for path in files:
+            # Every certificate of a bundle would become trusted, not only the first
+            validation = validate_ca_bundle(path, require_signatures=True)
+            if validation["ok"]:
+                valid.append(path)
+            else:
+                display_error(f"{path}: {'; '.join(validation['errors'])}")
+                results.append({"name": os.path.basename(path), "status": "invalid",
+                                "errors": validation["errors"]})
+        
+        stored = []
+        if valid:
+            stored = ca_store.add_certificates(valid)
+            results.extend(stored)
+            added = sum(result["status"] == "added" for result in stored)
+            display_success(f"WiFi CA store: {added} added, {len(stored) - added} already present.")
+        
+        if system and stored:
+            dest_path = "/usr/local/share/ca-certificates/"
+            # update-ca-certificates only picks up single PEM certificates in
+            # .crt files, which is what the store holds (DER and bundles converted)
+            commands = [["cp", os.path.join(ca_store.CA_STORE_DIR, result["file"]),
+                         os.path.join(dest_path, os.path.splitext(result["file"])[0] + ".crt")]
+                        for result in stored]
+            commands.append(["update-ca-certificates"])
+            outputs = execute_batch_with_sudo(commands)
+            if outputs[-1] is not None:
+                display_success("CA certificates added to the system trust store.")
+            else:
+                display_error("Failed to update the system trust store.")
+        
+        return results
+    
+    except Exception as e:
+        display_error(f"Error importing CA certificates: {str(e)}")
+        return []
+
+def use_ca_store(connection_names=None):
+    """
+    Point enterprise connections at the WiFi CA store (802-1x.ca-path).
+    
+    Args:
+        connection_names: The connections to update; every enterprise connection by default
+        
+    Returns:
+        bool: True if every connection was updated
+    """
+    try:
+        from src.ca_store import CA_STORE_DIR
+        
+        names = connection_names or [profile["name"] for profile in enterprise_profiles()]
+        if not names:
+            display_warning("No enterprise WiFi connections to update.")
+            return False
+        
+        # One helper round trip for all connections
+        outputs = execute_batch_with_sudo([["nmcli", "connection", "modify", name, "802-1x.ca-path", CA_STORE_DIR]
+                                           for name in names], stop_on_error=False)
+        failed = [name for name, output in zip(names, outputs) if output is None]
+        if failed:
+            display_error(f"Could not update: {', '.join(failed)}")
+            return False
+        display_success(f"{len(names)} connection(s) now use the WiFi CA store.")
+        return True
+    
+    except Exception as e:
+        display_error(f"Error updating connections: {str(e)}")
+        return False
+
+def _split_terse(line):
+    # Terse output escapes colons inside fields as "\:"
+    return [field.replace("\\:", ":") for field in re.split(r"(?<!\\):", line)]
+
+def _auth_result(ok, reason=None, detail=None, latency=None):
+    return {"ok": ok, "reason": reason, "detail": detail, "latency": latency}
+
+def wait_for_authentication(events, started, timeout=AUTH_TIMEOUT, until_connected=False, connection_name=None):
+    """
+    Follow wpa_supplicant events until 802.1X authentication succeeds or fails.
+    
+    Args:
+        events: An event source from open_events, opened before the activation
+        started: time.monotonic() when the activation was requested
+        timeout: Seconds allowed from ``started``
+        until_connected: Also wait for the association to complete
+        connection_name: Also poll this connection's activation state, for
+                         event sources that may not see every event
+        
+    Returns:
+        dict: ok, reason (a FAILURE_REASONS key, None on success), detail and
+              latency (seconds from ``started`` to the result)
+    """
+    # The last EAP stage reached decides what a failure means
+    stage = None
+    authenticated = None
+    seen_activating = False
+    deadline = started + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return _auth_result(False, "timeout", f"Last EAP stage: {stage or 'none'}")
+        
+        if connection_name is not None:
+            # The journal may show no wpa_supplicant lines at all (e.g. without
+            # journal access), so a finished activation also ends the wait
+            state = run_command(["nmcli", "-g", "GENERAL.STATE", "connection", "show", connection_name])
+            if state == "activated":
+                return _auth_result(True, latency=authenticated if authenticated is not None
+                                    else time.monotonic() - started)
+            if state == "activating":
+                seen_activating = True
+            elif seen_activating:
+                return _auth_result(False, "failed", f"Activation ended; last EAP stage: {stage or 'none'}",
+                                    time.monotonic() - started)
+            remaining = min(remaining, POLL_INTERVAL)
+
+        for event in events.read(remaining):
+            name, _, detail = event.partition(" ")
+            elapsed = time.monotonic() - started
+            if name == "CTRL-EVENT-EAP-STARTED":
+                stage = "started"
+            elif name == "CTRL-EVENT-EAP-PROPOSED-METHOD":
+                stage = "proposed"
+            elif name == "CTRL-EVENT-EAP-METHOD":
+                stage = "method"
+            elif name == "CTRL-EVENT-EAP-TLS-CERT-ERROR":
+                return _auth_result(False, "bad-certificate", detail, elapsed)
+            elif name == "CTRL-EVENT-EAP-TIMEOUT-FAILURE":
+                return _auth_result(False, "timeout", detail, elapsed)
+            elif name in ("CTRL-EVENT-EAP-FAILURE", "CTRL-EVENT-SSID-TEMP-DISABLED"):
+                reason = {"method": "credentials-rejected", "proposed": "method-rejected"}.get(stage, "identity-rejected")
+                return _auth_result(False, reason, detail, elapsed)
+            elif name == "CTRL-EVENT-EAP-SUCCESS":
+                authenticated = elapsed
+                if not until_connected:
+                    return _auth_result(True, latency=elapsed)
+            elif name == "CTRL-EVENT-CONNECTED":
+                # A cached PMK can connect without a new EAP exchange
+                return _auth_result(True, latency=authenticated if authenticated is not None else elapsed)
+
+def _poll_activation(connection_name, started, timeout):
+    """Fallback for wait_for_authentication that polls the activation state."""
+    seen_activating = False
+    while time.monotonic() - started < timeout:
+        state = run_command(["nmcli", "-g", "GENERAL.STATE", "connection", "show", connection_name])
+        if state == "activated":
+            return _auth_result(True, latency=time.monotonic() - started)
+        if state == "activating":
+            seen_activating = True
+        elif seen_activating:
+            return _auth_result(False, "failed", "No wpa_supplicant events to tell why",
+                                time.monotonic() - started)
+        time.sleep(POLL_INTERVAL)
+    return _auth_result(False, "timeout", None)
+
+def activate_and_wait(connection_name, device=None, timeout=AUTH_TIMEOUT, until_connected=False):
+    """
+    Activate a connection and wait for its 802.1X authentication result.
+    
+    Args:
+        connection_name: The connection to activate
+        device: The interface to activate it on; without one the activation
+                state is polled instead of following wpa_supplicant events
+        timeout: Seconds allowed for authentication
+        until_connected: Also wait for the association to complete
+        
+    Returns:
+        dict: As for wait_for_authentication
+    """
+    # Subscribe first so no event of this attempt is missed
+    events = open_events(device) if device else None
+    try:
+        command = ["nmcli", "--wait", "0", "connection", "up", connection_name]
+        if device:
+            command.extend(["ifname", device])
+        started = time.monotonic()
+        if execute_with_sudo(command) is None:
+            return _auth_result(False, "activation-failed")
+        if events is None:
+            return _poll_activation(connection_name, started, timeout)
+        # Only the control socket is sure to deliver every event
+        connection = None if events.complete else connection_name
+        return wait_for_authentication(events, started, timeout, until_connected, connection)
+    finally:
+        if events is not None:
+            events.close()
+
+def enterprise_profiles(names=None):
+    """
+    Get the SSID, EAP method and bound interface of enterprise connections.
+    
+    Args:
+        names: The connections to describe; every WiFi connection by default
+        
+    Returns:
+        list: dicts with name, ssid, eap, device (None when not bound),
+              ca_cert and client_cert, for the connections that use 802.1X
+    """
+    if names is None:
+        output = run_command(["nmcli", "-t", "-f", "NAME,TYPE", "connection", "show"])
+        names = [fields[0] for fields in map(_split_terse, (output or "").splitlines())
+                 if len(fields) >= 2 and fields[1] in ("wifi", "802-11-wireless")]
+    if not names:
+        return []
+    
+    # One query for every profile; each profile's fields start with connection.id
+    output = run_command(["nmcli", "-t", "-f", "connection.id,connection.interface-name,"
+                          "802-11-wireless.ssid,802-1x.eap,802-1x.ca-cert,802-1x.client-cert",
+                          "connection", "show"] + list(names))
+    profiles = []
+    for line in (output or "").splitlines():
+        key, _, value = line.partition(":")
+        value = value.replace("\\:", ":")
+        if key == "connection.id":
+            profiles.append({"name": value, "ssid": None, "eap": None, "device": None,
+                             "ca_cert": None, "client_cert": None})
+        elif profiles and key == "connection.interface-name":
+            profiles[-1]["device"] = value or None
+        elif profiles and key == "802-11-wireless.ssid":
+            profiles[-1]["ssid"] = value
+        elif profiles and key == "802-1x.eap":
+            profiles[-1]["eap"] = value or None
+        elif profiles and key in ("802-1x.ca-cert", "802-1x.client-cert"):
+            # Certificates stored as files may be shown as file:// URIs
+            path = value[len("file://"):] if value.startswith("file://") else value
+            profiles[-1][key[len("802-1x."):].replace("-", "_")] = path or None
+    return [profile for profile in profiles if profile["eap"]]
+
+def wifi_devices():
+    """
+    Get the usable WiFi interfaces and their active connections in one query.
+    
+    Returns:
+        dict: The active connection name (or None) keyed by interface
+    """
+    output = run_command(["nmcli", "-t", "-f", "DEVICE,TYPE,STATE,CONNECTION", "device"])
+    devices = {}
+    for fields in map(_split_terse, (output or "").splitlines()):
+        if len(fields) >= 4 and fields[1] == "wifi" and fields[2] not in ("unavailable", "unmanaged"):
+            devices[fields[0]] = fields[3] if fields[2] == "connected" else None
+    return devices
+
+def visible_networks():
+    """
+    Get the interfaces that can see each SSID.
+    
+    Returns:
+        dict: Sets of interface names keyed by SSID
+    """
+    output = run_command(["nmcli", "-t", "-f", "SSID,DEVICE", "device", "wifi", "list"])
+    visible = {}
+    for fields in map(_split_terse, (output or "").splitlines()):
+        if len(fields) >= 2 and fields[0]:
+            visible.setdefault(fields[0], set()).add(fields[1])
+    return visible
+
+def schedule_profiles(profiles, visible):
+    """
+    Spread profiles over the interfaces that can reach their networks.
+    
+    An interface authenticates one network at a time, so each interface gets
+    a queue; profiles with the fewest candidate interfaces are placed first.
+    
+    Args:
+        profiles: As returned by enterprise_profiles
+        visible: As returned by visible_networks, limited to usable interfaces
+        
+    Returns:
+        tuple: (queues of profiles keyed by interface, unreachable profiles)
+    """
+    queues = {}
+    unreachable = []
+    candidates = {}
+    for profile in profiles:
+        devices = set(visible.get(profile["ssid"], ()))
+        if profile["device"]:
+            devices &= {profile["device"]}
+        candidates[profile["name"]] = devices
+    
+    for profile in sorted(profiles, key=lambda profile: len(candidates[profile["name"]])):
+        devices = candidates[profile["name"]]
+        if not devices:
+            unreachable.append(profile)
+            continue
+        device = min(sorted(devices), key=lambda device: len(queues.get(device, [])))
+        queues.setdefault(device, []).append(profile)
+    return queues, unreachable
+
+def verify_enterprise_profiles(names=None, timeout=AUTH_TIMEOUT):
+    """
+    Test which enterprise profiles can still authenticate.
+    
+    Each profile whose network is visible is activated and followed until
+    authentication succeeds or fails. Interfaces work through their queues
+    concurrently; the connection each interface had before is restored.
+    
+    Args:
+        names: The connections to test; every enterprise connection by default
+        timeout: Seconds allowed for each authentication
+        
+    Returns:
+        list: One dict per profile (name, ssid, device, ok, reason, detail,
+              latency), in profile order
+    """
+    try:
+        profiles = enterprise_profiles(names)
+        devices = wifi_devices()
+        visible = {ssid: found & set(devices) for ssid, found in visible_networks().items()}
+        queues, unreachable = schedule_profiles(profiles, visible)
+        
+        display_message(f"Verifying {len(profiles) - len(unreachable)} enterprise profile(s) "
+                        f"on {len(queues)} adapter(s)...", color='blue')
+        
+        results = {}
+        for profile in unreachable:
+            results[profile["name"]] = dict(_auth_result(False, "not-visible"), name=profile["name"],
+                                            ssid=profile["ssid"], device=None)
+        
+        def verify_device(device):
+            device_results = []
+            for profile in queues[device]:
+                result = activate_and_wait(profile["name"], device, timeout)
+                if result["reason"] != "activation-failed":
+                    # Leave the interface free for the next profile; after a failure
+                    # NetworkManager would otherwise keep retrying the activation
+                    execute_with_sudo(["nmcli", "connection", "down", profile["name"]])
+                device_results.append(dict(result, name=profile["name"], ssid=profile["ssid"], device=device))
+            if devices[device]:
+                execute_with_sudo(["nmcli", "--wait", "0", "connection", "up", devices[device],
+                                   "ifname", device])
+            return device_results
+        
+        if queues:
+            with ThreadPoolExecutor(max_workers=len(queues)) as executor:
+                for device_results in executor.map(verify_device, list(queues)):
+                    results.update((result["name"], result) for result in device_results)
+        
+        return [results[profile["name"]] for profile in profiles]
+    
+    except Exception as e:
+        display_error(f"Error verifying enterprise connections: {str(e)}")
+        return []
+
+def certificate_expiry_report(within_days=None):
+    """
+    Find the certificates of enterprise connections that expire soon.
+    
+    Parsed certificates are cached, so repeated sweeps only stat the files.
+    
+    Args:
+        within_days: How far ahead to look (cert_inspector.EXPIRY_WARNING_DAYS by default)
+        
+    Returns:
+        list: As for cert_inspector.expiring_certificates, plus the
+              connections using each certificate
+    """
+    try:
+        from src.cert_inspector import EXPIRY_WARNING_DAYS, expiring_certificates
+        
+        users = {}
+        for profile in enterprise_profiles():
+            for path in (profile["ca_cert"], profile["client_cert"]):
+                if path:
+                    users.setdefault(path, []).append(profile["name"])
+        
+        report = expiring_certificates(list(users), within_days or EXPIRY_WARNING_DAYS)
+        for item in report:
+            item["connections"] = users[item["path"]]
+        return report
+    
+    except Exception as e:
+        display_error(f"Error checking certificate expiry: {str(e)}")
+        return []
+
+def describe_failure(result):
+    """Return a one-line explanation of a failed authentication result."""
+    text = FAILURE_REASONS.get(result["reason"], result["reason"] or "")
+    return f"{text} ({result['detail']})" if result.get("detail") else text
+
 def connect_to_enterprise_network(connection_name):
     """
     Connect to an enterprise WiFi network.
@@ -227,26 +687,21 @@ def connect_to_enterprise_network(connection_name):
     try:
         display_message(f"Connecting to enterprise WiFi network: {connection_name}...", color='blue')
         
-        # Activate the connection
-        result = execute_with_sudo(["nmcli", "connection", "up", connection_name])
+        profiles = enterprise_profiles([connection_name])
+        device = profiles[0]["device"] if profiles else None
         
-        if result:
-            # Wait for the connection to establish
-            time.sleep(5)
-            
-            # Check if the connection is active
-            output = run_command(["nmcli", "-t", "-f", "ACTIVE", "connection", "show", connection_name])
-            
-            if output and "yes" in output.lower():
-                display_success(f"Connected to enterprise WiFi network: {connection_name}")
-                return True
-            else:
-                display_warning(f"Connection attempt completed, but connection may not be active.")
-                return False
+        # Returns as soon as wpa_supplicant reports the outcome
+        result = activate_and_wait(connection_name, device, until_connected=True)
+        
+        if result["ok"]:
+            display_success(f"Connected to enterprise WiFi network: {connection_name} "
+                            f"(authenticated in {result['latency']:.1f} s)")
+            return True
         else:
-            display_error(f"Failed to connect to enterprise WiFi network: {connection_name}")
+            display_error(f"Failed to connect to enterprise WiFi network: {connection_name}: "
+                          f"{describe_failure(result)}")
             return False
             
     except Exception as e:
         display_error(f"Error connecting to enterprise network: {str(e)}")
-        return False
\ No newline at end of file
+        return False
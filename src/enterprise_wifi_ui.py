@@ -6,15 +6,23 @@ This module provides a user interface for configuring enterprise WiFi connection
 
 import os
 import time
-from utils.ui_helpers import display_header, display_message, display_success, display_error, display_warning
-from enterprise_wifi import (
+from src.utils.ui_helpers import (
+    display_header, display_message, display_success, display_error, display_warning, display_table
+)
+from src.ca_store import CA_STORE_DIR, list_certificates as list_ca_store
+from src.enterprise_wifi import (
     EAP_METHODS, 
     configure_enterprise_wifi, 
     verify_certificate, 
     list_enterprise_connections,
     delete_enterprise_connection,
     import_certificate,
-    connect_to_enterprise_network
+    import_ca_certificates,
+    use_ca_store,
+    connect_to_enterprise_network,
+    verify_enterprise_profiles,
+    certificate_expiry_report,
+    describe_failure
 )
 
 def enterprise_wifi_menu():
@@ -29,6 +37,8 @@ def enterprise_wifi_menu():
         print("4. Delete Enterprise WiFi Connection")
         print("5. Import Certificate")
         print("6. Verify Certificate")
+        print("7. Verify Enterprise Connections")
+        print("8. Check Certificate Expiry")
         print("b. Back to Main Menu")
         
         choice = input("\nSelect an option: ").strip().lower()
@@ -45,6 +55,10 @@ def enterprise_wifi_menu():
             import_cert()
         elif choice == '6':
             verify_cert()
+        elif choice == '7':
+            verify_connections()
+        elif choice == '8':
+            check_certificate_expiry()
         elif choice == 'b':
             break
         else:
@@ -93,6 +107,11 @@ def configure_new_connection():
     # Get certificate paths
     ca_cert = input("\nEnter path to CA certificate (leave empty if not needed): ").strip()
     
+    ca_path = None
+    if not ca_cert and list_ca_store():
+        if input("Verify the server against the WiFi CA store? (y/n): ").strip().lower().startswith('y'):
+            ca_path = CA_STORE_DIR
+    
     client_cert = None
     private_key = None
     private_key_password = None
@@ -113,11 +132,11 @@ def configure_new_connection():
         private_key_password = input("\nEnter private key password (leave empty if not needed): ").strip()
     
     # Verify certificates if provided
-    if ca_cert and not verify_certificate(ca_cert):
+    if ca_cert and not verify_certificate(ca_cert, purpose="ca"):
         if not input("\nContinue anyway? (y/n): ").strip().lower().startswith('y'):
             return
     
-    if client_cert and not verify_certificate(client_cert):
+    if client_cert and not verify_certificate(client_cert, purpose="client"):
         if not input("\nContinue anyway? (y/n): ").strip().lower().startswith('y'):
             return
     
@@ -130,7 +149,8 @@ def configure_new_connection():
         ca_cert=ca_cert,
         client_cert=client_cert,
         private_key=private_key,
-        private_key_password=private_key_password
+        private_key_password=private_key_password,
+        ca_path=ca_path
     )
     
     if success:
@@ -229,13 +249,21 @@ def import_cert():
     
     cert_type = "ca" if cert_type_choice == '1' else "client"
     
-    cert_path = input("\nEnter path to certificate file: ").strip()
+    prompt = "certificate file or directory" if cert_type == "ca" else "certificate file"
+    cert_path = input(f"\nEnter path to {prompt}: ").strip()
     if not cert_path:
         display_error("Certificate path cannot be empty.")
         time.sleep(1)
         return
     
-    import_certificate(cert_path, cert_type)
+    if cert_type == "ca":
+        # CA certificates go into the WiFi CA store; the system store is slow to rebuild
+        system = input("Also add to the system trust store (slow)? (y/n): ").strip().lower().startswith('y')
+        if import_ca_certificates([cert_path], system):
+            if input("\nUse the WiFi CA store for all enterprise connections? (y/n): ").strip().lower().startswith('y'):
+                use_ca_store()
+    else:
+        import_certificate(cert_path, cert_type)
     
     input("\nPress Enter to continue...")
 
@@ -250,6 +278,54 @@ def verify_cert():
         time.sleep(1)
         return
     
-    verify_certificate(cert_path)
+    ca_cert = input("Enter path to the CA certificate (optional): ").strip() or None
+    hostname = input("Enter the RADIUS server name (optional): ").strip() or None
+    
+    verify_certificate(cert_path, ca_cert, hostname)
+    
+    input("\nPress Enter to continue...")
+
+def verify_connections():
+    """Test which enterprise connections can still authenticate."""
+    os.system('clear' if os.name == 'posix' else 'cls')
+    display_header("Verify Enterprise WiFi Connections")
+    
+    display_warning("Each adapter is disconnected while its profiles are tested, "
+                    "then reconnected to its previous network.")
+    if not input("\nContinue? (y/n): ").strip().lower().startswith('y'):
+        return
+    
+    results = verify_enterprise_profiles()
+    
+    if results:
+        print()
+        display_table(["Connection", "SSID", "Adapter", "Result", "Auth Time"],
+                      [[result["name"], result["ssid"] or "", result["device"] or "-",
+                        "OK" if result["ok"] else "FAILED",
+                        f"{result['latency']:.2f} s" if result["latency"] is not None else "-"]
+                       for result in results])
+        for result in results:
+            if not result["ok"]:
+                display_error(f"{result['name']}: {describe_failure(result)}")
+    else:
+        display_message("No enterprise WiFi connections configured.", color='yellow')
     
-    input("\nPress Enter to continue...")
\ No newline at end of file
+    input("\nPress Enter to continue...")
+
+def check_certificate_expiry():
+    """List the certificates of enterprise connections that expire soon."""
+    os.system('clear' if os.name == 'posix' else 'cls')
+    display_header("Certificate Expiry")
+    
+    report = certificate_expiry_report()
+    
+    if report:
+        print()
+        display_table(["Certificate", "Expires", "Days Left", "Connections"],
+                      [[item["path"], (item["not_after"] or "")[:10],
+                        item["days_left"] if item["error"] is None else item["error"],
+                        ", ".join(item["connections"])] for item in report])
+    else:
+        display_success("No enterprise connection certificates expire soon.")
+    
+    input("\nPress Enter to continue...")
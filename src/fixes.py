@@ -3,6 +3,11 @@ import time
 import subprocess
 import re
 from src.utils.command_runner import run_command, execute_with_sudo
+from src.driver_reload import reload_driver
+from src.utils.config_writer import read_config, write_config
+from src.driver_profiles import (
+    MODPROBE_CONF_PATH, get_module_parameters, parse_modprobe_options, merge_modprobe_options
+)
 from src.utils.ui_helpers import display_progress, display_message, display_success, display_error, display_warning
 
 def reset_adapter(adapter_info=None):
@@ -55,24 +60,23 @@ def restart_wpa_supplicant(adapter_info=None):
         display_error(f"Failed to restart wpa_supplicant service: {str(e)}")
         return False
 
-def configure_driver_parameters(adapter_info=None):
-    """Configure optimal driver parameters for the Intel Centrino Advanced-N 6205."""
+def configure_driver_parameters(adapter_info=None, module_parameters=None):
+    """Configure driver parameters, by default the ones recommended for the detected adapter."""
     try:
         display_message("Configuring driver parameters...", color='blue')
         
-        # Create or update the iwlwifi.conf file
-        config_content = "options iwlwifi 11n_disable=1 power_save=0"
+        # Merge the adapter's profile into iwlwifi.conf; options lines for modules
+        # the profile does not set are dropped, other lines are kept
+        if module_parameters is None:
+            module_parameters = get_module_parameters(adapter_info)
+        current_content = read_config(MODPROBE_CONF_PATH)
+        parameters = {module: {} for module in parse_modprobe_options(current_content)}
+        parameters.update(module_parameters)
         
-        # Check if the file exists
-        if os.path.exists("/etc/modprobe.d/iwlwifi.conf"):
-            # Read the current content
-            current_content = run_command(["cat", "/etc/modprobe.d/iwlwifi.conf"])
-            
-            # Only update if needed
-            if config_content not in current_content:
-                execute_with_sudo(["bash", "-c", f"echo '{config_content}' > /etc/modprobe.d/iwlwifi.conf"])
-        else:
-            execute_with_sudo(["bash", "-c", f"echo '{config_content}' > /etc/modprobe.d/iwlwifi.conf"])
+        # Only written if the merged content differs
+        if not write_config(MODPROBE_CONF_PATH, merge_modprobe_options(current_content, parameters)):
+            display_message("Driver parameters are already up to date.", color='green')
+            return True
         
         display_success("Driver parameters configured successfully.")
         display_message("Note: You may need to reboot for changes to take effect.", color='yellow')
@@ -116,8 +120,8 @@ def update_firmware(adapter_info=None):
             # Note: This URL might need to be updated if the firmware location changes
             firmware_url = "https://git.kernel.org/pub/scm/linux/kernel/git/firmware/linux-firmware.git/plain/iwlwifi-6000g2a-6.ucode"
             
-            # Create a temporary file for the download
-            temp_firmware_path = "/tmp/iwlwifi-6000g2a-6.ucode.new"
+            # Download next to the firmware; the helper only writes to root-owned directories
+            temp_firmware_path = f"{firmware_path}.new"
             
             try:
                 # Download to temporary location first
@@ -180,21 +184,20 @@ def update_firmware(adapter_info=None):
         display_error(f"Failed to update firmware: {str(e)}")
         return False
 
-def configure_driver(adapter_info=None):
+def configure_driver(adapter_info=None, module_parameters=None):
     """Configure the driver for optimal performance."""
     try:
         display_message("Configuring driver for optimal performance...", color='blue')
         
         # Configure driver parameters
-        configure_driver_parameters()
+        configure_driver_parameters(adapter_info, module_parameters)
         
-        # Reload the driver if possible
+        # Reload the driver if possible, restoring the active connections
         try:
             display_message("Attempting to reload the driver...", color='blue')
-            execute_with_sudo(["modprobe", "-r", "iwlwifi"])
-            time.sleep(1)
-            execute_with_sudo(["modprobe", "iwlwifi"])
-            display_success("Driver reloaded successfully.")
+            report = reload_driver(adapter_info)
+            if not report["success"]:
+                display_message("You may need to reboot for changes to take effect.", color='yellow')
         except Exception as e:
             display_warning(f"Could not reload driver: {str(e)}")
             display_message("You may need to reboot for changes to take effect.", color='yellow')
@@ -253,6 +256,33 @@ def scan_networks(adapter_info=None):
         display_error(f"Failed to scan for networks: {str(e)}")
         return []
 
+# Fix applied for each kind of issue: (issue substrings, fix function name)
+FIX_RULES = [
+    (("blocked by rfkill",), "unblock_rfkill"),
+    (("interface is down", "adapter is disconnected"), "reset_adapter"),
+    (("NetworkManager is not running",), "restart_network_manager"),
+    (("wpa_supplicant is not running", "authentication issues"), "restart_wpa_supplicant"),
+    (("11n mode is", "Power save mode is enabled", "Driver parameter"), "configure_driver_parameters"),
+    (("firmware version",), "update_firmware")
+]
+
+def plan_fixes(issues):
+    """
+    Decide which fix addresses each issue, without applying anything.
+    
+    Args:
+        issues: Issues reported by run_diagnostics
+        
+    Returns:
+        list: (issue, fix function name or None) tuples
+    """
+    plan = []
+    for issue in issues:
+        fix = next((name for patterns, name in FIX_RULES
+                    if any(pattern in issue for pattern in patterns)), None)
+        plan.append((issue, fix))
+    return plan
+
 def apply_all_fixes(issues, adapter_info=None):
     """Apply all necessary fixes based on identified issues."""
     if not issues:
@@ -261,27 +291,13 @@ def apply_all_fixes(issues, adapter_info=None):
     
     display_message("Applying fixes...", color='blue')
     
-    steps = len(issues)
-    for i, issue in enumerate(issues, 1):
+    plan = plan_fixes(issues)
+    steps = len(plan)
+    for i, (issue, fix) in enumerate(plan, 1):
         display_progress(f"Fixing: {issue}", steps, i)
         
-        if "blocked by rfkill" in issue:
-            unblock_rfkill(adapter_info)
-        
-        elif "interface is down" in issue or "adapter is disconnected" in issue:
-            reset_adapter(adapter_info)
-        
-        elif "NetworkManager is not running" in issue:
-            restart_network_manager(adapter_info)
-            
-        elif "wpa_supplicant is not running" in issue or "authentication issues" in issue:
-            restart_wpa_supplicant(adapter_info)
-        
-        elif "11n mode is enabled" in issue or "Power save mode is enabled" in issue:
-            configure_driver_parameters(adapter_info)
-        
-        elif "firmware version" in issue:
-            update_firmware(adapter_info)
+        if fix:
+            globals()[fix](adapter_info)
         
         time.sleep(1)
     
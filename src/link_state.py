@@ -0,0 +1,217 @@
+"""
+Link State Module
+
+This module collects the state of a wireless interface (addresses, driver,
+firmware, channel, frequency, bitrate and transmit power) into a single
+snapshot. It reads sysfs and issues ioctl/netlink requests directly, and
+only falls back to the iw command when nl80211 is not reachable.
+"""
+
+import fcntl
+import os
+import re
+import socket
+import struct
+from array import array
+from src.utils.command_runner import run_command
+from src.utils.netlink import NetlinkError, nl80211_link_info
+
+SIOCGIFADDR = 0x8915
+SIOCETHTOOL = 0x8946
+ETHTOOL_GDRVINFO = 0x00000003
+ETHTOOL_DRVINFO_SIZE = 196
+IFREQ_SIZE = 40
+IFF_UP = 0x1
+
+def freq_to_channel(freq):
+    """
+    Convert a frequency in MHz to a WiFi channel number.
+
+    Args:
+        freq: The frequency in MHz
+
+    Returns:
+        int: The channel number, or None if the frequency is not recognised
+    """
+    if freq is None:
+        return None
+    if freq == 2484:
+        return 14
+    if 2412 <= freq <= 2472:
+        return (freq - 2407) // 5
+    if 5150 <= freq <= 5895:
+        return (freq - 5000) // 5
+    if 5955 <= freq <= 7115:
+        return (freq - 5950) // 5
+    return None
+
+def _read_sysfs(interface, name):
+    try:
+        with open(f"/sys/class/net/{interface}/{name}") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _ifreq_name(interface):
+    return struct.pack("16s", interface.encode()[:15])
+
+def _ethtool_drvinfo(sock, interface):
+    """Return (driver, firmware) using the ETHTOOL_GDRVINFO ioctl."""
+    buf = array('B', struct.pack("I", ETHTOOL_GDRVINFO) + b"\0" * (ETHTOOL_DRVINFO_SIZE - 4))
+    address, _ = buf.buffer_info()
+    ifreq = _ifreq_name(interface) + struct.pack("P", address)
+    fcntl.ioctl(sock.fileno(), SIOCETHTOOL, ifreq + b"\0" * (IFREQ_SIZE - len(ifreq)))
+
+    raw = buf.tobytes()
+    driver = raw[4:36].split(b"\0", 1)[0].decode()
+    firmware = raw[68:100].split(b"\0", 1)[0].decode()
+    return driver or None, firmware or None
+
+def _ipv4_address(sock, interface):
+    """Return the primary IPv4 address using the SIOCGIFADDR ioctl."""
+    ifreq = _ifreq_name(interface) + b"\0" * (IFREQ_SIZE - 16)
+    try:
+        result = fcntl.ioctl(sock.fileno(), SIOCGIFADDR, ifreq)
+    except OSError:
+        # EADDRNOTAVAIL when no address is assigned
+        return None
+    return socket.inet_ntoa(result[20:24])
+
+def _iw_link_info(interface):
+    """Fallback for nl80211_link_info that parses iw output."""
+    info = {}
+
+    link = run_command(["iw", "dev", interface, "link"])
+    if link and "Not connected" not in link:
+        ssid_match = re.search(r"SSID: (.+)", link)
+        if ssid_match:
+            info["ssid"] = ssid_match.group(1).strip()
+        freq_match = re.search(r"freq: ([\d.]+)", link)
+        if freq_match:
+            info["frequency"] = int(float(freq_match.group(1)))
+        signal_match = re.search(r"signal: (-?\d+) dBm", link)
+        if signal_match:
+            info["signal"] = int(signal_match.group(1))
+        rate_match = re.search(r"tx bitrate: ([\d.]+) MBit/s", link)
+        if rate_match:
+            info["bitrate"] = float(rate_match.group(1))
+
+    dev_info = run_command(["iw", "dev", interface, "info"])
+    if dev_info:
+        power_match = re.search(r"txpower ([\d.]+) dBm", dev_info)
+        if power_match:
+            info["tx_power"] = float(power_match.group(1))
+        if "frequency" not in info:
+            chan_match = re.search(r"channel \d+ \((\d+) MHz\)", dev_info)
+            if chan_match:
+                info["frequency"] = int(chan_match.group(1))
+
+    return info
+
+def get_static_info(interface="wlan0"):
+    """
+    Collect the facts about an interface that do not change while it exists.
+
+    Args:
+        interface: The interface name
+
+    Returns:
+        dict: mac, driver and firmware; unknown values are None
+    """
+    info = {
+        "mac": _read_sysfs(interface, "address"),
+        "driver": None,
+        "firmware": None
+    }
+
+    driver_link = f"/sys/class/net/{interface}/device/driver"
+    if os.path.islink(driver_link):
+        info["driver"] = os.path.basename(os.readlink(driver_link))
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        driver, firmware = _ethtool_drvinfo(sock, interface)
+        info["driver"] = info["driver"] or driver
+        info["firmware"] = firmware
+    except OSError:
+        pass
+    finally:
+        sock.close()
+
+    return info
+
+def get_address(interface="wlan0"):
+    """Return the primary IPv4 address of an interface, or None."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        return _ipv4_address(sock, interface)
+    finally:
+        sock.close()
+
+def get_wireless_info(interface="wlan0"):
+    """
+    Query the wireless link of an interface over nl80211, falling back to iw.
+
+    Args:
+        interface: The wireless interface name
+
+    Returns:
+        dict: Any of ssid, frequency, bitrate, tx_power and signal that are known
+    """
+    if not os.path.exists(f"/sys/class/net/{interface}/phy80211"):
+        # Not a wireless interface
+        return {}
+
+    try:
+        return nl80211_link_info(interface)
+    except (OSError, NetlinkError):
+        try:
+            return _iw_link_info(interface)
+        except OSError:
+            return {}
+
+def get_link_state(interface="wlan0"):
+    """
+    Collect a snapshot of the interface and its wireless link.
+
+    Args:
+        interface: The wireless interface name
+
+    Returns:
+        dict: interface, exists, up, operstate, mac, driver, firmware, ipv4,
+              ssid, frequency (MHz), channel, bitrate (Mb/s), tx_power (dBm)
+              and signal (dBm); unknown values are None
+    """
+    state = {
+        "interface": interface,
+        "exists": os.path.isdir(f"/sys/class/net/{interface}"),
+        "up": False,
+        "operstate": None,
+        "mac": None,
+        "driver": None,
+        "firmware": None,
+        "ipv4": None,
+        "ssid": None,
+        "frequency": None,
+        "channel": None,
+        "bitrate": None,
+        "tx_power": None,
+        "signal": None
+    }
+
+    if not state["exists"]:
+        return state
+
+    state.update(get_static_info(interface))
+    state["operstate"] = _read_sysfs(interface, "operstate")
+    flags = _read_sysfs(interface, "flags")
+    state["up"] = bool(flags and int(flags, 16) & IFF_UP)
+    state["ipv4"] = get_address(interface)
+
+    link = get_wireless_info(interface)
+    for key in ("ssid", "frequency", "bitrate", "tx_power", "signal"):
+        if link.get(key) is not None:
+            state[key] = link[key]
+    state["channel"] = freq_to_channel(state["frequency"])
+
+    return state
@@ -0,0 +1,289 @@
+"""
+Multi-Uplink Load Balancing Module
+
+This module spreads traffic across several wireless uplinks (e.g. two radios
+associated to different access points) with an ECMP default route. Each
+uplink gets its own routing table and a source rule, so replies leave through
+the interface that owns the address. The kernel schedules flows across the
+next hops by a layer-4 hash, which keeps each flow on one radio while
+aggregate throughput scales with the number of uplinks.
+
+Next-hop weights follow live measurements: each uplink is scored by its link
+bitrate (or measured throughput) divided by its smoothed RTT, and the
+multipath route is only rewritten when the resulting weights change.
+"""
+
+import re
+import time
+import socket
+import threading
+from src.utils.command_runner import run_command, execute_batch_with_sudo
+from src.utils.ui_helpers import display_error, display_warning
+from src.link_state import get_address, get_wireless_info
+
+# Per-uplink routing tables and rule priorities
+TABLE_BASE = 200
+RULE_PRIORITY_BASE = 1000
+
+MAX_WEIGHT = 16
+# Hash flows on addresses and ports so different flows can take different radios
+MULTIPATH_HASH_POLICY = "net.ipv4.fib_multipath_hash_policy=1"
+
+PROBE_TARGET = ("1.1.1.1", 53)
+
+def read_interface_bytes(interface):
+    """Return the (tx, rx) byte counters of an interface, or None."""
+    try:
+        with open(f"/sys/class/net/{interface}/statistics/tx_bytes") as f:
+            tx = int(f.read())
+        with open(f"/sys/class/net/{interface}/statistics/rx_bytes") as f:
+            rx = int(f.read())
+        return tx, rx
+    except (OSError, ValueError):
+        return None
+
+def find_gateway(interface):
+    """Return the IPv4 default gateway reachable through an interface, or None."""
+    # Matches plain default routes as well as the next hops of a multipath route
+    output = run_command(["ip", "-4", "route", "show", "default"])
+    match = re.search(rf"via ([\d.]+) dev {re.escape(interface)}\b", output or "")
+    return match.group(1) if match else None
+
+def measure_rtt(source_address, target=PROBE_TARGET, timeout=2.0):
+    """
+    Measure the TCP connect time to a target from a source address.
+
+    The source rules route the probe out of the uplink owning the address.
+
+    Returns:
+        float: The RTT in milliseconds, or None if the target was unreachable
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.bind((source_address, 0))
+        started = time.perf_counter()
+        sock.connect(target)
+        return (time.perf_counter() - started) * 1000
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+def compute_weights(scores, max_weight=MAX_WEIGHT):
+    """
+    Turn uplink scores into integer next-hop weights.
+
+    Returns:
+        list: Weights between 1 and max_weight, proportional to the scores;
+              uplinks without a score get the minimum weight
+    """
+    best = max((score for score in scores if score), default=0)
+    if not best:
+        return [1] * len(scores)
+    return [max(1, round(max_weight * score / best)) if score else 1 for score in scores]
+
+class Uplink:
+    """One interface taking part in load balancing."""
+
+    def __init__(self, interface, gateway, address, table):
+        self.interface = interface
+        self.gateway = gateway
+        self.address = address
+        self.table = table
+        self.weight = 1
+        self.rtt = None
+        self.capacity = None
+        self.peak_mbps = 0.0
+        self.tx_mbps = 0.0
+        self.rx_mbps = 0.0
+        self._counters = None
+
+    def score(self):
+        capacity = self.capacity or self.peak_mbps
+        if not capacity or not self.rtt:
+            return None
+        return capacity / self.rtt
+
+class LoadBalancer:
+    """Programs and maintains an ECMP default route over several uplinks."""
+
+    def __init__(self, interfaces, interval=5.0, alpha=0.3, probe_target=PROBE_TARGET):
+        """
+        Args:
+            interfaces: The uplink interface names
+            interval: Seconds between weight updates
+            alpha: Smoothing factor for RTT measurements
+            probe_target: (address, port) used for RTT probes
+        """
+        self.interfaces = list(interfaces)
+        self.interval = interval
+        self.alpha = alpha
+        self.probe_target = probe_target
+        self.uplinks = []
+        self.updated = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def discover(self):
+        """Find the gateway and address of each interface; returns the usable uplinks."""
+        uplinks = []
+        for index, interface in enumerate(self.interfaces):
+            gateway = find_gateway(interface)
+            address = get_address(interface)
+            if not gateway or not address:
+                display_warning(f"{interface} has no address or default gateway; skipping it.")
+                continue
+            uplinks.append(Uplink(interface, gateway, address, TABLE_BASE + index))
+        self.uplinks = uplinks
+        return uplinks
+
+    def measure(self):
+        """Update RTT, capacity and throughput of every uplink."""
+        now = time.monotonic()
+        for uplink in self.uplinks:
+            rtt = measure_rtt(uplink.address, self.probe_target)
+            if rtt is not None:
+                uplink.rtt = rtt if uplink.rtt is None else self.alpha * rtt + (1 - self.alpha) * uplink.rtt
+
+            bitrate = get_wireless_info(uplink.interface).get("bitrate")
+            if bitrate:
+                uplink.capacity = bitrate
+
+            counters = read_interface_bytes(uplink.interface)
+            if counters and uplink._counters:
+                elapsed = max(now - uplink._counters[0], 1e-6)
+                uplink.tx_mbps = (counters[0] - uplink._counters[1][0]) * 8 / elapsed / 1e6
+                uplink.rx_mbps = (counters[1] - uplink._counters[1][1]) * 8 / elapsed / 1e6
+                uplink.peak_mbps = max(uplink.peak_mbps, uplink.tx_mbps + uplink.rx_mbps)
+            if counters:
+                uplink._counters = (now, counters)
+
+    def _multipath_route(self, action="replace"):
+        command = ["ip", "route", action, "default", "scope", "global"]
+        for uplink in self.uplinks:
+            command.extend(["nexthop", "via", uplink.gateway, "dev", uplink.interface,
+                            "weight", str(uplink.weight)])
+        return command
+
+    def apply(self):
+        """
+        Program source routing for each uplink and the weighted multipath route.
+
+        Returns:
+            bool: True if the routes were programmed
+        """
+        if len(self.uplinks) < 2:
+            display_error("At least two uplinks with a gateway are required for load balancing.")
+            return False
+
+        commands = [["sysctl", "-w", MULTIPATH_HASH_POLICY]]
+        for index, uplink in enumerate(self.uplinks):
+            commands.append(["ip", "route", "replace", "default", "via", uplink.gateway,
+                             "dev", uplink.interface, "table", str(uplink.table)])
+            # Replace rather than stack rules on repeated runs
+            commands.append(["ip", "rule", "del", "priority", str(RULE_PRIORITY_BASE + index)])
+            commands.append(["ip", "rule", "add", "from", uplink.address, "table", str(uplink.table),
+                             "priority", str(RULE_PRIORITY_BASE + index)])
+        commands.append(self._multipath_route())
+
+        outputs = execute_batch_with_sudo(commands, stop_on_error=False)
+        # Deleting a rule that does not exist yet is expected to fail
+        failed = [command for command, output in zip(commands, outputs)
+                  if output is None and command[:3] != ["ip", "rule", "del"]]
+        for command in failed:
+            display_error(f"Could not run: {' '.join(command)}")
+        return not failed
+
+    def update(self):
+        """
+        Measure the uplinks and reweight the multipath route if needed.
+
+        Returns:
+            bool: True if the weights changed
+        """
+        self.measure()
+        with self._lock:
+            weights = compute_weights([uplink.score() for uplink in self.uplinks])
+            changed = weights != [uplink.weight for uplink in self.uplinks]
+            for uplink, weight in zip(self.uplinks, weights):
+                uplink.weight = weight
+            self.updated = time.time()
+
+        if changed:
+            execute_batch_with_sudo([self._multipath_route()])
+        return changed
+
+    def start(self):
+        """Discover the uplinks, program the routes and keep the weights updated in the background."""
+        if not self.uplinks:
+            self.discover()
+        self.measure()
+        if not self.apply():
+            return False
+        if self._thread and self._thread.is_alive():
+            return True
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.update()
+            except Exception as e:
+                display_warning(f"Load balancer update failed: {str(e)}")
+
+    def stop(self, restore=True):
+        """
+        Stop updating the weights.
+
+        Args:
+            restore: Remove the multipath route, source rules and tables, so
+                     NetworkManager's own default routes take effect again
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if not restore or not self.uplinks:
+            return
+
+        # Delete exactly the route we installed (with its current weights); a
+        # replacement default route would be static and outrank NetworkManager's
+        commands = [self._multipath_route("del")]
+        for index, uplink in enumerate(self.uplinks):
+            commands.append(["ip", "rule", "del", "priority", str(RULE_PRIORITY_BASE + index)])
+            commands.append(["ip", "route", "flush", "table", str(uplink.table)])
+        execute_batch_with_sudo(commands, stop_on_error=False)
+
+    def status(self):
+        """
+        Report the state of each uplink.
+
+        Returns:
+            list: dicts with interface, gateway, weight, share (percent of new
+                  flows), rtt_ms, capacity_mbps, tx_mbps, rx_mbps and
+                  utilization (percent of capacity)
+        """
+        with self._lock:
+            total_weight = sum(uplink.weight for uplink in self.uplinks) or 1
+            report = []
+            for uplink in self.uplinks:
+                capacity = uplink.capacity or uplink.peak_mbps
+                throughput = uplink.tx_mbps + uplink.rx_mbps
+                report.append({
+                    "interface": uplink.interface,
+                    "gateway": uplink.gateway,
+                    "weight": uplink.weight,
+                    "share": 100.0 * uplink.weight / total_weight,
+                    "rtt_ms": uplink.rtt,
+                    "capacity_mbps": capacity or None,
+                    "tx_mbps": uplink.tx_mbps,
+                    "rx_mbps": uplink.rx_mbps,
+                    "utilization": 100.0 * throughput / capacity if capacity else None
+                })
+            return report
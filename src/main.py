@@ -3,45 +3,33 @@ import os
 import sys
 import time
 from src.adapter_info import AdapterInfo
-from src.diagnostics import run_diagnostics, gather_diagnostics, display_diagnostics
-from src.fixes import apply_all_fixes, update_firmware, configure_driver, scan_networks
+from src.status_service import StatusService
 from src.utils.ui_helpers import (
     display_banner, get_user_choice, display_message, 
     display_header, display_success, display_error, display_warning,
-    display_footer, display_menu, display_about, clear_screen, display_table
+    display_footer, display_menu, display_about, clear_screen, display_table, stream_table
 )
 
-# Import optional modules
-try:
-    from src.enterprise_wifi_ui import enterprise_wifi_menu
-except ImportError:
-    enterprise_wifi_menu = None
-
-try:
-    from src.regulatory_ui import regulatory_domain_menu
-except ImportError:
-    regulatory_domain_menu = None
-
-try:
-    from src.captive_portal_ui import captive_portal_menu
-except ImportError:
-    captive_portal_menu = None
-
-try:
-    from src.troubleshooting_ui import troubleshooting_menu
-except ImportError:
-    troubleshooting_menu = None
-
-try:
-    from src.multi_connection_ui import multi_connection_menu
-except ImportError:
-    multi_connection_menu = None
+# Diagnostics, fixes and the subsystem menus (see src.plugins) are imported on
+# first use so the main menu appears without loading modules most runs never touch.
+# Scan results table: content widths of each column and rows per page
+SCAN_COLUMN_WIDTHS = [3, 23, 10, 17, 7, 7, 10]
+SCAN_PAGE_SIZE = 30
 
 def main_menu():
     """Display the main menu and handle user input."""
+    adapter_info = AdapterInfo()
+    # Keeps the status current in the background so redraws never wait on nmcli
+    status_service = StatusService(adapter_info)
+    status_service.start()
+    try:
+        _main_menu_loop(adapter_info, status_service)
+    finally:
+        status_service.stop()
+
+def _main_menu_loop(adapter_info, status_service):
     while True:
-        adapter_info = AdapterInfo()
-        status = adapter_info.retrieve_status()
+        status = status_service.status()
         
         # Define menu options
         menu_options = [
@@ -49,6 +37,7 @@ def main_menu():
             ('2', 'Fix Common Issues'),
             ('3', 'Advanced Options'),
             ('4', 'Scan for Networks'),
+            ('d', 'Live Dashboard'),
             ('a', 'About'),
             ('q', 'Quit')
         ]
@@ -61,11 +50,12 @@ def main_menu():
         print(f"\n  {'Detected Adapter:':<20} {adapter_info.adapter_name}")
         
         # Display connection status with color
-        if 'connected' in status:
-            print(f"  {'Status:':<20} ", end='')
+        print(f"  {'Status:':<20} ", end='')
+        if status is None:
+            display_message("Checking...", color='yellow')
+        elif status == 'connected':
             display_message("Connected", color='green')
         else:
-            print(f"  {'Status:':<20} ", end='')
             display_message("Disconnected", color='red')
         
         # Display the menu and get user choice
@@ -79,6 +69,10 @@ def main_menu():
             advanced_options_menu(adapter_info)
         elif choice == '4':
             scan_networks_menu(adapter_info)
+        elif choice == 'd':
+            from src.dashboard import run_dashboard
+            if not run_dashboard(adapter_info):
+                input("\nPress Enter to continue...")
         elif choice == 'a':
             display_about()
         elif choice == 'q':
@@ -92,6 +86,9 @@ def main_menu():
 
 def run_diagnostics_menu(adapter_info):
     """Run diagnostics and display results."""
+    from src.diagnostics import run_diagnostics, gather_diagnostics
+    from src.fixes import apply_all_fixes
+    
     clear_screen()
     display_banner()
     display_header("Running Diagnostics")
@@ -168,6 +165,9 @@ def run_diagnostics_menu(adapter_info):
 
 def fix_issues_menu(adapter_info):
     """Menu for fixing common issues."""
+    from src.diagnostics import run_diagnostics
+    from src.fixes import apply_all_fixes, update_firmware, configure_driver
+    
     while True:
         # Define menu options
         menu_options = [
@@ -176,6 +176,7 @@ def fix_issues_menu(adapter_info):
             ('3', 'Configure Driver Parameters'),
             ('4', 'Restart wpa_supplicant Service'),
             ('5', 'Scan for Networks'),
+            ('6', 'Auto-Tune Driver Parameters'),
             ('b', 'Back to Main Menu')
         ]
         
@@ -207,6 +208,22 @@ def fix_issues_menu(adapter_info):
             input("\nPress Enter to continue...")
         elif choice == '5':
             scan_networks_menu(adapter_info)
+        elif choice == '6':
+            clear_screen()
+            display_header("Auto-Tuning Driver Parameters")
+            from src.autotune import DriverTuner
+            from src.benchmark import DEFAULT_PORT
+            host = input("Benchmark server address: ").strip()
+            if host:
+                port = input(f"Benchmark server port [{DEFAULT_PORT}]: ").strip()
+                tuner = DriverTuner(host, int(port) if port.isdigit() else DEFAULT_PORT, adapter_info)
+                outcome = tuner.run()
+                if outcome:
+                    print(f"\nBest parameters after {len(outcome['trials'])} trials:")
+                    for module, params in outcome["best"]["parameters"].items():
+                        for key, value in params.items():
+                            print(f"  {module}.{key} = {value}")
+            input("\nPress Enter to continue...")
         elif choice == 'b':
             return
         else:
@@ -215,68 +232,62 @@ def fix_issues_menu(adapter_info):
 
 def advanced_options_menu(adapter_info):
     """Menu for advanced options."""
+    from src.plugins import get_registry, PluginLoadError
+    
+    registry = get_registry()
     while True:
-        # Define menu options
-        menu_options = [
-            ('1', 'Configure Enterprise WiFi'),
-            ('2', 'Manage Multiple Connections'),
-            ('3', 'Set Regulatory Domain'),
-            ('4', 'Handle Captive Portal'),
-            ('5', 'Advanced Troubleshooting'),
-            ('b', 'Back to Main Menu')
-        ]
+        # Subsystem menus come from the plugin registry; none is imported until selected
+        menu_options = [(plugin.key, plugin.title) for plugin in registry.plugins()]
+        menu_options.append(('b', 'Back to Main Menu'))
         
         # Display the menu and get user choice
         choice = display_menu("Advanced Options", menu_options)
+        plugin = registry.get(choice)
         
-        if choice == '1':
-            if enterprise_wifi_menu:
-                enterprise_wifi_menu()
-            else:
-                clear_screen()
-                display_header("Enterprise WiFi Configuration")
-                display_error("Enterprise WiFi module not found.")
-                input("\nPress Enter to continue...")
-        elif choice == '2':
-            if multi_connection_menu:
-                multi_connection_menu()
-            else:
-                clear_screen()
-                display_header("Multiple Connection Management")
-                display_error("Multi-connection management module not found.")
-                input("\nPress Enter to continue...")
-        elif choice == '3':
-            if regulatory_domain_menu:
-                regulatory_domain_menu()
-            else:
-                clear_screen()
-                display_header("Regulatory Domain Configuration")
-                display_error("Regulatory domain module not found.")
-                input("\nPress Enter to continue...")
-        elif choice == '4':
-            if captive_portal_menu:
-                captive_portal_menu()
-            else:
-                clear_screen()
-                display_header("Captive Portal Handling")
-                display_error("Captive portal module not found.")
-                input("\nPress Enter to continue...")
-        elif choice == '5':
-            if troubleshooting_menu:
-                troubleshooting_menu()
-            else:
+        if plugin:
+            try:
+                menu = plugin.load()
+            except PluginLoadError as e:
                 clear_screen()
-                display_header("Advanced Troubleshooting")
-                display_error("Advanced troubleshooting module not found.")
+                display_header(plugin.title)
+                display_error(str(e))
                 input("\nPress Enter to continue...")
+                continue
+            menu()
         elif choice == 'b':
             return
         else:
             display_error("Invalid option. Please try again.")
             time.sleep(1)
 
+def network_rows(networks):
+    """Yield scan results as table rows."""
+    for i, network in enumerate(networks):
+        # Format signal strength with color indicators
+        signal_strength = int(network['signal_strength']) if network['signal_strength'].isdigit() else 0
+        if signal_strength >= 70:
+            signal_quality = "Excellent"
+        elif signal_strength >= 50:
+            signal_quality = "Good"
+        elif signal_strength >= 30:
+            signal_quality = "Fair"
+        else:
+            signal_quality = "Poor"
+        
+        yield [
+            i+1,
+            network['ssid'],
+            network['security'],
+            f"{network['signal']} ({signal_quality})",
+            network['channel'],
+            network['band'],
+            network['speed']
+        ]
+
 def scan_networks_menu(adapter_info):
     """Scan for available WiFi networks."""
+    from src.fixes import scan_networks
+    
     clear_screen()
     display_banner()
     display_header("Scanning for Networks")
@@ -288,39 +299,10 @@ def scan_networks_menu(adapter_info):
         # Find the network with the strongest signal for recommendation
         strongest_network = max(networks, key=lambda x: int(x.get('signal_strength', 0)) if x.get('signal_strength', '').isdigit() else 0)
         
-        # Prepare data for table display
+        # Rows are formatted as they are printed, a page at a time
         headers = ["#", "SSID", "Security", "Signal", "Channel", "Band", "Speed"]
-        data = []
-        
-        for i, network in enumerate(networks):
-            # Truncate SSID if too long
-            ssid = network['ssid'][:20] + "..." if len(network['ssid']) > 23 else network['ssid']
-            
-            # Format signal strength with color indicators
-            signal_strength = int(network['signal_strength']) if network['signal_strength'].isdigit() else 0
-            signal_quality = ""
-            if signal_strength >= 70:
-                signal_quality = "Excellent"
-            elif signal_strength >= 50:
-                signal_quality = "Good"
-            elif signal_strength >= 30:
-                signal_quality = "Fair"
-            else:
-                signal_quality = "Poor"
-                
-            # Add row to data
-            data.append([
-                i+1,
-                ssid,
-                network['security'][:10],
-                f"{network['signal']} ({signal_quality})",
-                network['channel'],
-                network['band'],
-                network['speed']
-            ])
-        
         print("\n")
-        display_table(headers, data)
+        stream_table(headers, network_rows(networks), widths=SCAN_COLUMN_WIDTHS, page_size=SCAN_PAGE_SIZE)
         
         # Display recommendation
         recommended = f"{strongest_network['ssid']} (Ch {strongest_network['channel']})"
@@ -358,12 +340,21 @@ def scan_networks_menu(adapter_info):
 
 def main():
     """Main entry point for the application."""
+    # Any arguments select a scriptable subcommand instead of the menus
+    if len(sys.argv) > 1:
+        from src.cli import run
+        sys.exit(run(sys.argv[1:]))
+    
     try:
-        # Check if running with sudo/admin privileges
+        # Without root, start the privileged helper once for the whole session
         if os.geteuid() != 0:
-            display_error("This program requires administrative privileges.")
-            display_message("Please run with sudo or as administrator.", color='yellow')
-            sys.exit(1)
+            from src.utils.privileged_helper import get_helper, HelperError
+            try:
+                get_helper().start()
+            except HelperError as e:
+                display_error(f"This program requires administrative privileges: {str(e)}")
+                display_message("Please run with sudo or as administrator.", color='yellow')
+                sys.exit(1)
         
         main_menu()
     except KeyboardInterrupt:
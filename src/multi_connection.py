@@ -9,8 +9,16 @@ import os
 import re
 import time
 import subprocess
-from utils.command_runner import run_command, execute_with_sudo
-from utils.ui_helpers import display_message, display_success, display_error, display_warning
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.command_runner import run_command, execute_with_sudo
+from src.utils.config_writer import write_config
+from src.utils.ui_helpers import display_message, display_success, display_error, display_warning
+
+# Concurrent nmcli processes for bulk operations
+MAX_BULK_WORKERS = 8
+
+# The LoadBalancer started by configure_load_balancing
+_load_balancer = None
 
 def list_connections():
     """
@@ -155,16 +163,133 @@ def delete_connection(connection_name):
         display_error(f"Error deleting connection: {str(e)}")
         return False
 
+def connection_devices():
+    """
+    Get every configured connection (of any type) and its device in one query.
+    
+    Returns:
+        dict: Device names keyed by connection name ("" for inactive connections)
+    """
+    output = run_command(["nmcli", "-t", "-f", "NAME,DEVICE", "connection", "show"])
+    
+    devices = {}
+    for line in (output or "").splitlines():
+        # Terse output escapes colons inside fields as "\:"
+        fields = [field.replace("\\:", ":") for field in re.split(r"(?<!\\):", line)]
+        if len(fields) >= 2:
+            devices[fields[0]] = fields[1]
+    return devices
+
+def run_bulk(operations, max_workers=MAX_BULK_WORKERS):
+    """
+    Run independent nmcli operations concurrently with a bounded pool.
+    
+    Args:
+        operations: A list of (name, command) tuples; command may be None to
+                    record the item as skipped
+        max_workers: The maximum number of concurrent nmcli processes
+        
+    Returns:
+        list: One result dict (name, ok, status, output) per operation, in order
+    """
+    def run(operation):
+        name, command = operation
+        if command is None:
+            return {"name": name, "ok": True, "status": "skipped", "output": None}
+        try:
+            output = execute_with_sudo(command)
+        except Exception as e:
+            return {"name": name, "ok": False, "status": "error", "output": str(e)}
+        if output is None:
+            return {"name": name, "ok": False, "status": "failed", "output": None}
+        return {"name": name, "ok": True, "status": "done", "output": output}
+    
+    if not operations:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(operations))) as executor:
+        return list(executor.map(run, operations))
+
+def bulk_add_connections(profiles, max_workers=MAX_BULK_WORKERS):
+    """
+    Create many WiFi connection profiles at once.
+    
+    Args:
+        profiles: A list of dicts with name and ssid, and optionally psk,
+                  device and settings (extra nmcli property/value pairs)
+        max_workers: The maximum number of concurrent nmcli processes
+        
+    Returns:
+        list: One result dict per profile; existing profiles are skipped
+    """
+    existing = connection_devices()
+    operations = []
+    for profile in profiles:
+        if profile["name"] in existing:
+            operations.append((profile["name"], None))
+            continue
+        command = ["nmcli", "connection", "add", "type", "wifi", "con-name", profile["name"],
+                   "ifname", profile.get("device") or "*", "ssid", profile["ssid"]]
+        if profile.get("psk"):
+            command.extend(["wifi-sec.key-mgmt", "wpa-psk", "wifi-sec.psk", profile["psk"]])
+        for key, value in profile.get("settings", {}).items():
+            command.extend([key, str(value)])
+        operations.append((profile["name"], command))
+    return run_bulk(operations, max_workers)
+
+def bulk_activate_connections(connection_names, device=None, max_workers=MAX_BULK_WORKERS):
+    """Activate several connections concurrently (each on its own device)."""
+    operations = []
+    for name in connection_names:
+        command = ["nmcli", "connection", "up", name]
+        if device:
+            command.extend(["ifname", device])
+        operations.append((name, command))
+    return run_bulk(operations, max_workers)
+
+def bulk_deactivate_connections(connection_names, max_workers=MAX_BULK_WORKERS):
+    """Deactivate several connections concurrently."""
+    return run_bulk([(name, ["nmcli", "connection", "down", name]) for name in connection_names],
+                    max_workers)
+
+def bulk_delete_connections(connection_names, max_workers=MAX_BULK_WORKERS):
+    """Delete several connections concurrently."""
+    return run_bulk([(name, ["nmcli", "connection", "delete", name]) for name in connection_names],
+                    max_workers)
+
+def report_bulk_results(results, action):
+    """
+    Display the outcome of a bulk operation.
+    
+    Returns:
+        bool: True if every item succeeded
+    """
+    failed = [result["name"] for result in results if not result["ok"]]
+    skipped = [result["name"] for result in results if result["status"] == "skipped"]
+    done = len(results) - len(failed) - len(skipped)
+    
+    if done:
+        display_success(f"{action} {done} connection(s).")
+    if skipped:
+        display_message(f"Skipped (already present): {', '.join(skipped)}", color='yellow')
+    if failed:
+        display_error(f"Failed: {', '.join(failed)}")
+    return not failed
+
 def configure_load_balancing(connections):
     """
     Configure load balancing between multiple WiFi connections.
     
+    Each connection must be active on its own radio. Traffic is spread over
+    them with a weighted multipath default route that is kept up to date in
+    the background (see load_balancer.LoadBalancer).
+    
     Args:
         connections: A list of connection names to load balance
         
     Returns:
         bool: True if load balancing was configured successfully, False otherwise
     """
+    global _load_balancer
     try:
         if len(connections) < 2:
             display_error("At least two connections are required for load balancing.")
@@ -172,59 +297,65 @@ def configure_load_balancing(connections):
         
         display_message(f"Configuring load balancing for {', '.join(connections)}...", color='blue')
         
-        # Create a bond interface
-        bond_name = "wifi-bond"
-        
-        # Check if the bond already exists
-        bond_exists = run_command(["ip", "link", "show", bond_name])
-        
-        if not bond_exists:
-            # Create the bond interface
-            result = execute_with_sudo([
-                "nmcli", "connection", "add", "type", "bond", "con-name", bond_name, 
-                "ifname", bond_name, "bond.options", "mode=balance-rr"
-            ])
-            
-            if not result:
-                display_error("Failed to create bond interface.")
-                return False
-        
-        # Add each connection to the bond
+        # Each connection needs its own active device
+        devices = connection_devices()
+        interfaces = []
         for conn in connections:
-            # Get the device for this connection
-            conn_details = get_connection_details(conn)
-            device = conn_details.get("GENERAL.DEVICES", "wlan0")
-            
-            # Create a bond slave connection
-            slave_name = f"{conn}-bond-slave"
-            
-            # Check if the slave already exists
-            slave_exists = run_command(["nmcli", "connection", "show", slave_name])
-            
-            if not slave_exists:
-                result = execute_with_sudo([
-                    "nmcli", "connection", "add", "type", "bond-slave", "con-name", slave_name,
-                    "ifname", device, "master", bond_name
-                ])
-                
-                if not result:
-                    display_error(f"Failed to add {conn} to bond.")
+            device = devices.get(conn)
+            if not device:
+                display_error(f"Connection {conn} is not active. Activate it first.")
+                return False
+            if device in interfaces:
+                display_error(f"Connections share the device {device}; each uplink needs its own radio.")
+                return False
+            interfaces.append(device)
+        
+        # Interfaces on one radio must be a combination it supports, and share its airtime
+        from src.phy_capabilities import get_phy
+        radios = {}
+        for interface in interfaces:
+            phy = get_phy(interface)
+            if phy:
+                radios.setdefault(phy.name, (phy, []))[1].append(interface)
+        for phy, members in radios.values():
+            if len(members) > 1:
+                if not phy.can_run(["managed"] * len(members), channels=len(members)):
+                    display_error(f"{', '.join(members)} share the radio {phy.name}, which cannot run "
+                                  f"{len(members)} client interfaces on separate channels.")
                     return False
+                display_warning(f"{', '.join(members)} share the radio {phy.name} and will split its airtime.")
         
-        # Activate the bond
-        result = execute_with_sudo(["nmcli", "connection", "up", bond_name])
+        if _load_balancer is not None:
+            _load_balancer.stop(restore=False)
         
-        if result:
-            display_success("Load balancing configured successfully.")
-            return True
-        else:
-            display_error("Failed to activate load balancing.")
+        from src.load_balancer import LoadBalancer
+        balancer = LoadBalancer(interfaces)
+        if not balancer.start():
+            display_error("Failed to configure load balancing.")
             return False
+        
+        _load_balancer = balancer
+        display_success("Load balancing configured successfully.")
+        return True
             
     except Exception as e:
         display_error(f"Error configuring load balancing: {str(e)}")
         return False
 
+def get_load_balancer():
+    """Return the running load balancer, or None."""
+    return _load_balancer
+
+def stop_load_balancing():
+    """Stop load balancing and route everything through the first uplink again."""
+    global _load_balancer
+    if _load_balancer is None:
+        return False
+    _load_balancer.stop()
+    _load_balancer = None
+    display_success("Load balancing stopped.")
+    return True
+
 def configure_failover(primary_connection, backup_connection):
     """
     Configure failover between a primary and backup WiFi connection.
@@ -318,12 +449,8 @@ while true; do
 done
 """
         
-        # Write the script to a file
-        with open(script_path, 'w') as f:
-            f.write(script_content)
-        
-        # Make the script executable
-        os.chmod(script_path, 0o755)
+        # Write the script to a file and make it executable
+        write_config(script_path, script_content, mode=0o755)
         
         # Create a systemd service to run the script
         service_path = "/etc/systemd/system/wifi-failover.service"
@@ -341,11 +468,9 @@ User=root
 WantedBy=multi-user.target
 """
         
-        # Write the service file
-        execute_with_sudo(["bash", "-c", f"echo '{service_content}' > {service_path}"])
-        
-        # Reload systemd
-        execute_with_sudo(["systemctl", "daemon-reload"])
+        # Write the service file, reloading systemd only if it changed
+        if write_config(service_path, service_content):
+            execute_with_sudo(["systemctl", "daemon-reload"])
         
         # Enable and start the service
         execute_with_sudo(["systemctl", "enable", "wifi-failover.service"])
@@ -362,6 +487,8 @@ def configure_traffic_routing(connection, applications):
     """
     Configure traffic routing for specific applications through a specific connection.
     
+    The traffic is steered by an fwmark rule and a cgroup (see policy_routing).
+    
     Args:
         connection: The name of the connection
         applications: A list of application names
@@ -376,67 +503,44 @@ def configure_traffic_routing(connection, applications):
         conn_details = get_connection_details(connection)
         device = conn_details.get("GENERAL.DEVICES", "wlan0")
         
-        # Create a routing table for this connection
-        table_name = f"wifi_{device}"
-        table_id = abs(hash(connection)) % 250 + 1  # Generate a table ID between 1 and 250
-        
-        # Add the table to /etc/iproute2/rt_tables
-        execute_with_sudo(["bash", "-c", f"echo '{table_id} {table_name}' >> /etc/iproute2/rt_tables"])
-        
-        # Get the gateway for this connection
-        gateway = None
-        ip_route = run_command(["ip", "route", "show", "dev", device])
-        if ip_route:
-            gateway_match = re.search(r"default via ([\d.]+)", ip_route)
-            if gateway_match:
-                gateway = gateway_match.group(1)
-        
-        if not gateway:
-            display_error(f"Could not determine gateway for {connection}.")
+        from src.policy_routing import install_app_routing
+        routing = install_app_routing(device, applications)
+        if not routing:
             return False
         
-        # Add routing rules for this connection
-        execute_with_sudo(["ip", "route", "add", "default", "via", gateway, "dev", device, "table", table_name])
-        
-        # Add rules for each application
-        for app in applications:
-            # Find the path to the application
-            app_path = run_command(["which", app])
-            
-            if not app_path:
-                display_warning(f"Could not find path for {app}. Skipping.")
-                continue
-            
-            # Create a wrapper script for the application
-            wrapper_path = os.path.expanduser(f"~/.local/bin/{app}_routed")
-            
-            wrapper_content = f"""#!/bin/bash
-
-# Set the routing for this application
-export DEVICE="{device}"
-export TABLE="{table_name}"
-
-# Run the application with the specified routing
-exec ip route exec dev $DEVICE {app_path} "$@"
-"""
-            
-            # Create the directory if it doesn't exist
-            os.makedirs(os.path.dirname(wrapper_path), exist_ok=True)
-            
-            # Write the wrapper script
-            with open(wrapper_path, 'w') as f:
-                f.write(wrapper_content)
-            
-            # Make the wrapper script executable
-            os.chmod(wrapper_path, 0o755)
-            
+        for app, wrapper_path in routing["wrappers"].items():
             display_success(f"Created routing wrapper for {app} at {wrapper_path}")
         
-        display_success("Traffic routing configured successfully.")
+        display_success(f"Traffic routing configured successfully (table {routing['table']}, id {routing['table_id']}).")
         display_message("To use routing, run the applications with their wrapper scripts.", color='blue')
         
         return True
             
     except Exception as e:
         display_error(f"Error configuring traffic routing: {str(e)}")
+        return False
+
+def remove_traffic_routing(connection):
+    """
+    Remove the application routing configured through a connection.
+    
+    Args:
+        connection: The name of the connection
+        
+    Returns:
+        bool: True if the routing was removed, False otherwise
+    """
+    try:
+        conn_details = get_connection_details(connection)
+        device = conn_details.get("GENERAL.DEVICES", "wlan0")
+        
+        from src.policy_routing import remove_app_routing
+        if not remove_app_routing(device):
+            return False
+        
+        display_success(f"Removed traffic routing through {connection}.")
+        return True
+            
+    except Exception as e:
+        display_error(f"Error removing traffic routing: {str(e)}")
         return False
\ No newline at end of file
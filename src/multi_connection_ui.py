@@ -6,16 +6,20 @@ This module provides a user interface for managing multiple WiFi connections.
 
 import os
 import time
-from utils.ui_helpers import display_header, display_message, display_success, display_error, display_warning
-from multi_connection import (
+from src.utils.ui_helpers import display_header, display_message, display_success, display_error, display_warning, display_table
+from src.multi_connection import (
     list_connections,
     get_connection_details,
     activate_connection,
-    deactivate_connection,
-    delete_connection,
+    bulk_deactivate_connections,
+    bulk_delete_connections,
+    report_bulk_results,
     configure_load_balancing,
+    get_load_balancer,
+    stop_load_balancing,
     configure_failover,
-    configure_traffic_routing
+    configure_traffic_routing,
+    remove_traffic_routing
 )
 
 def multi_connection_menu():
@@ -37,11 +41,13 @@ def multi_connection_menu():
             print("\nNo WiFi connections configured.")
         
         print("\n1. Activate Connection")
-        print("2. Deactivate Connection")
-        print("3. Delete Connection")
+        print("2. Deactivate Connections")
+        print("3. Delete Connections")
         print("4. Configure Load Balancing")
         print("5. Configure Failover")
         print("6. Configure Traffic Routing")
+        print("7. Sync Profiles from Manifest")
+        print("8. Remove Traffic Routing")
         print("b. Back to Advanced Options")
         
         choice = input("\nSelect an option: ").strip().lower()
@@ -58,6 +64,10 @@ def multi_connection_menu():
             configure_failover_menu(connections)
         elif choice == '6':
             configure_traffic_routing_menu(connections)
+        elif choice == '7':
+            sync_profiles_menu()
+        elif choice == '8':
+            remove_traffic_routing_menu(connections)
         elif choice == 'b':
             break
         else:
@@ -94,8 +104,23 @@ def activate_connection_menu(connections):
     
     input("\nPress Enter to continue...")
 
+def select_connections(connections):
+    """Read a comma-separated list of connection numbers (or "all") and return the selection."""
+    choices = input("\nEnter connection numbers separated by commas, or 'all': ").strip().lower()
+    if choices == "all":
+        return list(connections)
+    
+    selected = []
+    for choice in choices.split(','):
+        choice = choice.strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(connections):
+            connection = connections[int(choice) - 1]
+            if connection not in selected:
+                selected.append(connection)
+    return selected
+
 def deactivate_connection_menu(connections):
-    """Menu for deactivating a connection."""
+    """Menu for deactivating connections."""
     active_connections = [conn for conn in connections if conn["active"]]
     
     if not active_connections:
@@ -104,58 +129,83 @@ def deactivate_connection_menu(connections):
         return
     
     os.system('clear' if os.name == 'posix' else 'cls')
-    display_header("Deactivate Connection")
+    display_header("Deactivate Connections")
     
-    print("\nSelect a connection to deactivate:")
+    print("\nSelect connections to deactivate:")
     for i, conn in enumerate(active_connections, 1):
         print(f"{i}. {conn['name']} (Active on {conn['device']})")
     
-    choice = input("\nEnter connection number: ").strip()
+    selected = select_connections(active_connections)
     
-    if choice.isdigit() and 1 <= int(choice) <= len(active_connections):
-        connection = active_connections[int(choice) - 1]
-        deactivate_connection(connection["name"])
+    if selected:
+        results = bulk_deactivate_connections([conn["name"] for conn in selected])
+        report_bulk_results(results, "Deactivated")
     else:
         display_error("Invalid selection.")
     
     input("\nPress Enter to continue...")
 
 def delete_connection_menu(connections):
-    """Menu for deleting a connection."""
+    """Menu for deleting connections."""
     if not connections:
         display_warning("No WiFi connections configured.")
         input("\nPress Enter to continue...")
         return
     
     os.system('clear' if os.name == 'posix' else 'cls')
-    display_header("Delete Connection")
+    display_header("Delete Connections")
     
-    print("\nSelect a connection to delete:")
+    print("\nSelect connections to delete:")
     for i, conn in enumerate(connections, 1):
         status = "Active" if conn["active"] else "Inactive"
         print(f"{i}. {conn['name']} ({status})")
     
-    choice = input("\nEnter connection number: ").strip()
+    selected = select_connections(connections)
     
-    if choice.isdigit() and 1 <= int(choice) <= len(connections):
-        connection = connections[int(choice) - 1]
+    if selected:
+        names = [conn["name"] for conn in selected]
+        active = [conn["name"] for conn in selected if conn["active"]]
+        if active:
+            display_warning(f"Active connections will be deactivated first: {', '.join(active)}")
         
-        if connection["active"]:
-            display_warning(f"Connection {connection['name']} is active. Deactivate it first.")
-            
-            if input("\nDeactivate and delete? (y/n): ").strip().lower().startswith('y'):
-                deactivate_connection(connection["name"])
-                delete_connection(connection["name"])
-        else:
-            if input(f"\nAre you sure you want to delete {connection['name']}? (y/n): ").strip().lower().startswith('y'):
-                delete_connection(connection["name"])
+        if input(f"\nAre you sure you want to delete {', '.join(names)}? (y/n): ").strip().lower().startswith('y'):
+            if active:
+                bulk_deactivate_connections(active)
+            results = bulk_delete_connections(names)
+            report_bulk_results(results, "Deleted")
     else:
         display_error("Invalid selection.")
     
     input("\nPress Enter to continue...")
 
+def load_balancing_status_menu(balancer):
+    """Show the live state of the running load balancer."""
+    os.system('clear' if os.name == 'posix' else 'cls')
+    display_header("Load Balancing Status")
+    
+    def fmt(value, suffix=""):
+        return f"{value:.1f}{suffix}" if value is not None else "-"
+    
+    rows = [
+        [uplink["interface"], uplink["gateway"], str(uplink["weight"]), fmt(uplink["share"], "%"),
+         fmt(uplink["rtt_ms"]), fmt(uplink["capacity_mbps"]), fmt(uplink["tx_mbps"]),
+         fmt(uplink["rx_mbps"]), fmt(uplink["utilization"], "%")]
+        for uplink in balancer.status()
+    ]
+    display_table(["Uplink", "Gateway", "Weight", "Share", "RTT (ms)", "Capacity (Mb/s)",
+                   "TX (Mb/s)", "RX (Mb/s)", "Utilization"], rows)
+    
+    if input("\nStop load balancing? (y/n): ").strip().lower().startswith('y'):
+        stop_load_balancing()
+        input("\nPress Enter to continue...")
+
 def configure_load_balancing_menu(connections):
     """Menu for configuring load balancing."""
+    balancer = get_load_balancer()
+    if balancer is not None:
+        load_balancing_status_menu(balancer)
+        return
+    
     if len(connections) < 2:
         display_warning("At least two WiFi connections are required for load balancing.")
         input("\nPress Enter to continue...")
@@ -277,4 +327,52 @@ def configure_traffic_routing_menu(connections):
         if input("\nConfigure traffic routing for these applications? (y/n): ").strip().lower().startswith('y'):
             configure_traffic_routing(connection, applications)
     
+    input("\nPress Enter to continue...")
+
+def remove_traffic_routing_menu(connections):
+    """Menu for removing traffic routing."""
+    if not connections:
+        display_warning("No WiFi connections configured.")
+        input("\nPress Enter to continue...")
+        return
+    
+    os.system('clear' if os.name == 'posix' else 'cls')
+    display_header("Remove Traffic Routing")
+    
+    print("\nSelect the connection applications are routed through:")
+    for i, conn in enumerate(connections, 1):
+        status = "Active" if conn["active"] else "Inactive"
+        print(f"{i}. {conn['name']} ({status})")
+    
+    choice = input("\nEnter connection number: ").strip()
+    
+    if choice.isdigit() and 1 <= int(choice) <= len(connections):
+        connection = connections[int(choice) - 1]["name"]
+        
+        if input(f"\nRemove traffic routing through {connection}? (y/n): ").strip().lower().startswith('y'):
+            remove_traffic_routing(connection)
+    else:
+        display_error("Invalid connection selection.")
+    
+    input("\nPress Enter to continue...")
+
+def sync_profiles_menu():
+    """Menu for syncing connection profiles from a manifest."""
+    from src.profile_sync import sync_profiles
+    
+    os.system('clear' if os.name == 'posix' else 'cls')
+    display_header("Sync Profiles from Manifest")
+    
+    manifest_path = input("\nEnter the path to the manifest (YAML or JSON): ").strip()
+    
+    if not manifest_path:
+        display_error("No manifest specified.")
+    else:
+        manifest_path = os.path.expanduser(manifest_path)
+        plan = sync_profiles(manifest_path, dry_run=True)
+        
+        if plan and any(plan[action] for action in ("create", "modify", "delete")):
+            if input("\nApply these changes? (y/n): ").strip().lower().startswith('y'):
+                sync_profiles(manifest_path)
+    
     input("\nPress Enter to continue...")
\ No newline at end of file
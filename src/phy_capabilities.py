@@ -0,0 +1,330 @@
+"""
+Wireless PHY Capabilities
+
+Builds a model of each wireless PHY (radio) from one parse of `iw list`:
+its bands and channels (with their disabled, DFS and no-IR flags), the
+HT/VHT/HE/EHT capabilities and channel widths of each band, the ciphers
+it supports and the interface combinations it can run.
+
+`iw list` prints hundreds of lines per PHY, so the models are cached.
+The cache is keyed on the PHYs' indexes (which change when a device is
+added or its driver reloaded) and on the regulatory domains `iw reg get`
+reports, globally and for each self-managed PHY, since the kernel rewrites
+the channel flags whenever one changes (including LAR updates the
+firmware makes on its own). `iw reg get` is short, so checking it on
+every lookup is far cheaper than parsing `iw list` again.
+"""
+
+import os
+import re
+import threading
+from src.utils.command_runner import run_command
+
+IEEE80211_CLASS = "/sys/class/ieee80211"
+
+_FREQUENCY_PATTERN = re.compile(r"\*\s+([\d.]+) MHz \[(\d+)\](.*)")
+_POWER_PATTERN = re.compile(r"\(([\d.]+) dBm\)")
+_LIMIT_PATTERN = re.compile(r"#\{\s*([^}]*)\}\s*<=\s*(\d+)")
+
+# Channel flags as printed by different iw versions
+_FLAG_NAMES = {"no IR": "no-ir", "passive scanning": "no-ir", "no IBSS": "no-ir",
+               "radar detection": "radar", "disabled": "disabled"}
+
+def _band_of(freq):
+    if freq < 2500:
+        return "2.4 GHz"
+    if freq < 5925:
+        return "5 GHz"
+    return "6 GHz" if freq < 7200 else "60 GHz"
+
+def _band_widths(band, caps):
+    """Return the channel widths a band's capabilities allow."""
+    if band == "2.4 GHz":
+        return [20, 40] if caps["ht40"] or caps["he40"] else [20]
+    if band == "5 GHz":
+        widths = [20]
+        if caps["ht40"] or caps["he40"]:
+            widths.append(40)
+        if caps["vht"] or caps["he40"]:
+            widths.append(80)
+        if caps["vht160"] or caps["he160"]:
+            widths.append(160)
+        return widths
+    if band == "6 GHz":
+        widths = [20, 40, 80] if caps["he"] else [20]
+        if caps["he160"]:
+            widths.append(160)
+        if caps["eht320"]:
+            widths.append(320)
+        return widths
+    return []
+
+class PhyCapabilities:
+    """What one PHY supports, as reported by `iw list`."""
+
+    def __init__(self, name):
+        self.name = name
+        self.index = None
+        self.bands = {}
+        self.ciphers = []
+        self.interface_modes = []
+        self.software_modes = []
+        self.combinations = []
+
+    def channels(self, band=None, usable=False):
+        """
+        List the PHY's channels.
+
+        Args:
+            band: Only list this band's channels
+            usable: Leave out disabled channels
+
+        Returns:
+            list: dicts with band, channel, frequency, max_power (dBm),
+                  disabled, dfs, no_ir and flags
+        """
+        return [channel for name, caps in self.bands.items() if band in (None, name)
+                for channel in caps["channels"] if not (usable and channel["disabled"])]
+
+    def channel(self, number, band=None):
+        """Return a channel by number (in the given band, if it is ambiguous), or None."""
+        return next((channel for channel in self.channels(band) if channel["channel"] == number), None)
+
+    def widths(self, band):
+        """Return the channel widths the PHY supports in a band."""
+        return self.bands[band]["widths"] if band in self.bands else []
+
+    def can_run(self, modes, channels=1):
+        """
+        Check whether the PHY can run interfaces of the given modes at once.
+
+        Args:
+            modes: Interface modes, e.g. ["managed", "managed"] for two clients
+            channels: The number of different channels they would use
+
+        Returns:
+            bool: True if a valid interface combination allows it
+        """
+        # Software interfaces can always be added
+        modes = [mode for mode in modes if mode not in self.software_modes]
+        if len(modes) <= 1:
+            return not modes or modes[0] in self.interface_modes
+        for combination in self.combinations:
+            if len(modes) > combination["total"] or channels > combination["channels"]:
+                continue
+            counts = [0] * len(combination["limits"])
+            for mode in modes:
+                index = next((i for i, (types, _) in enumerate(combination["limits"]) if mode in types), None)
+                if index is None:
+                    break
+                counts[index] += 1
+            else:
+                if all(count <= limit for count, (_, limit) in zip(counts, combination["limits"])):
+                    return True
+        return False
+
+    def as_dict(self):
+        return {"name": self.name, "index": self.index, "bands": self.bands, "ciphers": self.ciphers,
+                "interface_modes": self.interface_modes, "software_modes": self.software_modes,
+                "combinations": [{"limits": [{"modes": sorted(types), "max": limit}
+                                             for types, limit in combination["limits"]],
+                                  "total": combination["total"], "channels": combination["channels"]}
+                                 for combination in self.combinations]}
+
+def _new_band():
+    return {"channels": [], "ht": False, "ht40": False, "vht": False, "vht160": False,
+            "he": False, "he40": False, "he160": False, "eht": False, "eht320": False}
+
+def _parse_frequency(line):
+    match = _FREQUENCY_PATTERN.match(line)
+    if not match:
+        return None
+    freq = float(match.group(1))
+    power = _POWER_PATTERN.search(match.group(3))
+    flags = []
+    for group in re.findall(r"\(([^)]*)\)", _POWER_PATTERN.sub("", match.group(3))):
+        flags.extend(flag.strip() for flag in group.split(",") if flag.strip())
+    names = {_FLAG_NAMES.get(flag) for flag in flags}
+    return {"band": _band_of(freq), "channel": int(match.group(2)),
+            "frequency": int(freq) if freq.is_integer() else freq,
+            "max_power": float(power.group(1)) if power else None,
+            "disabled": "disabled" in names, "dfs": "radar" in names, "no_ir": "no-ir" in names,
+            "flags": flags}
+
+def _parse_combination(text):
+    limits = [({mode.strip() for mode in types.split(",")}, int(limit))
+              for types, limit in _LIMIT_PATTERN.findall(text)]
+    total = re.search(r"total <= (\d+)", text)
+    channels = re.search(r"#channels <= (\d+)", text)
+    return {"limits": limits, "total": int(total.group(1)) if total else sum(limit for _, limit in limits),
+            "channels": int(channels.group(1)) if channels else 1}
+
+def parse_iw_list(output):
+    """
+    Parse the output of `iw list` (or `iw phy <phy> info`).
+
+    Args:
+        output: The command output
+
+    Returns:
+        dict: PhyCapabilities by PHY name
+    """
+    phys = {}
+    bands = {}
+    combinations = {}
+    phy = None
+    section = None
+    band = None
+    context = ""
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        depth = len(line) - len(line.lstrip("\t"))
+        text = line.strip()
+
+        if depth == 0:
+            match = re.match(r"Wiphy (\S+)", text)
+            phy = phys.setdefault(match.group(1), PhyCapabilities(match.group(1))) if match else None
+            section = None
+            continue
+        if phy is None:
+            continue
+
+        if depth == 1:
+            section = None
+            if text.startswith("Band "):
+                section = "band"
+                band = _new_band()
+                bands.setdefault(phy.name, []).append(band)
+                context = ""
+            elif text.startswith("wiphy index:"):
+                phy.index = int(text.split(":")[1])
+            elif text.startswith("Supported Ciphers"):
+                section = "ciphers"
+            elif text.startswith("Supported interface modes"):
+                section = "modes"
+            elif text.startswith("software interface modes"):
+                section = "software"
+            elif text.startswith("valid interface combinations"):
+                section = "combinations"
+            continue
+
+        if section == "band":
+            if depth == 2:
+                # A capability block or the frequency list; details follow one level deeper
+                context = text
+                if text.startswith("Capabilities:"):
+                    band["ht"] = True
+                elif text.startswith("VHT Capabilities"):
+                    band["vht"] = True
+                elif text.startswith("HE Iftypes"):
+                    band["he"] = True
+                elif text.startswith("EHT Iftypes"):
+                    band["eht"] = True
+            elif context == "Frequencies:":
+                channel = _parse_frequency(text)
+                if channel:
+                    band["channels"].append(channel)
+            elif context.startswith("Capabilities:"):
+                band["ht40"] = band["ht40"] or text == "HT20/HT40"
+            elif context.startswith("VHT Capabilities") and text.startswith("Supported Channel Width:"):
+                band["vht160"] = "160 MHz" in text
+            elif context.startswith("HE Iftypes"):
+                band["he40"] = band["he40"] or bool(re.match(r"HE40(/HE80)?/(2\.4|5)GHz$", text))
+                band["he160"] = band["he160"] or text.startswith("HE160/")
+            elif context.startswith("EHT Iftypes"):
+                band["eht320"] = band["eht320"] or "320MHz in 6GHz" in text
+        elif section == "ciphers" and text.startswith("*"):
+            phy.ciphers.append(text[1:].split("(")[0].strip())
+        elif section in ("modes", "software") and text.startswith("*"):
+            (phy.interface_modes if section == "modes" else phy.software_modes).append(text[1:].strip())
+        elif section == "combinations":
+            lines = combinations.setdefault(phy.name, [])
+            if text.startswith("*"):
+                lines.append(text[1:].strip())
+            elif lines:
+                # A combination continues on the following lines
+                lines[-1] += " " + text
+
+    for name, phy in phys.items():
+        for band in bands.get(name, []):
+            if band["channels"]:
+                band_name = band["channels"][0]["band"]
+                band["widths"] = _band_widths(band_name, band)
+                phy.bands[band_name] = band
+        phy.combinations = [_parse_combination(text) for text in combinations.get(name, []) if "#{" in text]
+    return phys
+
+def _phy_indexes():
+    """Return (name, index) for each PHY the kernel knows, from sysfs."""
+    indexes = []
+    try:
+        entries = sorted(os.listdir(IEEE80211_CLASS))
+    except OSError:
+        return ()
+    for name in entries:
+        try:
+            with open(os.path.join(IEEE80211_CLASS, name, "index")) as f:
+                indexes.append((name, f.read().strip()))
+        except OSError:
+            continue
+    return tuple(indexes)
+
+def _regulatory_domains():
+    """Return (scope, country) for the global and each self-managed domain, from `iw reg get`."""
+    from src.regdb import parse_reg_get
+    try:
+        output = run_command(["iw", "reg", "get"])
+    except OSError:
+        # iw is not installed
+        return ()
+    return tuple(sorted((scope, domain.alpha2) for scope, domain in parse_reg_get(output or "").items()))
+
+_phys = None
+_phys_key = None
+_phys_lock = threading.Lock()
+
+def get_phys():
+    """
+    Return the capability models of every PHY, parsing `iw list` only when
+    the PHYs or a regulatory domain changed since the last parse.
+
+    Returns:
+        dict: PhyCapabilities by PHY name (empty if iw is unavailable)
+    """
+    global _phys, _phys_key
+    with _phys_lock:
+        key = (_phy_indexes(), _regulatory_domains())
+        if _phys is None or key != _phys_key:
+            try:
+                output = run_command(["iw", "list"])
+            except OSError:
+                # iw is not installed
+                output = None
+            _phys = parse_iw_list(output or "")
+            _phys_key = key
+        return _phys
+
+def invalidate_phys():
+    """Drop the cached models, e.g. after the regulatory domain was set."""
+    global _phys
+    with _phys_lock:
+        _phys = None
+
+def get_phy(interface=None):
+    """
+    Return the capability model of an interface's PHY.
+
+    Args:
+        interface: A wireless interface name (the first PHY if not given)
+
+    Returns:
+        PhyCapabilities: The model, or None if the interface is not wireless
+    """
+    if interface is None:
+        phys = get_phys()
+        return min(phys.values(), key=lambda phy: (phy.index is None, phy.index, phy.name), default=None)
+    link = f"/sys/class/net/{interface}/phy80211"
+    if not os.path.exists(link):
+        return None
+    return get_phys().get(os.path.basename(os.path.realpath(link)))
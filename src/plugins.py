@@ -0,0 +1,131 @@
+"""
+Subsystem Plugin Registry
+
+Optional subsystems (enterprise WiFi, regulatory domain, captive portals...)
+are described by metadata only: a menu key, a title and a "module:function"
+target. Listing them imports nothing, so startup cost does not grow with the
+number of subsystems; a subsystem's module is imported the first time its
+menu is selected, and a failure to import it is reported with the error and
+the time spent instead of hiding the menu.
+
+Installed packages can add menus through the "intel_wifi_fixer.menus" entry
+point group, e.g. in setup.py:
+
+    entry_points={"intel_wifi_fixer.menus": ["VPN Tools = vpn_tools.ui:vpn_menu"]}
+
+Entry points are only read when the plugin list is first needed.
+"""
+
+import time
+import importlib
+import threading
+
+ENTRY_POINT_GROUP = "intel_wifi_fixer.menus"
+
+BUILTIN_PLUGINS = [
+    ("1", "Configure Enterprise WiFi", "src.enterprise_wifi_ui:enterprise_wifi_menu"),
+    ("2", "Manage Multiple Connections", "src.multi_connection_ui:multi_connection_menu"),
+    ("3", "Set Regulatory Domain", "src.regulatory_ui:regulatory_domain_menu"),
+    ("4", "Handle Captive Portal", "src.captive_portal_ui:captive_portal_menu"),
+    ("5", "Advanced Troubleshooting", "src.troubleshooting_ui:troubleshooting_menu")
+]
+
+class PluginLoadError(Exception):
+    """Raised when a plugin's module or menu function cannot be loaded."""
+
+class Plugin:
+    """A subsystem menu that is imported on first use."""
+
+    def __init__(self, key, title, target):
+        """
+        Args:
+            key: The menu key selecting the plugin
+            title: The menu title
+            target: "module:function" naming the menu function
+        """
+        self.key = key
+        self.title = title
+        self.target = target
+        self.load_time = None
+        self._menu = None
+
+    @property
+    def loaded(self):
+        return self._menu is not None
+
+    def load(self):
+        """
+        Import the plugin's module and return its menu function.
+
+        Raises:
+            PluginLoadError: With the cause and the time spent importing
+        """
+        if self._menu is not None:
+            return self._menu
+
+        module_name, _, attribute = self.target.partition(":")
+        started = time.perf_counter()
+        try:
+            menu = getattr(importlib.import_module(module_name), attribute)
+        except Exception as e:
+            self.load_time = time.perf_counter() - started
+            raise PluginLoadError(f"Could not load {self.title} ({self.target}) after "
+                                  f"{self.load_time * 1000:.0f} ms: {type(e).__name__}: {e}")
+        self.load_time = time.perf_counter() - started
+        self._menu = menu
+        return menu
+
+def discover_entry_points(group=ENTRY_POINT_GROUP):
+    """
+    Read plugin metadata from installed packages without importing them.
+
+    Returns:
+        list: (title, target) tuples
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+
+    found = entry_points()
+    # Python 3.10+ selects by group; older versions return a dict of groups
+    selected = found.select(group=group) if hasattr(found, "select") else found.get(group, [])
+    return sorted((entry_point.name, entry_point.value) for entry_point in selected)
+
+class PluginRegistry:
+    """The subsystem menus, in display order."""
+
+    def __init__(self, builtin=BUILTIN_PLUGINS, group=ENTRY_POINT_GROUP):
+        self._builtin = builtin
+        self.group = group
+        self._plugins = None
+
+    def plugins(self):
+        """Return every plugin, reading entry points on first call."""
+        if self._plugins is None:
+            plugins = [Plugin(key, title, target) for key, title, target in self._builtin]
+            keys = {plugin.key for plugin in plugins}
+            next_key = len(plugins) + 1
+            for title, target in discover_entry_points(self.group):
+                # Installed plugins are numbered after the built-in ones
+                while str(next_key) in keys:
+                    next_key += 1
+                plugins.append(Plugin(str(next_key), title, target))
+                keys.add(str(next_key))
+            self._plugins = plugins
+        return self._plugins
+
+    def get(self, key):
+        """Return the plugin for a menu key, or None."""
+        return next((plugin for plugin in self.plugins() if plugin.key == key), None)
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """Return the session's plugin registry, creating it on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PluginRegistry()
+        return _registry
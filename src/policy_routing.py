@@ -0,0 +1,207 @@
+"""
+Policy Routing Module
+
+This module routes the traffic of selected applications through a specific
+WiFi interface. Each interface gets a routing table with a stable ID kept in
+/etc/iproute2/rt_tables, an fwmark rule selecting that table and a cgroup v2
+group. An nftables table marks every socket created inside the group (a
+socket cgroupv2 match), so the application's wrapper script only has to join
+the group before starting the application.
+
+All route and rule changes for a request are sent as one `ip -batch`, and
+the nftables table is replaced atomically, so repeated runs converge on the
+same state instead of stacking rules.
+"""
+
+import os
+from src.utils.command_runner import run_command, execute_batch_with_sudo
+from src.utils.config_writer import read_config, write_config, merge_rt_tables, remove_rt_table, parse_rt_tables
+from src.utils.ui_helpers import display_error, display_warning
+from src.load_balancer import find_gateway
+
+RT_TABLES_PATH = "/etc/iproute2/rt_tables"
+
+# Tables managed here are named wifi_<device> and use IDs from this range
+TABLE_PREFIX = "wifi_"
+TABLE_IDS = range(100, 200)
+RULE_PRIORITY_BASE = 900
+
+CGROUP_ROOT = "/sys/fs/cgroup/intel-wifi-fixer"
+NFT_TABLE = "inet intel_wifi_fixer"
+WRAPPER_DIR = os.path.expanduser("~/.local/bin")
+
+def table_name_for(device):
+    """Return the routing table name used for a device."""
+    return f"{TABLE_PREFIX}{device}"
+
+def allocate_table_id(tables, table_name):
+    """
+    Return the table's existing ID, or the lowest free ID in TABLE_IDS.
+
+    Args:
+        tables: Table IDs keyed by name (from parse_rt_tables)
+        table_name: The table to allocate an ID for
+
+    Raises:
+        ValueError: If every ID in the range is taken
+    """
+    if table_name in tables:
+        return tables[table_name]
+    used = set(tables.values())
+    for table_id in TABLE_IDS:
+        if table_id not in used:
+            return table_id
+    raise ValueError("No free routing table IDs")
+
+def managed_tables(tables):
+    """Return the tables created by this module, keyed by name."""
+    return {name: table_id for name, table_id in tables.items()
+            if name.startswith(TABLE_PREFIX) and table_id in TABLE_IDS}
+
+def rule_priority(table_id):
+    return RULE_PRIORITY_BASE + table_id - TABLE_IDS.start
+
+def cgroup_path(table_name):
+    return f"{CGROUP_ROOT}/{table_name}"
+
+def render_nft_ruleset(tables):
+    """
+    Render the nftables table marking the sockets of each routing cgroup.
+
+    The table is declared, deleted and declared again in one transaction so
+    loading it replaces any previous version atomically.
+
+    Args:
+        tables: Managed table IDs keyed by table name
+
+    Returns:
+        str: Input for `nft -f -`
+    """
+    lines = [f"table {NFT_TABLE}", f"delete table {NFT_TABLE}"]
+    if not tables:
+        return "\n".join(lines) + "\n"
+
+    cgroup_prefix = os.path.basename(CGROUP_ROOT)
+    lines.extend([
+        f"table {NFT_TABLE} {{",
+        "    chain output {",
+        "        type route hook output priority mangle; policy accept;"
+    ])
+    for name, table_id in sorted(tables.items()):
+        lines.append(f'        socket cgroupv2 level 2 "{cgroup_prefix}/{name}" meta mark set {table_id}')
+    lines.extend([
+        "    }",
+        "    chain postrouting {",
+        "        type nat hook postrouting priority srcnat; policy accept;"
+    ])
+    # The source address was chosen before the mark rerouted the packet
+    for name, table_id in sorted(tables.items()):
+        lines.append(f'        meta mark {table_id} oifname "{name[len(TABLE_PREFIX):]}" masquerade')
+    lines.extend(["    }", "}"])
+    return "\n".join(lines) + "\n"
+
+def render_wrapper(app_path, device, table_name):
+    """Render a wrapper script that runs an application inside a routing cgroup."""
+    return f"""#!/bin/sh
+# Routes {os.path.basename(app_path)} through {device} (table {table_name})
+echo $$ | sudo tee {cgroup_path(table_name)}/cgroup.procs > /dev/null || exit 1
+exec {app_path} "$@"
+"""
+
+def _apply(tables, route_lines, extra_commands=()):
+    """Send the route batch, cgroup and nftables changes in one helper round trip."""
+    commands = list(extra_commands)
+    inputs = [None] * len(commands)
+    commands.append(["ip", "-force", "-batch", "-"])
+    inputs.append("\n".join(route_lines) + "\n")
+    commands.append(["nft", "-f", "-"])
+    inputs.append(render_nft_ruleset(tables))
+    return execute_batch_with_sudo(commands, stop_on_error=True, inputs=inputs)
+
+def install_app_routing(device, applications):
+    """
+    Route applications through a device.
+
+    Args:
+        device: The interface to route through
+        applications: Application names or paths
+
+    Returns:
+        dict: table (name), table_id and wrappers (application -> wrapper
+              path), or None if routing could not be installed
+    """
+    gateway = find_gateway(device)
+    if not gateway:
+        display_error(f"Could not determine the gateway of {device}.")
+        return None
+
+    rt_tables = read_config(RT_TABLES_PATH)
+    tables = parse_rt_tables(rt_tables)
+    table_name = table_name_for(device)
+    table_id = allocate_table_id(tables, table_name)
+    write_config(RT_TABLES_PATH, merge_rt_tables(rt_tables, table_id, table_name))
+
+    tables = managed_tables(parse_rt_tables(read_config(RT_TABLES_PATH)))
+    priority = rule_priority(table_id)
+    route_lines = [
+        f"route replace default via {gateway} dev {device} table {table_id}",
+        # Deleting first keeps a single rule however often this runs (-force ignores a miss)
+        f"rule del priority {priority}",
+        f"rule add fwmark {table_id} table {table_id} priority {priority}"
+    ]
+    outputs = _apply(tables, route_lines, [
+        ["mkdir", "-p"] + [cgroup_path(name) for name in sorted(tables)],
+        # Replies arrive on the marked interface without the mark
+        ["sysctl", "-w", f"net.ipv4.conf.{device}.rp_filter=2"]
+    ])
+    if None in outputs:
+        display_error("Could not install the routing rules.")
+        return None
+
+    wrappers = {}
+    for app in applications:
+        app_path = app if os.path.isabs(app) else run_command(["which", app])
+        if not app_path:
+            display_warning(f"Could not find path for {app}. Skipping.")
+            continue
+        wrapper_path = os.path.join(WRAPPER_DIR, f"{os.path.basename(app)}_routed")
+        write_config(wrapper_path, render_wrapper(app_path, device, table_name), mode=0o755)
+        wrappers[app] = wrapper_path
+
+    return {"table": table_name, "table_id": table_id, "wrappers": wrappers}
+
+def remove_app_routing(device):
+    """
+    Remove the routing table, rules, cgroup and wrappers of a device.
+
+    Returns:
+        bool: True if everything was removed
+    """
+    rt_tables = read_config(RT_TABLES_PATH)
+    tables = managed_tables(parse_rt_tables(rt_tables))
+    table_name = table_name_for(device)
+    if table_name not in tables:
+        display_warning(f"No application routing is configured for {device}.")
+        return False
+
+    table_id = tables.pop(table_name)
+    outputs = _apply(tables, [
+        f"rule del priority {rule_priority(table_id)}",
+        f"route flush table {table_id}"
+    ])
+    removed = None not in outputs
+    # Fails while wrapped applications are still running inside the group
+    if execute_batch_with_sudo([["rmdir", cgroup_path(table_name)]])[0] is None:
+        display_warning(f"Routing cgroup for {device} is still in use; close the routed applications.")
+        removed = False
+
+    write_config(RT_TABLES_PATH, remove_rt_table(rt_tables, table_name))
+
+    marker = f"(table {table_name})"
+    if os.path.isdir(WRAPPER_DIR):
+        for name in os.listdir(WRAPPER_DIR):
+            path = os.path.join(WRAPPER_DIR, name)
+            if name.endswith("_routed") and marker in read_config(path):
+                os.unlink(path)
+
+    return removed
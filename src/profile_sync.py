@@ -0,0 +1,283 @@
+"""
+Connection Profile Sync Module
+
+This module applies a fleet manifest of WiFi and enterprise connection
+profiles to NetworkManager. Each profile is rendered to nmcli properties and
+hashed; the hashes of what was last applied are kept in a local state file,
+so an up-to-date host is recognised from a single connection listing and
+only the profiles that were added, changed or removed are touched.
+
+Manifest (YAML or JSON):
+
+    prune: true
+    profiles:
+      - name: Office
+        ssid: office
+        psk: secret
+      - name: Corp
+        ssid: corp
+        enterprise: {eap: peap, identity: alice, password: secret, ca_cert: /etc/ssl/corp.pem}
+        settings: {connection.autoconnect-priority: 10}
+"""
+
+import os
+import re
+import json
+import hashlib
+from src.utils.command_runner import run_command
+from src.utils.config_writer import read_config, write_config
+from src.utils.ui_helpers import display_message, display_success, display_error, display_warning
+from src.multi_connection import run_bulk
+from src.enterprise_wifi import enterprise_properties
+
+STATE_PATH = os.path.join(
+    os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share")),
+    "intel-wifi-fixer", "profile_sync.json"
+)
+
+# Inner authentication used when an enterprise profile does not name one
+DEFAULT_PHASE2 = {"peap": "mschapv2", "ttls": "pap"}
+
+MANIFEST_SCHEMA = {
+    "type": "object",
+    "required": ["profiles"],
+    "properties": {
+        "prune": {"type": "boolean"},
+        "profiles": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "ssid"],
+                "properties": {
+                    "name": {"type": "string", "minLength": 1},
+                    "ssid": {"type": "string", "minLength": 1},
+                    "psk": {"type": "string", "minLength": 8},
+                    "device": {"type": "string"},
+                    "enterprise": {
+                        "type": "object",
+                        "required": ["eap", "identity"],
+                        "properties": {
+                            "eap": {"enum": ["peap", "ttls", "tls"]},
+                            "phase2": {"enum": ["mschapv2", "pap"]},
+                            "identity": {"type": "string"},
+                            "password": {"type": "string"},
+                            "ca_cert": {"type": "string"},
+                            "client_cert": {"type": "string"},
+                            "private_key": {"type": "string"},
+                            "private_key_password": {"type": "string"}
+                        }
+                    },
+                    "settings": {"type": "object"}
+                }
+            }
+        }
+    }
+}
+
+def load_manifest(path):
+    """
+    Load and validate a manifest file.
+
+    Returns:
+        dict: The manifest
+
+    Raises:
+        ValueError: If the manifest is invalid
+    """
+    import jsonschema
+
+    with open(path, 'r') as f:
+        if path.endswith(".json"):
+            manifest = json.load(f)
+        else:
+            import yaml
+            manifest = yaml.safe_load(f)
+
+    try:
+        jsonschema.validate(manifest, MANIFEST_SCHEMA)
+    except jsonschema.ValidationError as e:
+        raise ValueError(f"Invalid manifest: {e.message}")
+
+    names = [profile["name"] for profile in manifest["profiles"]]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate profile names: {', '.join(duplicates)}")
+    return manifest
+
+def profile_properties(profile):
+    """
+    Render a manifest profile as nmcli properties.
+
+    Returns:
+        dict: Property values keyed by nmcli property name
+    """
+    properties = {
+        "connection.interface-name": profile.get("device", ""),
+        "802-11-wireless.ssid": profile["ssid"]
+    }
+    if "enterprise" in profile:
+        enterprise = profile["enterprise"]
+        eap_method = {"value": enterprise["eap"],
+                      "inner_auth": enterprise.get("phase2", DEFAULT_PHASE2.get(enterprise["eap"]))}
+        pairs = enterprise_properties(eap_method, enterprise["identity"], enterprise.get("password"),
+                                      enterprise.get("ca_cert"), enterprise.get("client_cert"),
+                                      enterprise.get("private_key"), enterprise.get("private_key_password"))
+        properties["wifi-sec.key-mgmt"] = "wpa-eap"
+        properties.update(zip(pairs[::2], pairs[1::2]))
+    elif "psk" in profile:
+        properties["wifi-sec.key-mgmt"] = "wpa-psk"
+        properties["wifi-sec.psk"] = profile["psk"]
+
+    for key, value in profile.get("settings", {}).items():
+        properties[key] = str(value)
+    return properties
+
+def properties_hash(properties):
+    """Hash rendered properties independently of their order."""
+    return hashlib.sha256(json.dumps(properties, sort_keys=True).encode()).hexdigest()
+
+def list_profiles():
+    """
+    List every NetworkManager connection with a single nmcli call.
+
+    Returns:
+        dict: Connection UUIDs keyed by connection name
+    """
+    output = run_command(["nmcli", "-t", "-f", "NAME,UUID", "connection", "show"])
+    profiles = {}
+    for line in (output or "").splitlines():
+        # Terse output escapes colons inside fields as "\:"
+        fields = [field.replace("\\:", ":") for field in re.split(r"(?<!\\):", line)]
+        if len(fields) >= 2:
+            profiles[fields[0]] = fields[1]
+    return profiles
+
+def load_state(path=None):
+    """Load the hashes of the profiles applied by earlier syncs."""
+    try:
+        return json.loads(read_config(path or STATE_PATH) or "{}")
+    except ValueError:
+        display_warning("Ignoring corrupt profile sync state.")
+        return {}
+
+def plan_sync(manifest, existing, state):
+    """
+    Compute the minimal set of changes.
+
+    Args:
+        manifest: The loaded manifest
+        existing: Connection UUIDs keyed by name (from list_profiles)
+        state: Applied profiles keyed by name (uuid, hash and keys)
+
+    Returns:
+        dict: create, modify and delete lists plus unchanged names
+    """
+    plan = {"create": [], "modify": [], "delete": [], "unchanged": []}
+    wanted = set()
+
+    for profile in manifest["profiles"]:
+        name = profile["name"]
+        wanted.add(name)
+        properties = profile_properties(profile)
+        digest = properties_hash(properties)
+        applied = state.get(name)
+
+        if name not in existing:
+            plan["create"].append({"name": name, "properties": properties, "hash": digest})
+        elif applied and applied.get("uuid") == existing[name] and applied.get("hash") == digest:
+            plan["unchanged"].append(name)
+        else:
+            # Clear properties an earlier sync set that the profile no longer has
+            stale = [key for key in (applied or {}).get("keys", []) if key not in properties]
+            plan["modify"].append({"name": name, "uuid": existing[name], "properties": properties,
+                                   "hash": digest, "clear": stale})
+
+    # Only profiles an earlier sync created are ever deleted
+    if manifest.get("prune", True):
+        for name, applied in state.items():
+            if name not in wanted and existing.get(name) == applied.get("uuid"):
+                plan["delete"].append({"name": name, "uuid": applied["uuid"]})
+
+    return plan
+
+def _command(item, action):
+    if action == "create":
+        command = ["nmcli", "connection", "add", "type", "wifi", "con-name", item["name"],
+                   "ifname", item["properties"]["connection.interface-name"] or "*",
+                   "ssid", item["properties"]["802-11-wireless.ssid"]]
+        properties = {key: value for key, value in item["properties"].items()
+                      if key not in ("connection.interface-name", "802-11-wireless.ssid")}
+    elif action == "modify":
+        command = ["nmcli", "connection", "modify", "uuid", item["uuid"]]
+        properties = dict(item["properties"])
+        properties.update({key: "" for key in item["clear"]})
+    else:
+        return ["nmcli", "connection", "delete", "uuid", item["uuid"]]
+
+    for key, value in properties.items():
+        command.extend([key, value])
+    return command
+
+def sync_profiles(manifest_path, dry_run=False, state_path=None):
+    """
+    Bring NetworkManager in line with a manifest.
+
+    Args:
+        manifest_path: The YAML or JSON manifest
+        dry_run: Only compute and show the plan
+        state_path: Where applied hashes are recorded
+
+    Returns:
+        dict: The plan, plus per-item results unless dry_run; None if the
+              manifest could not be loaded
+    """
+    try:
+        manifest = load_manifest(manifest_path)
+    except (OSError, ValueError) as e:
+        display_error(f"Could not load manifest: {str(e)}")
+        return None
+
+    state_path = state_path or STATE_PATH
+    state = load_state(state_path)
+    plan = plan_sync(manifest, list_profiles(), state)
+    plan["results"] = []
+
+    for action in ("create", "modify", "delete"):
+        for item in plan[action]:
+            display_message(f"{action.capitalize()}: {item['name']}", color='blue')
+    if not any(plan[action] for action in ("create", "modify", "delete")):
+        display_success(f"All {len(plan['unchanged'])} profiles are up to date.")
+        return plan
+    if dry_run:
+        return plan
+
+    operations = []
+    actions = []
+    for action in ("create", "modify", "delete"):
+        for item in plan[action]:
+            operations.append((item["name"], _command(item, action)))
+            actions.append((action, item))
+    plan["results"] = run_bulk(operations)
+
+    # Record what was applied; failed items are retried on the next sync
+    for (action, item), result in zip(actions, plan["results"]):
+        if not result["ok"]:
+            display_error(f"Failed to {action} {item['name']}.")
+            continue
+        if action == "delete":
+            state.pop(item["name"], None)
+            continue
+        uuid = item.get("uuid")
+        if action == "create":
+            match = re.search(r"\(([0-9a-f-]{36})\)", result["output"] or "")
+            uuid = match.group(1) if match else None
+        state[item["name"]] = {"uuid": uuid, "hash": item["hash"], "keys": sorted(item["properties"])}
+
+    write_config(state_path, json.dumps(state, indent=2, sort_keys=True), mode=0o600)
+
+    failed = sum(not result["ok"] for result in plan["results"])
+    if failed:
+        display_warning(f"{failed} profile change(s) failed.")
+    else:
+        display_success(f"Applied {len(plan['results'])} profile change(s).")
+    return plan
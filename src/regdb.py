@@ -0,0 +1,354 @@
+"""
+Wireless Regulatory Database
+
+Reads the regulatory rules of every country from the kernel's regulatory
+database (regulatory.db, shipped by wireless-regdb), and the rules in
+effect from `iw reg get`. A rule covers a frequency range and sets its
+maximum bandwidth, maximum EIRP and flags (DFS, NO-IR...).
+
+Each country's rules are kept sorted by start frequency, so whether a
+channel of a given width is allowed, and at what power, is answered with
+a binary search. All countries are loaded from regulatory.db at once, so
+countries can be compared without changing the regulatory domain.
+"""
+
+import os
+import re
+import struct
+import threading
+from bisect import bisect_right
+
+REGDB_PATHS = ("/lib/firmware/regulatory.db", "/usr/lib/firmware/regulatory.db")
+
+REGDB_MAGIC = 0x52474442  # "RGDB"
+REGDB_VERSION = 20
+
+# Rule flags as stored in regulatory.db, named as iw prints them
+REGDB_FLAGS = {0x01: "NO-OFDM", 0x02: "NO-OUTDOOR", 0x04: "DFS", 0x08: "NO-IR", 0x10: "AUTO-BW"}
+
+# Older iw versions print the two flags NO-IR replaced
+FLAG_ALIASES = {"PASSIVE-SCAN": "NO-IR", "NO-IBSS": "NO-IR"}
+
+DFS_REGIONS = {0: "DFS-UNSET", 1: "DFS-FCC", 2: "DFS-ETSI", 3: "DFS-JP"}
+
+# Channel widths in MHz each band can use
+BAND_WIDTHS = {
+    "2.4 GHz": (20, 40),
+    "5 GHz": (20, 40, 80, 160),
+    "6 GHz": (20, 40, 80, 160, 320),
+}
+
+# Lower edge of the first bonded block in each part of the 5 and 6 GHz bands
+_BLOCK_BASES = ((5150, 5735, 5170), (5735, 5925, 5735), (5925, 7125, 5945))
+
+_RULE_PATTERN = re.compile(
+    r"\(\s*([\d.]+)\s*-\s*([\d.]+)\s*@\s*([\d.]+)\s*\),\s*"   # (start - end @ max bandwidth)
+    r"\(\s*(?:N/A|[\d.]+)\s*,\s*([\d.]+)\s*\)"                  # (max antenna gain, max EIRP)
+    r"(?:,\s*\((N/A|\d+)(?:\s*ms)?\))?"                         # (CAC time)
+    r"((?:\s*,\s*[\w-]+)*)")                                    # , FLAG, FLAG...
+_COUNTRY_PATTERN = re.compile(r"^country (\w\w):\s*(DFS-\w+)?")
+
+class RegulatoryDBError(Exception):
+    """Raised when regulatory.db cannot be read or parsed."""
+
+def channel_plan():
+    """
+    List the 20 MHz channels of each band.
+
+    Returns:
+        list: (band, channel, centre frequency in MHz) tuples
+    """
+    plan = [("2.4 GHz", channel, 2407 + 5 * channel) for channel in range(1, 14)]
+    plan.append(("2.4 GHz", 14, 2484))
+    plan.extend(("5 GHz", channel, 5000 + 5 * channel)
+                for channel in list(range(36, 145, 4)) + list(range(149, 178, 4)))
+    plan.extend(("6 GHz", channel, 5950 + 5 * channel) for channel in range(1, 234, 4))
+    return plan
+
+def _blocks(band, freq, width):
+    """Return the (low, high) edges a channel of the given width may occupy."""
+    if width == 20:
+        return [(freq - 10, freq + 10)]
+    if band == "2.4 GHz":
+        # HT40+ and HT40- use the channel four above or below
+        return [(freq - 10, freq + 30), (freq - 30, freq + 10)]
+    for low, high, base in _BLOCK_BASES:
+        if low <= freq < high:
+            start = base + (freq - 10 - base) // width * width
+            return [(start, start + width)]
+    return []
+
+class RegulatoryRule:
+    """A frequency range with its maximum bandwidth, maximum EIRP and flags."""
+
+    __slots__ = ("start", "end", "max_bandwidth", "max_eirp", "flags", "cac_timeout")
+
+    def __init__(self, start, end, max_bandwidth, max_eirp, flags=(), cac_timeout=None):
+        self.start = start
+        self.end = end
+        self.max_bandwidth = max_bandwidth
+        self.max_eirp = max_eirp
+        self.flags = frozenset(FLAG_ALIASES.get(flag, flag) for flag in flags)
+        self.cac_timeout = cac_timeout
+
+    def as_dict(self):
+        return {"start": self.start, "end": self.end, "max_bandwidth": self.max_bandwidth,
+                "max_eirp": self.max_eirp, "flags": sorted(self.flags), "cac_timeout": self.cac_timeout}
+
+    def __repr__(self):
+        return (f"RegulatoryRule({self.start:g} - {self.end:g} @ {self.max_bandwidth:g}, "
+                f"{self.max_eirp:g} dBm, {sorted(self.flags)})")
+
+class RegulatoryDomain:
+    """The rules of one country, indexed by start frequency."""
+
+    def __init__(self, alpha2, rules, dfs_region=None):
+        self.alpha2 = alpha2
+        self.dfs_region = dfs_region
+        self.rules = sorted(rules, key=lambda rule: rule.start)
+        self._starts = [rule.start for rule in self.rules]
+        self._channels = None
+
+    def rule_at(self, freq):
+        """Return the rule covering a frequency in MHz, or None."""
+        index = bisect_right(self._starts, freq) - 1
+        if index >= 0 and freq <= self.rules[index].end:
+            return self.rules[index]
+        return None
+
+    def _span(self, low, high):
+        """Return the contiguous rules covering [low, high], or None."""
+        index = bisect_right(self._starts, low) - 1
+        if index < 0:
+            return None
+        rules = [self.rules[index]]
+        while rules[-1].end < high:
+            index += 1
+            if index == len(self.rules) or self.rules[index].start > rules[-1].end:
+                return None
+            rules.append(self.rules[index])
+        return rules
+
+    def allows(self, freq, width=20, band=None):
+        """
+        Check whether a channel may be used at a given width.
+
+        Args:
+            freq: The channel's centre frequency in MHz
+            width: The channel width in MHz
+            band: The channel's band (derived from the frequency if not given)
+
+        Returns:
+            dict: max_eirp (dBm) and flags when allowed, otherwise None
+        """
+        band = band or _band_of(freq)
+        blocked = {f"NO-{width}MHZ"}
+        for i, (low, high) in enumerate(_blocks(band, freq, width)):
+            rules = self._span(low, high)
+            if not rules:
+                continue
+            # A block may span adjacent rules only when they allow automatic bandwidth
+            if len(rules) == 1:
+                if width > rules[0].max_bandwidth:
+                    continue
+            elif not all("AUTO-BW" in rule.flags for rule in rules):
+                continue
+            flags = frozenset().union(*(rule.flags for rule in rules))
+            if blocked & flags or (band == "2.4 GHz" and width == 40
+                                   and ("NO-HT40PLUS", "NO-HT40MINUS")[i] in flags):
+                continue
+            return {"max_eirp": min(rule.max_eirp for rule in rules),
+                    "flags": sorted(flags - {"AUTO-BW"})}
+        return None
+
+    def channels(self):
+        """
+        List the channels this domain allows, with their widths and power.
+
+        The table is built on first use and kept.
+
+        Returns:
+            list: dicts with band, channel, frequency, widths, max_eirp and flags
+        """
+        if self._channels is None:
+            channels = []
+            for band, channel, freq in channel_plan():
+                allowed = self.allows(freq, 20, band)
+                if allowed is None:
+                    continue
+                widths = [width for width in BAND_WIDTHS[band]
+                          if width == 20 or self.allows(freq, width, band) is not None]
+                channels.append({"band": band, "channel": channel, "frequency": freq, "widths": widths,
+                                 "max_eirp": allowed["max_eirp"], "flags": allowed["flags"]})
+            self._channels = channels
+        return self._channels
+
+    def max_eirp(self):
+        """
+        Return the highest EIRP allowed in each band.
+
+        Returns:
+            dict: dBm by band, for the bands with at least one allowed channel
+        """
+        power = {}
+        for channel in self.channels():
+            power[channel["band"]] = max(power.get(channel["band"], channel["max_eirp"]), channel["max_eirp"])
+        return power
+
+def _band_of(freq):
+    if freq < 2500:
+        return "2.4 GHz"
+    return "5 GHz" if freq < 5925 else "6 GHz"
+
+def parse_regdb(data):
+    """
+    Parse a regulatory.db file.
+
+    Args:
+        data: The file contents
+
+    Returns:
+        dict: RegulatoryDomain by country code
+
+    Raises:
+        RegulatoryDBError: If the data is not a valid database
+    """
+    try:
+        magic, version = struct.unpack_from(">II", data, 0)
+        if magic != REGDB_MAGIC or version != REGDB_VERSION:
+            raise RegulatoryDBError("Not a version 20 regulatory.db file")
+
+        domains = {}
+        offset = 8
+        while True:
+            alpha2, collection = struct.unpack_from(">2sH", data, offset)
+            offset += 4
+            if not collection:
+                break
+            collection <<= 2
+            length, n_rules, dfs_region = struct.unpack_from(">BBB", data, collection)
+            pointers = struct.unpack_from(f">{n_rules}H", data, collection + length + (length & 1))
+
+            rules = []
+            for pointer in pointers:
+                pointer <<= 2
+                length, flags, eirp, start, end, bandwidth = struct.unpack_from(">BBHIII", data, pointer)
+                if length < 16:
+                    raise RegulatoryDBError(f"Truncated rule at offset {pointer}")
+                cac_timeout = struct.unpack_from(">H", data, pointer + 16)[0] if length >= 18 else None
+                rules.append(RegulatoryRule(start / 1000, end / 1000, bandwidth / 1000, eirp / 100,
+                                            [name for bit, name in REGDB_FLAGS.items() if flags & bit],
+                                            cac_timeout or None))
+            code = alpha2.decode("ascii")
+            domains[code] = RegulatoryDomain(code, rules, DFS_REGIONS.get(dfs_region))
+        return domains
+    except (struct.error, UnicodeDecodeError) as e:
+        raise RegulatoryDBError(f"Malformed regulatory.db: {str(e)}")
+
+def parse_reg_get(output):
+    """
+    Parse the output of `iw reg get`.
+
+    Args:
+        output: The command output
+
+    Returns:
+        dict: RegulatoryDomain by scope: "global" for the domain the kernel
+              applies, "phy#N" for devices with a self-managed domain
+    """
+    parsed = {}
+    scope = "global"
+    rules = None
+    for line in output.splitlines():
+        stripped = line.strip()
+        if stripped == "global" or stripped.startswith("phy#"):
+            scope = stripped.split()[0]
+            continue
+        match = _COUNTRY_PATTERN.match(stripped)
+        if match:
+            rules = []
+            parsed[scope] = (match.group(1), match.group(2), rules)
+            continue
+        match = _RULE_PATTERN.match(stripped)
+        if match and rules is not None:
+            start, end, bandwidth, eirp, cac_timeout, flags = match.groups()
+            rules.append(RegulatoryRule(float(start), float(end), float(bandwidth), float(eirp),
+                                        [flag.strip() for flag in flags.split(",") if flag.strip()],
+                                        int(cac_timeout) or None if cac_timeout and cac_timeout != "N/A" else None))
+    return {scope: RegulatoryDomain(alpha2, rules, dfs_region)
+            for scope, (alpha2, dfs_region, rules) in parsed.items()}
+
+def find_regdb():
+    """Return the path of regulatory.db, or None if it is not installed."""
+    return next((path for path in REGDB_PATHS if os.path.isfile(path)), None)
+
+class RegulatoryIndex:
+    """Every country's rules from one regulatory.db."""
+
+    def __init__(self, domains, path=None):
+        self.domains = domains
+        self.path = path
+
+    def get(self, alpha2):
+        """Return a country's RegulatoryDomain, or None."""
+        return self.domains.get(alpha2.upper())
+
+    def countries(self):
+        return sorted(self.domains)
+
+    def compare(self, first, second):
+        """
+        Compare the channels two countries allow.
+
+        Returns:
+            list: One dict per channel that differs, with band, channel,
+                  frequency and each country's entry (None if not allowed)
+
+        Raises:
+            KeyError: If a country is not in the database
+        """
+        tables = []
+        for alpha2 in (first, second):
+            domain = self.get(alpha2)
+            if domain is None:
+                raise KeyError(alpha2)
+            tables.append({channel["frequency"]: channel for channel in domain.channels()})
+
+        differences = []
+        for band, channel, freq in channel_plan():
+            entries = [table.get(freq) for table in tables]
+            if entries[0] == entries[1]:
+                continue
+            differences.append({"band": band, "channel": channel, "frequency": freq,
+                                first.upper(): entries[0], second.upper(): entries[1]})
+        return differences
+
+_index = None
+_index_key = None
+_index_lock = threading.Lock()
+
+def get_index():
+    """
+    Return the index of regulatory.db, reloading it when the file changes.
+
+    Returns:
+        RegulatoryIndex: The index, or None if regulatory.db is not installed
+
+    Raises:
+        RegulatoryDBError: If the file cannot be read or parsed
+    """
+    global _index, _index_key
+    path = find_regdb()
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with _index_lock:
+            if _index_key != key:
+                with open(path, "rb") as f:
+                    _index = RegulatoryIndex(parse_regdb(f.read()), path)
+                _index_key = key
+            return _index
+    except OSError as e:
+        raise RegulatoryDBError(f"{path}: {e.strerror}")
@@ -5,11 +5,11 @@ This module provides functionality for configuring the regulatory domain
 for the wireless adapter, which affects available channels and transmit power.
 """
 
-import os
-import re
 import time
-from utils.command_runner import run_command, execute_with_sudo
-from utils.ui_helpers import display_message, display_success, display_error, display_warning
+from src.regdb import BAND_WIDTHS, RegulatoryDBError, get_index, parse_reg_get
+from src.phy_capabilities import get_phy, invalidate_phys
+from src.utils.command_runner import run_command, execute_with_sudo
+from src.utils.ui_helpers import display_message, display_success, display_error, display_warning
 
 # Define common regulatory domains
 REGULATORY_DOMAINS = {
@@ -31,26 +31,51 @@ REGULATORY_DOMAINS = {
     "TW": "Taiwan"
 }
 
-def get_current_regulatory_domain():
+def get_regulatory_rules():
     """
-    Get the current regulatory domain.
+    Get the regulatory rules in effect, as printed by `iw reg get`.
     
     Returns:
-        str: The current regulatory domain code
+        RegulatoryDomain: The global domain's rules, or None if unavailable
     """
     try:
         output = run_command(["iw", "reg", "get"])
         
         if output:
-            match = re.search(r"country (\w+):", output)
-            if match:
-                return match.group(1)
+            return parse_reg_get(output).get("global")
         
-        return "Unknown"
+        return None
             
     except Exception as e:
-        display_error(f"Error getting regulatory domain: {str(e)}")
-        return "Unknown"
+        display_error(f"Error getting regulatory rules: {str(e)}")
+        return None
+
+def get_current_regulatory_domain():
+    """
+    Get the current regulatory domain.
+    
+    Returns:
+        str: The current regulatory domain code
+    """
+    rules = get_regulatory_rules()
+    return rules.alpha2 if rules else "Unknown"
+
+def get_known_domains():
+    """
+    Get the regulatory domains that can be set.
+    
+    Returns:
+        dict: Country names by code; every country in regulatory.db when it
+              is installed, otherwise the common domains
+    """
+    domains = dict(REGULATORY_DOMAINS)
+    try:
+        index = get_index()
+        if index:
+            domains.update((code, REGULATORY_DOMAINS.get(code, code)) for code in index.countries())
+    except RegulatoryDBError as e:
+        display_warning(f"Could not read the regulatory database: {str(e)}")
+    return domains
 
 def set_regulatory_domain(domain_code):
     """
@@ -66,7 +91,8 @@ def set_regulatory_domain(domain_code):
         display_message(f"Setting regulatory domain to {domain_code}...", color='blue')
         
         # Check if the domain code is valid
-        if domain_code not in REGULATORY_DOMAINS:
+        domains = get_known_domains()
+        if domain_code not in domains:
             display_error(f"Invalid regulatory domain code: {domain_code}")
             return False
         
@@ -74,12 +100,15 @@ def set_regulatory_domain(domain_code):
         result = execute_with_sudo(["iw", "reg", "set", domain_code])
         
         if result:
+            # The kernel rewrites the adapters' channel flags for the new domain
+            invalidate_phys()
+            
             # Verify that the domain was set
             time.sleep(1)
             current_domain = get_current_regulatory_domain()
             
             if current_domain == domain_code:
-                display_success(f"Regulatory domain set to {domain_code} ({REGULATORY_DOMAINS[domain_code]}).")
+                display_success(f"Regulatory domain set to {domain_code} ({domains[domain_code]}).")
                 return True
             else:
                 display_warning(f"Regulatory domain may not have been set correctly. Current domain: {current_domain}")
@@ -92,81 +121,121 @@ def set_regulatory_domain(domain_code):
         display_error(f"Error setting regulatory domain: {str(e)}")
         return False
 
-def get_available_channels():
+def get_available_channels(rules=None, interface=None):
     """
     Get the available channels for the current regulatory domain.
     
+    The adapter's own channel list is used when it is known, since it
+    reflects both the hardware and the domain (including self-managed
+    domains); otherwise the domain's rules are used.
+    
+    Args:
+        rules: The RegulatoryDomain to use (read from `iw reg get` if not given)
+        interface: The wireless interface (the first adapter if not given)
+    
     Returns:
         dict: A dictionary of available channels by band
     """
     try:
-        output = run_command(["iw", "list"])
+        rules = rules or get_regulatory_rules()
+        phy = get_phy(interface)
         
-        channels = {
-            "2.4 GHz": [],
-            "5 GHz": []
-        }
+        channels = {band: [] for band in BAND_WIDTHS}
         
-        if output:
-            # Extract the channels from the output
-            in_channels_section = False
-            current_band = None
-            
-            for line in output.split('\n'):
-                if "Frequencies:" in line:
-                    in_channels_section = True
-                    if "2.4 GHz" in line:
-                        current_band = "2.4 GHz"
-                    elif "5 GHz" in line:
-                        current_band = "5 GHz"
-                elif in_channels_section and "* " in line and current_band:
-                    # Extract the channel number
-                    match = re.search(r"\[(\d+)\]", line)
-                    if match:
-                        channel = match.group(1)
-                        channels[current_band].append(channel)
-                elif in_channels_section and not line.strip():
-                    in_channels_section = False
-                    current_band = None
+        if phy:
+            for channel in phy.channels(usable=True):
+                if channel["band"] in channels:
+                    channels[channel["band"]].append(str(channel["channel"]))
+        elif rules:
+            for channel in rules.channels():
+                channels[channel["band"]].append(str(channel["channel"]))
         
         return channels
             
     except Exception as e:
         display_error(f"Error getting available channels: {str(e)}")
-        return {"2.4 GHz": [], "5 GHz": []}
+        return {band: [] for band in BAND_WIDTHS}
 
-def get_max_transmit_power():
+def get_max_transmit_power(rules=None):
     """
     Get the maximum transmit power for the current regulatory domain.
     
+    Args:
+        rules: The RegulatoryDomain to use (read from `iw reg get` if not given)
+    
     Returns:
-        dict: A dictionary of maximum transmit power by band
+        dict: A dictionary of maximum transmit power (EIRP) by band
     """
     try:
-        output = run_command(["iw", "reg", "get"])
+        rules = rules or get_regulatory_rules()
         
-        max_power = {
-            "2.4 GHz": "Unknown",
-            "5 GHz": "Unknown"
-        }
+        max_power = {band: "Unknown" for band in BAND_WIDTHS}
         
-        if output:
-            # Extract the maximum power from the output
-            for line in output.split('\n'):
-                if "2.4 GHz" in line and "dBm" in line:
-                    match = re.search(r"(\d+\.\d+) dBm", line)
-                    if match:
-                        max_power["2.4 GHz"] = f"{match.group(1)} dBm"
-                elif "5 GHz" in line and "dBm" in line:
-                    match = re.search(r"(\d+\.\d+) dBm", line)
-                    if match:
-                        max_power["5 GHz"] = f"{match.group(1)} dBm"
+        if rules:
+            for band, eirp in rules.max_eirp().items():
+                max_power[band] = f"{eirp:g} dBm"
         
         return max_power
             
     except Exception as e:
         display_error(f"Error getting maximum transmit power: {str(e)}")
-        return {"2.4 GHz": "Unknown", "5 GHz": "Unknown"}
+        return {band: "Unknown" for band in BAND_WIDTHS}
+
+def get_channel_rules(country=None):
+    """
+    Get the channels, widths and maximum EIRP a regulatory domain allows.
+    
+    Args:
+        country: The country code to look up in regulatory.db, without
+                 setting it (the current domain if not given)
+    
+    Returns:
+        list: dicts with band, channel, frequency, widths, max_eirp and flags
+    """
+    try:
+        if country is None:
+            rules = get_regulatory_rules()
+        else:
+            index = get_index()
+            if index is None:
+                display_error("The regulatory database (regulatory.db) is not installed.")
+                return []
+            rules = index.get(country)
+            if rules is None:
+                display_error(f"Unknown regulatory domain code: {country}")
+                return []
+        
+        return rules.channels() if rules else []
+            
+    except Exception as e:
+        display_error(f"Error getting channel rules: {str(e)}")
+        return []
+
+def compare_regulatory_domains(first, second):
+    """
+    Compare the channels two regulatory domains allow, without setting either.
+    
+    Args:
+        first: A country code
+        second: Another country code
+    
+    Returns:
+        list: The channels that differ (see RegulatoryIndex.compare), or None on error
+    """
+    try:
+        index = get_index()
+        if index is None:
+            display_error("The regulatory database (regulatory.db) is not installed.")
+            return None
+        
+        return index.compare(first, second)
+            
+    except KeyError as e:
+        display_error(f"Unknown regulatory domain code: {e.args[0]}")
+        return None
+    except Exception as e:
+        display_error(f"Error comparing regulatory domains: {str(e)}")
+        return None
 
 def set_transmit_power(power_level):
     """
@@ -181,12 +250,12 @@ def set_transmit_power(power_level):
     try:
         display_message(f"Setting transmit power to {power_level}...", color='blue')
         
-        # Map power level to iwconfig power setting
+        # Map power level to iw txpower arguments (levels are in mBm)
         power_map = {
-            "auto": "auto",
-            "high": "on",
-            "medium": "15",
-            "low": "10"
+            "auto": ["auto"],
+            "high": ["limit", "3000"],
+            "medium": ["fixed", "1500"],
+            "low": ["fixed", "1000"]
         }
         
         if power_level not in power_map:
@@ -194,7 +263,7 @@ def set_transmit_power(power_level):
             return False
         
         # Set the power level
-        result = execute_with_sudo(["iwconfig", "wlan0", "txpower", power_map[power_level]])
+        result = execute_with_sudo(["iw", "dev", "wlan0", "set", "txpower"] + power_map[power_level])
         
         if result:
             display_success(f"Transmit power set to {power_level}.")
@@ -215,10 +284,11 @@ def display_regulatory_info():
         dict: A dictionary of regulatory information
     """
     try:
-        domain = get_current_regulatory_domain()
+        rules = get_regulatory_rules()
+        domain = rules.alpha2 if rules else "Unknown"
         domain_name = REGULATORY_DOMAINS.get(domain, "Unknown")
-        channels = get_available_channels()
-        max_power = get_max_transmit_power()
+        channels = get_available_channels(rules)
+        max_power = get_max_transmit_power(rules)
         
         info = {
             "domain": domain,
@@ -234,6 +304,6 @@ def display_regulatory_info():
         return {
             "domain": "Unknown",
             "domain_name": "Unknown",
-            "channels": {"2.4 GHz": [], "5 GHz": []},
-            "max_power": {"2.4 GHz": "Unknown", "5 GHz": "Unknown"}
+            "channels": {band: [] for band in BAND_WIDTHS},
+            "max_power": {band: "Unknown" for band in BAND_WIDTHS}
         }
\ No newline at end of file
@@ -6,14 +6,14 @@ This module provides a user interface for configuring the regulatory domain.
 
 import os
 import time
-from utils.ui_helpers import display_header, display_message, display_success, display_error, display_warning
-from regulatory import (
+from src.utils.ui_helpers import display_header, display_message, display_success, display_error, display_warning
+from src.regulatory import (
     REGULATORY_DOMAINS,
-    get_current_regulatory_domain,
+    get_known_domains,
     set_regulatory_domain,
-    get_available_channels,
-    get_max_transmit_power,
     set_transmit_power,
+    get_channel_rules,
+    compare_regulatory_domains,
     display_regulatory_info
 )
 
@@ -28,17 +28,22 @@ def regulatory_domain_menu():
         
         print(f"\nCurrent Regulatory Domain: {info['domain']} ({info['domain_name']})")
         
+        # 6 GHz is only listed where the domain allows it
+        bands = [band for band in info['channels'] if band != "6 GHz" or info['channels'][band]]
+        
         print("\nAvailable Channels:")
-        print(f"  2.4 GHz: {', '.join(info['channels']['2.4 GHz'])}")
-        print(f"  5 GHz: {', '.join(info['channels']['5 GHz'])}")
+        for band in bands:
+            print(f"  {band}: {', '.join(info['channels'][band])}")
         
-        print("\nMaximum Transmit Power:")
-        print(f"  2.4 GHz: {info['max_power']['2.4 GHz']}")
-        print(f"  5 GHz: {info['max_power']['5 GHz']}")
+        print("\nMaximum Transmit Power (EIRP):")
+        for band in bands:
+            print(f"  {band}: {info['max_power'][band]}")
         
         print("\n1. Set Regulatory Domain")
         print("2. Set Transmit Power")
         print("3. Refresh Regulatory Information")
+        print("4. Show Channel Rules")
+        print("5. Compare Countries")
         print("b. Back to Advanced Options")
         
         choice = input("\nSelect an option: ").strip().lower()
@@ -50,6 +55,10 @@ def regulatory_domain_menu():
         elif choice == '3':
             display_message("Refreshing regulatory information...", color='blue')
             time.sleep(1)
+        elif choice == '4':
+            channel_rules_menu()
+        elif choice == '5':
+            compare_domains_menu()
         elif choice == 'b':
             break
         else:
@@ -76,7 +85,7 @@ def set_domain_menu():
     domain_code = input("Domain code: ").strip().upper()
     
     if domain_code:
-        if domain_code in REGULATORY_DOMAINS:
+        if domain_code in get_known_domains():
             set_regulatory_domain(domain_code)
         else:
             display_error(f"Invalid regulatory domain code: {domain_code}")
@@ -108,4 +117,53 @@ def set_power_menu():
     else:
         display_error("Invalid power level selection.")
     
-    input("\nPress Enter to continue...")
\ No newline at end of file
+    input("\nPress Enter to continue...")
+
+def _print_channels(channels):
+    print(f"\n  {'Band':<8} {'Channel':>7}  {'MHz':>5}  {'Widths (MHz)':<18} {'Max EIRP':>8}  Flags")
+    for channel in channels:
+        widths = "/".join(str(width) for width in channel['widths'])
+        print(f"  {channel['band']:<8} {channel['channel']:>7}  {channel['frequency']:>5}  {widths:<18} "
+              f"{channel['max_eirp']:>4g} dBm  {' '.join(channel['flags'])}")
+
+def channel_rules_menu():
+    """Show the channels, widths and power a country allows."""
+    os.system('clear' if os.name == 'posix' else 'cls')
+    display_header("Channel Rules")
+    
+    country = input("\nCountry code (leave empty for the current domain): ").strip().upper()
+    channels = get_channel_rules(country or None)
+    
+    if channels:
+        _print_channels(channels)
+        print("\nDFS channels need radar detection; NO-IR channels cannot start a network.")
+    elif not country:
+        display_warning("No regulatory rules are available.")
+    
+    input("\nPress Enter to continue...")
+
+def compare_domains_menu():
+    """Compare two countries' channels without changing the regulatory domain."""
+    os.system('clear' if os.name == 'posix' else 'cls')
+    display_header("Compare Countries")
+    
+    first = input("\nFirst country code: ").strip().upper()
+    second = input("Second country code: ").strip().upper()
+    
+    if first and second:
+        differences = compare_regulatory_domains(first, second)
+        if differences == []:
+            display_success(f"{first} and {second} allow the same channels.")
+        elif differences:
+            print(f"\n  {'Band':<8} {'Channel':>7}  {first:<24} {second:<24}")
+            for difference in differences:
+                columns = []
+                for code in (first, second):
+                    entry = difference[code]
+                    columns.append(f"{'/'.join(str(width) for width in entry['widths'])} MHz, "
+                                   f"{entry['max_eirp']:g} dBm" if entry else "not allowed")
+                print(f"  {difference['band']:<8} {difference['channel']:>7}  {columns[0]:<24} {columns[1]:<24}")
+    else:
+        display_error("Two country codes are needed.")
+    
+    input("\nPress Enter to continue...")
@@ -0,0 +1,108 @@
+"""
+Adapter Status Service
+
+This module keeps the adapter status current in a background thread so the
+main menu can draw it without waiting on nmcli. The status is refreshed at a
+fixed interval and immediately when a link notification arrives for the
+adapter (carrier or operstate changes), so it is never more than one
+interval old.
+"""
+
+import threading
+import time
+from src.utils.netlink import LinkMonitor
+from src.utils.ui_helpers import display_warning
+
+REFRESH_INTERVAL = 1.0
+
+class StatusService:
+    """Background refresher for an AdapterInfo's connection status."""
+
+    def __init__(self, adapter_info, interval=REFRESH_INTERVAL):
+        """
+        Args:
+            adapter_info: The AdapterInfo whose status is kept current
+            interval: Maximum seconds between refreshes
+        """
+        self.adapter_info = adapter_info
+        self.interval = interval
+        self._status = None
+        self._updated = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        """Query the adapter status now and publish it."""
+        self.adapter_info.refresh("status")
+        status = self.adapter_info.retrieve_status()
+        with self._lock:
+            self._status = status
+            self._updated = time.monotonic()
+        return status
+
+    def status(self):
+        """
+        Return the latest status without blocking.
+
+        Returns:
+            str: "connected", "disconnected" or "unknown"; None before the
+                 first refresh has completed
+        """
+        with self._lock:
+            return self._status
+
+    def age(self):
+        """Seconds since the status was last refreshed, or None."""
+        with self._lock:
+            return None if self._updated is None else time.monotonic() - self._updated
+
+    def start(self):
+        """Start refreshing in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresher."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        try:
+            monitor = LinkMonitor()
+        except OSError:
+            monitor = None
+
+        try:
+            while not self._stop_event.is_set():
+                started = time.monotonic()
+                try:
+                    self.refresh()
+                except Exception as e:
+                    display_warning(f"Error refreshing adapter status: {str(e)}")
+                self._wait(monitor, max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            if monitor is not None:
+                monitor.close()
+
+    def _wait(self, monitor, timeout):
+        """Sleep until the next refresh is due or a link event for the adapter arrives."""
+        if monitor is None:
+            self._stop_event.wait(timeout)
+            return
+
+        deadline = time.monotonic() + timeout
+        while not self._stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            # Short reads so stop() is not held up by a quiet link
+            events = monitor.read(min(remaining, 0.2))
+            if any(name == self.adapter_info.adapter_id for _, name in events):
+                return
@@ -0,0 +1,259 @@
+"""
+Link-Quality Telemetry Module
+
+This module samples station statistics for the wireless link at a fixed rate
+and keeps a bounded history in ring buffers, so slow degradation (rising
+retries, falling bitrate, beacon loss) can be observed over time.
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from array import array
+from src.utils.command_runner import run_command
+from src.utils.ui_helpers import display_error, display_warning
+
+# Station dump fields we track, keyed by metric name
+STATION_FIELDS = {
+    "signal": r"^\s*signal:\s*(-?\d+)",
+    "tx_bitrate": r"^\s*tx bitrate:\s*([\d.]+)",
+    "rx_bitrate": r"^\s*rx bitrate:\s*([\d.]+)",
+    "tx_packets": r"^\s*tx packets:\s*(\d+)",
+    "tx_retries": r"^\s*tx retries:\s*(\d+)",
+    "tx_failed": r"^\s*tx failed:\s*(\d+)",
+    "beacon_loss": r"^\s*beacon loss:\s*(\d+)",
+}
+
+# Cumulative kernel counters; these are stored as per-sample deltas
+COUNTER_METRICS = ("tx_packets", "tx_retries", "tx_failed", "beacon_loss")
+
+METRICS = tuple(STATION_FIELDS)
+
+def read_station_stats(interface="wlan0"):
+    """
+    Read the station statistics for the associated access point.
+
+    Args:
+        interface: The wireless interface to query
+
+    Returns:
+        dict: Metric values keyed by metric name, or None if not associated
+    """
+    output = run_command(["iw", "dev", interface, "station", "dump"])
+
+    if not output or "Station" not in output:
+        return None
+
+    stats = {}
+    for metric, pattern in STATION_FIELDS.items():
+        match = re.search(pattern, output, re.MULTILINE)
+        if match:
+            stats[metric] = float(match.group(1))
+
+    return stats
+
+def percentile(values, pct):
+    """
+    Compute a percentile of a sequence using linear interpolation.
+
+    Args:
+        values: The sample values
+        pct: The percentile to compute (0-100)
+
+    Returns:
+        float: The percentile value, or None if there are no values
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+
+    rank = (len(ordered) - 1) * (pct / 100.0)
+    lower = int(math.floor(rank))
+    upper = int(math.ceil(rank))
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+class RingBuffer:
+    """Fixed-capacity buffer of floats backed by a preallocated array."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = array('d', [0.0]) * capacity
+        self._start = 0
+        self._count = 0
+
+    def append(self, value):
+        """Append a value, overwriting the oldest one when full."""
+        end = (self._start + self._count) % self.capacity
+        self._data[end] = value
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def values(self, last=None):
+        """Return the stored values from oldest to newest, optionally only the last N."""
+        count = self._count if last is None else min(last, self._count)
+        first = self._start + self._count - count
+        return [self._data[(first + i) % self.capacity] for i in range(count)]
+
+    def __len__(self):
+        return self._count
+
+class LinkTelemetry:
+    """Samples link statistics into ring buffers and computes rolling aggregates."""
+
+    def __init__(self, interface="wlan0", interval=1.0, capacity=600, alpha=0.2):
+        self.interface = interface
+        self.interval = interval
+        self.capacity = capacity
+        self.alpha = alpha
+        self.timestamps = RingBuffer(capacity)
+        self.buffers = {metric: RingBuffer(capacity) for metric in METRICS}
+        self.ewma = {metric: None for metric in METRICS}
+        self._last_counters = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """
+        Take a single sample of the station statistics.
+
+        Returns:
+            dict: The recorded sample, or None if the adapter is not associated
+        """
+        try:
+            stats = read_station_stats(self.interface)
+        except Exception as e:
+            display_warning(f"Error reading station statistics: {str(e)}")
+            return None
+
+        if stats is None:
+            return None
+
+        record = {"timestamp": time.time()}
+        for metric in METRICS:
+            value = stats.get(metric, float('nan'))
+
+            if metric in COUNTER_METRICS and not math.isnan(value):
+                previous = self._last_counters.get(metric)
+                self._last_counters[metric] = value
+                # Without a previous value (the first sample, or after a reconnect
+                # restarted the counters from zero) there is no delta to record
+                value = value - previous if previous is not None and value >= previous else float('nan')
+
+            record[metric] = value
+
+        self.record(record)
+        return record
+
+    def record(self, record):
+        """Store a sample and update the running averages."""
+        with self._lock:
+            self.timestamps.append(record["timestamp"])
+            for metric in METRICS:
+                value = record.get(metric, float('nan'))
+                self.buffers[metric].append(value)
+                if math.isnan(value):
+                    continue
+                if self.ewma[metric] is None:
+                    self.ewma[metric] = value
+                else:
+                    self.ewma[metric] = self.alpha * value + (1 - self.alpha) * self.ewma[metric]
+
+    def start(self):
+        """Start sampling in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background sampler."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            self.sample()
+            self._stop_event.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def query(self, metric, window=None):
+        """
+        Compute aggregates for a metric.
+
+        Args:
+            metric: The metric name (see METRICS)
+            window: Only consider the most recent N samples
+
+        Returns:
+            dict: count, latest, ewma, min, max, p50, p90 and p99 for the metric
+        """
+        if metric not in self.buffers:
+            raise KeyError(f"Unknown metric: {metric}")
+
+        with self._lock:
+            values = [v for v in self.buffers[metric].values(window) if not math.isnan(v)]
+            ewma = self.ewma[metric]
+
+        if not values:
+            return {"count": 0, "latest": None, "ewma": None, "min": None, "max": None,
+                    "p50": None, "p90": None, "p99": None}
+
+        return {
+            "count": len(values),
+            "latest": values[-1],
+            "ewma": ewma,
+            "min": min(values),
+            "max": max(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99)
+        }
+
+    def summary(self, window=None):
+        """Return the aggregates for every metric."""
+        return {metric: self.query(metric, window) for metric in METRICS}
+
+    def samples(self):
+        """Return the buffered samples from oldest to newest."""
+        with self._lock:
+            timestamps = self.timestamps.values()
+            columns = {metric: self.buffers[metric].values() for metric in METRICS}
+
+        for i, timestamp in enumerate(timestamps):
+            sample = {"timestamp": timestamp}
+            for metric in METRICS:
+                value = columns[metric][i]
+                sample[metric] = None if math.isnan(value) else value
+            yield sample
+
+    def export_ndjson(self, path):
+        """
+        Export the buffered samples as newline-delimited JSON.
+
+        Args:
+            path: The file to write to
+
+        Returns:
+            int: The number of samples written, or -1 on failure
+        """
+        try:
+            count = 0
+            with open(path, 'w') as f:
+                for sample in self.samples():
+                    f.write(json.dumps(sample) + "\n")
+                    count += 1
+            return count
+        except Exception as e:
+            display_error(f"Error exporting telemetry: {str(e)}")
+            return -1
@@ -11,6 +11,8 @@ import time
 import datetime
 import subprocess
 from src.utils.command_runner import run_command, execute_with_sudo
+from src.link_state import get_link_state
+from src.phy_capabilities import get_phy
 from src.utils.ui_helpers import display_message, display_success, display_error, display_warning
 
 def capture_wifi_traffic(interface="wlan0", duration=30, filename=None):
@@ -101,15 +103,29 @@ def analyze_wifi_interference():
                         else:
                             interference["channels"][channel] = 1
         
-        # Find the least congested channels
+        # Find the least congested channels the adapter can use
         if interference["channels"]:
+            phy = get_phy()
+            
+            def congestion(channel):
+                return interference["channels"].get(str(channel), 0)
+            
             # For 2.4 GHz, recommend channels 1, 6, or 11
-            channels_2g = {k: v for k, v in interference["channels"].items() if int(k) <= 14}
-            best_2g = min([1, 6, 11], key=lambda c: channels_2g.get(str(c), 0))
+            usable_2g = ({channel["channel"] for channel in phy.channels("2.4 GHz", usable=True)}
+                         if phy else {1, 6, 11})
+            candidates_2g = [channel for channel in (1, 6, 11) if channel in usable_2g]
+            best_2g = min(candidates_2g, key=congestion) if candidates_2g else None
             
-            # For 5 GHz, find the least congested channel
-            channels_5g = {k: v for k, v in interference["channels"].items() if int(k) > 14}
-            best_5g = min(channels_5g.items(), key=lambda x: x[1])[0] if channels_5g else None
+            # For 5 GHz, find the least congested channel the adapter allows,
+            # preferring channels that need no radar detection
+            if phy:
+                channels_5g = phy.channels("5 GHz", usable=True)
+                best_5g = min(channels_5g, key=lambda channel: (congestion(channel["channel"]), channel["dfs"]),
+                              default=None)
+                best_5g = best_5g["channel"] if best_5g else None
+            else:
+                channels_5g = {k: v for k, v in interference["channels"].items() if int(k) > 14}
+                best_5g = min(channels_5g.items(), key=lambda x: x[1])[0] if channels_5g else None
             
             if best_2g:
                 interference["recommendations"].append(f"For 2.4 GHz, use channel {best_2g}")
@@ -256,6 +272,49 @@ def check_system_logs():
         display_error(f"Error checking system logs: {str(e)}")
         return "Error retrieving system logs."
 
+# Log messages relevant to WiFi
+WIFI_LOG_PATTERN = re.compile(r"wifi|wlan|iwlwifi|80211", re.IGNORECASE)
+
+def stream_system_logs(since="1 hour ago", units=("NetworkManager", "wpa_supplicant")):
+    """
+    Yield WiFi-related journal entries as they are read.
+    
+    The journal is read line by line from a pipe, so callers can show the
+    first entries before journalctl has finished, and stop early.
+    
+    Args:
+        since: Passed to journalctl --since
+        units: Systemd units whose entries are read
+        
+    Yields:
+        tuple: (timestamp, source, message)
+    """
+    command = ["journalctl", "--no-pager", "-o", "short-iso", "--since", since]
+    for unit in units:
+        command.extend(["-u", unit])
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   universal_newlines=True)
+    except OSError as e:
+        display_error(f"Error reading system logs: {str(e)}")
+        return
+    
+    try:
+        for line in process.stdout:
+            if not WIFI_LOG_PATTERN.search(line):
+                continue
+            # "2024-05-01T10:00:00+0000 host NetworkManager[812]: message"
+            fields = line.rstrip("\n").split(" ", 3)
+            if len(fields) < 4:
+                continue
+            source, _, message = fields[3].partition(": ")
+            yield fields[0], re.sub(r"\[\d+\]$", "", source), message
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.terminate()
+        process.wait()
+
 def run_network_diagnostics():
     """
     Run comprehensive network diagnostics.
@@ -268,16 +327,16 @@ def run_network_diagnostics():
         
         diagnostics = {}
         
+        # Collect interface, address and link details in one pass
+        link_state = get_link_state("wlan0")
+        
         # Check if the interface is up
-        interface_status = run_command(["ip", "link", "show", "wlan0"])
-        diagnostics["interface_status"] = "UP" if "UP" in interface_status else "DOWN"
+        diagnostics["interface_status"] = "UP" if link_state["up"] else "DOWN"
         
         # Check if the interface has an IP address
-        ip_address = run_command(["ip", "addr", "show", "wlan0"])
-        if ip_address:
-            ip_match = re.search(r"inet ([\d.]+)", ip_address)
-            if ip_match:
-                diagnostics["ip_address"] = ip_match.group(1)
+        if link_state["exists"]:
+            if link_state["ipv4"]:
+                diagnostics["ip_address"] = link_state["ipv4"]
             else:
                 # No IP address found, but interface exists
                 diagnostics["ip_address"] = "None"
@@ -312,19 +371,12 @@ def run_network_diagnostics():
         diagnostics["dns_resolution"] = "Success" if dns_resolution else "Failed"
         
         # Check WiFi signal strength
-        iwconfig_output = run_command(["iwconfig", "wlan0"])
-        if iwconfig_output:
-            signal_match = re.search(r"Signal level=(-\d+) dBm", iwconfig_output)
-            diagnostics["signal_strength"] = f"{signal_match.group(1)} dBm" if signal_match else "Unknown"
-        else:
-            diagnostics["signal_strength"] = "Unknown"
+        signal = link_state["signal"]
+        diagnostics["signal_strength"] = f"{signal} dBm" if signal is not None else "Unknown"
         
         # Check WiFi connection speed
-        if iwconfig_output:
-            speed_match = re.search(r"Bit Rate=([\d.]+) Mb/s", iwconfig_output)
-            diagnostics["connection_speed"] = f"{speed_match.group(1)} Mb/s" if speed_match else "Unknown"
-        else:
-            diagnostics["connection_speed"] = "Unknown"
+        bitrate = link_state["bitrate"]
+        diagnostics["connection_speed"] = f"{bitrate:g} Mb/s" if bitrate else "Unknown"
             
         # Check wpa_supplicant status
         wpa_status = run_command(["systemctl", "status", "wpa_supplicant.service"])
@@ -12,10 +12,16 @@ from src.troubleshooting import (
     analyze_wifi_interference,
     diagnose_connection_timing,
     check_driver_debug_info,
-    check_system_logs,
+    stream_system_logs,
     run_network_diagnostics
 )
 from src.fixes import restart_wpa_supplicant
+from src.telemetry import LinkTelemetry, METRICS
+from src.benchmark import DEFAULT_PORT, run_benchmark, load_results, compare_results
+from src.utils.ui_helpers import display_table, stream_table
+
+# Log entries shown before asking to continue
+LOG_PAGE_SIZE = 40
 
 def troubleshooting_menu():
     """Display the advanced troubleshooting menu."""
@@ -30,6 +36,8 @@ def troubleshooting_menu():
         print("5. Check System Logs")
         print("6. Run Comprehensive Network Diagnostics")
         print("7. Restart wpa_supplicant Service")
+        print("8. Monitor Link Quality")
+        print("9. Throughput Benchmark")
         print("b. Back to Advanced Options")
         
         choice = input("\nSelect an option: ").strip().lower()
@@ -48,6 +56,10 @@ def troubleshooting_menu():
             run_diagnostics_menu()
         elif choice == '7':
             restart_wpa_supplicant_menu()
+        elif choice == '8':
+            monitor_link_quality_menu()
+        elif choice == '9':
+            benchmark_menu()
         elif choice == 'b':
             break
         else:
@@ -162,11 +174,13 @@ def check_logs_menu():
     os.system('clear' if os.name == 'posix' else 'cls')
     display_header("Check System Logs")
     
-    print("\nRetrieving WiFi-related system logs...")
-    logs = check_system_logs()
+    print("\nWiFi-related system logs from the last hour:\n")
+    # Entries are shown as journalctl produces them, a page at a time
+    count = stream_table(["Time", "Source", "Message"], stream_system_logs(),
+                         widths=[24, 16, 80], page_size=LOG_PAGE_SIZE)
     
-    print("\nSystem Logs:")
-    print(logs)
+    if not count:
+        display_message("No WiFi-related log entries found.", color='yellow')
     
     input("\nPress Enter to continue...")
 
@@ -266,4 +280,108 @@ def restart_wpa_supplicant_menu():
             display_error("Failed to restart wpa_supplicant service.")
             print("\nYou may need to check if the service is installed or try restarting it manually.")
     
-    input("\nPress Enter to continue...")
\ No newline at end of file
+    input("\nPress Enter to continue...")
+
+def monitor_link_quality_menu():
+    """Menu for monitoring link quality over time."""
+    os.system('clear' if os.name == 'posix' else 'cls')
+    display_header("Monitor Link Quality")
+    
+    print("\nThis will sample retries, tx failures, bitrate and beacon loss")
+    print("from the station statistics at a fixed rate.")
+    
+    interface = input("\nEnter the wireless interface (default: wlan0): ").strip() or "wlan0"
+    
+    try:
+        duration = int(input("Enter the monitoring duration in seconds (default: 30): ").strip() or "30")
+        interval = float(input("Enter the sampling interval in seconds (default: 1): ").strip() or "1")
+    except ValueError:
+        duration = 30
+        interval = 1.0
+    
+    telemetry = LinkTelemetry(interface, interval=interval)
+    
+    print(f"\nMonitoring {interface} for {duration} seconds...")
+    telemetry.start()
+    try:
+        time.sleep(duration)
+    except KeyboardInterrupt:
+        pass
+    telemetry.stop()
+    
+    summary = telemetry.summary()
+    
+    if summary["signal"]["count"] == 0:
+        display_warning("No samples collected. Is the adapter associated with an access point?")
+    else:
+        print("\nLink Quality Summary:")
+        print(f"  {'Metric':<14} {'Latest':>9} {'EWMA':>9} {'Min':>9} {'Max':>9} {'P50':>9} {'P90':>9}")
+        for metric in METRICS:
+            stats = summary[metric]
+            if stats["count"] == 0:
+                continue
+            print(f"  {metric:<14} {stats['latest']:>9.1f} {stats['ewma']:>9.1f} {stats['min']:>9.1f} "
+                  f"{stats['max']:>9.1f} {stats['p50']:>9.1f} {stats['p90']:>9.1f}")
+        
+        path = input("\nExport samples to NDJSON file (leave empty to skip): ").strip()
+        if path:
+            count = telemetry.export_ndjson(os.path.expanduser(path))
+            if count >= 0:
+                display_success(f"Exported {count} samples to {path}")
+    
+    input("\nPress Enter to continue...")
+
+def benchmark_menu():
+    """Menu for running and comparing throughput benchmarks."""
+    os.system('clear' if os.name == 'posix' else 'cls')
+    display_header("Throughput Benchmark")
+    
+    print("\nThis measures throughput, latency and retransmits against a benchmark server.")
+    print("Start the server on a LAN host with: python -m src.benchmark")
+    
+    print("\n1. Run Benchmark")
+    print("2. Compare Previous Runs")
+    
+    choice = input("\nSelect an option: ").strip()
+    
+    if choice == '1':
+        host = input("\nEnter the benchmark server address: ").strip()
+        if not host:
+            display_error("No server address specified.")
+            input("\nPress Enter to continue...")
+            return
+        
+        try:
+            port = int(input(f"Enter the server port (default: {DEFAULT_PORT}): ").strip() or DEFAULT_PORT)
+            duration = float(input("Enter the test duration per direction in seconds (default: 5): ").strip() or "5")
+        except ValueError:
+            port = DEFAULT_PORT
+            duration = 5.0
+        
+        label = input("Enter a label for this run (e.g. power_save=0): ").strip() or None
+        
+        result = run_benchmark(host, port, duration, label)
+        if result:
+            print(f"\nResults for {result['label']}:")
+            print(f"  Upload: {result['upload_mbps']:.1f} Mb/s")
+            print(f"  Download: {result['download_mbps']:.1f} Mb/s")
+            if result["rtt_p50"] is not None:
+                print(f"  RTT p50/p90/p99: {result['rtt_p50']:.1f} / {result['rtt_p90']:.1f} / {result['rtt_p99']:.1f} ms")
+            print(f"  Packet Loss: {result['loss']:.1f}%")
+            print(f"  Retransmits (up/down): {result['upload_retransmits']} / {result['download_retransmits']}")
+    elif choice == '2':
+        results = load_results()
+        if not results:
+            display_warning("No benchmark results recorded yet.")
+        else:
+            try:
+                count = int(input("\nNumber of recent runs to compare (default: 3): ").strip() or "3")
+            except ValueError:
+                count = 3
+            headers, rows = compare_results(results[-count:])
+            print()
+            display_table(headers, rows)
+    else:
+        display_error("Invalid option.")
+    
+    input("\nPress Enter to continue...")
@@ -1,4 +1,5 @@
 import subprocess
+from src.utils.privileged_helper import get_helper
 
 def run_command(command, get_output=True):
     """Run a shell command and return its output."""
@@ -16,6 +17,10 @@ def check_command(command):
     """Check if a command is available on the system."""
     return run_command(['which', command]) is not None
 
-def execute_with_sudo(command):
-    """Execute a command with sudo privileges."""
-    return run_command(['sudo'] + command)
\ No newline at end of file
+def execute_with_sudo(command, input_text=None):
+    """Execute a command with root privileges through the session's privileged helper."""
+    return get_helper().run(command, input_text)
+
+def execute_batch_with_sudo(commands, stop_on_error=True, inputs=None):
+    """Execute several commands with root privileges in a single round trip."""
+    return get_helper().run_batch(commands, stop_on_error, inputs)
\ No newline at end of file
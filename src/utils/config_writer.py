@@ -0,0 +1,237 @@
+"""
+Transactional configuration file writer.
+
+Files are replaced atomically (write to a temporary file in the same
+directory, fsync, rename), only when their content actually changes, and the
+previous version is kept as a numbered backup so it can be rolled back.
+Files the current user cannot write are committed by the session's
+privileged helper (see src.utils.privileged_helper), so writing them needs no
+extra privilege escalation.
+"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+from urllib.parse import quote
+
+SYSTEM_BACKUP_DIR = "/var/lib/intel-wifi-fixer/backups"
+USER_BACKUP_DIR = os.path.join(
+    os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share")),
+    "intel-wifi-fixer", "backups"
+)
+
+# Backups kept per file
+KEEP_BACKUPS = 5
+
+class ConfigWriteError(Exception):
+    """Raised when a configuration file cannot be written."""
+
+def content_hash(content):
+    """Return the SHA-256 hex digest of a text."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+def read_config(path):
+    """Read a configuration file, returning an empty string if it does not exist."""
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
+def _can_write(path):
+    directory = os.path.dirname(path) or "."
+    while not os.path.exists(directory):
+        directory = os.path.dirname(directory)
+    if not os.access(directory, os.W_OK):
+        return False
+    return not os.path.exists(path) or os.access(path, os.W_OK)
+
+def _default_backup_dir(path):
+    if os.geteuid() == 0 or not _can_write(path):
+        return SYSTEM_BACKUP_DIR
+    return USER_BACKUP_DIR
+
+def _backup_prefix(path, backup_dir):
+    return os.path.join(backup_dir, quote(os.path.abspath(path), safe=""))
+
+def list_backups(path, backup_dir=None):
+    """
+    List the backups of a file.
+
+    Returns:
+        list: (version, backup path) tuples, oldest first
+    """
+    backup_dir = backup_dir or _default_backup_dir(path)
+    prefix = _backup_prefix(path, backup_dir)
+    backups = []
+    try:
+        names = os.listdir(backup_dir)
+    except OSError:
+        return backups
+    for name in names:
+        candidate = os.path.join(backup_dir, name)
+        version = candidate[len(prefix) + 1:]
+        if candidate.startswith(prefix + ".") and version.isdigit():
+            backups.append((int(version), candidate))
+    return sorted(backups)
+
+def commit_config(path, content, mode=0o644, backup_dir=None, keep=KEEP_BACKUPS):
+    """
+    Back up a file and atomically replace its content.
+
+    This is the part that needs write access to the file; write_config runs
+    it in the privileged helper when the current user lacks that access.
+    """
+    backup_dir = backup_dir or SYSTEM_BACKUP_DIR
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    if os.path.exists(path):
+        os.makedirs(backup_dir, mode=0o700, exist_ok=True)
+        backups = list_backups(path, backup_dir)
+        version = backups[-1][0] + 1 if backups else 1
+        shutil.copy2(path, f"{_backup_prefix(path, backup_dir)}.{version}")
+        for _, old_backup in backups[:max(len(backups) + 1 - keep, 0)]:
+            os.unlink(old_backup)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    # Make the rename itself durable
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+def write_config(path, content, mode=0o644, backup_dir=None, keep=KEEP_BACKUPS):
+    """
+    Write a configuration file if its content differs.
+
+    Args:
+        path: The file to write
+        content: The complete new content
+        mode: The file mode to set
+        backup_dir: Where to keep backups (defaults to a per-user directory for
+                    files the user owns, a system directory otherwise); files
+                    written by the privileged helper are always backed up to
+                    SYSTEM_BACKUP_DIR with the default retention
+        keep: The number of backups to keep
+
+    Returns:
+        bool: True if the file was written, False if it was already up to date
+
+    Raises:
+        ConfigWriteError: If the file could not be written
+    """
+    if not content.endswith("\n"):
+        content += "\n"
+    if content_hash(read_config(path)) == content_hash(content):
+        return False
+
+    try:
+        if _can_write(path):
+            commit_config(path, content, mode, backup_dir or _default_backup_dir(path), keep)
+            return True
+    except OSError as e:
+        raise ConfigWriteError(f"Could not write {path}: {str(e)}")
+
+    # The privileged helper does the backup, write and rename
+    from src.utils.privileged_helper import get_helper, HelperError
+    try:
+        get_helper().write_config(path, content, mode)
+    except HelperError as e:
+        raise ConfigWriteError(f"Could not write {path}: {str(e)}")
+    return True
+
+def rollback_config(path, version=None, backup_dir=None):
+    """
+    Restore a file from a backup.
+
+    Args:
+        path: The file to restore
+        version: The backup version; the most recent one if omitted
+        backup_dir: The directory the backups were written to
+
+    Returns:
+        bool: True if the file was restored
+    """
+    if not _can_write(path):
+        # System backups are only readable by root
+        from src.utils.privileged_helper import get_helper, HelperError
+        try:
+            get_helper().rollback_config(path, version)
+        except HelperError as e:
+            raise ConfigWriteError(str(e))
+        return True
+
+    backups = dict(list_backups(path, backup_dir))
+    if not backups:
+        raise ConfigWriteError(f"No backups of {path}")
+    version = version or max(backups)
+    if version not in backups:
+        raise ConfigWriteError(f"No backup version {version} of {path}")
+    with open(backups[version], 'r') as f:
+        content = f.read()
+    return write_config(path, content, backup_dir=backup_dir)
+
+def merge_rt_tables(content, table_id, table_name):
+    """
+    Add or update a routing table entry in /etc/iproute2/rt_tables content.
+
+    Entries that reuse the table's ID or name are replaced rather than
+    duplicated; comments and unrelated entries are kept as they are.
+
+    Returns:
+        str: The merged content
+    """
+    entry = f"{table_id}\t{table_name}"
+    lines = []
+    merged = False
+    for line in content.splitlines():
+        fields = line.split("#", 1)[0].split()
+        if len(fields) >= 2 and (fields[0] == str(table_id) or fields[1] == table_name):
+            if not merged:
+                lines.append(entry)
+                merged = True
+            continue
+        lines.append(line)
+    if not merged:
+        lines.append(entry)
+    return "\n".join(lines) + "\n"
+
+def remove_rt_table(content, table_name):
+    """
+    Remove a routing table entry from /etc/iproute2/rt_tables content.
+
+    Returns:
+        str: The content without entries named table_name
+    """
+    lines = [line for line in content.splitlines()
+             if line.split("#", 1)[0].split()[1:2] != [table_name]]
+    return "\n".join(lines) + "\n"
+
+def parse_rt_tables(content):
+    """
+    Parse /etc/iproute2/rt_tables content.
+
+    Returns:
+        dict: Table IDs keyed by table name
+    """
+    tables = {}
+    for line in content.splitlines():
+        fields = line.split("#", 1)[0].split()
+        if len(fields) >= 2 and fields[0].isdigit():
+            tables[fields[1]] = int(fields[0])
+    return tables
@@ -0,0 +1,128 @@
+"""
+Minimal DER decoder.
+
+Only what X.509 certificates need is implemented: walking TLVs, and decoding
+object identifiers, integers, bit strings, strings and times. Values are
+located by offsets into the original buffer, so nothing is copied until a
+field is actually decoded.
+"""
+
+from datetime import datetime, timezone
+
+BOOLEAN = 0x01
+INTEGER = 0x02
+BIT_STRING = 0x03
+OCTET_STRING = 0x04
+NULL = 0x05
+OID = 0x06
+UTF8_STRING = 0x0c
+PRINTABLE_STRING = 0x13
+T61_STRING = 0x14
+IA5_STRING = 0x16
+UTC_TIME = 0x17
+GENERALIZED_TIME = 0x18
+VISIBLE_STRING = 0x1a
+UNIVERSAL_STRING = 0x1c
+BMP_STRING = 0x1e
+SEQUENCE = 0x30
+SET = 0x31
+
+class DERError(ValueError):
+    """Raised when data is not valid DER."""
+
+def read_tlv(data, offset=0):
+    """
+    Read one tag-length-value element.
+
+    Returns:
+        tuple: (tag, value start, value end); the next element starts at value end
+    """
+    if offset + 2 > len(data):
+        raise DERError("Truncated element")
+    tag = data[offset]
+    if tag & 0x1f == 0x1f:
+        raise DERError("Multi-byte tags are not supported")
+    length = data[offset + 1]
+    start = offset + 2
+    if length & 0x80:
+        count = length & 0x7f
+        if count == 0 or count > 4 or start + count > len(data):
+            raise DERError("Invalid length")
+        length = int.from_bytes(data[start:start + count], "big")
+        start += count
+    end = start + length
+    if end > len(data):
+        raise DERError("Element extends past the end of the data")
+    return tag, start, end
+
+def encode(tag, value):
+    """Encode one tag-length-value element."""
+    length = len(value)
+    if length < 0x80:
+        return bytes([tag, length]) + value
+    size = (length.bit_length() + 7) // 8
+    return bytes([tag, 0x80 | size]) + length.to_bytes(size, "big") + value
+
+def children(data, start, end):
+    """Yield (tag, start, end) for each element of a constructed value."""
+    offset = start
+    while offset < end:
+        tag, value_start, value_end = read_tlv(data, offset)
+        yield tag, value_start, value_end
+        offset = value_end
+
+def element(data, start, end, index):
+    """Return the index-th child element of a constructed value."""
+    for i, child in enumerate(children(data, start, end)):
+        if i == index:
+            return child
+    raise DERError(f"Missing element {index}")
+
+def decode_oid(value):
+    """Decode an OBJECT IDENTIFIER value to dotted form."""
+    if not value:
+        raise DERError("Empty object identifier")
+    arcs = []
+    number = 0
+    for byte in value:
+        number = (number << 7) | (byte & 0x7f)
+        if not byte & 0x80:
+            arcs.append(number)
+            number = 0
+    first = min(arcs[0] // 40, 2)
+    return ".".join(map(str, [first, arcs[0] - 40 * first] + arcs[1:]))
+
+def decode_integer(value):
+    return int.from_bytes(value, "big", signed=True)
+
+def decode_bit_string(value):
+    """Return (bytes, number of unused bits in the last byte)."""
+    if not value:
+        raise DERError("Empty bit string")
+    return value[1:], value[0]
+
+def decode_string(tag, value):
+    if tag == BMP_STRING:
+        return value.decode("utf-16-be", "replace")
+    if tag == UNIVERSAL_STRING:
+        return value.decode("utf-32-be", "replace")
+    if tag in (PRINTABLE_STRING, IA5_STRING, VISIBLE_STRING):
+        return value.decode("ascii", "replace")
+    if tag == T61_STRING:
+        return value.decode("latin-1")
+    return value.decode("utf-8", "replace")
+
+def decode_time(tag, value):
+    """Decode a UTCTime or GeneralizedTime to an aware UTC datetime."""
+    text = value.decode("ascii", "replace")
+    if not text.endswith("Z"):
+        raise DERError(f"Time without UTC designator: {text}")
+    if tag == UTC_TIME:
+        year = int(text[:2])
+        # RFC 5280: two-digit years 50-99 are 19xx
+        text = ("19" if year >= 50 else "20") + text
+    elif tag != GENERALIZED_TIME:
+        raise DERError(f"Unexpected time tag 0x{tag:02x}")
+    # Seconds may be omitted and GeneralizedTime may carry fractions
+    digits = text[:-1].split(".")[0].ljust(14, "0")
+    return datetime.strptime(digits, "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
@@ -0,0 +1,230 @@
+"""
+Minimal netlink clients for nl80211 queries and link events.
+
+Only the handful of requests the tool needs are implemented: resolving the
+nl80211 family, GET_INTERFACE and a GET_STATION dump for one interface, and
+a route netlink subscription to link add/remove notifications.
+"""
+
+import os
+import select
+import socket
+import struct
+
+NETLINK_ROUTE = 0
+NETLINK_GENERIC = 16
+
+RTMGRP_LINK = 0x1
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+IFLA_IFNAME = 3
+
+NLM_F_REQUEST = 0x1
+NLM_F_ACK = 0x4
+NLM_F_DUMP = 0x300
+
+NLMSG_ERROR = 0x2
+NLMSG_DONE = 0x3
+
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+
+NL80211_CMD_GET_INTERFACE = 5
+NL80211_CMD_GET_STATION = 17
+
+NL80211_ATTR_WIPHY = 1
+NL80211_ATTR_IFINDEX = 3
+NL80211_ATTR_IFNAME = 4
+NL80211_ATTR_MAC = 6
+NL80211_ATTR_STA_INFO = 21
+NL80211_ATTR_WIPHY_FREQ = 38
+NL80211_ATTR_SSID = 52
+NL80211_ATTR_WIPHY_TX_POWER_LEVEL = 98
+NL80211_ATTR_CHANNEL_WIDTH = 159
+
+NL80211_STA_INFO_SIGNAL = 7
+NL80211_STA_INFO_TX_BITRATE = 8
+NL80211_STA_INFO_RX_BITRATE = 14
+
+NL80211_RATE_INFO_BITRATE = 1
+NL80211_RATE_INFO_BITRATE32 = 5
+
+NLA_TYPE_MASK = 0x3fff
+
+class NetlinkError(Exception):
+    """Raised when the kernel rejects a netlink request."""
+
+def pack_attr(attr_type, payload):
+    """Pack a single netlink attribute, padded to a 4-byte boundary."""
+    length = 4 + len(payload)
+    return struct.pack("HH", length, attr_type) + payload + b"\0" * ((4 - length % 4) % 4)
+
+def parse_attrs(data):
+    """
+    Parse a block of netlink attributes.
+
+    Returns:
+        dict: Raw attribute payloads keyed by attribute type
+    """
+    attrs = {}
+    offset = 0
+    while offset + 4 <= len(data):
+        length, attr_type = struct.unpack_from("HH", data, offset)
+        if length < 4:
+            break
+        attrs[attr_type & NLA_TYPE_MASK] = data[offset + 4:offset + length]
+        offset += (length + 3) & ~3
+    return attrs
+
+def attr_u32(attrs, attr_type):
+    """Return an attribute as an unsigned 32-bit integer, or None."""
+    value = attrs.get(attr_type)
+    return struct.unpack("I", value[:4])[0] if value and len(value) >= 4 else None
+
+class GenlSocket:
+    """A generic netlink socket bound to one family."""
+
+    def __init__(self, family_name):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_GENERIC)
+        self.sock.bind((0, 0))
+        self.seq = 0
+        self.family_id = GENL_ID_CTRL
+        replies = self.request(CTRL_CMD_GETFAMILY,
+                               pack_attr(CTRL_ATTR_FAMILY_NAME, family_name.encode() + b"\0"))
+        family_id = attr_u32(replies[0], CTRL_ATTR_FAMILY_ID) if replies else None
+        if family_id is None:
+            self.close()
+            raise NetlinkError(f"Generic netlink family not found: {family_name}")
+        # The family id is a u16 stored in a 4-byte padded attribute
+        self.family_id = family_id & 0xffff
+
+    def request(self, cmd, payload=b"", dump=False):
+        """
+        Send a request and collect every reply.
+
+        Returns:
+            list: One attribute dict per reply message
+        """
+        self.seq += 1
+        flags = NLM_F_REQUEST | (NLM_F_DUMP if dump else NLM_F_ACK)
+        body = struct.pack("BBH", cmd, 1, 0) + payload
+        header = struct.pack("IHHII", 16 + len(body), self.family_id, flags, self.seq, 0)
+        self.sock.send(header + body)
+
+        replies = []
+        while True:
+            data = self.sock.recv(65536)
+            offset = 0
+            while offset + 16 <= len(data):
+                length, msg_type, _, seq, _ = struct.unpack_from("IHHII", data, offset)
+                if length < 16:
+                    return replies
+                if msg_type == NLMSG_DONE:
+                    return replies
+                if msg_type == NLMSG_ERROR:
+                    error = struct.unpack_from("i", data, offset + 16)[0]
+                    if error != 0:
+                        raise NetlinkError(os.strerror(-error))
+                    return replies
+                replies.append(parse_attrs(data[offset + 20:offset + length]))
+                offset += (length + 3) & ~3
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class LinkMonitor:
+    """
+    A route netlink socket subscribed to link notifications.
+
+    Create the monitor before triggering a change (e.g. loading a driver) so
+    the resulting RTM_NEWLINK/RTM_DELLINK events are not missed.
+    """
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        self.sock.bind((0, RTMGRP_LINK))
+
+    def read(self, timeout):
+        """
+        Wait up to ``timeout`` seconds for link events.
+
+        Returns:
+            list: (message type, interface name) tuples; empty on timeout
+        """
+        ready, _, _ = select.select([self.sock], [], [], max(timeout, 0))
+        if not ready:
+            return []
+
+        data = self.sock.recv(65536)
+        events = []
+        offset = 0
+        while offset + 16 <= len(data):
+            length, msg_type = struct.unpack_from("IH", data, offset)
+            if length < 16:
+                break
+            if msg_type in (RTM_NEWLINK, RTM_DELLINK):
+                # nlmsghdr (16 bytes) is followed by struct ifinfomsg (16 bytes)
+                attrs = parse_attrs(data[offset + 32:offset + length])
+                name = attrs.get(IFLA_IFNAME, b"").rstrip(b"\0").decode("utf-8", "replace")
+                events.append((msg_type, name))
+            offset += (length + 3) & ~3
+        return events
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def nl80211_link_info(interface):
+    """
+    Query nl80211 for the interface and its associated station in one session.
+
+    Args:
+        interface: The wireless interface name
+
+    Returns:
+        dict: ssid, frequency (MHz), tx_power (dBm), bitrate (Mb/s) and signal (dBm)
+    """
+    ifindex = socket.if_nametoindex(interface)
+    ifindex_attr = pack_attr(NL80211_ATTR_IFINDEX, struct.pack("I", ifindex))
+
+    info = {}
+    with GenlSocket("nl80211") as nl:
+        replies = nl.request(NL80211_CMD_GET_INTERFACE, ifindex_attr)
+        if replies:
+            attrs = replies[0]
+            if NL80211_ATTR_SSID in attrs:
+                info["ssid"] = attrs[NL80211_ATTR_SSID].decode("utf-8", "replace")
+            info["frequency"] = attr_u32(attrs, NL80211_ATTR_WIPHY_FREQ)
+            tx_power = attr_u32(attrs, NL80211_ATTR_WIPHY_TX_POWER_LEVEL)
+            if tx_power is not None:
+                # Reported in mBm
+                info["tx_power"] = tx_power / 100.0
+            info["phy"] = attr_u32(attrs, NL80211_ATTR_WIPHY)
+
+        for station in nl.request(NL80211_CMD_GET_STATION, ifindex_attr, dump=True):
+            sta_info = parse_attrs(station.get(NL80211_ATTR_STA_INFO, b""))
+            if NL80211_STA_INFO_SIGNAL in sta_info:
+                info["signal"] = struct.unpack("b", sta_info[NL80211_STA_INFO_SIGNAL][:1])[0]
+            rate = parse_attrs(sta_info.get(NL80211_STA_INFO_TX_BITRATE, b""))
+            bitrate = attr_u32(rate, NL80211_RATE_INFO_BITRATE32)
+            if bitrate is None and NL80211_RATE_INFO_BITRATE in rate:
+                bitrate = struct.unpack("H", rate[NL80211_RATE_INFO_BITRATE][:2])[0]
+            if bitrate is not None:
+                # Reported in units of 100 kbit/s
+                info["bitrate"] = bitrate / 10.0
+            break
+
+    return info
@@ -0,0 +1,444 @@
+"""
+Privileged helper process.
+
+Instead of forking sudo for every command, the session starts one root
+helper (a single password prompt) and sends it operations over a pipe as
+JSON lines:
+
+    {"id": 1, "operations": [{"op": "run", "argv": ["ip", "link", "set", "wlan0", "up"]}],
+     "stop_on_error": false}
+
+The helper replies with one result per operation. Only the commands and
+paths in the allowlist below are accepted, and commands are executed without
+a shell. When the session already runs as root, operations are executed
+in-process with the same checks.
+
+    sudo python -m src.utils.privileged_helper
+"""
+
+import os
+import re
+import sys
+import json
+import base64
+import atexit
+import threading
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Directories cp/rm/wget may write to. None of them is writable by users, so
+# a path inside cannot be swapped for a symlink between the check and the write.
+WRITABLE_DIRS = ("/usr/lib/firmware", "/lib/firmware", "/usr/local/share/ca-certificates")
+# Directories write_config/rollback_config may replace files in
+CONFIG_DIRS = ("/etc/modprobe.d", "/etc/systemd/system", "/etc/iproute2", "/etc/NetworkManager")
+# File modes write_config may set
+CONFIG_MODES = (0o644, 0o600)
+
+# Directories store_ca/remove_ca may manage (see src.ca_store)
+CA_STORE_DIRS = ("/etc/intel-wifi-fixer/ca-certificates",)
+
+SYSTEMCTL_ACTIONS = {"start", "stop", "restart", "enable", "disable", "daemon-reload"}
+SYSCTL_KEYS = {"net.ipv4.fib_multipath_hash_policy"}
+# Per-application routing cgroups and nftables table (see policy_routing)
+ROUTING_CGROUP_ROOT = "/sys/fs/cgroup/intel-wifi-fixer"
+NFT_TABLE = "inet intel_wifi_fixer"
+
+def _under(path, directories):
+    path = os.path.normpath(os.path.abspath(path))
+    return any(path == directory or path.startswith(directory + os.sep) for directory in directories)
+
+def _writable(path):
+    return _under(os.path.realpath(path), WRITABLE_DIRS)
+
+# `ip` objects and actions the tools use; `netns`/`vrf exec` would run arbitrary commands
+IP_ACTIONS = {"link": {"show"}, "route": {"show", "replace", "del", "delete", "flush"},
+              "rule": {"show", "add", "del", "delete"}}
+IP_FORBIDDEN = {"netns", "vrf", "exec"}
+IP_BATCH = ["-force", "-batch", "-"]
+MODULE_PATTERN = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_-]*")
+MODULE_PARAMETER_PATTERN = re.compile(r"[A-Za-z0-9_]+=[\w.,:-]*")
+
+def _ip_command_ok(args):
+    if args[:2] == ["link", "set"]:
+        return len(args) == 4 and not args[2].startswith("-") and args[3] in ("up", "down")
+    if len(args) < 2 or args[1] not in IP_ACTIONS.get(args[0], ()):
+        return False
+    return not any(arg in IP_FORBIDDEN or arg.startswith("-") for arg in args)
+
+def _ip_batch_ok(text):
+    # Each line of an `ip -batch` is an ip command without the executable
+    return all(_ip_command_ok(line.split()) for line in text.splitlines() if line.strip())
+
+def _modprobe_ok(args):
+    # Only `modprobe -r MODULE...` and `modprobe MODULE [param=value...]`; no
+    # -C/--config or -d, which would load configuration or modules from elsewhere
+    if args[:1] == ["-r"]:
+        return len(args) > 1 and all(MODULE_PATTERN.fullmatch(arg) for arg in args[1:])
+    return bool(args) and MODULE_PATTERN.fullmatch(args[0]) is not None and all(
+        MODULE_PARAMETER_PATTERN.fullmatch(arg) for arg in args[1:])
+
+def _wget_ok(args):
+    # Exactly `wget URL -O TARGET`: wget honours the last -O and has options
+    # such as --post-file that would read or send other files
+    if len(args) != 3 or args.count("-O") != 1 or args[-1] == "-O":
+        return False
+    index = args.index("-O")
+    target = args[index + 1]
+    url = args[2] if index == 0 else args[0]
+    return url.startswith("https://") and not target.startswith("-") and _writable(target)
+
+def _cp_ok(args):
+    # No options at all, so -t/--target-directory cannot move the destination
+    return len(args) == 2 and not any(arg.startswith("-") for arg in args) and _writable(args[1])
+
+# Argument checks per allowed executable
+ALLOWED_COMMANDS = {
+    "ip": lambda args: args == IP_BATCH or _ip_command_ok(args),
+    "iw": lambda args: True,
+    "nmcli": lambda args: True,
+    "modprobe": _modprobe_ok,
+    "rfkill": lambda args: args[:1] in (["block"], ["unblock"]),
+    "systemctl": lambda args: bool(args) and args[0] in SYSTEMCTL_ACTIONS,
+    "sysctl": lambda args: len(args) == 2 and args[0] == "-w" and (
+        args[1].split("=")[0] in SYSCTL_KEYS or re.fullmatch(r"net\.ipv4\.conf\.[\w.-]+\.rp_filter=[012]", args[1])),
+    "update-ca-certificates": lambda args: not args,
+    "cp": _cp_ok,
+    "rm": lambda args: bool(args) and all(not arg.startswith("-") and _writable(arg) for arg in args),
+    "wget": _wget_ok,
+    "mkdir": lambda args: bool(args) and all(_under(arg, (ROUTING_CGROUP_ROOT,)) for arg in args if arg != "-p"),
+    "rmdir": lambda args: bool(args) and all(_under(arg, (ROUTING_CGROUP_ROOT,)) for arg in args),
+    "nft": lambda args: args == ["-f", "-"]
+}
+
+_NFT_TOKEN_PATTERN = re.compile(r'"[^"\n]*"|#[^\n]*|[{};\n]|[^\s{};"#]+')
+# Top-level commands allowed on our own table (the block form may follow the first)
+NFT_COMMANDS = [prefix + NFT_TABLE.split() for prefix in (["table"], ["add", "table"], ["delete", "table"],
+                                                          ["flush", "table"])]
+
+def _nft_input_ok(text):
+    """
+    Check that an nft script only declares, flushes or deletes our own table.
+
+    Statements are split on newlines and semicolons and braces are tracked,
+    so indentation does not hide a top-level command such as `flush ruleset`.
+    """
+    if text.count('"') % 2:
+        return False
+    depth = 0
+    statement = []
+    for token in _NFT_TOKEN_PATTERN.findall(text) + ["\n"]:
+        if token.startswith("#"):
+            continue
+        if token in ("include", "define"):
+            return False
+        if token == "{":
+            # Only our table's block may be opened at the top level
+            if depth == 0 and statement not in NFT_COMMANDS[:2]:
+                return False
+            depth += 1
+            statement = []
+        elif token == "}":
+            depth -= 1
+            if depth < 0:
+                return False
+            statement = []
+        elif token in (";", "\n"):
+            if depth == 0 and statement and statement not in NFT_COMMANDS:
+                return False
+            statement = []
+        else:
+            statement.append(token)
+    return depth == 0
+
+# Checks of the standard input passed to a command
+INPUT_CHECKS = {
+    "ip": _ip_batch_ok,
+    "nft": _nft_input_ok
+}
+
+class HelperError(Exception):
+    """Raised when the helper cannot be started or refuses an operation."""
+
+def validate_command(argv, input_text=None):
+    """
+    Check a command (and its standard input, if any) against the allowlist.
+
+    Raises:
+        HelperError: If the command is not allowed
+    """
+    if not argv or not all(isinstance(arg, str) for arg in argv):
+        raise HelperError("Malformed command")
+    check = ALLOWED_COMMANDS.get(argv[0])
+    if check is None or not check(argv[1:]):
+        raise HelperError(f"Command not allowed: {' '.join(argv)}")
+    input_check = INPUT_CHECKS.get(argv[0])
+    if input_text is not None and input_check is not None and not input_check(input_text):
+        raise HelperError(f"Input not allowed for {argv[0]}")
+
+def execute_operation(operation):
+    """
+    Execute one operation (as root when running inside the helper).
+
+    Returns:
+        dict: ok, plus output and returncode for "run" or error on failure
+    """
+    try:
+        op = operation.get("op")
+        if op == "run":
+            validate_command(operation.get("argv"), operation.get("input"))
+            # Without input, a command reading "-" must not inherit the helper's request pipe
+            stdin = {"input": operation["input"]} if operation.get("input") is not None else {"stdin": subprocess.DEVNULL}
+            result = subprocess.run(operation["argv"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    universal_newlines=True, **stdin)
+            return {"ok": result.returncode == 0, "output": result.stdout.strip(),
+                    "returncode": result.returncode}
+
+        if op in ("write_config", "rollback_config"):
+            from src.utils.config_writer import SYSTEM_BACKUP_DIR, commit_config, rollback_config
+            path = operation.get("path", "")
+            if not _under(path, CONFIG_DIRS):
+                raise HelperError(f"Path not allowed: {path}")
+            if op == "write_config":
+                # Backups always go to the system backup directory with the default
+                # retention, and no executable or setuid modes are handed out
+                mode = operation.get("mode", 0o644)
+                if mode not in CONFIG_MODES:
+                    raise HelperError(f"Mode not allowed: {mode!r}")
+                commit_config(path, operation["content"], mode, SYSTEM_BACKUP_DIR)
+            else:
+                rollback_config(path, operation.get("version"))
+            return {"ok": True}
+
+        if op in ("store_ca", "remove_ca"):
+            from src import ca_store
+            store_dir = operation.get("store_dir", "")
+            if not _under(store_dir, CA_STORE_DIRS):
+                raise HelperError(f"Path not allowed: {store_dir}")
+            if op == "store_ca":
+                output = ca_store.commit_certificates(
+                    [(name, base64.b64decode(data)) for name, data in operation["certificates"]], store_dir)
+            else:
+                output = ca_store.commit_removal(operation["filenames"], store_dir)
+            return {"ok": True, "output": output}
+
+        raise HelperError(f"Unknown operation: {op}")
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+def execute_request(request):
+    """Execute a request's operations in order, optionally stopping at the first failure."""
+    results = []
+    for operation in request.get("operations", []):
+        if results and request.get("stop_on_error") and not results[-1]["ok"]:
+            results.append({"ok": False, "error": "Skipped after an earlier failure"})
+            continue
+        results.append(execute_operation(operation))
+    return {"id": request.get("id"), "results": results}
+
+def serve(infile=None, outfile=None):
+    """Serve requests from a pipe; each request is handled in its own thread."""
+    infile = infile or sys.stdin
+    outfile = outfile or sys.stdout
+    write_lock = threading.Lock()
+
+    def respond(message):
+        with write_lock:
+            outfile.write(json.dumps(message) + "\n")
+            outfile.flush()
+
+    def handle(line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            respond({"id": None, "error": "Malformed request"})
+            return
+        respond(execute_request(request))
+
+    respond({"ready": True})
+    threads = []
+    for line in infile:
+        if line.strip():
+            thread = threading.Thread(target=handle, args=(line,))
+            thread.start()
+            threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+class PrivilegedHelper:
+    """Client side of the helper; one instance is shared by the session."""
+
+    def __init__(self, command=None):
+        """
+        Args:
+            command: The command starting the helper; defaults to running this
+                     module under sudo. Not used when already running as root.
+        """
+        self.command = command or ["sudo", sys.executable, "-m", "src.utils.privileged_helper"]
+        self.process = None
+        self.in_process = command is None and os.geteuid() == 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._next_id = 0
+
+    def start(self):
+        """Start the helper process (prompting for a password once, if needed)."""
+        if self.in_process or self.process is not None:
+            return
+        try:
+            self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            cwd=PROJECT_ROOT, universal_newlines=True, bufsize=1)
+        except OSError as e:
+            raise HelperError(f"Could not start privileged helper: {str(e)}")
+
+        ready = self.process.stdout.readline()
+        if not ready or not json.loads(ready).get("ready"):
+            self.process.wait()
+            self.process = None
+            raise HelperError("Privileged helper failed to start")
+        threading.Thread(target=self._read_replies, daemon=True).start()
+
+    def _read_replies(self):
+        for line in self.process.stdout:
+            reply = json.loads(line)
+            with self._lock:
+                waiter = self._pending.pop(reply.get("id"), None)
+            if waiter is not None:
+                waiter["reply"] = reply
+                waiter["event"].set()
+        # The helper exited; fail everything still waiting
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for waiter in pending.values():
+            waiter["event"].set()
+
+    def request(self, operations, stop_on_error=False):
+        """
+        Send a batch of operations.
+
+        Returns:
+            list: One result dict per operation
+        """
+        request = {"operations": operations, "stop_on_error": stop_on_error}
+        if self.in_process:
+            return execute_request(request)["results"]
+
+        with self._lock:
+            if self.process is None:
+                self.start()
+            self._next_id += 1
+            request["id"] = self._next_id
+            waiter = {"event": threading.Event(), "reply": None}
+            self._pending[request["id"]] = waiter
+            try:
+                self.process.stdin.write(json.dumps(request) + "\n")
+                self.process.stdin.flush()
+            except OSError as e:
+                self._pending.pop(request["id"], None)
+                raise HelperError(f"Privileged helper is not running: {str(e)}")
+
+        waiter["event"].wait()
+        if waiter["reply"] is None:
+            raise HelperError("Privileged helper exited")
+        return waiter["reply"]["results"]
+
+    def run(self, argv, input_text=None):
+        """
+        Run one command as root.
+
+        Returns:
+            str: The command output, or None if it failed (like run_command)
+
+        Raises:
+            HelperError: If the command is not allowed
+        """
+        return self.run_batch([argv], inputs=[input_text])[0]
+
+    def run_batch(self, commands, stop_on_error=False, inputs=None):
+        """
+        Run several commands as root in one round trip.
+
+        Args:
+            commands: The commands to run, in order
+            stop_on_error: Skip the remaining commands after a failure
+            inputs: Standard input for each command (None for no input)
+
+        Returns:
+            list: The output of each command, None for those that failed
+        """
+        inputs = inputs or [None] * len(commands)
+        operations = []
+        for argv, input_text in zip(commands, inputs):
+            validate_command(argv, input_text)
+            operation = {"op": "run", "argv": argv}
+            if input_text is not None:
+                operation["input"] = input_text
+            operations.append(operation)
+        outputs = []
+        for argv, result in zip(commands, self.request(operations, stop_on_error)):
+            if result["ok"]:
+                outputs.append(result["output"])
+            else:
+                print(f"Command failed: {result.get('output') or result.get('error', '')}")
+                outputs.append(None)
+        return outputs
+
+    def write_config(self, path, content, mode=0o644):
+        """
+        Atomically replace a system configuration file (see config_writer.commit_config),
+        backing it up to the system backup directory.
+        """
+        result = self.request([{"op": "write_config", "path": path, "content": content, "mode": mode}])[0]
+        if not result["ok"]:
+            raise HelperError(result["error"])
+
+    def rollback_config(self, path, version=None):
+        """Restore a system configuration file from a backup."""
+        result = self.request([{"op": "rollback_config", "path": path, "version": version}])[0]
+        if not result["ok"]:
+            raise HelperError(result["error"])
+
+    def store_ca(self, certificates, store_dir):
+        """
+        Add CA certificates to the WiFi CA store (see ca_store.commit_certificates).
+
+        Args:
+            certificates: (name, base64-encoded file content) tuples
+            store_dir: The store directory
+        """
+        result = self.request([{"op": "store_ca", "certificates": certificates, "store_dir": store_dir}])[0]
+        if not result["ok"]:
+            raise HelperError(result["error"])
+        return result["output"]
+
+    def remove_ca(self, filenames, store_dir):
+        """Remove certificates from the WiFi CA store (see ca_store.commit_removal)."""
+        result = self.request([{"op": "remove_ca", "filenames": filenames, "store_dir": store_dir}])[0]
+        if not result["ok"]:
+            raise HelperError(result["error"])
+        return result["output"]
+
+    def close(self):
+        """Stop the helper process."""
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process.wait()
+            self.process = None
+
+_helper = None
+_helper_lock = threading.Lock()
+
+def get_helper():
+    """Return the session's privileged helper, creating it on first use."""
+    global _helper
+    with _helper_lock:
+        if _helper is None:
+            _helper = PrivilegedHelper()
+            atexit.register(_helper.close)
+        return _helper
+
+if __name__ == "__main__":
+    serve()
@@ -2,6 +2,7 @@ import os
 import sys
 import time
 import datetime
+import itertools
 from importlib import util
 
 # Try to import dev_info module
@@ -118,72 +119,120 @@ def display_progress(message, total_steps=10, current_step=0):
     if current_step == total_steps:
         print()  # New line after completion
 
+# Box drawing characters: (left, junction, right) for each kind of rule
+TABLE_RULES = {
+    "top": ("┌", "┬", "┐"),
+    "middle": ("├", "┼", "┤"),
+    "bottom": ("└", "┴", "┘")
+}
+
+# Columns are never narrowed below this to fit the terminal
+MIN_COLUMN_WIDTH = 3
+
+def terminal_width():
+    """Return the terminal width, or None when output is not a terminal."""
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns if sys.stdout.isatty() else None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def fit_column_widths(widths, max_width):
+    """
+    Narrow the widest columns until a table fits in max_width characters.
+
+    Args:
+        widths: Content widths of the columns (without padding)
+        max_width: The available width, or None for no limit
+
+    Returns:
+        list: The adjusted content widths
+    """
+    widths = list(widths)
+    if max_width is None:
+        return widths
+    # Each column adds two spaces of padding and one border
+    excess = sum(widths) + 3 * len(widths) + 1 - max_width
+    while excess > 0:
+        widest = max(range(len(widths)), key=lambda i: widths[i])
+        if widths[widest] <= MIN_COLUMN_WIDTH:
+            break
+        widths[widest] -= 1
+        excess -= 1
+    return widths
+
+def _table_rule(kind, widths):
+    left, junction, right = TABLE_RULES[kind]
+    return left + junction.join('─' * (width + 2) for width in widths) + right
+
+def _table_row(cells, widths):
+    parts = []
+    for cell, width in zip(cells, widths):
+        text = str(cell)
+        if len(text) > width:
+            text = text[:width - 1] + '…'
+        parts.append(f" {text.ljust(width)} ")
+    return '│' + '│'.join(parts) + '│'
+
+def stream_table(headers, rows, widths=None, sample=50, max_width=None, page_size=None):
+    """
+    Print a table while its rows are still being produced.
+
+    Column widths are fixed up front, either given or measured on the first
+    ``sample`` rows, so at most that many rows are held in memory. Cells
+    that do not fit are truncated, and the table is narrowed to the terminal
+    width.
+
+    Args:
+        headers: Column headings
+        rows: Any iterable of rows, e.g. a generator
+        widths: Content widths of the columns; sampled from the rows if omitted
+        sample: The number of rows used to measure column widths
+        max_width: Maximum table width; the terminal width by default
+        page_size: Rows per page; the user is prompted between pages
+
+    Returns:
+        int: The number of rows printed
+    """
+    rows = iter(rows)
+    buffered = []
+    if widths is None:
+        widths = [len(str(header)) for header in headers]
+        for row in rows:
+            buffered.append(row)
+            for i, cell in enumerate(row):
+                widths[i] = max(widths[i], len(str(cell)))
+            if len(buffered) >= sample:
+                break
+    widths = fit_column_widths(widths, max_width or terminal_width())
+
+    header_lines = [_table_rule("top", widths), _table_row(headers, widths), _table_rule("middle", widths)]
+    print("\n".join(header_lines))
+
+    count = 0
+    for row in itertools.chain(buffered, rows):
+        if page_size and count and count % page_size == 0:
+            print(_table_rule("bottom", widths))
+            if input(f"-- {count} rows shown; Enter for more, q to stop -- ").strip().lower() == 'q':
+                # Let a generator release what it holds (e.g. a child process)
+                close = getattr(rows, "close", None)
+                if close:
+                    close()
+                return count
+            print("\n".join(header_lines))
+        print(_table_row(row, widths))
+        count += 1
+
+    print(_table_rule("bottom", widths))
+    return count
+
 def display_table(headers, data):
     """Display data in a formatted table with box drawing characters."""
-    # Calculate column widths
-    col_widths = [len(h) for h in headers]
+    # Every row is at hand, so size the columns exactly
+    widths = [len(str(h)) for h in headers]
     for row in data:
         for i, cell in enumerate(row):
-            col_widths[i] = max(col_widths[i], len(str(cell)))
-    
-    # Add padding to column widths
-    col_widths = [w + 2 for w in col_widths]
-    
-    # Calculate total width
-    total_width = sum(col_widths) + len(col_widths) - 1
-    
-    # Box drawing characters
-    top_left = '┌'
-    top_right = '┐'
-    bottom_left = '└'
-    bottom_right = '┘'
-    horizontal = '─'
-    vertical = '│'
-    t_down = '┬'
-    t_up = '┴'
-    t_right = '├'
-    t_left = '┤'
-    cross = '┼'
-    
-    # Build top border
-    top_border = top_left + horizontal * col_widths[0]
-    for width in col_widths[1:]:
-        top_border += t_down + horizontal * width
-    top_border += top_right
-    
-    # Build header separator
-    header_sep = t_right + horizontal * col_widths[0]
-    for width in col_widths[1:]:
-        header_sep += cross + horizontal * width
-    header_sep += t_left
-    
-    # Build bottom border
-    bottom_border = bottom_left + horizontal * col_widths[0]
-    for width in col_widths[1:]:
-        bottom_border += t_up + horizontal * width
-    bottom_border += bottom_right
-    
-    # Print top border
-    print(top_border)
-    
-    # Print headers
-    header_row = vertical
-    for i, h in enumerate(headers):
-        header_row += f" {h.ljust(col_widths[i]-2)} {vertical}"
-    print(header_row)
-    
-    # Print header separator
-    print(header_sep)
-    
-    # Print data rows
-    for row in data:
-        data_row = vertical
-        for i, cell in enumerate(row):
-            data_row += f" {str(cell).ljust(col_widths[i]-2)} {vertical}"
-        print(data_row)
-    
-    # Print bottom border
-    print(bottom_border)
+            widths[i] = max(widths[i], len(str(cell)))
+    stream_table(headers, data, widths=widths)
 
 def clear_screen():
     """Clear the terminal screen."""
@@ -0,0 +1,148 @@
+"""
+wpa_supplicant event sources.
+
+802.1X progress is reported by wpa_supplicant as control-interface events
+(CTRL-EVENT-EAP-STARTED, CTRL-EVENT-EAP-METHOD, CTRL-EVENT-EAP-TLS-CERT-ERROR,
+CTRL-EVENT-EAP-FAILURE, CTRL-EVENT-EAP-SUCCESS, ...). They are read from the
+interface's control socket when it is reachable (root, with a ctrl_interface
+configured), and otherwise from the wpa_supplicant journal, which logs the
+same lines prefixed with the interface name. The journal may show none of
+them, so its events are not ``complete`` and callers should also watch the
+connection state.
+
+Open the source before starting an activation so no event is missed.
+"""
+
+import os
+import re
+import select
+import socket
+import itertools
+import subprocess
+
+CTRL_DIR = "/run/wpa_supplicant"
+
+# Control socket messages carry a "<level>" prefix
+_LEVEL_PREFIX = re.compile(r"^<\d>")
+_client_ids = itertools.count()
+
+class WpaCtrlError(Exception):
+    """Raised when wpa_supplicant refuses a control interface request."""
+
+class ControlSocketEvents:
+    """Events from an interface's wpa_supplicant control socket."""
+
+    # Every event of the interface is delivered
+    complete = True
+
+    def __init__(self, interface, ctrl_dir=CTRL_DIR):
+        self.interface = interface
+        self.local_path = f"/tmp/intel-wifi-fixer-wpa-{os.getpid()}-{next(_client_ids)}"
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            self.sock.bind(self.local_path)
+            self.sock.connect(os.path.join(ctrl_dir, interface))
+            self.sock.send(b"ATTACH")
+            ready, _, _ = select.select([self.sock], [], [], 2)
+            if not ready or not self.sock.recv(4096).startswith(b"OK"):
+                raise WpaCtrlError(f"wpa_supplicant did not accept ATTACH on {interface}")
+        except Exception:
+            self.close()
+            raise
+
+    def read(self, timeout):
+        """
+        Wait up to ``timeout`` seconds for events.
+
+        Returns:
+            list: Event lines such as "CTRL-EVENT-EAP-SUCCESS ..."; empty on timeout
+        """
+        events = []
+        ready, _, _ = select.select([self.sock], [], [], max(timeout, 0))
+        while ready:
+            message = self.sock.recv(4096).decode("utf-8", "replace").strip()
+            events.append(_LEVEL_PREFIX.sub("", message))
+            # Drain whatever else is queued without waiting
+            ready, _, _ = select.select([self.sock], [], [], 0)
+        return events
+
+    def close(self):
+        try:
+            self.sock.send(b"DETACH")
+        except OSError:
+            pass
+        self.sock.close()
+        try:
+            os.unlink(self.local_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class JournalEvents:
+    """Events for one interface followed from the wpa_supplicant journal."""
+
+    # Users outside the systemd-journal group see no system journal lines,
+    # and wpa_supplicant may not log to the journal at all
+    complete = False
+
+    def __init__(self, interface):
+        self.interface = interface
+        self.process = subprocess.Popen(["journalctl", "--follow", "--lines", "0", "--output", "cat",
+                                         "--unit", "wpa_supplicant"],
+                                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._buffer = b""
+
+    def read(self, timeout):
+        """
+        Wait up to ``timeout`` seconds for events.
+
+        Returns:
+            list: Event lines for this interface; empty on timeout
+        """
+        ready, _, _ = select.select([self.process.stdout], [], [], max(timeout, 0))
+        if not ready:
+            return []
+        data = os.read(self.process.stdout.fileno(), 65536)
+        if not data:
+            # journalctl exited; behave like a quiet source until the deadline
+            select.select([], [], [], max(timeout, 0))
+            return []
+
+        self._buffer += data
+        complete, _, self._buffer = self._buffer.rpartition(b"\n")
+        prefix = f"{self.interface}: "
+        return [line[len(prefix):] for line in complete.decode("utf-8", "replace").splitlines()
+                if line.startswith(prefix)]
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait()
+        self.process.stdout.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_events(interface):
+    """
+    Open the best available event source for an interface.
+
+    Returns:
+        ControlSocketEvents or JournalEvents, or None when neither is available
+    """
+    try:
+        return ControlSocketEvents(interface)
+    except (OSError, WpaCtrlError):
+        pass
+    try:
+        return JournalEvents(interface)
+    except OSError:
+        return None
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import json
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import adapter_db
+from src.adapter_db import load_adapter_index, compile_index, ADAPTER_DB_DIR
+
+ADAPTER = {
+    "name": "Test Adapter",
+    "chipset": "Test",
+    "bus": "pci",
+    "ids": ["8086:0001", "8086:0002"],
+    "specs": {"adapter": "Test Adapter"}
+}
+
+class TestAdapterDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_dir = os.path.join(self.tmpdir.name, "adapters")
+        self.cache_path = os.path.join(self.tmpdir.name, "cache", "index.json")
+        os.makedirs(self.db_dir)
+        with open(os.path.join(self.db_dir, "test.json"), 'w') as f:
+            json.dump(ADAPTER, f)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_bundled_database_is_valid(self):
+        index = load_adapter_index(ADAPTER_DB_DIR, cache_path=None)
+        for device_id in ["8086:0085", "8086:08b1", "8086:24fd", "8086:2723"]:
+            self.assertIn(device_id, index)
+        self.assertEqual(index["8086:0085"]["name"], "Intel Centrino Advanced-N 6205")
+
+    def test_yaml_and_validation(self):
+        with open(os.path.join(self.db_dir, "other.yaml"), 'w') as f:
+            f.write("name: Other\nchipset: Other\nbus: usb\nids: ['0bda:8812']\nspecs: {}\n")
+        with open(os.path.join(self.db_dir, "broken.json"), 'w') as f:
+            json.dump({"name": "Broken", "ids": ["not-an-id"]}, f)
+
+        with patch('src.adapter_db.display_warning') as mock_display_warning:
+            index = load_adapter_index(self.db_dir, cache_path=None)
+
+        self.assertEqual(sorted(index), ["0bda:8812", "8086:0001", "8086:0002"])
+        self.assertIs(index["8086:0001"], index["8086:0002"])
+        mock_display_warning.assert_called_once()
+
+    def test_index_cache_keyed_on_mtime(self):
+        index = load_adapter_index(self.db_dir, self.cache_path)
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        # Unchanged sources are served from the cache
+        with patch('src.adapter_db.compile_index', wraps=compile_index) as mock_compile:
+            self.assertEqual(load_adapter_index(self.db_dir, self.cache_path), index)
+            mock_compile.assert_not_called()
+
+        # Touching a source file rebuilds the index
+        path = os.path.join(self.db_dir, "test.json")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        with patch('src.adapter_db.compile_index', wraps=compile_index) as mock_compile:
+            load_adapter_index(self.db_dir, self.cache_path)
+            mock_compile.assert_called_once()
+
+    def test_index_cache_round_trip_and_permissions(self):
+        index = load_adapter_index(self.db_dir, self.cache_path)
+        with open(self.cache_path) as f:
+            self.assertIn("signature", json.load(f))
+
+        cached = load_adapter_index(self.db_dir, self.cache_path)
+        self.assertEqual(cached, index)
+        self.assertIs(cached["8086:0001"], cached["8086:0002"])
+
+        # A cache others could have written is ignored
+        os.chmod(self.cache_path, 0o666)
+        with patch('src.adapter_db.compile_index', wraps=compile_index) as mock_compile:
+            load_adapter_index(self.db_dir, self.cache_path)
+            mock_compile.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
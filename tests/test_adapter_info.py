@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import adapter_info
+from src.adapter_info import AdapterInfo
+
+class TestAdapterInfo(unittest.TestCase):
+
+    def setUp(self):
+        adapter_info._STATIC_CACHE.clear()
+
+    @patch('src.adapter_info.get_wireless_info')
+    @patch('src.adapter_info.get_static_info')
+    def test_fields_are_lazy(self, mock_static_info, mock_wireless_info):
+        mock_wireless_info.return_value = {"ssid": "Office", "frequency": 5180}
+
+        info = AdapterInfo()
+        mock_static_info.assert_not_called()
+        mock_wireless_info.assert_not_called()
+
+        # Reading the SSID does not touch the static facts
+        self.assertEqual(info.ssid, "Office")
+        self.assertEqual(info.channel, "36")
+        mock_static_info.assert_not_called()
+        self.assertEqual(mock_wireless_info.call_count, 1)
+
+    @patch('src.adapter_info.get_wireless_info')
+    @patch('src.adapter_info.get_static_info')
+    def test_static_fields_memoized(self, mock_static_info, mock_wireless_info):
+        mock_static_info.return_value = {"mac": "00:11:22:33:44:55", "driver": "iwlwifi", "firmware": "18.168.6.1"}
+
+        self.assertEqual(AdapterInfo().driver, "iwlwifi")
+        self.assertEqual(AdapterInfo().mac_address, "00:11:22:33:44:55")
+        self.assertEqual(mock_static_info.call_count, 1)
+
+        # Refreshing a static field recomputes it
+        info = AdapterInfo()
+        info.refresh("firmware")
+        mock_static_info.return_value = {"mac": "00:11:22:33:44:55", "driver": "iwlwifi", "firmware": "18.168.6.2"}
+        self.assertEqual(info.firmware, "18.168.6.2")
+        self.assertEqual(mock_static_info.call_count, 2)
+
+    @patch('src.adapter_info.default_adapter', return_value={"name": "Default"})
+    @patch('src.adapter_info.detect_adapter', return_value=None)
+    @patch('src.adapter_info.get_static_info')
+    def test_fallbacks_are_not_cached(self, mock_static_info, mock_detect_adapter, mock_default_adapter):
+        # Read while the interface is absent (e.g. during a driver reload)
+        mock_static_info.return_value = {"mac": None, "driver": None, "firmware": None}
+        self.assertEqual(AdapterInfo().driver, "Unknown")
+        self.assertEqual(AdapterInfo().adapter_name, "Default")
+
+        mock_static_info.return_value = {"mac": "00:11:22:33:44:55", "driver": "iwlwifi", "firmware": "18.168.6.1"}
+        mock_detect_adapter.return_value = {"name": "Intel Wi-Fi 6 AX200", "specs": {"Chipset": "AX200"}}
+        info = AdapterInfo()
+        self.assertEqual(info.driver, "iwlwifi")
+        self.assertEqual(info.adapter_name, "Intel Wi-Fi 6 AX200")
+        self.assertEqual(info.specs, {"Chipset": "AX200"})
+
+        # Once read, the values are memoized
+        mock_static_info.return_value = {"mac": None, "driver": None, "firmware": None}
+        mock_detect_adapter.return_value = None
+        self.assertEqual(AdapterInfo().driver, "iwlwifi")
+        self.assertEqual(AdapterInfo().adapter_name, "Intel Wi-Fi 6 AX200")
+
+    @patch('src.adapter_info.get_wireless_info')
+    def test_refresh_single_field(self, mock_wireless_info):
+        mock_wireless_info.return_value = {"ssid": "Office"}
+        info = AdapterInfo()
+        self.assertEqual(info.ssid, "Office")
+
+        mock_wireless_info.return_value = {"ssid": "Home"}
+        self.assertEqual(info.ssid, "Office")
+        info.refresh("ssid")
+        self.assertEqual(info.ssid, "Home")
+
+        with self.assertRaises(AttributeError):
+            info.refresh("nonexistent")
+
+    @patch('src.adapter_info.run_command')
+    def test_status_cached(self, mock_run_command):
+        mock_run_command.return_value = "wlan0:wifi:connected:Office"
+        info = AdapterInfo()
+        self.assertEqual(info.retrieve_status(), "connected")
+        self.assertEqual(info.retrieve_status(), "connected")
+        self.assertEqual(mock_run_command.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.autotune import DriverTuner
+
+BASELINE = {"iwlwifi": {"11n_disable": 1, "power_save": 0}}
+
+def make_result(mbps, rtt=5.0):
+    return {"upload_mbps": mbps, "download_mbps": mbps, "loss": 0.0, "rtt_p90": rtt}
+
+class TestDriverTuner(unittest.TestCase):
+
+    def make_tuner(self, measure, **kwargs):
+        applied = []
+
+        def apply(parameters):
+            applied.append(parameters)
+            return True
+
+        def probe():
+            return measure(applied[-1])
+
+        with patch('src.autotune.get_module_parameters', return_value=BASELINE):
+            tuner = DriverTuner("127.0.0.1", apply=apply, probe=probe, **kwargs)
+        return tuner, applied
+
+    @patch('src.autotune.display_message')
+    @patch('src.autotune.display_success')
+    def test_keeps_best_configuration(self, mock_display_success, mock_display_message):
+        # Re-enabling 11n is much faster; everything else makes no difference
+        def measure(parameters):
+            return make_result(200 if parameters["iwlwifi"]["11n_disable"] == 0 else 50)
+
+        tuner, applied = self.make_tuner(measure, search_space={
+            ("iwlwifi", "11n_disable"): [0, 1],
+            ("iwlwifi", "power_save"): [0, 1]
+        })
+        outcome = tuner.run()
+
+        self.assertEqual(outcome["best"]["parameters"]["iwlwifi"]["11n_disable"], 0)
+        self.assertEqual(applied[-1], outcome["best"]["parameters"])
+        # Baseline, 11n_disable=0, power_save=1
+        self.assertEqual(len(outcome["trials"]), 3)
+
+    @patch('src.autotune.display_message')
+    @patch('src.autotune.display_warning')
+    def test_rolls_back_on_regression(self, mock_display_warning, mock_display_message):
+        # power_save=1 loses connectivity
+        def measure(parameters):
+            return None if parameters["iwlwifi"]["power_save"] == 1 else make_result(100)
+
+        tuner, applied = self.make_tuner(measure, search_space={("iwlwifi", "power_save"): [0, 1]})
+        outcome = tuner.run()
+
+        self.assertEqual(outcome["best"]["parameters"], BASELINE)
+        self.assertEqual(applied[-1], BASELINE)
+        mock_display_warning.assert_called_once()
+
+    @patch('src.autotune.display_message')
+    def test_early_stopping(self, mock_display_message):
+        tuner, applied = self.make_tuner(lambda parameters: make_result(100), patience=2, search_space={
+            ("iwlwifi", "amsdu_size"): [1, 2, 3],
+            ("iwlwifi", "power_save"): [1]
+        })
+        outcome = tuner.run()
+
+        self.assertTrue(outcome["stopped_early"])
+        # Baseline, two amsdu_size values without improvement, then power_save still gets its trial
+        self.assertEqual(len(outcome["trials"]), 4)
+        self.assertEqual(applied[3]["iwlwifi"]["power_save"], 1)
+
+    @patch('src.autotune.display_message')
+    @patch('src.autotune.display_success')
+    def test_later_parameters_are_tried(self, mock_display_success, mock_display_message):
+        # Only the last parameters improve anything
+        def measure(parameters):
+            iwlwifi = parameters["iwlwifi"]
+            return make_result(100 + 50 * (iwlwifi.get("uapsd_disable") == 1) + 50 * (iwlwifi["power_save"] == 1))
+
+        tuner, applied = self.make_tuner(measure, patience=1, search_space={
+            ("iwlwifi", "amsdu_size"): [1, 2, 3],
+            ("iwlwifi", "11n_disable"): [0],
+            ("iwlwifi", "uapsd_disable"): [1],
+            ("iwlwifi", "power_save"): [1]
+        })
+        outcome = tuner.run()
+
+        best = outcome["best"]["parameters"]["iwlwifi"]
+        self.assertEqual((best["uapsd_disable"], best["power_save"]), (1, 1))
+        self.assertEqual(applied[-1], outcome["best"]["parameters"])
+
+    @patch('src.autotune.display_warning')
+    @patch('src.autotune.reload_driver')
+    @patch('src.autotune.configure_driver_parameters', return_value=True)
+    def test_apply_requires_a_reloaded_driver(self, mock_configure, mock_reload_driver, mock_display_warning):
+        with patch('src.autotune.get_module_parameters', return_value=BASELINE):
+            tuner = DriverTuner("127.0.0.1", probe=lambda: make_result(100))
+
+        mock_reload_driver.return_value = {"success": True}
+        self.assertTrue(tuner._apply(BASELINE))
+        mock_configure.assert_called_with(None, BASELINE)
+
+        # A failed or crashed reload leaves the old parameters loaded
+        mock_reload_driver.return_value = {"success": False}
+        self.assertFalse(tuner._apply(BASELINE))
+        mock_reload_driver.side_effect = OSError("modprobe not found")
+        self.assertFalse(tuner._apply(BASELINE))
+
+        mock_configure.return_value = False
+        mock_reload_driver.reset_mock()
+        self.assertFalse(tuner._apply(BASELINE))
+        mock_reload_driver.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.benchmark import (
+    BenchmarkServer,
+    measure_upload,
+    measure_download,
+    measure_latency,
+    run_benchmark,
+    load_results,
+    compare_results
+)
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        # Loopback server on a free port
+        self.server = BenchmarkServer("127.0.0.1", 0).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_throughput(self):
+        upload = measure_upload("127.0.0.1", self.server.port, duration=0.2)
+        self.assertGreater(upload["bytes"], 0)
+        self.assertGreater(upload["mbps"], 0)
+
+        download = measure_download("127.0.0.1", self.server.port, duration=0.2)
+        self.assertGreater(download["bytes"], 0)
+        self.assertGreater(download["mbps"], 0)
+
+    def test_latency(self):
+        latency = measure_latency("127.0.0.1", self.server.port, count=10, interval=0)
+        self.assertEqual(latency["loss"], 0.0)
+        self.assertLessEqual(latency["rtt_min"], latency["rtt_p50"])
+        self.assertLessEqual(latency["rtt_p50"], latency["rtt_p99"])
+
+    @patch('src.benchmark.capture_configuration')
+    @patch('src.benchmark.display_message')
+    def test_run_and_compare(self, mock_display_message, mock_capture_configuration):
+        mock_capture_configuration.return_value = {}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "results.ndjson")
+            with patch('src.benchmark.RESULTS_PATH', path):
+                first = run_benchmark("127.0.0.1", self.server.port, duration=0.1, label="baseline", pings=5)
+                second = run_benchmark("127.0.0.1", self.server.port, duration=0.1, label="tuned", pings=5)
+                self.assertIsNotNone(first)
+                self.assertIsNotNone(second)
+            results = load_results(path)
+
+        self.assertEqual([r["label"] for r in results], ["baseline", "tuned"])
+        headers, rows = compare_results(results)
+        self.assertEqual(headers, ["Metric", "baseline", "tuned"])
+        self.assertEqual(rows[0][0], "Upload (Mb/s)")
+        self.assertIn("%", rows[0][2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import base64
+import shutil
+import subprocess
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import ca_store
+from src.ca_store import subject_hash, commit_certificates, commit_removal, rehash, add_certificates
+from src.cert_inspector import get_cache
+from src.utils.privileged_helper import execute_operation
+
+def openssl(*args, cwd):
+    return subprocess.run(["openssl"] + list(args), cwd=cwd, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, universal_newlines=True)
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is needed to create test certificates")
+class TestCAStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.dir = cls.tmpdir.name
+        # Two CAs with the same subject (e.g. before and after a key rollover) share a hash
+        for name, subject in (("site-a", "/CN=Site  A Root/O=Example"), ("site-a-new", "/CN=Site A Root/O=Example"),
+                              ("site-b", "/C=DE/O=Beispiel GmbH/CN=Zertifizierungsstelle")):
+            openssl("req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", f"{name}.key", "-out", f"{name}.pem",
+                    "-days", "365", "-subj", subject, "-addext", "basicConstraints=critical,CA:TRUE", cwd=cls.dir)
+        openssl("req", "-newkey", "rsa:2048", "-nodes", "-keyout", "server.key", "-out", "server.csr",
+                "-subj", "/CN=radius.example.com", cwd=cls.dir)
+        openssl("x509", "-req", "-in", "server.csr", "-CA", "site-a.pem", "-CAkey", "site-a.key",
+                "-CAcreateserial", "-out", "server.pem", "-days", "30", cwd=cls.dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        self.store = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.store)
+        get_cache().clear()
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def read(self, name):
+        with open(self.path(name), "rb") as f:
+            return f.read()
+
+    def test_subject_hash_matches_openssl(self):
+        for name in ("site-a.pem", "site-a-new.pem", "site-b.pem", "server.pem"):
+            expected = openssl("x509", "-hash", "-noout", "-in", name, cwd=self.dir).stdout.strip()
+            self.assertEqual(subject_hash(get_cache().load(self.path(name))[0]), expected)
+
+    def test_commit_and_remove(self):
+        digest = subject_hash(get_cache().load(self.path("site-a.pem"))[0])
+        results = commit_certificates([("site-a.pem", self.read("site-a.pem")),
+                                       ("site-a-new.pem", self.read("site-a-new.pem")),
+                                       ("site-b.crt", self.read("site-b.pem").decode())], self.store)
+        self.assertEqual([result["status"] for result in results], ["added"] * 3)
+        self.assertEqual([results[0]["link"], results[1]["link"]], [f"{digest}.0", f"{digest}.1"])
+        self.assertEqual(os.readlink(os.path.join(self.store, f"{digest}.1")), "site-a-new.pem")
+
+        # OpenSSL finds the CA through the hash links
+        verified = openssl("verify", "-CApath", self.store, self.path("server.pem"), cwd=self.dir)
+        self.assertIn("OK", verified.stdout)
+
+        # Adding the same certificate again under another name changes nothing
+        again = commit_certificates([("copy.pem", self.read("site-a.pem"))], self.store)
+        self.assertEqual(again[0]["status"], "present")
+        self.assertFalse(os.path.exists(os.path.join(self.store, "copy.pem")))
+
+        # Removing the first of two links moves the last one into its place
+        self.assertEqual(commit_removal(["site-a.pem", "unknown.pem"], self.store), ["site-a.pem"])
+        self.assertEqual(os.readlink(os.path.join(self.store, f"{digest}.0")), "site-a-new.pem")
+        self.assertFalse(os.path.lexists(os.path.join(self.store, f"{digest}.1")))
+
+    def test_rehash(self):
+        commit_certificates([("site-a.pem", self.read("site-a.pem")), ("site-b.pem", self.read("site-b.pem"))],
+                            self.store)
+        links = sorted(name for name in os.listdir(self.store) if os.path.islink(os.path.join(self.store, name)))
+        for name in links:
+            os.unlink(os.path.join(self.store, name))
+        self.assertEqual(rehash(self.store), 2)
+        self.assertEqual(sorted(name for name in os.listdir(self.store)
+                                if os.path.islink(os.path.join(self.store, name))), links)
+
+    def test_add_certificates_through_helper(self):
+        class Helper:
+            def store_ca(self, certificates, store_dir):
+                self.request = (certificates, store_dir)
+                return [{"name": "site-b", "status": "added"}]
+
+        helper = Helper()
+        with patch('src.ca_store._can_write', return_value=False), \
+                patch('src.utils.privileged_helper.get_helper', return_value=helper):
+            self.assertEqual(add_certificates([self.path("site-b.pem")], self.store)[0]["status"], "added")
+        certificates, store_dir = helper.request
+        self.assertEqual(store_dir, self.store)
+        self.assertEqual(base64.b64decode(certificates[0][1]), self.read("site-b.pem"))
+
+    def test_helper_operation(self):
+        certificates = [("site-b.pem", base64.b64encode(self.read("site-b.pem")).decode())]
+        refused = execute_operation({"op": "store_ca", "certificates": certificates, "store_dir": self.store})
+        self.assertFalse(refused["ok"])
+
+        with patch('src.utils.privileged_helper.CA_STORE_DIRS', (self.store,)):
+            result = execute_operation({"op": "store_ca", "certificates": certificates, "store_dir": self.store})
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["output"][0]["file"], "site-b.pem")
+
+if __name__ == '__main__':
+    unittest.main()
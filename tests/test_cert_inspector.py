@@ -0,0 +1,253 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import shutil
+import hashlib
+import subprocess
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import cert_inspector
+from src.cert_inspector import (
+    CertificateCache, CertificateError, DIGEST_INFO_PREFIXES, load_certificates, validate_certificate,
+    validate_ca_bundle, expiring_certificates, _verify_rsa
+)
+from src.enterprise_wifi import import_ca_certificates
+
+SERVER_EXTENSIONS = """subjectAltName=DNS:radius.example.com,DNS:*.wifi.example.com,IP:10.0.0.5
+extendedKeyUsage=serverAuth
+keyUsage=critical,digitalSignature,keyEncipherment
+basicConstraints=CA:FALSE
+"""
+
+def openssl(*args, cwd):
+    subprocess.run(["openssl"] + list(args), cwd=cwd, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is needed to create test certificates")
+class TestCertInspector(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.dir = cls.tmpdir.name
+        openssl("req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", "ca.key", "-out", "ca.pem",
+                "-days", "3650", "-subj", "/CN=Test CA/O=Example",
+                "-addext", "basicConstraints=critical,CA:TRUE", "-addext", "keyUsage=keyCertSign,cRLSign",
+                cwd=cls.dir)
+        openssl("req", "-newkey", "rsa:2048", "-nodes", "-keyout", "server.key", "-out", "server.csr",
+                "-subj", "/CN=radius.example.com", cwd=cls.dir)
+        with open(os.path.join(cls.dir, "server.ext"), "w") as f:
+            f.write(SERVER_EXTENSIONS)
+        openssl("x509", "-req", "-in", "server.csr", "-CA", "ca.pem", "-CAkey", "ca.key", "-CAcreateserial",
+                "-out", "server.pem", "-days", "365", "-extfile", "server.ext", cwd=cls.dir)
+        openssl("x509", "-in", "server.pem", "-outform", "DER", "-out", "server.der", cwd=cls.dir)
+        # An unrelated CA the server certificate does not chain to
+        openssl("req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", "other.key", "-out", "other.pem",
+                "-days", "30", "-subj", "/CN=Other CA", cwd=cls.dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        cert_inspector.get_cache().clear()
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def test_parse_fields(self):
+        with open(self.path("server.pem"), "rb") as f:
+            certificate, = load_certificates(f.read())
+        self.assertEqual(certificate.common_name, "radius.example.com")
+        self.assertEqual(dict(certificate.issuer)["O"], "Example")
+        self.assertEqual(certificate.dns_names, ["radius.example.com", "*.wifi.example.com"])
+        self.assertEqual(certificate.ip_addresses, ["10.0.0.5"])
+        self.assertEqual(certificate.key_usage, {"digitalSignature", "keyEncipherment"})
+        self.assertEqual(certificate.extended_key_usage, ["serverAuth"])
+        self.assertFalse(certificate.is_ca)
+        self.assertEqual(certificate.public_key_bits, 2048)
+
+        with open(self.path("server.der"), "rb") as f:
+            self.assertEqual(load_certificates(f.read())[0].fingerprint, certificate.fingerprint)
+        with self.assertRaises(CertificateError):
+            load_certificates(b"not a certificate")
+
+    def test_validate_server_certificate(self):
+        result = validate_certificate(self.path("server.pem"), self.path("ca.pem"), "ap1.wifi.example.com")
+        self.assertTrue(result["ok"], result["errors"])
+
+        result = validate_certificate(self.path("server.pem"), self.path("other.pem"), "a.b.wifi.example.com")
+        self.assertFalse(result["ok"])
+        self.assertEqual(len(result["errors"]), 2)
+        self.assertIn("No trusted issuer", result["errors"][1])
+
+        self.assertIn("clientAuth", validate_certificate(self.path("server.pem"), purpose="client")["errors"][0])
+        self.assertIn("Not a CA", validate_certificate(self.path("server.pem"), purpose="ca")["errors"][0])
+        self.assertTrue(validate_certificate(self.path("ca.pem"), purpose="ca")["ok"])
+
+    def test_validate_expiry(self):
+        later = datetime.now(timezone.utc) + timedelta(days=355)
+        result = validate_certificate(self.path("server.pem"), now=later)
+        self.assertTrue(result["ok"])
+        self.assertIn("Expires in", result["warnings"][0])
+
+        result = validate_certificate(self.path("server.pem"), now=later + timedelta(days=30))
+        self.assertIn("Expired on", result["errors"][0])
+
+    def test_tampered_signature(self):
+        with open(self.path("server.der"), "rb") as f:
+            data = bytearray(f.read())
+        data[-1] ^= 0xff
+        with open(self.path("tampered.der"), "wb") as f:
+            f.write(data)
+        result = validate_certificate(self.path("tampered.der"), self.path("ca.pem"))
+        self.assertIn("No trusted issuer", result["errors"][0])
+
+    def issue(self, name, issuer, extensions, days="30"):
+        openssl("req", "-newkey", "rsa:2048", "-nodes", "-keyout", f"{name}.key", "-out", f"{name}.csr",
+                "-subj", f"/CN={name}", cwd=self.dir)
+        with open(self.path(f"{name}.ext"), "w") as f:
+            f.write(extensions)
+        openssl("x509", "-req", "-in", f"{name}.csr", "-CA", f"{issuer}.pem", "-CAkey", f"{issuer}.key",
+                "-CAcreateserial", "-out", f"{name}.pem", "-days", days, "-extfile", f"{name}.ext", cwd=self.dir)
+
+    def bundle(self, name, *parts):
+        with open(self.path(name), "w") as f:
+            for part in parts:
+                with open(self.path(part)) as cert:
+                    f.write(cert.read())
+        return self.path(name)
+
+    def test_issuers_must_be_cas(self):
+        # A leaf of the site CA signs a RADIUS server certificate
+        self.issue("leaf", "ca", "basicConstraints=CA:FALSE\nkeyUsage=critical,digitalSignature\n")
+        self.issue("forged", "leaf", SERVER_EXTENSIONS)
+        result = validate_certificate(self.bundle("forged-bundle.pem", "forged.pem", "leaf.pem"),
+                                      self.path("ca.pem"), "radius.example.com")
+        self.assertFalse(result["ok"])
+        self.assertIn("No trusted issuer", result["errors"][0])
+
+        # A proper intermediate is accepted, but not beyond its path length
+        ca_extensions = "basicConstraints=critical,CA:TRUE,pathlen:{}\nkeyUsage=critical,keyCertSign\n"
+        self.issue("intermediate", "ca", ca_extensions.format(0))
+        self.issue("via-intermediate", "intermediate", SERVER_EXTENSIONS)
+        result = validate_certificate(self.bundle("good-bundle.pem", "via-intermediate.pem", "intermediate.pem"),
+                                      self.path("ca.pem"))
+        self.assertTrue(result["ok"], result["errors"])
+
+        self.issue("sub", "intermediate", ca_extensions.format(0))
+        self.issue("via-sub", "sub", SERVER_EXTENSIONS)
+        result = validate_certificate(self.bundle("long-bundle.pem", "via-sub.pem", "sub.pem", "intermediate.pem"),
+                                      self.path("ca.pem"))
+        self.assertFalse(result["ok"])
+
+    def test_pure_python_rsa_verification(self):
+        with open(self.path("server.pem"), "rb") as f:
+            certificate, = load_certificates(f.read())
+        with open(self.path("ca.pem"), "rb") as f:
+            issuer, = load_certificates(f.read())
+        with open(self.path("other.pem"), "rb") as f:
+            other, = load_certificates(f.read())
+        self.assertTrue(_verify_rsa(certificate, issuer))
+        self.assertFalse(_verify_rsa(certificate, other))
+
+    def test_rsa_e3_forgery_is_rejected(self):
+        with open(self.path("server.pem"), "rb") as f:
+            certificate, = load_certificates(f.read())
+        # Bleichenbacher's forgery: a short padding and a valid DigestInfo followed by
+        # garbage, signed by taking the cube root against a 2048-bit key with e = 3
+        n = (1 << 2047) | int.from_bytes(os.urandom(256), "big") | 1
+        prefix = (b"\x00\x01" + b"\xff" * 8 + b"\x00" + DIGEST_INFO_PREFIXES["sha256"]
+                  + hashlib.sha256(certificate._tbs).digest())
+        garbage_bits = 8 * (256 - len(prefix))
+        target = (int.from_bytes(prefix, "big") << garbage_bits) | ((1 << garbage_bits) - 1)
+        low, high = 0, 1 << 700
+        while low < high:
+            mid = (low + high + 1) // 2
+            low, high = (mid, high) if mid ** 3 <= target else (low, mid - 1)
+        self.assertEqual((low ** 3).to_bytes(256, "big")[:len(prefix)], prefix)
+
+        class Issuer:
+            _rsa_key = (n, 3)
+
+        certificate._signature = low.to_bytes(256, "big")
+        self.assertFalse(_verify_rsa(certificate, Issuer()))
+
+    def test_unchecked_signatures_fail_when_required(self):
+        openssl("req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:P-256", "-nodes",
+                "-keyout", "ec.key", "-out", "ec.pem", "-days", "30", "-subj", "/CN=EC CA",
+                "-addext", "basicConstraints=critical,CA:TRUE", cwd=self.dir)
+        with patch('src.cert_inspector.verify_signature', return_value=None):
+            self.assertTrue(validate_certificate(self.path("ec.pem"), purpose="ca")["ok"])
+            result = validate_certificate(self.path("ec.pem"), purpose="ca", require_signatures=True)
+            self.assertIn("cannot be checked", result["errors"][0])
+
+            result = validate_certificate(self.path("server.pem"), self.path("ca.pem"), require_signatures=True)
+            self.assertFalse(result["ok"])
+
+    @patch('src.enterprise_wifi.display_error')
+    @patch('src.enterprise_wifi.display_success')
+    @patch('src.enterprise_wifi.execute_batch_with_sudo', return_value=["", ""])
+    @patch('src.ca_store.add_certificates')
+    def test_import_checks_every_certificate_in_a_bundle(self, mock_add_certificates, mock_execute_batch_with_sudo,
+                                                         mock_display_success, mock_display_error):
+        with open(self.path("bundle.pem"), "w") as f:
+            for name in ("ca.pem", "server.pem"):
+                with open(self.path(name)) as cert:
+                    f.write(cert.read())
+        self.assertTrue(validate_ca_bundle(self.path("ca.pem"))["ok"])
+        result = validate_ca_bundle(self.path("bundle.pem"))
+        self.assertFalse(result["ok"])
+        self.assertTrue(result["errors"][0].startswith("radius.example.com: Not a CA"))
+        self.assertEqual(len(result["certificates"]), 2)
+
+        results = import_ca_certificates([self.path("bundle.pem")])
+        self.assertEqual(results[0]["status"], "invalid")
+        mock_add_certificates.assert_not_called()
+
+        # The system store gets the store's PEM copy as .crt, never the DER file itself
+        openssl("x509", "-in", "ca.pem", "-outform", "DER", "-out", "ca.der", cwd=self.dir)
+        mock_add_certificates.return_value = [{"name": "ca", "file": "ca.pem", "link": "0a1b2c3d.0",
+                                               "status": "added"}]
+        import_ca_certificates([self.path("ca.der")], system=True)
+        commands = mock_execute_batch_with_sudo.call_args.args[0]
+        self.assertEqual(commands, [
+            ["cp", "/etc/intel-wifi-fixer/ca-certificates/ca.pem", "/usr/local/share/ca-certificates/ca.crt"],
+            ["update-ca-certificates"]
+        ])
+
+    def test_cache_reparses_only_changed_files(self):
+        cache = CertificateCache()
+        path = self.path("cached.pem")
+        shutil.copy(self.path("server.pem"), path)
+
+        with patch('src.cert_inspector.load_certificates', wraps=load_certificates) as mock_load:
+            first = cache.load(path)
+            self.assertIs(cache.load(path), first)
+            self.assertEqual(mock_load.call_count, 1)
+
+            shutil.copy(self.path("ca.pem"), path)
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+            self.assertEqual(cache.load(path)[0].common_name, "Test CA")
+            self.assertEqual(mock_load.call_count, 2)
+
+            found = cache.scan(self.dir)
+            self.assertIn(self.path("other.pem"), found)
+            self.assertNotIn(self.path("server.key"), found)
+            cache.scan(self.dir)
+            # Only the files first seen by the scan were parsed
+            self.assertEqual(mock_load.call_count, 2 + len(found) - 1)
+
+    def test_expiring_certificates(self):
+        report = expiring_certificates([self.path("ca.pem"), self.path("other.pem"), self.path("missing.pem")])
+        self.assertEqual([item["path"] for item in report], [self.path("missing.pem"), self.path("other.pem")])
+        self.assertIsNotNone(report[0]["error"])
+        self.assertIn(report[1]["days_left"], (29, 30))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import io
+import json
+import contextlib
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import cli
+from src.fixes import plan_fixes
+from src.utils.privileged_helper import HelperError
+
+def run_cli(*argv):
+    """Run the CLI, returning (exit code, stdout, stderr)."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        code = cli.run(list(argv))
+    return code, stdout.getvalue(), stderr.getvalue()
+
+class TestCli(unittest.TestCase):
+
+    def test_plan_fixes(self):
+        plan = plan_fixes(["WiFi adapter is disconnected", "WiFi is blocked by rfkill", "WiFi driver is not loaded"])
+        self.assertEqual(plan, [("WiFi adapter is disconnected", "reset_adapter"),
+                                ("WiFi is blocked by rfkill", "unblock_rfkill"),
+                                ("WiFi driver is not loaded", None)])
+
+    def test_json_after_action(self):
+        args = cli.build_parser().parse_args(["conn", "up", "Office", "Home", "--json"])
+        self.assertTrue(args.json)
+        self.assertEqual(args.names, ["Office", "Home"])
+
+    def test_usage_error(self):
+        self.assertEqual(run_cli("no-such-command")[0], cli.EXIT_USAGE)
+        self.assertEqual(run_cli("conn")[0], cli.EXIT_USAGE)
+
+    @patch('src.cli._adapter')
+    @patch('src.diagnostics.run_diagnostics', return_value=["WiFi adapter is disconnected"])
+    def test_fix_plan_json(self, mock_run_diagnostics, mock_adapter):
+        code, stdout, _ = run_cli("fix", "--plan", "--json")
+        self.assertEqual(code, cli.EXIT_ISSUES)
+        self.assertEqual(json.loads(stdout), [{"issue": "WiFi adapter is disconnected", "fix": "reset_adapter"}])
+
+        mock_run_diagnostics.return_value = []
+        self.assertEqual(run_cli("fix", "--plan")[0], cli.EXIT_OK)
+
+    @patch('src.regulatory.REGULATORY_DOMAINS', {"US": "United States"})
+    def test_progress_goes_to_stderr_with_json(self):
+        with patch('src.regulatory.get_current_regulatory_domain', side_effect=lambda: print("Reading...") or "US"):
+            code, stdout, stderr = run_cli("reg", "show", "--json")
+        self.assertEqual(code, cli.EXIT_OK)
+        self.assertEqual(json.loads(stdout), {"domain": "US"})
+        self.assertIn("Reading...", stderr)
+
+    @patch('src.multi_connection.bulk_activate_connections')
+    def test_conn_up_exit_code(self, mock_activate):
+        mock_activate.return_value = [{"name": "Office", "status": "activated", "ok": True},
+                                      {"name": "Home", "status": "failed", "ok": False}]
+        code, stdout, _ = run_cli("conn", "up", "Office", "Home", "--device", "wlan1")
+        self.assertEqual(code, cli.EXIT_FAILURE)
+        self.assertIn("Home: failed", stdout)
+        mock_activate.assert_called_once_with(["Office", "Home"], "wlan1")
+
+    @patch('src.regulatory.set_regulatory_domain', side_effect=HelperError("sudo refused"))
+    def test_missing_privileges(self, mock_set):
+        code, _, stderr = run_cli("reg", "set", "us")
+        self.assertEqual(code, cli.EXIT_PRIVILEGES)
+        mock_set.assert_called_once_with("US")
+        self.assertIn("sudo refused", stderr)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.config_writer import (
+    write_config, read_config, list_backups, rollback_config, merge_rt_tables
+)
+from src.driver_profiles import merge_modprobe_options
+
+class TestConfigWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "etc", "test.conf")
+        self.backup_dir = os.path.join(self.tmp.name, "backups")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_is_idempotent(self):
+        self.assertTrue(write_config(self.path, "a=1", backup_dir=self.backup_dir))
+        self.assertEqual(read_config(self.path), "a=1\n")
+        # Same content: no write and no backup
+        with patch('src.utils.config_writer.commit_config') as mock_commit_config:
+            self.assertFalse(write_config(self.path, "a=1\n", backup_dir=self.backup_dir))
+            mock_commit_config.assert_not_called()
+        self.assertEqual(list_backups(self.path, self.backup_dir), [])
+
+    def test_backups_and_rollback(self):
+        for value in range(4):
+            write_config(self.path, f"a={value}", backup_dir=self.backup_dir, keep=2)
+        backups = list_backups(self.path, self.backup_dir)
+        self.assertEqual([version for version, _ in backups], [2, 3])
+
+        rollback_config(self.path, backup_dir=self.backup_dir)
+        self.assertEqual(read_config(self.path), "a=2\n")
+
+    def test_write_sets_mode(self):
+        write_config(self.path, "#!/bin/bash", mode=0o755, backup_dir=self.backup_dir)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o755)
+        # No temporary files are left behind
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["test.conf"])
+
+    def test_merge_rt_tables(self):
+        content = "255\tlocal\n# comment\n42 wifi_wlan0\n42 wifi_wlan0\n"
+        merged = merge_rt_tables(content, 7, "wifi_wlan0")
+        self.assertEqual(merged, "255\tlocal\n# comment\n7\twifi_wlan0\n")
+        self.assertEqual(merge_rt_tables(merged, 7, "wifi_wlan0"), merged)
+
+    def test_merge_modprobe_options(self):
+        content = "# tuned\noptions iwlwifi power_save=1\nblacklist foo\noptions iwlwifi swcrypto=1\n"
+        merged = merge_modprobe_options(content, {"iwlwifi": {"power_save": 0}, "iwlmvm": {"power_scheme": 1}})
+        self.assertEqual(merged, "# tuned\noptions iwlwifi power_save=0\nblacklist foo\noptions iwlmvm power_scheme=1\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.dashboard import LogTail, StatusLine, diff_frame, render_frame, read_connections, read_networks
+
+LINK = {"ssid": "office", "signal": -55, "frequency": 5180, "bitrate": 300.0, "tx_power": 15.0}
+
+class TestDashboard(unittest.TestCase):
+
+    def test_diff_frame(self):
+        previous = ["signal -55 dBm", "unchanged"]
+        current = ["signal -61 dBm", "unchanged"]
+        self.assertEqual(diff_frame(previous, current), [(0, 8, "61")])
+        self.assertEqual(diff_frame(current, current), [])
+        # Nothing to compare with: everything is drawn
+        self.assertEqual(diff_frame(None, current), [(0, 0, current[0]), (1, 0, current[1])])
+        self.assertEqual(len(diff_frame(previous[:1], current)), 2)
+
+    def test_render_frame(self):
+        connections = [{"name": "Office", "type": "802-11-wireless", "device": "wlan0", "active": True}]
+        networks = [{"ssid": "office", "signal": 80, "channel": "36", "security": "WPA2"}]
+        log = [f"line {i}" for i in range(100)]
+        for width, height in ((120, 40), (60, 20), (40, 5)):
+            frame = render_frame(width, height, "wlan0", LINK, connections, networks, log)
+            self.assertEqual(len(frame), height)
+            self.assertTrue(all(len(line) == width for line in frame))
+
+        frame = render_frame(120, 40, "wlan0", LINK, connections, networks, log)
+        text = "\n".join(frame)
+        self.assertIn("-55 dBm", text)
+        self.assertIn("* Office", text)
+        self.assertIn("########.. ", text)
+        self.assertIn("line 99", text)
+        self.assertNotIn("line 0\n", text)
+
+        # A failed command shows on the bottom line instead of over the screen
+        status = StatusLine()
+        print("Command failed: nmcli: not running", file=status)
+        frame = render_frame(120, 40, "wlan0", LINK, connections, networks, log, status.message())
+        self.assertEqual(len(frame), 40)
+        self.assertEqual(frame[-1].rstrip(), " ! Command failed: nmcli: not running")
+        self.assertIn("line 99", "\n".join(frame))
+
+    def test_log_tail(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "syslog")
+            with open(path, 'w') as f:
+                f.write("one\ntwo\npart")
+            tail = LogTail(path, max_lines=3)
+            self.assertEqual(tail.read(), ["one", "two"])
+
+            with open(path, 'a') as f:
+                f.write("ial\nthree\n")
+            self.assertEqual(tail.read(), ["two", "partial", "three"])
+
+            # Rotation: the file starts over
+            with open(path, 'w') as f:
+                f.write("four\n")
+            self.assertEqual(tail.read(), ["partial", "three", "four"])
+
+    def test_log_tail_starts_near_the_end(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "syslog")
+            with open(path, 'w') as f:
+                f.write("".join(f"old line {i}\n" for i in range(20000)) + "last\n")
+            with patch('src.dashboard.LOG_TAIL_BYTES', 1000):
+                tail = LogTail(path, max_lines=500)
+                lines = tail.read()
+            # Only about the last 1000 bytes are read, starting at a whole line
+            self.assertLess(len(lines), 100)
+            self.assertEqual(lines[-1], "last")
+            self.assertTrue(lines[0].startswith("old line 19"))
+
+            with patch('src.dashboard.LOG_TAIL_BYTES', 20):
+                self.assertEqual(LogTail(path).read(), ["old line 19999", "last"])
+            with patch('src.dashboard.LOG_TAIL_BYTES', 19):
+                # The line cut by the tail's start is skipped
+                self.assertEqual(LogTail(path).read(), ["last"])
+
+    @patch('src.dashboard.run_command')
+    def test_read_connections_and_networks(self, mock_run_command):
+        mock_run_command.return_value = "Cafe\\: Guest:802-11-wireless:wlan0:yes\nHome:802-11-wireless::no"
+        connections = read_connections()
+        self.assertEqual(connections[0]["name"], "Cafe: Guest")
+        self.assertTrue(connections[0]["active"])
+        self.assertFalse(connections[1]["active"])
+
+        mock_run_command.return_value = "weak:20:1:WPA2\n:70:6:\nstrong:90:36:WPA3"
+        networks = read_networks()
+        self.assertEqual([network["ssid"] for network in networks], ["strong", "(hidden)", "weak"])
+        self.assertEqual(networks[1]["security"], "Open")
+
+if __name__ == '__main__':
+    unittest.main()
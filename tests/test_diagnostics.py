@@ -127,5 +127,29 @@ class TestDiagnostics(unittest.TestCase):
         self.assertIn("WiFi is blocked by rfkill", issues)
         self.assertIn("WiFi driver is not loaded", issues)
 
+    def test_identify_issues_follows_adapter_profile(self):
+        diagnostics = {
+            "Adapter Status": "Connected",
+            "RFKill Status": "Not blocked",
+            "Driver Status": "Driver loaded",
+            "Firmware Version": "48.4fa0041f.0",
+            "Signal Strength": "80%",
+            "NetworkManager Status": "Running",
+            "WPA Supplicant Status": "Running",
+            "Interface Status": "Up",
+            "Driver Parameters": "options iwlwifi 11n_disable=1 power_save=0"
+        }
+        ax_profile = {"iwlwifi": {"power_save": 0}, "iwlmvm": {"power_scheme": 1}}
+        
+        # 11n must not be disabled on an 11ax adapter
+        issues = identify_issues(diagnostics, ax_profile)
+        self.assertIn("11n mode is disabled, which throttles throughput on this adapter", issues)
+        self.assertIn("Driver parameter iwlmvm.power_scheme should be set to 1 for this adapter", issues)
+        self.assertEqual(len(issues), 2)
+        
+        # The 6205 profile is satisfied by the same configuration
+        issues = identify_issues(diagnostics, {"iwlwifi": {"11n_disable": 1, "power_save": 0}})
+        self.assertEqual(len(issues), 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
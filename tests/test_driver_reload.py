@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch, MagicMock, call
+import sys
+import os
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.driver_reload import snapshot_connections, wait_for_interfaces, reload_driver
+from src.utils.netlink import RTM_NEWLINK, RTM_DELLINK
+
+class TestDriverReload(unittest.TestCase):
+
+    @patch('src.driver_reload.run_command')
+    def test_snapshot_connections(self, mock_run_command):
+        mock_run_command.return_value = (
+            "Home\\:5G:1111-2222:wlan0\n"
+            "Wired:3333-4444:eth0\n"
+            "lo:5555-6666:lo"
+        )
+        connections = snapshot_connections(["wlan0"])
+        self.assertEqual(connections, [{"name": "Home:5G", "uuid": "1111-2222", "device": "wlan0"}])
+
+    @patch('src.driver_reload.os.path.exists', return_value=False)
+    def test_wait_for_interfaces_uses_link_events(self, mock_exists):
+        monitor = MagicMock()
+        monitor.read.side_effect = [[(RTM_DELLINK, "wlan0")], [(RTM_NEWLINK, "wlan0")]]
+        # Missing at first, present when its NEWLINK arrives
+        mock_exists.side_effect = [False, True]
+        self.assertTrue(wait_for_interfaces(["wlan0"], timeout=5, monitor=monitor))
+        self.assertEqual(monitor.read.call_count, 2)
+
+        mock_exists.side_effect = None
+        monitor.read.side_effect = None
+        monitor.read.return_value = []
+        self.assertFalse(wait_for_interfaces(["wlan0"], timeout=0.01, monitor=monitor))
+
+    @patch('src.driver_reload.os.path.exists')
+    def test_wait_ignores_link_events_from_before_the_unload(self, mock_exists):
+        present = set()
+        mock_exists.side_effect = lambda path: os.path.basename(path) in present
+        monitor = MagicMock()
+
+        def read(timeout):
+            events = reads.pop(0)
+            if events == [(RTM_NEWLINK, "wlan0")] and not reads:
+                # The device is registered again
+                present.add("wlan0")
+            return events
+        # wlan0 going down queued a NEWLINK before its DELLINK
+        reads = [[(RTM_NEWLINK, "wlan0"), (RTM_DELLINK, "wlan0")], [], [(RTM_NEWLINK, "wlan0")]]
+        monitor.read.side_effect = read
+
+        self.assertTrue(wait_for_interfaces(["wlan0"], timeout=5, monitor=monitor))
+        self.assertEqual(monitor.read.call_count, 3)
+
+    @patch('src.driver_reload.display_success')
+    @patch('src.driver_reload.display_message')
+    @patch('src.driver_reload.wait_for_interfaces', return_value=True)
+    @patch('src.driver_reload.LinkMonitor')
+    @patch('src.driver_reload.loaded_modules')
+    @patch('src.driver_reload.driver_interfaces', return_value=["wlan0"])
+    @patch('src.driver_reload.run_command')
+    @patch('src.driver_reload.execute_batch_with_sudo', side_effect=lambda commands, **kwargs: [""] * len(commands))
+    @patch('src.driver_reload.execute_with_sudo', return_value="")
+    def test_reload_driver(self, mock_execute_with_sudo, mock_execute_batch_with_sudo, mock_run_command,
+                           mock_driver_interfaces,
+                           mock_loaded_modules, mock_link_monitor, mock_wait_for_interfaces,
+                           mock_display_message, mock_display_success):
+        mock_run_command.return_value = "Home:1111-2222:wlan0\nOffice:3333-4444:wlan0"
+        # Unloading iwlmvm takes iwlwifi with it
+        mock_loaded_modules.side_effect = [{"iwlwifi", "iwlmvm", "cfg80211"}, {"iwlwifi", "iwlmvm", "cfg80211"},
+                                           {"cfg80211"}]
+        adapter_info = MagicMock()
+
+        report = reload_driver(adapter_info)
+
+        self.assertTrue(report["success"])
+        self.assertEqual(report["connections"], {"Home": True, "Office": True})
+        self.assertIsNotNone(report["downtime"])
+        # The op-mode module goes first; iwlwifi is not unloaded twice, then both are loaded again
+        self.assertEqual(mock_execute_batch_with_sudo.call_args_list, [
+            call([["modprobe", "-r", "iwlmvm"]]),
+            call([["modprobe", "iwlwifi"], ["modprobe", "iwlmvm"]], stop_on_error=False)
+        ])
+        # Both connections are reactivated
+        self.assertEqual(mock_execute_with_sudo.call_count, 2)
+        adapter_info.refresh.assert_any_call("driver", "firmware", "mac_address")
+
+    @patch('src.driver_reload.display_error')
+    @patch('src.driver_reload.display_message')
+    @patch('src.driver_reload.LinkMonitor')
+    @patch('src.driver_reload.loaded_modules', return_value={"iwlwifi"})
+    @patch('src.driver_reload.driver_interfaces', return_value=["wlan0"])
+    @patch('src.driver_reload.run_command', return_value="")
+    @patch('src.driver_reload.execute_batch_with_sudo', side_effect=[[None], [""]])
+    def test_reload_driver_unload_failure(self, mock_execute_batch_with_sudo, mock_run_command,
+                                          mock_driver_interfaces, mock_loaded_modules,
+                                          mock_link_monitor, mock_display_message, mock_display_error):
+        report = reload_driver()
+        self.assertFalse(report["success"])
+        mock_display_error.assert_called_once_with("Could not run: modprobe -r iwlwifi")
+        # The driver is loaded again regardless
+        mock_execute_batch_with_sudo.assert_called_with([["modprobe", "iwlwifi"]], stop_on_error=False)
+        mock_link_monitor.return_value.close.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
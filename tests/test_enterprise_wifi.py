@@ -0,0 +1,163 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import socket
+import tempfile
+import threading
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.enterprise_wifi import (
+    wait_for_authentication, enterprise_profiles, schedule_profiles, verify_enterprise_profiles
+)
+from src.utils.wpa_events import ControlSocketEvents
+
+class FakeEvents:
+    """An event source replaying batches of events, one batch per read."""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+
+    def read(self, timeout):
+        if self.batches:
+            return self.batches.pop(0)
+        time.sleep(min(timeout, 0.01))
+        return []
+
+def profile(name, ssid, device=None):
+    return {"name": name, "ssid": ssid, "eap": "peap", "device": device}
+
+class TestEnterpriseWifi(unittest.TestCase):
+
+    def wait(self, *batches, **kwargs):
+        return wait_for_authentication(FakeEvents(*batches), time.monotonic(), **kwargs)
+
+    def test_wait_for_authentication(self):
+        result = self.wait(["CTRL-EVENT-EAP-STARTED EAP authentication started"],
+                           ["CTRL-EVENT-EAP-METHOD EAP vendor 0 method 25 (PEAP) selected",
+                            "CTRL-EVENT-EAP-SUCCESS EAP authentication completed successfully"])
+        self.assertTrue(result["ok"])
+        self.assertIsNotNone(result["latency"])
+
+        result = self.wait(["CTRL-EVENT-EAP-STARTED", "CTRL-EVENT-EAP-METHOD EAP vendor 0 method 25 (PEAP) selected",
+                            "CTRL-EVENT-EAP-TLS-CERT-ERROR reason=1 depth=0 err='certificate has expired'",
+                            "CTRL-EVENT-EAP-FAILURE EAP authentication failed"])
+        self.assertEqual(result["reason"], "bad-certificate")
+        self.assertIn("expired", result["detail"])
+
+        self.assertEqual(self.wait(["CTRL-EVENT-EAP-STARTED", "CTRL-EVENT-EAP-FAILURE"])["reason"],
+                         "identity-rejected")
+        self.assertEqual(self.wait(["CTRL-EVENT-EAP-STARTED", "CTRL-EVENT-EAP-METHOD",
+                                    "CTRL-EVENT-EAP-FAILURE"])["reason"], "credentials-rejected")
+
+        result = self.wait(["CTRL-EVENT-EAP-STARTED"], timeout=0.05)
+        self.assertEqual((result["ok"], result["reason"]), (False, "timeout"))
+
+    @patch('src.enterprise_wifi.run_command', side_effect=["activating", "activating", "activated"])
+    def test_wait_ends_on_activation_without_events(self, mock_run_command):
+        # A journal that shows no wpa_supplicant lines must not hold the wait until the timeout
+        with patch('src.enterprise_wifi.POLL_INTERVAL', 0.01):
+            result = self.wait([], [], timeout=5, connection_name="Work")
+        self.assertTrue(result["ok"])
+        self.assertLess(result["latency"], 1)
+        mock_run_command.assert_called_with(["nmcli", "-g", "GENERAL.STATE", "connection", "show", "Work"])
+
+        mock_run_command.side_effect = ["activating", ""]
+        with patch('src.enterprise_wifi.POLL_INTERVAL', 0.01):
+            result = self.wait([], [], timeout=5, connection_name="Work")
+        self.assertEqual((result["ok"], result["reason"]), (False, "failed"))
+
+    def test_wait_until_connected(self):
+        result = self.wait(["CTRL-EVENT-EAP-SUCCESS"], [], ["CTRL-EVENT-CONNECTED - Connection completed"],
+                           until_connected=True)
+        self.assertTrue(result["ok"])
+
+    @patch('src.enterprise_wifi.run_command')
+    def test_enterprise_profiles(self, mock_run_command):
+        mock_run_command.return_value = (
+            "connection.id:Corp\nconnection.interface-name:wlan1\n802-11-wireless.ssid:Corp\\:Net\n"
+            "802-1x.eap:peap\n802-1x.ca-cert:file:///etc/certs/ca.pem\n802-1x.client-cert:\n"
+            "connection.id:Home\nconnection.interface-name:\n"
+            "802-11-wireless.ssid:Home\n802-1x.eap:\n")
+        self.assertEqual(enterprise_profiles(["Corp", "Home"]),
+                         [{"name": "Corp", "ssid": "Corp:Net", "eap": "peap", "device": "wlan1",
+                           "ca_cert": "/etc/certs/ca.pem", "client_cert": None}])
+        mock_run_command.assert_called_once()
+
+    def test_schedule_profiles(self):
+        profiles = [profile("a", "A"), profile("b", "A"), profile("c", "C", device="wlan1"),
+                    profile("d", "D"), profile("e", "A", device="wlan2")]
+        visible = {"A": {"wlan0", "wlan1"}, "C": {"wlan1"}}
+
+        queues, unreachable = schedule_profiles(profiles, visible)
+
+        self.assertEqual([item["name"] for item in queues["wlan1"]][0], "c")
+        self.assertEqual(sorted(len(queue) for queue in queues.values()), [1, 2])
+        self.assertEqual([item["name"] for item in unreachable], ["d", "e"])
+
+    @patch('src.enterprise_wifi.execute_with_sudo', return_value="")
+    @patch('src.enterprise_wifi.activate_and_wait')
+    @patch('src.enterprise_wifi.visible_networks', return_value={"A": {"wlan0", "wlan1"}, "B": {"wlan1"}})
+    @patch('src.enterprise_wifi.wifi_devices', return_value={"wlan0": "Home", "wlan1": None})
+    @patch('src.enterprise_wifi.enterprise_profiles')
+    def test_verify_enterprise_profiles(self, mock_profiles, mock_devices, mock_visible,
+                                        mock_activate, mock_execute_with_sudo):
+        mock_profiles.return_value = [profile("a", "A"), profile("b", "B"), profile("c", "A"), profile("x", "X")]
+        active = set()
+        overlaps = []
+        lock = threading.Lock()
+
+        def activate(name, device, timeout):
+            with lock:
+                # Never two profiles on one interface; the two interfaces run together
+                self.assertNotIn(device, active)
+                active.add(device)
+                overlaps.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.discard(device)
+            if name == "b":
+                return {"ok": False, "reason": "credentials-rejected", "detail": None, "latency": 0.04}
+            return {"ok": True, "reason": None, "detail": None, "latency": 0.05}
+
+        mock_activate.side_effect = activate
+
+        results = verify_enterprise_profiles()
+
+        self.assertEqual([result["name"] for result in results], ["a", "b", "c", "x"])
+        self.assertEqual([result["ok"] for result in results], [True, False, True, False])
+        self.assertEqual(results[3]["reason"], "not-visible")
+        self.assertEqual(results[1]["device"], "wlan1")
+        self.assertEqual(max(overlaps), 2)
+        # A rejected profile is brought down too, so NetworkManager stops retrying it
+        mock_execute_with_sudo.assert_any_call(["nmcli", "connection", "down", "b"])
+        # The interface's previous connection is restored
+        mock_execute_with_sudo.assert_any_call(["nmcli", "--wait", "0", "connection", "up", "Home",
+                                                "ifname", "wlan0"])
+
+    def test_control_socket_events(self):
+        with tempfile.TemporaryDirectory() as ctrl_dir:
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            server.bind(os.path.join(ctrl_dir, "wlan0"))
+
+            def supplicant():
+                request, client = server.recvfrom(4096)
+                server.sendto(b"OK\n" if request == b"ATTACH" else b"FAIL\n", client)
+                server.sendto(b"<3>CTRL-EVENT-EAP-STARTED EAP authentication started", client)
+                server.sendto(b"<3>CTRL-EVENT-EAP-SUCCESS EAP authentication completed successfully", client)
+
+            thread = threading.Thread(target=supplicant)
+            thread.start()
+            with ControlSocketEvents("wlan0", ctrl_dir) as events:
+                thread.join()
+                self.assertEqual(events.read(1), ["CTRL-EVENT-EAP-STARTED EAP authentication started",
+                                                  "CTRL-EVENT-EAP-SUCCESS EAP authentication completed successfully"])
+                local_path = events.local_path
+            self.assertFalse(os.path.exists(local_path))
+            server.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -65,34 +65,32 @@ class TestFixes(unittest.TestCase):
         result = restart_network_manager()
         self.assertFalse(result)
 
-    @patch('src.fixes.os.path.exists')
-    @patch('src.fixes.run_command')
-    @patch('src.fixes.execute_with_sudo')
+    @patch('src.fixes.read_config')
+    @patch('src.fixes.write_config')
     @patch('src.fixes.display_success')
-    def test_configure_driver_parameters(self, mock_display_success, mock_execute_with_sudo, 
-                                        mock_run_command, mock_path_exists):
+    def test_configure_driver_parameters(self, mock_display_success, mock_write_config, mock_read_config):
         # Test when file exists and needs updating
-        mock_path_exists.return_value = True
-        mock_run_command.return_value = "options iwlwifi power_save=0"  # Missing 11n_disable=1
+        mock_read_config.return_value = "options iwlwifi power_save=0\noptions iwlmvm power_scheme=3"  # Missing 11n_disable=1
+        mock_write_config.return_value = True
         
-        result = configure_driver_parameters()
+        result = configure_driver_parameters(module_parameters={"iwlwifi": {"11n_disable": 1, "power_save": 0}})
         self.assertTrue(result)
-        mock_execute_with_sudo.assert_called_once()
+        mock_write_config.assert_called_once()
+        # Options for modules the profile does not set are dropped
+        self.assertEqual(mock_write_config.call_args.args[1], "options iwlwifi 11n_disable=1 power_save=0\n")
         mock_display_success.assert_called_once()
         
-        # Test when file doesn't exist
-        mock_path_exists.return_value = False
-        mock_execute_with_sudo.reset_mock()
+        # Test when the file is already up to date
+        mock_write_config.return_value = False
         mock_display_success.reset_mock()
         
-        result = configure_driver_parameters()
+        result = configure_driver_parameters(module_parameters={"iwlwifi": {"11n_disable": 1, "power_save": 0}})
         self.assertTrue(result)
-        mock_execute_with_sudo.assert_called_once()
-        mock_display_success.assert_called_once()
+        mock_display_success.assert_not_called()
         
-        # Test when command fails
-        mock_execute_with_sudo.side_effect = Exception("Command failed")
-        result = configure_driver_parameters()
+        # Test when the write fails
+        mock_write_config.side_effect = Exception("Command failed")
+        result = configure_driver_parameters(module_parameters={"iwlwifi": {"11n_disable": 1}})
         self.assertFalse(result)
 
     @patch('src.fixes.run_command')
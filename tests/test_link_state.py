@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import struct
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.link_state import freq_to_channel, _iw_link_info
+from src.utils.netlink import pack_attr, parse_attrs, attr_u32
+
+IW_LINK = """Connected to 00:11:22:33:44:55 (on wlan0)
+	SSID: Office WiFi
+	freq: 5180
+	signal: -52 dBm
+	tx bitrate: 300.0 MBit/s MCS 15 40MHz short GI"""
+
+IW_INFO = """Interface wlan0
+	ifindex 3
+	type managed
+	wiphy 0
+	channel 36 (5180 MHz), width: 40 MHz, center1: 5190 MHz
+	txpower 15.00 dBm"""
+
+class TestLinkState(unittest.TestCase):
+
+    def test_freq_to_channel(self):
+        self.assertEqual(freq_to_channel(2412), 1)
+        self.assertEqual(freq_to_channel(2484), 14)
+        self.assertEqual(freq_to_channel(5180), 36)
+        self.assertEqual(freq_to_channel(5975), 5)
+        self.assertIsNone(freq_to_channel(None))
+        self.assertIsNone(freq_to_channel(900))
+
+    def test_netlink_attrs(self):
+        data = pack_attr(38, struct.pack("I", 5180)) + pack_attr(52, b"abc")
+        attrs = parse_attrs(data)
+        self.assertEqual(attr_u32(attrs, 38), 5180)
+        self.assertEqual(attrs[52], b"abc")
+        self.assertIsNone(attr_u32(attrs, 98))
+
+    @patch('src.link_state.run_command')
+    def test_iw_fallback(self, mock_run_command):
+        mock_run_command.side_effect = [IW_LINK, IW_INFO]
+        info = _iw_link_info("wlan0")
+        self.assertEqual(info["ssid"], "Office WiFi")
+        self.assertEqual(info["frequency"], 5180)
+        self.assertEqual(info["signal"], -52)
+        self.assertEqual(info["bitrate"], 300.0)
+        self.assertEqual(info["tx_power"], 15.0)
+
+        # Not connected
+        mock_run_command.side_effect = ["Not connected.", IW_INFO]
+        info = _iw_link_info("wlan0")
+        self.assertNotIn("ssid", info)
+        self.assertEqual(info["frequency"], 5180)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.load_balancer import LoadBalancer, Uplink, compute_weights, find_gateway
+
+class TestLoadBalancer(unittest.TestCase):
+
+    def make_balancer(self):
+        balancer = LoadBalancer(["wlan0", "wlan1"])
+        balancer.uplinks = [
+            Uplink("wlan0", "192.168.1.1", "192.168.1.10", 200),
+            Uplink("wlan1", "10.0.0.1", "10.0.0.10", 201)
+        ]
+        return balancer
+
+    def test_compute_weights(self):
+        self.assertEqual(compute_weights([300 / 10, 150 / 10]), [16, 8])
+        self.assertEqual(compute_weights([None, 20.0]), [1, 16])
+        self.assertEqual(compute_weights([None, None]), [1, 1])
+
+    @patch('src.load_balancer.run_command')
+    def test_find_gateway(self, mock_run_command):
+        mock_run_command.return_value = (
+            "default proto static metric 600\n"
+            "\tnexthop via 192.168.1.1 dev wlan0 weight 2\n"
+            "\tnexthop via 10.0.0.1 dev wlan1 weight 1"
+        )
+        self.assertEqual(find_gateway("wlan1"), "10.0.0.1")
+        mock_run_command.return_value = "default via 192.168.1.1 dev wlan0 proto dhcp metric 600"
+        self.assertEqual(find_gateway("wlan0"), "192.168.1.1")
+        self.assertIsNone(find_gateway("wlan1"))
+
+    @patch('src.load_balancer.execute_batch_with_sudo')
+    def test_apply(self, mock_execute_batch_with_sudo):
+        balancer = self.make_balancer()
+        # The first rule deletion fails because no rule exists yet
+        mock_execute_batch_with_sudo.return_value = ["", "", None, "", "", "", "", ""]
+
+        self.assertTrue(balancer.apply())
+        commands = mock_execute_batch_with_sudo.call_args.args[0]
+        self.assertEqual(commands[0], ["sysctl", "-w", "net.ipv4.fib_multipath_hash_policy=1"])
+        self.assertIn(["ip", "rule", "add", "from", "10.0.0.10", "table", "201", "priority", "1001"], commands)
+        self.assertEqual(commands[-1], [
+            "ip", "route", "replace", "default", "scope", "global",
+            "nexthop", "via", "192.168.1.1", "dev", "wlan0", "weight", "1",
+            "nexthop", "via", "10.0.0.1", "dev", "wlan1", "weight", "1"
+        ])
+
+    @patch('src.load_balancer.execute_batch_with_sudo')
+    def test_stop_removes_the_multipath_route(self, mock_execute_batch_with_sudo):
+        balancer = self.make_balancer()
+        balancer.stop()
+
+        commands = mock_execute_batch_with_sudo.call_args.args[0]
+        self.assertEqual(commands[0], [
+            "ip", "route", "del", "default", "scope", "global",
+            "nexthop", "via", "192.168.1.1", "dev", "wlan0", "weight", "1",
+            "nexthop", "via", "10.0.0.1", "dev", "wlan1", "weight", "1"
+        ])
+        self.assertIn(["ip", "route", "flush", "table", "201"], commands)
+        # No static default route is put in place of NetworkManager's
+        self.assertFalse(any(command[2] == "replace" for command in commands))
+
+    @patch('src.load_balancer.execute_batch_with_sudo')
+    @patch('src.load_balancer.read_interface_bytes', return_value=None)
+    @patch('src.load_balancer.get_wireless_info')
+    @patch('src.load_balancer.measure_rtt')
+    def test_update_reweights_only_on_change(self, mock_measure_rtt, mock_get_wireless_info,
+                                             mock_read_interface_bytes, mock_execute_batch_with_sudo):
+        balancer = self.make_balancer()
+        mock_measure_rtt.side_effect = lambda address, target: 10.0 if address == "192.168.1.10" else 20.0
+        mock_get_wireless_info.return_value = {"bitrate": 300.0}
+
+        self.assertTrue(balancer.update())
+        self.assertEqual([uplink.weight for uplink in balancer.uplinks], [16, 8])
+        mock_execute_batch_with_sudo.assert_called_once()
+
+        mock_execute_batch_with_sudo.reset_mock()
+        self.assertFalse(balancer.update())
+        mock_execute_batch_with_sudo.assert_not_called()
+
+        status = balancer.status()
+        self.assertAlmostEqual(status[0]["share"], 100 * 16 / 24)
+        self.assertEqual(status[1]["rtt_ms"], 20.0)
+
+if __name__ == '__main__':
+    unittest.main()
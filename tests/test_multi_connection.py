@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import threading
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import multi_connection
+from src.multi_connection import run_bulk, bulk_add_connections, configure_load_balancing
+
+class TestMultiConnection(unittest.TestCase):
+
+    @patch('src.multi_connection.execute_with_sudo')
+    def test_run_bulk_is_concurrent_and_bounded(self, mock_execute_with_sudo):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def execute(command):
+            with lock:
+                running.append(command)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(command)
+            return None if command[-1] == "bad" else ""
+
+        mock_execute_with_sudo.side_effect = execute
+        operations = [(f"c{i}", ["nmcli", "connection", "delete", f"c{i}"]) for i in range(9)]
+        operations.append(("bad", ["nmcli", "connection", "delete", "bad"]))
+
+        results = run_bulk(operations, max_workers=4)
+
+        self.assertEqual([result["name"] for result in results], [name for name, _ in operations])
+        self.assertEqual(sum(not result["ok"] for result in results), 1)
+        self.assertLessEqual(max(peak), 4)
+        self.assertGreater(max(peak), 1)
+
+    @patch('src.multi_connection.execute_with_sudo', return_value="")
+    @patch('src.multi_connection.run_command', return_value="Office:wlan0\nHome\\:5G:")
+    def test_bulk_add_connections_skips_existing(self, mock_run_command, mock_execute_with_sudo):
+        results = bulk_add_connections([
+            {"name": "Office", "ssid": "office"},
+            {"name": "Site 1", "ssid": "site1", "psk": "secret", "settings": {"connection.autoconnect": "no"}}
+        ])
+
+        self.assertEqual([result["status"] for result in results], ["skipped", "done"])
+        mock_execute_with_sudo.assert_called_once_with([
+            "nmcli", "connection", "add", "type", "wifi", "con-name", "Site 1", "ifname", "*",
+            "ssid", "site1", "wifi-sec.key-mgmt", "wpa-psk", "wifi-sec.psk", "secret",
+            "connection.autoconnect", "no"
+        ])
+        # Existing profiles are found with a single query
+        mock_run_command.assert_called_once()
+
+    @patch('src.multi_connection.display_success')
+    @patch('src.multi_connection.display_message')
+    @patch('src.load_balancer.LoadBalancer')
+    @patch('src.multi_connection.run_command')
+    def test_configure_load_balancing(self, mock_run_command, mock_load_balancer,
+                                      mock_display_message, mock_display_success):
+        mock_run_command.return_value = "A:wlan0\nB:wlan1\nC:"
+        mock_load_balancer.return_value.start.return_value = True
+
+        self.assertTrue(configure_load_balancing(["A", "B"]))
+        mock_load_balancer.assert_called_once_with(["wlan0", "wlan1"])
+        self.assertIs(multi_connection.get_load_balancer(), mock_load_balancer.return_value)
+        multi_connection._load_balancer = None
+
+    @patch('src.multi_connection.display_error')
+    @patch('src.multi_connection.display_message')
+    @patch('src.multi_connection.run_command', return_value="A:wlan0\nB:wlan0\nC:")
+    def test_configure_load_balancing_needs_separate_radios(self, mock_run_command,
+                                                            mock_display_message, mock_display_error):
+        self.assertFalse(configure_load_balancing(["A", "B"]))
+        self.assertFalse(configure_load_balancing(["A", "C"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import unittest
+from unittest.mock import patch, call
+import sys
+import os
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import phy_capabilities
+from src.phy_capabilities import parse_iw_list, get_phys, invalidate_phys
+from src.troubleshooting import analyze_wifi_interference
+from src.multi_connection import configure_load_balancing
+
+IW_LIST = """Wiphy phy0
+	wiphy index: 0
+	max # scan SSIDs: 20
+	Supported Ciphers:
+		* WEP40 (00-0f-ac:1)
+		* TKIP (00-0f-ac:2)
+		* CCMP-128 (00-0f-ac:4)
+		* GCMP-256 (00-0f-ac:9)
+	Available Antennas: TX 0x3 RX 0x3
+	Supported interface modes:
+		 * IBSS
+		 * managed
+		 * AP
+		 * AP/VLAN
+		 * monitor
+		 * P2P-client
+		 * P2P-GO
+		 * P2P-device
+	Band 1:
+		Capabilities: 0x1ff2
+			RX LDPC
+			HT20/HT40
+			Static SM Power Save
+		Maximum RX AMPDU length 65535 bytes (exponent: 0x003)
+		HE Iftypes: managed
+			HE MAC Capabilities (0x780112a0abc0):
+				+HTC HE Supported
+			HE PHY Capabilities: (0x0e3f0200fd09800ecff200):
+				HE40/2.4GHz
+				HE40/HE80/5GHz
+		Bitrates (non-HT):
+			* 1.0 Mbps
+		Frequencies:
+			* 2412.0 MHz [1] (22.0 dBm)
+			* 2467.0 MHz [12] (22.0 dBm) (no IR)
+			* 2484.0 MHz [14] (disabled)
+	Band 2:
+		Capabilities: 0x1ff2
+			HT20/HT40
+		VHT Capabilities (0x039071b0):
+			Max MPDU length: 3895
+			Supported Channel Width: neither 160 nor 80+80
+		HE Iftypes: managed
+			HE PHY Capabilities: (0x0e3f0200fd09800ecff200):
+				HE40/HE80/5GHz
+				HE160/5GHz
+		Frequencies:
+			* 5180.0 MHz [36] (22.0 dBm)
+			* 5260.0 MHz [52] (22.0 dBm) (no IR, radar detection)
+			* 5500.0 MHz [100] (disabled)
+			* 5745.0 MHz [149] (22.0 dBm)
+	Band 4:
+		HE Iftypes: managed
+			HE PHY Capabilities: (0x0e3f0200fd09800ecff200):
+				HE40/HE80/5GHz
+				HE160/5GHz
+		EHT Iftypes: managed
+			EHT PHY Capabilities: (0xe26f090001000000):
+				320MHz in 6GHz Supported
+		Frequencies:
+			* 5955.0 MHz [1] (12.0 dBm) (no IR)
+			* 6035.0 MHz [17] (12.0 dBm) (no IR)
+	Supported commands:
+		 * new_interface
+		 * set_interface
+	software interface modes (can always be added):
+		 * AP/VLAN
+		 * monitor
+	valid interface combinations:
+		 * #{ managed } <= 1, #{ AP, P2P-client, P2P-GO } <= 1, #{ P2P-device } <= 1,
+		   total <= 3, #channels <= 2
+		 * #{ managed } <= 2, #{ P2P-device } <= 1,
+		   total <= 3, #channels <= 1
+	HT Capability overrides:
+		 * MCS: ff ff ff ff ff ff ff ff ff ff
+	Device supports TX status socket option.
+Wiphy phy1
+	wiphy index: 1
+	Supported Ciphers:
+		* CCMP (00-0f-ac:4)
+	Supported interface modes:
+		 * managed
+		 * monitor
+	Band 1:
+		Frequencies:
+			* 2412 MHz [1] (20.0 dBm)
+			* 2417 MHz [2] (20.0 dBm)
+"""
+
+class TestPhyCapabilities(unittest.TestCase):
+
+    def setUp(self):
+        invalidate_phys()
+        self.addCleanup(invalidate_phys)
+
+    def test_parse_bands_and_channels(self):
+        phy = parse_iw_list(IW_LIST)["phy0"]
+        self.assertEqual(phy.index, 0)
+        self.assertEqual(list(phy.bands), ["2.4 GHz", "5 GHz", "6 GHz"])
+        self.assertEqual(phy.widths("2.4 GHz"), [20, 40])
+        # VHT without 160 MHz, but HE160
+        self.assertEqual(phy.widths("5 GHz"), [20, 40, 80, 160])
+        self.assertEqual(phy.widths("6 GHz"), [20, 40, 80, 160, 320])
+
+        channel = phy.channel(52)
+        self.assertEqual((channel["frequency"], channel["dfs"], channel["no_ir"], channel["disabled"]),
+                         (5260, True, True, False))
+        self.assertEqual(phy.channel(1, "6 GHz")["frequency"], 5955)
+        self.assertEqual([channel["channel"] for channel in phy.channels("5 GHz", usable=True)], [36, 52, 149])
+        self.assertEqual(phy.ciphers, ["WEP40", "TKIP", "CCMP-128", "GCMP-256"])
+        self.assertEqual(phy.software_modes, ["AP/VLAN", "monitor"])
+
+        legacy = parse_iw_list(IW_LIST)["phy1"]
+        self.assertEqual(legacy.widths("2.4 GHz"), [20])
+        self.assertEqual(legacy.channel(2)["max_power"], 20.0)
+
+    def test_interface_combinations(self):
+        phys = parse_iw_list(IW_LIST)
+        phy = phys["phy0"]
+        self.assertEqual(len(phy.combinations), 2)
+        self.assertEqual(phy.combinations[0]["channels"], 2)
+        self.assertTrue(phy.can_run(["managed", "managed"]))
+        self.assertFalse(phy.can_run(["managed", "managed"], channels=2))
+        self.assertTrue(phy.can_run(["managed", "P2P-GO"], channels=2))
+        self.assertTrue(phy.can_run(["managed", "monitor", "AP/VLAN"]))
+        self.assertFalse(phy.can_run(["managed", "IBSS"]))
+        # No combinations: one interface at a time
+        self.assertFalse(phys["phy1"].can_run(["managed", "managed"]))
+
+    @patch('src.phy_capabilities._phy_indexes', return_value=(("phy0", "0"),))
+    @patch('src.phy_capabilities.run_command')
+    def test_cache(self, mock_run_command, mock_indexes):
+        domains = {"global": "US", "phy#0": "US"}
+
+        def run_command(command):
+            if command == ["iw", "reg", "get"]:
+                return "".join(f"{scope}\ncountry {alpha2}: DFS-FCC\n\t(2400 - 2483 @ 40), (N/A, 20), (N/A)\n\n"
+                               for scope, alpha2 in domains.items())
+            return IW_LIST
+        mock_run_command.side_effect = run_command
+
+        phys = get_phys()
+        self.assertIs(get_phys(), phys)
+        self.assertEqual(mock_run_command.call_args_list.count(call(["iw", "list"])), 1)
+
+        # A self-managed PHY moving to another domain (e.g. by LAR) is seen without a caller passing it
+        domains["phy#0"] = "DE"
+        self.assertIsNot(get_phys(), phys)
+        # So are a re-added PHY and an explicit invalidation
+        mock_indexes.return_value = (("phy0", "2"),)
+        get_phys()
+        invalidate_phys()
+        get_phys()
+        self.assertEqual(mock_run_command.call_args_list.count(call(["iw", "list"])), 4)
+
+    @patch('src.troubleshooting.get_phy')
+    @patch('src.troubleshooting.run_command')
+    def test_channel_advice_uses_usable_channels(self, mock_run_command, mock_get_phy):
+        mock_get_phy.return_value = parse_iw_list(IW_LIST)["phy0"]
+        mock_run_command.return_value = "Home:1:80\nCafe:6:40\nOffice:11:30\nCorp:36:70\nLab:149:60\n"
+        recommendations = analyze_wifi_interference()["recommendations"]
+        # Channel 100 is disabled, so the only free 5 GHz channel is 52, even though it needs radar detection
+        self.assertEqual(recommendations, ["For 2.4 GHz, use channel 1", "For 5 GHz, use channel 52"])
+
+    @patch('src.load_balancer.LoadBalancer')
+    @patch('src.multi_connection.connection_devices', return_value={"A": "wlan0", "B": "wlan1"})
+    def test_load_balancing_checks_shared_radio(self, mock_devices, mock_balancer):
+        phy = parse_iw_list(IW_LIST)["phy0"]
+        with patch('src.phy_capabilities.get_phy', return_value=phy):
+            self.assertFalse(configure_load_balancing(["A", "B"]))
+        mock_balancer.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.plugins import Plugin, PluginRegistry, PluginLoadError, BUILTIN_PLUGINS
+
+class TestPlugins(unittest.TestCase):
+
+    @patch('src.plugins.discover_entry_points', return_value=[])
+    def test_builtin_plugins_load(self, mock_discover):
+        # Every built-in subsystem imports under the package entry point
+        for plugin in PluginRegistry().plugins():
+            self.assertTrue(callable(plugin.load()), plugin.target)
+            self.assertIsNotNone(plugin.load_time)
+
+    @patch('src.plugins.discover_entry_points', return_value=[("VPN Tools", "vpn_tools.ui:vpn_menu")])
+    def test_entry_points_are_appended(self, mock_discover):
+        registry = PluginRegistry(builtin=BUILTIN_PLUGINS[:2] + [("4", "Other", "x:y")])
+        plugins = registry.plugins()
+        self.assertEqual([plugin.key for plugin in plugins], ["1", "2", "4", "5"])
+        self.assertEqual(registry.get("5").title, "VPN Tools")
+        self.assertIsNone(registry.get("b"))
+        # Discovery runs once; no plugin module is imported by listing
+        registry.plugins()
+        mock_discover.assert_called_once()
+        self.assertFalse(any(plugin.loaded for plugin in plugins))
+
+    def test_load_failure_is_reported(self):
+        plugin = Plugin("9", "Broken", "src.no_such_module:menu")
+        with self.assertRaises(PluginLoadError) as context:
+            plugin.load()
+        self.assertIn("ModuleNotFoundError", str(context.exception))
+        self.assertIn(" ms", str(context.exception))
+
+        with self.assertRaises(PluginLoadError):
+            Plugin("9", "Missing", "src.plugins:no_such_menu").load()
+
+if __name__ == '__main__':
+    unittest.main()
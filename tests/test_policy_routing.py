@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import policy_routing
+from src.policy_routing import allocate_table_id, render_nft_ruleset, install_app_routing, remove_app_routing
+from src.utils.config_writer import parse_rt_tables, remove_rt_table
+from src.utils.privileged_helper import validate_command
+
+RT_TABLES = "255\tlocal\n254\tmain\n# comment\n100\twifi_wlan1\n101\tvpn\n"
+
+class TestPolicyRouting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.rt_tables = os.path.join(self.tmpdir.name, "rt_tables")
+        with open(self.rt_tables, 'w') as f:
+            f.write(RT_TABLES)
+        self.wrapper_dir = os.path.join(self.tmpdir.name, "bin")
+        for name, value in (("RT_TABLES_PATH", self.rt_tables), ("WRAPPER_DIR", self.wrapper_dir)):
+            patcher = patch.object(policy_routing, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        backups = patch('src.utils.config_writer._default_backup_dir', return_value=os.path.join(self.tmpdir.name, "backups"))
+        backups.start()
+        self.addCleanup(backups.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_tables(self):
+        with open(self.rt_tables) as f:
+            return parse_rt_tables(f.read())
+
+    def test_parse_and_remove_rt_tables(self):
+        tables = parse_rt_tables(RT_TABLES)
+        self.assertEqual(tables, {"local": 255, "main": 254, "wifi_wlan1": 100, "vpn": 101})
+        self.assertNotIn("vpn", parse_rt_tables(remove_rt_table(RT_TABLES, "vpn")))
+        self.assertIn("# comment", remove_rt_table(RT_TABLES, "vpn"))
+
+    def test_allocate_table_id(self):
+        tables = parse_rt_tables(RT_TABLES)
+        self.assertEqual(allocate_table_id(tables, "wifi_wlan1"), 100)
+        self.assertEqual(allocate_table_id(tables, "wifi_wlan0"), 102)
+        with self.assertRaises(ValueError):
+            allocate_table_id({f"t{i}": i for i in range(100, 200)}, "wifi_wlan0")
+
+    def test_render_nft_ruleset(self):
+        ruleset = render_nft_ruleset({"wifi_wlan1": 100})
+        self.assertIn('socket cgroupv2 level 2 "intel-wifi-fixer/wifi_wlan1" meta mark set 100', ruleset)
+        self.assertIn('meta mark 100 oifname "wlan1" masquerade', ruleset)
+        validate_command(["nft", "-f", "-"], ruleset)
+        # Without tables only the deletion remains
+        self.assertEqual(render_nft_ruleset({}).count("table"), 2)
+
+    @patch('src.policy_routing.run_command', return_value="/usr/bin/firefox")
+    @patch('src.policy_routing.find_gateway', return_value="10.0.0.1")
+    @patch('src.policy_routing.execute_batch_with_sudo')
+    def test_install_app_routing(self, mock_batch, mock_find_gateway, mock_run_command):
+        mock_batch.side_effect = lambda commands, stop_on_error=True, inputs=None: [""] * len(commands)
+
+        routing = install_app_routing("wlan0", ["firefox"])
+        self.assertEqual(routing["table_id"], 102)
+        self.assertEqual(self.read_tables()["wifi_wlan0"], 102)
+
+        # One helper round trip; every command passes the allowlist
+        self.assertEqual(mock_batch.call_count, 1)
+        commands = mock_batch.call_args[0][0]
+        inputs = mock_batch.call_args[1]["inputs"]
+        for command, input_text in zip(commands, inputs):
+            validate_command(command, input_text)
+        routes = inputs[commands.index(["ip", "-force", "-batch", "-"])]
+        self.assertIn("route replace default via 10.0.0.1 dev wlan0 table 102", routes)
+        self.assertIn("rule add fwmark 102 table 102 priority 902", routes)
+        # Existing managed tables keep their cgroups and marks
+        self.assertIn(["mkdir", "-p", "/sys/fs/cgroup/intel-wifi-fixer/wifi_wlan0",
+                       "/sys/fs/cgroup/intel-wifi-fixer/wifi_wlan1"], commands)
+        self.assertIn("mark set 100", inputs[-1])
+
+        with open(routing["wrappers"]["firefox"]) as f:
+            wrapper = f.read()
+        self.assertIn("/sys/fs/cgroup/intel-wifi-fixer/wifi_wlan0/cgroup.procs", wrapper)
+        self.assertIn('exec /usr/bin/firefox "$@"', wrapper)
+
+        # Running again reuses the table ID
+        self.assertEqual(install_app_routing("wlan0", ["firefox"])["table_id"], 102)
+        self.assertEqual(list(self.read_tables().values()).count(102), 1)
+
+    @patch('src.policy_routing.run_command', return_value="/usr/bin/firefox")
+    @patch('src.policy_routing.find_gateway', return_value="10.0.0.1")
+    @patch('src.policy_routing.execute_batch_with_sudo')
+    def test_remove_app_routing(self, mock_batch, mock_find_gateway, mock_run_command):
+        mock_batch.side_effect = lambda commands, stop_on_error=True, inputs=None: [""] * len(commands)
+        routing = install_app_routing("wlan0", ["firefox"])
+        mock_batch.reset_mock()
+
+        self.assertTrue(remove_app_routing("wlan0"))
+        self.assertNotIn("wifi_wlan0", self.read_tables())
+        self.assertIn("wifi_wlan1", self.read_tables())
+        self.assertFalse(os.path.exists(routing["wrappers"]["firefox"]))
+
+        commands = [command for call in mock_batch.call_args_list for command in call[0][0]]
+        inputs = mock_batch.call_args_list[0][1]["inputs"]
+        self.assertIn("rule del priority 902", inputs[0])
+        self.assertIn("route flush table 102", inputs[0])
+        self.assertNotIn("wifi_wlan0", inputs[1])
+        self.assertIn(["rmdir", "/sys/fs/cgroup/intel-wifi-fixer/wifi_wlan0"], commands)
+
+        self.assertFalse(remove_app_routing("wlan0"))
+
+if __name__ == '__main__':
+    unittest.main()
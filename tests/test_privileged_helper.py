@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import io
+import json
+import shutil
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.privileged_helper import (
+    validate_command, execute_request, execute_operation, serve, PrivilegedHelper, HelperError
+)
+
+class TestPrivilegedHelper(unittest.TestCase):
+
+    def test_validate_command(self):
+        validate_command(["ip", "link", "set", "wlan0", "up"])
+        validate_command(["systemctl", "restart", "NetworkManager"])
+        validate_command(["cp", "/tmp/fw.ucode", "/usr/lib/firmware/fw.ucode"])
+
+        for argv in (["bash", "-c", "echo hi"],
+                     ["systemctl", "mask", "NetworkManager"],
+                     ["cp", "/tmp/x", "/etc/shadow"],
+                     ["rm", "/tmp/../etc/passwd"],
+                     ["wget", "http://example.com/x"],
+                     []):
+            with self.assertRaises(HelperError):
+                validate_command(argv)
+
+    def test_validate_command_rejects_bypasses(self):
+        validate_command(["ip", "route", "replace", "default", "via", "10.0.0.1", "dev", "wlan0", "table", "100"])
+        validate_command(["ip", "-force", "-batch", "-"], "route flush table 100\nrule del priority 1000\n")
+        validate_command(["modprobe", "-r", "iwlmvm", "iwlwifi"])
+        validate_command(["modprobe", "iwlwifi", "power_save=0"])
+        validate_command(["wget", "https://example.com/fw.ucode", "-O", "/usr/lib/firmware/fw.ucode.new"])
+
+        for argv in (["ip", "netns", "exec", "x", "sh"],
+                     ["ip", "vrf", "exec", "x", "sh"],
+                     ["ip", "route", "replace", "default", "vrf", "x"],
+                     ["ip", "-batch", "/home/user/commands"],
+                     ["modprobe", "-C", "/home/user/modprobe.d", "iwlwifi"],
+                     ["modprobe", "--config=/home/user/modprobe.d", "iwlwifi"],
+                     ["modprobe", "-d", "/home/user", "iwlwifi"],
+                     ["wget", "https://example.com/x", "-O", "/usr/lib/firmware/x", "-O", "/etc/shadow"],
+                     ["wget", "https://example.com/x", "--post-file=/etc/shadow", "-O", "/usr/lib/firmware/x"],
+                     ["wget", "https://example.com/x", "-O", "/tmp/x"],
+                     ["cp", "-t", "/etc", "/usr/lib/firmware/x"],
+                     ["cp", "--target-directory=/etc", "/home/user/x", "/usr/lib/firmware/x"],
+                     ["rm", "-rf", "/usr/lib/firmware"]):
+            with self.assertRaises(HelperError, msg=argv):
+                validate_command(argv)
+        with self.assertRaises(HelperError):
+            validate_command(["ip", "-force", "-batch", "-"], "netns exec x sh\n")
+
+    def test_nft_input_checks_every_statement(self):
+        from src.policy_routing import render_nft_ruleset
+        validate_command(["nft", "-f", "-"], render_nft_ruleset({"iwf_wlan0": 100}))
+        validate_command(["nft", "-f", "-"], render_nft_ruleset({}))
+
+        for script in ("table inet intel_wifi_fixer\n  flush ruleset\n",
+                       "table inet intel_wifi_fixer\n\tdelete table inet filter\n",
+                       "table inet intel_wifi_fixer; flush ruleset\n",
+                       "table inet intel_wifi_fixer {\n}\n delete table ip nat\n",
+                       "table inet intel_wifi_fixer {\n}\n}\nflush ruleset\n",
+                       "table inet filter {\n chain input { type filter hook input priority 0; policy drop; }\n}\n",
+                       'include "/home/user/rules.nft"\n'):
+            with self.assertRaises(HelperError, msg=script):
+                validate_command(["nft", "-f", "-"], script)
+
+    @patch('src.utils.config_writer.commit_config')
+    def test_write_config_ignores_backup_dir_and_limits_mode(self, mock_commit_config):
+        operation = {"op": "write_config", "path": "/etc/modprobe.d/iwlwifi.conf", "content": "options x\n",
+                     "mode": 0o600, "backup_dir": "/home/user/.ssh", "keep": 0}
+        self.assertTrue(execute_operation(operation)["ok"])
+        mock_commit_config.assert_called_once_with("/etc/modprobe.d/iwlwifi.conf", "options x\n", 0o600,
+                                                   "/var/lib/intel-wifi-fixer/backups")
+
+        for mode in (0o4755, 0o755, 0o666):
+            result = execute_operation(dict(operation, mode=mode))
+            self.assertFalse(result["ok"])
+            self.assertIn("Mode not allowed", result["error"])
+        self.assertEqual(mock_commit_config.call_count, 1)
+
+    @patch('src.utils.privileged_helper.subprocess.run')
+    def test_execute_request_stop_on_error(self, mock_run):
+        mock_run.return_value.returncode = 1
+        mock_run.return_value.stdout = "FATAL: Module iwlmvm is in use."
+        request = {"id": 7, "stop_on_error": True, "operations": [
+            {"op": "run", "argv": ["modprobe", "-r", "iwlmvm"]},
+            {"op": "run", "argv": ["modprobe", "iwlwifi"]},
+            {"op": "run", "argv": ["bash", "-c", "true"]}
+        ]}
+        reply = execute_request(request)
+        self.assertEqual(reply["id"], 7)
+        self.assertFalse(reply["results"][0]["ok"])
+        self.assertIn("Skipped", reply["results"][1]["error"])
+        mock_run.assert_called_once()
+
+    def test_serve_protocol(self):
+        infile = io.StringIO(json.dumps({"id": 1, "operations": [{"op": "reboot"}]}) + "\n")
+        outfile = io.StringIO()
+        serve(infile, outfile)
+        lines = [json.loads(line) for line in outfile.getvalue().splitlines()]
+        self.assertEqual(lines[0], {"ready": True})
+        self.assertEqual(lines[1]["id"], 1)
+        self.assertIn("Unknown operation", lines[1]["results"][0]["error"])
+
+    @unittest.skipUnless(shutil.which("ip"), "ip is not installed")
+    def test_helper_process(self):
+        # Run the helper without sudo to exercise the pipe protocol end to end
+        helper = PrivilegedHelper([sys.executable, "-m", "src.utils.privileged_helper"])
+        try:
+            outputs = helper.run_batch([["ip", "link", "show", "lo"], ["ip", "link", "show", "lo"]])
+            self.assertEqual(len(outputs), 2)
+            self.assertIn("lo", outputs[0])
+            with self.assertRaises(HelperError):
+                helper.run(["sh", "-c", "id"])
+        finally:
+            helper.close()
+
+if __name__ == '__main__':
+    unittest.main()
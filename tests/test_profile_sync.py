@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import json
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.profile_sync import sync_profiles, plan_sync, profile_properties, properties_hash
+
+MANIFEST = {
+    "profiles": [
+        {"name": "Office", "ssid": "office", "psk": "secret123"},
+        {"name": "Corp", "ssid": "corp",
+         "enterprise": {"eap": "peap", "identity": "alice", "password": "pw"}}
+    ]
+}
+
+class TestProfileSync(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        self.state_path = os.path.join(self.tmp.name, "state.json")
+        with open(self.manifest_path, 'w') as f:
+            json.dump(MANIFEST, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_profile_properties(self):
+        properties = profile_properties(MANIFEST["profiles"][1])
+        self.assertEqual(properties["wifi-sec.key-mgmt"], "wpa-eap")
+        self.assertEqual(properties["802-1x.eap"], "peap")
+        self.assertEqual(properties["802-1x.phase2-auth"], "mschapv2")
+        self.assertEqual(properties["802-1x.identity"], "alice")
+
+    def test_plan_sync(self):
+        office = profile_properties(MANIFEST["profiles"][0])
+        state = {
+            "Office": {"uuid": "u1", "hash": properties_hash(office), "keys": sorted(office)},
+            "Old": {"uuid": "u3", "hash": "x", "keys": []},
+            "Renamed": {"uuid": "u9", "hash": "x", "keys": []}
+        }
+        existing = {"Office": "u1", "Old": "u3", "Renamed": "u4", "Home": "u5"}
+        plan = plan_sync(MANIFEST, existing, state)
+
+        self.assertEqual(plan["unchanged"], ["Office"])
+        self.assertEqual([item["name"] for item in plan["create"]], ["Corp"])
+        # Profiles not created by a sync (or replaced since) are never deleted
+        self.assertEqual([item["name"] for item in plan["delete"]], ["Old"])
+
+    @patch('src.profile_sync.display_message')
+    @patch('src.profile_sync.display_success')
+    @patch('src.multi_connection.execute_with_sudo')
+    @patch('src.profile_sync.run_command')
+    def test_second_sync_is_a_noop(self, mock_run_command, mock_execute_with_sudo,
+                                   mock_display_success, mock_display_message):
+        mock_run_command.return_value = "Home:u5"
+        uuids = {"Office": "11111111-1111-1111-1111-000000000000",
+                 "Corp": "11111111-1111-1111-1111-cccccccccccc"}
+        mock_execute_with_sudo.side_effect = lambda command: (
+            f"Connection '{command[6]}' ({uuids[command[6]]}) successfully added."
+        )
+
+        plan = sync_profiles(self.manifest_path, state_path=self.state_path)
+        self.assertEqual(len(plan["results"]), 2)
+        self.assertTrue(all(result["ok"] for result in plan["results"]))
+
+        mock_execute_with_sudo.reset_mock()
+        mock_run_command.reset_mock()
+        mock_run_command.return_value = "Home:u5\n" + "\n".join(
+            f"{name}:{uuid}" for name, uuid in uuids.items()
+        )
+
+        plan = sync_profiles(self.manifest_path, state_path=self.state_path)
+        self.assertEqual(sorted(plan["unchanged"]), ["Corp", "Office"])
+        mock_execute_with_sudo.assert_not_called()
+        # A single listing call
+        mock_run_command.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import struct
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import regdb
+from src.regdb import RegulatoryDBError, parse_regdb, parse_reg_get
+from src.regulatory import get_available_channels, get_max_transmit_power, compare_regulatory_domains
+
+REG_GET = """global
+country US: DFS-FCC
+	(902 - 904 @ 2), (N/A, 30), (N/A)
+	(2400 - 2472 @ 40), (N/A, 30), (N/A)
+	(5150 - 5250 @ 80), (N/A, 23), (N/A), AUTO-BW
+	(5250 - 5350 @ 80), (N/A, 24), (0 ms), DFS, AUTO-BW
+	(5470 - 5730 @ 160), (N/A, 24), (0 ms), DFS
+	(5730 - 5850 @ 80), (N/A, 30), (N/A), AUTO-BW
+	(5925 - 7125 @ 320), (N/A, 12), (N/A), NO-OUTDOOR, PASSIVE-SCAN
+
+phy#0 (self-managed)
+country DE: DFS-ETSI
+	(2400 - 2483 @ 40), (N/A, 20), (N/A)
+"""
+
+# (start, end, max bandwidth) in MHz, EIRP in dBm, regulatory.db flag bits
+DATABASE = {
+    "DE": (2, [(2400, 2483.5, 40, 20, 0), (5150, 5250, 80, 23, 0x02 | 0x10), (5250, 5350, 80, 20, 0x04 | 0x10)]),
+    "JP": (3, [(2402, 2482, 40, 20, 0), (2474, 2494, 20, 20, 0x01), (5170, 5250, 80, 20, 0x10)]),
+}
+
+def build_regdb(countries):
+    """Encode countries in the regulatory.db format."""
+    data = bytearray(struct.pack(">II", regdb.REGDB_MAGIC, regdb.REGDB_VERSION))
+    table = len(data)
+    data += bytes(4 * (len(countries) + 1))
+    for i, (alpha2, (dfs_region, rules)) in enumerate(sorted(countries.items())):
+        rule_offsets = []
+        for start, end, bandwidth, eirp, flags in rules:
+            rule_offsets.append(len(data) >> 2)
+            data += struct.pack(">BBHIIIH2x", 20, flags, int(eirp * 100), int(start * 1000), int(end * 1000),
+                                bandwidth * 1000, 60000 if flags & 0x04 else 0)
+        struct.pack_into(">2sH", data, table + 4 * i, alpha2.encode("ascii"), len(data) >> 2)
+        data += struct.pack(f">BBB1x{len(rules)}H", 3, len(rules), dfs_region, *rule_offsets)
+        data += bytes(-len(data) % 4)
+    return bytes(data)
+
+class TestRegulatoryDatabase(unittest.TestCase):
+
+    def test_parse_reg_get(self):
+        domains = parse_reg_get(REG_GET)
+        self.assertEqual(sorted(domains), ["global", "phy#0"])
+        us = domains["global"]
+        self.assertEqual((us.alpha2, us.dfs_region, len(us.rules)), ("US", "DFS-FCC", 7))
+        self.assertEqual(us.rule_at(5300).cac_timeout, None)
+        self.assertEqual(us.rule_at(6000).flags, {"NO-OUTDOOR", "NO-IR"})
+        self.assertIsNone(us.rule_at(5400))
+
+    def test_allowed_widths_and_power(self):
+        us = parse_reg_get(REG_GET)["global"]
+        self.assertEqual(us.allows(5180)["max_eirp"], 23)
+        # 36-64 spans two AUTO-BW rules at 160 MHz, taking the lower limit and both flags
+        self.assertEqual(us.allows(5180, 160), {"max_eirp": 23, "flags": ["DFS"]})
+        self.assertIsNone(us.allows(5660, 160))
+        self.assertIsNotNone(us.allows(5660, 80))
+        # HT40 on channel 11 only works below it
+        self.assertIsNotNone(us.allows(2462, 40))
+        self.assertIsNone(us.allows(2467))
+
+        channels = {channel["channel"]: channel for channel in us.channels() if channel["band"] == "5 GHz"}
+        self.assertEqual(channels[100]["widths"], [20, 40, 80, 160])
+        self.assertEqual(channels[100]["flags"], ["DFS"])
+        self.assertNotIn(148, channels)
+        self.assertEqual(us.max_eirp(), {"2.4 GHz": 30, "5 GHz": 30, "6 GHz": 12})
+
+    def test_parse_regdb(self):
+        domains = parse_regdb(build_regdb(DATABASE))
+        self.assertEqual(sorted(domains), ["DE", "JP"])
+        de = domains["DE"]
+        self.assertEqual(de.dfs_region, "DFS-ETSI")
+        self.assertEqual(de.rule_at(5300).flags, {"DFS", "AUTO-BW"})
+        self.assertEqual(de.rule_at(5300).cac_timeout, 60000)
+        self.assertEqual(de.rule_at(2483.5).max_eirp, 20)
+        # Channel 14 is allowed in Japan, without OFDM
+        self.assertEqual(domains["JP"].allows(2484)["flags"], ["NO-OFDM"])
+
+        with self.assertRaises(RegulatoryDBError):
+            parse_regdb(b"RGDB\x00\x00\x00\x13")
+        with self.assertRaises(RegulatoryDBError):
+            parse_regdb(build_regdb(DATABASE)[:40])
+
+    def test_index_compares_countries_and_reloads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "regulatory.db")
+            with open(path, "wb") as f:
+                f.write(build_regdb(DATABASE))
+
+            with patch('src.regdb.REGDB_PATHS', (os.path.join(directory, "missing.db"), path)):
+                index = regdb.get_index()
+                self.assertIs(regdb.get_index(), index)
+                self.assertEqual(index.countries(), ["DE", "JP"])
+
+                differences = {(item["band"], item["channel"]): item for item in compare_regulatory_domains("de", "JP")}
+                self.assertIsNone(differences[("2.4 GHz", 14)]["DE"])
+                self.assertEqual(differences[("2.4 GHz", 14)]["JP"]["max_eirp"], 20)
+                self.assertIsNone(differences[("5 GHz", 52)]["JP"])
+                self.assertNotIn(("2.4 GHz", 6), differences)
+                self.assertIsNone(compare_regulatory_domains("DE", "XX"))
+
+                with open(path, "wb") as f:
+                    f.write(build_regdb({"FR": DATABASE["DE"]}))
+                os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+                self.assertEqual(regdb.get_index().countries(), ["FR"])
+
+    @patch('src.regulatory.get_phy', return_value=None)
+    @patch('src.regulatory.run_command', return_value=REG_GET)
+    def test_regulatory_info_from_rules(self, mock_run_command, mock_get_phy):
+        channels = get_available_channels()
+        self.assertEqual(channels["2.4 GHz"], [str(channel) for channel in range(1, 12)])
+        self.assertEqual(channels["5 GHz"][:2], ["36", "40"])
+        self.assertEqual(get_max_transmit_power()["5 GHz"], "30 dBm")
+        mock_run_command.assert_called_with(["iw", "reg", "get"])
+
+if __name__ == '__main__':
+    unittest.main()
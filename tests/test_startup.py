@@ -0,0 +1,42 @@
+import unittest
+import sys
+import os
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cumulative `python -X importtime` budget for src.main, in microseconds
+IMPORT_BUDGET_US = 100000
+
+# Modules that must only be imported once their menu is used
+LAZY_MODULES = [
+    "src.diagnostics", "src.fixes", "src.driver_reload", "src.utils.config_writer",
+    "src.enterprise_wifi_ui", "src.multi_connection_ui", "src.regulatory_ui",
+    "src.captive_portal_ui", "src.troubleshooting_ui", "src.dashboard", "src.plugins", "src.cli", "curses",
+    "src.phy_capabilities", "webbrowser", "concurrent.futures", "importlib.metadata"
+]
+
+def run_python(*args):
+    return subprocess.run([sys.executable] + list(args), cwd=PROJECT_ROOT, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+class TestStartup(unittest.TestCase):
+
+    def test_subsystems_load_lazily(self):
+        result = run_python("-c", "import sys, src.main; print('\\n'.join(sys.modules))")
+        loaded = set(result.stdout.split())
+        self.assertIn("src.main", loaded)
+        self.assertEqual([module for module in LAZY_MODULES if module in loaded], [])
+
+    def test_import_time_budget(self):
+        timings = []
+        # Best of three runs, so a busy machine does not fail the test
+        for _ in range(3):
+            result = run_python("-X", "importtime", "-c", "import src.main")
+            line = next(line for line in result.stderr.splitlines() if line.endswith("| src.main"))
+            timings.append(int(line.split("|")[1]))
+        self.assertLess(min(timings), IMPORT_BUDGET_US,
+                        f"import src.main took {min(timings) / 1000:.1f} ms")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import time
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.status_service import StatusService
+from src.utils.netlink import RTM_NEWLINK
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+class TestStatusService(unittest.TestCase):
+
+    def make_adapter(self):
+        adapter_info = MagicMock()
+        adapter_info.adapter_id = "wlan0"
+        adapter_info.retrieve_status.return_value = "connected"
+        return adapter_info
+
+    @patch('src.status_service.LinkMonitor', side_effect=OSError)
+    def test_refreshes_in_background(self, mock_link_monitor):
+        adapter_info = self.make_adapter()
+        service = StatusService(adapter_info, interval=0.05)
+        self.assertIsNone(service.status())
+        self.assertIsNone(service.age())
+
+        service.start()
+        try:
+            self.assertTrue(wait_until(lambda: service.status() == "connected"))
+            adapter_info.retrieve_status.return_value = "disconnected"
+            self.assertTrue(wait_until(lambda: service.status() == "disconnected"))
+            self.assertLess(service.age(), 1.0)
+        finally:
+            service.stop()
+        adapter_info.refresh.assert_called_with("status")
+
+    @patch('src.status_service.LinkMonitor')
+    def test_link_event_triggers_refresh(self, mock_link_monitor):
+        monitor = mock_link_monitor.return_value
+        events = [[], [(RTM_NEWLINK, "wlan1")], [(RTM_NEWLINK, "wlan0")]]
+        monitor.read.side_effect = lambda timeout: events.pop(0) if events else time.sleep(timeout) or []
+
+        adapter_info = self.make_adapter()
+        # A long interval: only the event for wlan0 can cause the second refresh
+        service = StatusService(adapter_info, interval=60)
+        service.start()
+        try:
+            self.assertTrue(wait_until(lambda: adapter_info.retrieve_status.call_count >= 2))
+        finally:
+            service.stop()
+        self.assertEqual(adapter_info.retrieve_status.call_count, 2)
+        monitor.close.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
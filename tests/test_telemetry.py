@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import math
+import json
+import tempfile
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.telemetry import (
+    RingBuffer,
+    LinkTelemetry,
+    percentile,
+    read_station_stats
+)
+
+STATION_DUMP = """Station 00:11:22:33:44:55 (on wlan0)
+	inactive time:	300 ms
+	tx packets:	{packets}
+	tx retries:	{retries}
+	tx failed:	1
+	beacon loss:	0
+	signal:  	-55 [-57, -58] dBm
+	tx bitrate:	144.4 MBit/s MCS 15 short GI
+	rx bitrate:	130.0 MBit/s MCS 15"""
+
+class TestTelemetry(unittest.TestCase):
+
+    def test_ring_buffer(self):
+        buffer = RingBuffer(3)
+        for value in [1, 2, 3, 4, 5]:
+            buffer.append(value)
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.values(), [3.0, 4.0, 5.0])
+        self.assertEqual(buffer.values(2), [4.0, 5.0])
+
+    def test_percentile(self):
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 50), 3)
+        self.assertAlmostEqual(percentile([1, 2, 3, 4], 50), 2.5)
+        self.assertIsNone(percentile([], 90))
+
+    @patch('src.telemetry.run_command')
+    def test_read_station_stats(self, mock_run_command):
+        mock_run_command.return_value = STATION_DUMP.format(packets=50, retries=10)
+        stats = read_station_stats("wlan0")
+        self.assertEqual(stats["signal"], -55)
+        self.assertEqual(stats["tx_bitrate"], 144.4)
+        self.assertEqual(stats["tx_retries"], 10)
+
+        # Not associated
+        mock_run_command.return_value = ""
+        self.assertIsNone(read_station_stats("wlan0"))
+
+    @patch('src.telemetry.run_command')
+    def test_sample_counters_and_export(self, mock_run_command):
+        telemetry = LinkTelemetry("wlan0", capacity=10)
+
+        for packets, retries in [(50, 10), (80, 14), (100, 20)]:
+            mock_run_command.return_value = STATION_DUMP.format(packets=packets, retries=retries)
+            telemetry.sample()
+
+        # Counters are stored as per-sample deltas; the first sample has none
+        retries = telemetry.query("tx_retries")
+        self.assertEqual(retries["count"], 2)
+        self.assertEqual(retries["latest"], 6)
+        self.assertEqual(retries["min"], 4)
+        # The missing first delta does not drag the average towards zero
+        self.assertAlmostEqual(retries["ewma"], 0.2 * 6 + 0.8 * 4)
+
+        signal = telemetry.query("signal")
+        self.assertEqual(signal["ewma"], -55)
+        self.assertEqual(signal["p90"], -55)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "telemetry.ndjson")
+            self.assertEqual(telemetry.export_ndjson(path), 3)
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+
+        self.assertIsNone(lines[0]["tx_retries"])
+        self.assertEqual(lines[1]["tx_retries"], 4)
+        self.assertEqual(lines[2]["tx_bitrate"], 144.4)
+
+        # After a reconnect the counters start over; that sample has no delta either
+        mock_run_command.return_value = STATION_DUMP.format(packets=5, retries=1)
+        self.assertTrue(math.isnan(telemetry.sample()["tx_retries"]))
+
+if __name__ == '__main__':
+    unittest.main()
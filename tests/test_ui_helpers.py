@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+
+# Add the src directory to the path so we can import the modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.ui_helpers import display_table, stream_table, fit_column_widths
+
+def capture(func, *args, **kwargs):
+    output = io.StringIO()
+    with redirect_stdout(output):
+        result = func(*args, **kwargs)
+    return result, output.getvalue().splitlines()
+
+class TestUiHelpers(unittest.TestCase):
+
+    def test_display_table(self):
+        _, lines = capture(display_table, ["Name", "Value"], [["a", 1], ["long name", 22]])
+        self.assertEqual(lines, [
+            "┌───────────┬───────┐",
+            "│ Name      │ Value │",
+            "├───────────┼───────┤",
+            "│ a         │ 1     │",
+            "│ long name │ 22    │",
+            "└───────────┴───────┘"
+        ])
+
+    def test_stream_table_starts_before_rows_are_exhausted(self):
+        output = io.StringIO()
+        printed_at = {}
+
+        def rows():
+            for i in range(1000):
+                printed_at[i] = output.getvalue().count("\n")
+                yield [f"row {i:03}", "x" * (i % 13)]
+
+        with redirect_stdout(output):
+            count = stream_table(["Name", "Data"], rows(), sample=10)
+
+        self.assertEqual(count, 1000)
+        # Only the sampled rows were read before the first lines were printed
+        self.assertEqual(printed_at[9], 0)
+        self.assertEqual(printed_at[10], 3 + 10)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 1000 + 4)
+        # Widths came from the sample; longer cells are truncated
+        self.assertEqual(lines[-2], "│ row 999 │ xxxxxxxx… │")
+        self.assertEqual(len({len(line) for line in lines}), 1)
+
+    def test_fit_column_widths(self):
+        self.assertEqual(fit_column_widths([10, 40], None), [10, 40])
+        # 2 columns: 3 * 2 + 1 characters of padding and borders
+        self.assertEqual(fit_column_widths([10, 40], 37), [10, 20])
+        self.assertEqual(fit_column_widths([10, 40], 5), [3, 3])
+
+        _, lines = capture(stream_table, ["A", "B"], [["a" * 30, "b" * 30]], max_width=30)
+        self.assertTrue(all(len(line) == 30 for line in lines))
+
+    @patch('builtins.input', side_effect=["", "q"])
+    def test_paging(self, mock_input):
+        closed = []
+
+        def rows():
+            try:
+                for i in range(100):
+                    yield [i]
+            finally:
+                closed.append(True)
+
+        count, lines = capture(stream_table, ["#"], rows(), widths=[3], page_size=10)
+        self.assertEqual(count, 20)
+        self.assertEqual(mock_input.call_count, 2)
+        self.assertEqual(closed, [True])
+        self.assertEqual(sum(line == "│ #   │" for line in lines), 2)
+
+if __name__ == '__main__':
+    unittest.main()